@@ -0,0 +1,92 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark de la detección de sorpresas escalar frente a la vectorizada.
+
+Genera jornadas sintéticas a partir de los detalles grabados en tests/data_source_samples (con rachas y
+clasificaciones que activan las tres reglas) y compara detect() partido a partido con
+compute_divergence_scores() sobre todas las jornadas a la vez.
+
+Ejecutar: PYTHONPATH=. python benchmarks/bench_detector.py
+"""
+
+import json
+import random
+import timeit
+
+from kinielagpt.detector import SurpriseDetector
+from kinielagpt.records import JornadaFrame
+
+N_JORNADAS = 2000
+REPETITIONS = 3
+
+
+def build_frames(n_jornadas: int) -> list[JornadaFrame]:
+    """Jornadas sintéticas con probabilidades aleatorias y detalles derivados de la muestra."""
+    rng = random.Random(0)
+    with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+        sample_details = json.load(f)
+
+    frames = []
+    for jornada in range(1, n_jornadas + 1):
+        probabilities, details = [], []
+        for i, sample in enumerate(sample_details):
+            p1 = rng.uniform(10, 80)
+            px = rng.uniform(5, 100 - p1 - 5)
+            probabilities.append({
+                "partido": f"PARTIDO {i + 1}", "1_Prob": p1, "X_Prob": px, "2_Prob": 100 - p1 - px,
+            })
+            detail = dict(sample)
+            detail["evolucionLocal"] = [rng.choice("VED") for _ in range(5)]
+            detail["evolucionVisitante"] = [rng.choice("VED") for _ in range(5)]
+            detail["clasificacionLocal"] = f"{rng.randint(1, 20)}º"
+            detail["clasificacionVisitante"] = f"{rng.randint(1, 20)}º"
+            details.append(detail)
+        frames.append(JornadaFrame.from_sources(
+            jornada=jornada, temporada=2026, probabilities=probabilities, details=details
+        ))
+    return frames
+
+
+if __name__ == "__main__":
+    detector = SurpriseDetector()
+    frames = build_frames(n_jornadas=N_JORNADAS)
+
+    for frame in frames[:50]:
+        expected = detector.detect(jornada=frame.jornada, temporada=frame.temporada, threshold=20.0, frame=frame)
+        result = detector.detect_vectorized(
+            jornada=frame.jornada, temporada=frame.temporada, threshold=20.0, frame=frame
+        )
+        assert expected == result, f"Resultados distintos en la jornada {frame.jornada}"
+
+    def run_scalar() -> None:
+        for frame in frames:
+            detector.detect(jornada=frame.jornada, temporada=frame.temporada, threshold=20.0, frame=frame)
+
+    def run_vectorized() -> None:
+        detector.compute_divergence_scores(frames=frames)
+
+    t_scalar = min(timeit.repeat(run_scalar, number=1, repeat=REPETITIONS))
+    t_vectorized = min(timeit.repeat(run_vectorized, number=1, repeat=REPETITIONS))
+
+    print(f"{N_JORNADAS} jornadas ({N_JORNADAS * 15} partidos)")
+    print(f"  detect (escalar):          {N_JORNADAS / t_scalar:10.0f} jornadas/s")
+    print(f"  compute_divergence_scores: {N_JORNADAS / t_vectorized:10.0f} jornadas/s")
+    print(f"  speedup:                   {t_scalar / t_vectorized:10.2f}x")
@@ -0,0 +1,226 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Benchmark del procesado de la comparativa (ultimos_partidos) de los detalles de partido.
+
+Compara la implementación original de __procesar_ultimos_partidos (parseo del marcador repetido en cada caso y
+ordenación por jornada) con la actual (tabla de tipos, códigos de resultado memoizados y un único sort) sobre una
+temporada sintética: los payloads grabados en tests/data_source_samples repetidos para 38 jornadas.
+
+Ejecutar: PYTHONPATH=. python benchmarks/bench_procesar_ultimos_partidos.py
+"""
+
+import json
+import timeit
+
+import kinielagpt.data_source as ds_module
+
+N_JORNADAS = 38
+REPETITIONS = 5
+
+procesar_ultimos_partidos = getattr(ds_module, "__procesar_ultimos_partidos")
+
+
+def legacy_procesar_ultimos_partidos(ultimos_partidos: dict, equipo_local: str, equipo_visitante: str) -> list:
+    """Implementación original: parseo duplicado por caso y agrupado/ordenación por jornada."""
+    if not ultimos_partidos:
+        return []
+    
+    def resultado_valido(resultado: str) -> bool:
+        """Comprueba si el resultado es válido (no vacío tras strip, no '-')."""
+        if not resultado:
+            return False
+        resultado_clean = resultado.strip()
+        return bool(resultado_clean and resultado_clean != '-')
+    
+    partidos_por_jornada = {}
+    
+    for vuelta in ['vuelta1', 'vuelta2']:
+        if vuelta not in ultimos_partidos:
+            continue
+        
+        # Partidos del EQUIPO LOCAL (partidos_local)
+        # El equipo_local juega contra rival
+        for p in ultimos_partidos[vuelta].get('partidos_local', []):
+            if p.get('status') != 100:
+                continue
+            
+            resultado_casa = p.get('resultado_casa', '').strip()
+            resultado_fuera = p.get('resultado_fuera', '').strip()
+            rival = p.get('rival', '')
+            jornada = p.get('jornada')
+            
+            # Si hay resultado_casa válido: equipo_local | rival
+            if resultado_valido(resultado=resultado_casa):
+                if jornada not in partidos_por_jornada:
+                    partidos_por_jornada[jornada] = []
+                orden = len(partidos_por_jornada[jornada])
+                try:
+                    goles_local, goles_rival = map(int, resultado_casa.split('-'))
+                except ValueError:
+                    goles_local, goles_rival = None, None
+                if goles_local is not None and goles_rival is not None:
+                    if goles_local > goles_rival:
+                        signo = 'VICTORIA'
+                    elif goles_local == goles_rival:
+                        signo = 'EMPATE'
+                    else:
+                        signo = 'DERROTA'
+                else:
+                    signo = ''
+                partidos_por_jornada[jornada].append({
+                    'jornada': jornada,
+                    'partido': f"{equipo_local} | {rival}",
+                    'resultado': resultado_casa,
+                    'cod_resultado': signo,
+                    'tipo': 'local_como_local',
+                    'orden': orden
+                })
+            # Si hay resultado_fuera válido: rival | equipo_local
+            if resultado_valido(resultado=resultado_fuera):
+                if jornada not in partidos_por_jornada:
+                    partidos_por_jornada[jornada] = []
+                orden = len(partidos_por_jornada[jornada])
+                try:
+                    goles_rival, goles_local = map(int, resultado_fuera.split('-'))
+                except ValueError:
+                    goles_rival, goles_local = None, None
+                if goles_local is not None and goles_rival is not None:
+                    if goles_local > goles_rival:
+                        signo = 'VICTORIA'
+                    elif goles_local == goles_rival:
+                        signo = 'EMPATE'
+                    else:
+                        signo = 'DERROTA'
+                else:
+                    signo = ''
+                partidos_por_jornada[jornada].append({
+                    'jornada': jornada,
+                    'partido': f"{rival} | {equipo_local}",
+                    'resultado': resultado_fuera,
+                    'cod_resultado': signo,
+                    'tipo': 'local_como_visitante',
+                    'orden': orden
+                })
+        
+        # Partidos del EQUIPO VISITANTE (partidos_visitante)
+        # El equipo_visitante juega contra rival
+        for p in ultimos_partidos[vuelta].get('partidos_visitante', []):
+            if p.get('status') != 100:
+                continue
+            
+            resultado_casa = p.get('resultado_casa', '').strip()
+            resultado_fuera = p.get('resultado_fuera', '').strip()
+            rival = p.get('rival', '')
+            jornada = p.get('jornada')
+            
+            # Si hay resultado_casa válido: equipo_visitante | rival
+            if resultado_valido(resultado=resultado_casa):
+                if jornada not in partidos_por_jornada:
+                    partidos_por_jornada[jornada] = []
+                orden = len(partidos_por_jornada[jornada])
+                try:
+                    goles_visitante, goles_rival = map(int, resultado_casa.split('-'))
+                except ValueError:
+                    goles_visitante, goles_rival = None, None
+                if goles_visitante is not None and goles_rival is not None:
+                    if goles_visitante > goles_rival:
+                        signo = 'VICTORIA'
+                    elif goles_visitante == goles_rival:
+                        signo = 'EMPATE'
+                    else:
+                        signo = 'DERROTA'
+                else:
+                    signo = ''
+                partidos_por_jornada[jornada].append({
+                    'jornada': jornada,
+                    'partido': f"{equipo_visitante} | {rival}",
+                    'resultado': resultado_casa,
+                    'cod_resultado': signo,
+                    'tipo': 'visitante_como_local',
+                    'orden': orden
+                })
+            # Si hay resultado_fuera válido: rival | equipo_visitante
+            if resultado_valido(resultado=resultado_fuera):
+                if jornada not in partidos_por_jornada:
+                    partidos_por_jornada[jornada] = []
+                orden = len(partidos_por_jornada[jornada])
+                try:
+                    goles_rival, goles_visitante = map(int, resultado_fuera.split('-'))
+                except ValueError:
+                    goles_rival, goles_visitante = None, None
+                if goles_visitante is not None and goles_rival is not None:
+                    if goles_visitante > goles_rival:
+                        signo = 'VICTORIA'
+                    elif goles_visitante == goles_rival:
+                        signo = 'EMPATE'
+                    else:
+                        signo = 'DERROTA'
+                else:
+                    signo = ''
+                partidos_por_jornada[jornada].append({
+                    'jornada': jornada,
+                    'partido': f"{rival} | {equipo_visitante}",
+                    'resultado': resultado_fuera,
+                    'cod_resultado': signo,
+                    'tipo': 'visitante_como_visitante',
+                    'orden': orden
+                })
+    
+    # Ordenar por jornada y luego por orden
+    todos_partidos = []
+    for jornada in sorted(partidos_por_jornada.keys(), key=lambda x: int(x) if x.isdigit() else 0):
+        partidos_jornada = sorted(partidos_por_jornada[jornada], key=lambda x: x['orden'])
+        todos_partidos.extend(
+            [{'jornada': p['jornada'], 
+              'partido': p['partido'], 
+              'resultado': p['resultado'], 
+              'cod_resultado': p['cod_resultado'],
+              'tipo': p['tipo']}
+             for p in partidos_jornada]
+        )
+    
+    return todos_partidos
+
+
+def run(procesar, season: list[dict]) -> None:
+    """Procesa la comparativa de todos los partidos de la temporada."""
+    for dt in season:
+        procesar(ultimos_partidos=dt["comparativa"], equipo_local=dt["local"], equipo_visitante=dt["visitante"])
+
+
+if __name__ == "__main__":
+    with open("tests/data_source_samples/match_details_raw.json", encoding="utf-8") as f:
+        season = json.load(f)["detallePartidos"] * N_JORNADAS
+
+    for dt in season[:15]:
+        kwargs = {
+            "ultimos_partidos": dt["comparativa"], "equipo_local": dt["local"], "equipo_visitante": dt["visitante"],
+        }
+        assert legacy_procesar_ultimos_partidos(**kwargs) == procesar_ultimos_partidos(**kwargs), "Resultados distintos"
+
+    t_legacy = min(timeit.repeat(lambda: run(legacy_procesar_ultimos_partidos, season), number=1, repeat=REPETITIONS))
+    t_current = min(timeit.repeat(lambda: run(procesar_ultimos_partidos, season), number=1, repeat=REPETITIONS))
+
+    print(f"{N_JORNADAS} jornadas ({len(season)} comparativas)")
+    print(f"  original: {t_legacy * 1e3:8.1f} ms/temporada")
+    print(f"  actual:   {t_current * 1e3:8.1f} ms/temporada")
+    print(f"  speedup:  {t_legacy / t_current:8.2f}x")
@@ -0,0 +1,105 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Benchmark del agrupado por tipo de ultimos_partidos.
+
+Compara, por jornada, el reparto original (cuatro comprensiones en get_kiniela_matches_details y seis en cada uno
+de Analyzer.analyze_match y Analyzer.analyze_team) con un único pase de data_source.group_ultimos_partidos cuyo
+resultado reutilizan todos los consumidores. Usa los detalles grabados en tests/data_source_samples.
+
+Ejecutar: PYTHONPATH=. python benchmarks/bench_ultimos_partidos.py
+"""
+
+import json
+import timeit
+
+from kinielagpt import data_source
+
+REPETITIONS = 2000
+
+LOCAL = ["local_como_local", "local_como_visitante"]
+VISITANTE = ["visitante_como_local", "visitante_como_visitante"]
+
+
+def partition_comprehensions(matches: list[dict]) -> dict[str, list]:
+    """Reparto original de analyze_match / analyze_team: seis comprensiones sobre la misma lista."""
+    return {
+        "local": [p for p in matches if p.get("tipo") in LOCAL],
+        "visitante": [p for p in matches if p.get("tipo") in VISITANTE],
+        "local_como_local": [p for p in matches if p.get("tipo") == "local_como_local"],
+        "local_como_visitante": [p for p in matches if p.get("tipo") == "local_como_visitante"],
+        "visitante_como_local": [p for p in matches if p.get("tipo") == "visitante_como_local"],
+        "visitante_como_visitante": [p for p in matches if p.get("tipo") == "visitante_como_visitante"],
+    }
+
+
+def rachas_comprehensions(matches: list[dict]) -> list[list[str]]:
+    """Rachas originales de get_kiniela_matches_details: cuatro comprensiones más."""
+    return [
+        [p["cod_resultado"] for p in matches if p.get("cod_resultado") and p.get("tipo") in LOCAL][-5:],
+        [p["cod_resultado"] for p in matches if p.get("cod_resultado") and p.get("tipo") in VISITANTE][-5:],
+        [p["cod_resultado"] for p in matches if p.get("cod_resultado") and p.get("tipo") == "local_como_local"][-5:],
+        [p["cod_resultado"] for p in matches
+         if p.get("cod_resultado") and p.get("tipo") == "visitante_como_visitante"][-5:],
+    ]
+
+
+def rachas_grouped(grupos: dict[str, list]) -> list[list[str]]:
+    """Rachas a partir de los grupos ya construidos."""
+    return [
+        [p["cod_resultado"] for p in grupos[tipo] if p.get("cod_resultado")][-5:]
+        for tipo in ("local", "visitante", "local_como_local", "visitante_como_visitante")
+    ]
+
+
+def run_original(jornada: list[list[dict]]) -> None:
+    """Data source + analyze_match + analyze_team re-particionando cada uno la lista."""
+    for matches in jornada:
+        rachas_comprehensions(matches)
+        partition_comprehensions(matches)
+        partition_comprehensions(matches)
+
+
+def run_grouped(jornada: list[list[dict]]) -> None:
+    """Un único agrupado en data_source; analyze_match y analyze_team leen los grupos sin recorrer la lista."""
+    for matches in jornada:
+        grupos = data_source.group_ultimos_partidos(ultimos_partidos=matches)
+        rachas_grouped(grupos)
+
+
+if __name__ == "__main__":
+    with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+        jornada = [detail["ultimos_partidos"] for detail in json.load(f)]
+
+    for matches in jornada:
+        grupos = data_source.group_ultimos_partidos(ultimos_partidos=matches)
+        assert grupos == partition_comprehensions(matches), "Grupos distintos"
+        assert rachas_grouped(grupos) == rachas_comprehensions(matches), "Rachas distintas"
+
+    n_items = sum(len(matches) for matches in jornada)
+    t_original = timeit.timeit(lambda: run_original(jornada), number=REPETITIONS)
+    t_grouped = timeit.timeit(lambda: run_grouped(jornada), number=REPETITIONS)
+
+    print(f"Jornada de {len(jornada)} partidos ({n_items} entradas en ultimos_partidos)")
+    print(f"  pases sobre ultimos_partidos: {16 * len(jornada):6d} -> {len(jornada):6d}")
+    print(f"  comprensiones (original): {t_original / REPETITIONS * 1e6:8.1f} µs/jornada")
+    print(f"  group_ultimos_partidos:   {t_grouped / REPETITIONS * 1e6:8.1f} µs/jornada")
+    print(f"  speedup:                  {t_original / t_grouped:8.2f}x")
@@ -0,0 +1,65 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark del parseo de los feeds XML de quinielista.es.
+
+Compara xmltodict.parse + acceso a ['quinielista']['porcentajes']['partido'] con la extracción en streaming
+de data_source.extract_partidos sobre los feeds grabados en tests/data_source_samples.
+
+Ejecutar: PYTHONPATH=. python benchmarks/bench_xml_parsing.py
+"""
+
+import timeit
+
+import xmltodict
+
+from kinielagpt import data_source
+
+SAMPLES = [
+    "tests/data_source_samples/quiniela_probs.xml",
+    "tests/data_source_samples/quiniela_probs_lae.xml",
+]
+REPETITIONS = 2000
+
+
+def parse_xmltodict(content: bytes) -> list[dict]:
+    """Ruta original: árbol genérico de xmltodict y acceso anidado a los partidos."""
+    return xmltodict.parse(content, attr_prefix='')['quinielista']['porcentajes']['partido']
+
+
+def parse_streaming(content: bytes) -> list[dict]:
+    """Ruta nueva: extracción en streaming de los elementos partido."""
+    return data_source.extract_partidos(content=content)[1]
+
+
+if __name__ == "__main__":
+    for path in SAMPLES:
+        with open(path, "rb") as f:
+            content = f.read()
+
+        assert parse_xmltodict(content) == parse_streaming(content), f"Resultados distintos en {path}"
+
+        t_xmltodict = timeit.timeit(lambda content=content: parse_xmltodict(content), number=REPETITIONS)
+        t_streaming = timeit.timeit(lambda content=content: parse_streaming(content), number=REPETITIONS)
+
+        print(f"{path}")
+        print(f"  xmltodict:        {t_xmltodict / REPETITIONS * 1e6:8.1f} µs/feed")
+        print(f"  extract_partidos: {t_streaming / REPETITIONS * 1e6:8.1f} µs/feed")
+        print(f"  speedup:          {t_xmltodict / t_streaming:8.2f}x")
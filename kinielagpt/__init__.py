@@ -39,10 +39,15 @@ from kinielagpt import data_source
 from kinielagpt.analyzer import Analyzer
 from kinielagpt.detector import SurpriseDetector
 from kinielagpt.predictor import KinielaPredictor
+from kinielagpt.records import JornadaFrame, MatchRecord
+from kinielagpt.teams import TeamIndex
 
 __all__ = [
     "data_source",
     "KinielaPredictor",
     "Analyzer",
     "SurpriseDetector",
+    "JornadaFrame",
+    "MatchRecord",
+    "TeamIndex",
 ]
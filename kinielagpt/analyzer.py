@@ -27,6 +27,10 @@ de equipos específicos, generando informes detallados con justificaciones.
 from typing import Any
 
 from kinielagpt import data_source
+from kinielagpt.form import RESULT_CODES, FormFeatureStore, ResultWindow
+from kinielagpt.history import TeamHistoryStore
+from kinielagpt.records import JornadaFrame
+from kinielagpt.teams import TeamIndex
 
 
 class Analyzer:
@@ -50,7 +54,8 @@ class Analyzer:
     como integrados en flujos de trabajo más complejos de predicción deportiva.
     """
 
-    def get_raw_data(self, jornada: int, temporada: int, match_id: int) -> dict[str, Any] | None:
+    def get_raw_data(self, jornada: int, temporada: int, match_id: int,
+                     frame: JornadaFrame | None = None) -> dict[str, Any] | None:
         """
         Obtiene información en crudo de un partido específico sin análisis ni predicción.
 
@@ -82,6 +87,8 @@ class Analyzer:
             Año de la temporada.
         match_id : int
             ID del partido dentro de la jornada (1-15).
+        frame : JornadaFrame | None, optional
+            Registros de la jornada ya construidos. Si es None, se obtienen de data_source.
 
         Returns
         -------
@@ -97,37 +104,34 @@ class Analyzer:
         12
         """
         # Obtener datos del partido
-        probabilities = data_source.get_kiniela_probabilities(jornada=jornada, temporada=temporada)
-        details = data_source.get_kiniela_matches_details(jornada=jornada, temporada=temporada)
+        if frame is None:
+            frame = JornadaFrame.load(jornada=jornada, temporada=temporada)
+        record = frame.get(match_id=match_id) if frame is not None else None
 
-        if probabilities is None or details is None:
+        if record is None:
             return None
 
-        if match_id < 1 or match_id > len(probabilities):
-            return None
-
-        prob = probabilities[match_id - 1]
-        detail = details[match_id - 1]
+        detail = frame.raw_detail(match_id=match_id)
 
         # Retornar datos en crudo sin procesamiento
         return {
             "info_partido": {
                 "id_partido": match_id,
-                "partido": prob["partido"],
+                "partido": record.partido,
                 "jornada": jornada,
                 "temporada": temporada,
             },
             "probabilidades": {
-                "1": prob.get("1_Prob", 0),
-                "X": prob.get("X_Prob", 0),
-                "2": prob.get("2_Prob", 0),
-                "pronostico_goles": prob.get("pronosticoGoles", "N/A"),
+                "1": record.prob_1,
+                "X": record.prob_x,
+                "2": record.prob_2,
+                "pronostico_goles": frame.raw_prob(match_id=match_id).get("pronosticoGoles", "N/A"),
             },
             "historico": {
-                "victorias_local": detail.get("veces1", 0),
-                "empates": detail.get("vecesX", 0),
-                "victorias_visitante": detail.get("veces2", 0),
-                "total_partidos": detail.get("veces1", 0) + detail.get("vecesX", 0) + detail.get("veces2", 0),
+                "victorias_local": record.veces1,
+                "empates": record.veces_x,
+                "victorias_visitante": record.veces2,
+                "total_partidos": record.total_historic,
             },
             "clasificacion": {
                 "local": detail.get("clasificacion_local", "N/A"),
@@ -150,7 +154,7 @@ class Analyzer:
         }
 
     def analyze_match(
-        self, jornada: int, temporada: int, match_id: int
+        self, jornada: int, temporada: int, match_id: int, frame: JornadaFrame | None = None
     ) -> dict[str, Any] | None:
         """
         Analiza un partido específico con predicción justificada.
@@ -182,6 +186,8 @@ class Analyzer:
             Año de la temporada.
         match_id : int
             ID del partido dentro de la jornada (1-15).
+        frame : JornadaFrame | None, optional
+            Registros de la jornada ya construidos. Si es None, se obtienen de data_source.
 
         Returns
         -------
@@ -200,30 +206,23 @@ class Analyzer:
         'ALTA'
         """
         # Obtener datos del partido
-        probabilities = data_source.get_kiniela_probabilities(jornada=jornada, temporada=temporada)
-        details = data_source.get_kiniela_matches_details(jornada=jornada, temporada=temporada)
-
-        if probabilities is None or details is None:
-            return None
+        if frame is None:
+            frame = JornadaFrame.load(jornada=jornada, temporada=temporada)
+        record = frame.get(match_id=match_id) if frame is not None else None
 
-        if match_id < 1 or match_id > len(probabilities):
+        if record is None:
             return None
 
-        prob = probabilities[match_id - 1]
-        detail = details[match_id - 1]
+        detail = frame.raw_detail(match_id=match_id)
 
         # Extraer probabilidades
-        probs = {
-            "1": prob.get("1_Prob", 0),
-            "X": prob.get("X_Prob", 0),
-            "2": prob.get("2_Prob", 0),
-        }
+        probs = record.probs
 
         # Análisis histórico
-        veces1 = detail.get("veces1", 0)
-        vecesX = detail.get("vecesX", 0)
-        veces2 = detail.get("veces2", 0)
-        total_historic = veces1 + vecesX + veces2
+        veces1 = record.veces1
+        vecesX = record.veces_x
+        veces2 = record.veces2
+        total_historic = record.total_historic
 
         historical_analysis = {
             "total_partidos": total_historic,
@@ -245,27 +244,17 @@ class Analyzer:
             "evolucion_clasificacion_visitante": detail.get("evolucion_clasificacion_visitante", []),
         }
 
-        # Obtener últimos resultados
-        matches = detail.get("ultimos_partidos", [])
-        last_matches = {
-            "local": [p for p in matches if p.get("tipo") in ["local_como_local", "local_como_visitante"]],
-            "visitante": [p for p in matches if p.get("tipo") in ["visitante_como_local", "visitante_como_visitante"]],
-            "local_como_local": [p for p in matches if p.get("tipo") == "local_como_local"],
-            "local_como_visitante": [p for p in matches if p.get("tipo") == "local_como_visitante"],
-            "visitante_como_local": [p for p in matches if p.get("tipo") == "visitante_como_local"],
-            "visitante_como_visitante": [p for p in matches if p.get("tipo") == "visitante_como_visitante"],
-        }
-
+        # Últimos resultados (precalculados en el registro)
         racha_local = {
-            "racha_general": [p["cod_resultado"] for p in last_matches["local"]],
-            "racha_local_como_local": [p["cod_resultado"] for p in last_matches["local_como_local"]],
-            "racha_local_como_visitante": [p["cod_resultado"] for p in last_matches["local_como_visitante"]],
+            "racha_general": list(record.racha_local),
+            "racha_local_como_local": list(record.racha_local_como_local),
+            "racha_local_como_visitante": list(record.racha_local_como_visitante),
         }
 
         racha_visitante = {
-            "racha_general": [p["cod_resultado"] for p in last_matches["visitante"]],
-            "racha_visitante_como_local": [p["cod_resultado"] for p in last_matches["visitante_como_local"]],
-            "racha_visitante_como_visitante": [p["cod_resultado"] for p in last_matches["visitante_como_visitante"]],
+            "racha_general": list(record.racha_visitante),
+            "racha_visitante_como_local": list(record.racha_visitante_como_local),
+            "racha_visitante_como_visitante": list(record.racha_visitante_como_visitante),
         }
 
         # Generar predicción y justificación
@@ -277,7 +266,7 @@ class Analyzer:
         return {
             "info_partido": {
                 "id_partido": match_id,
-                "partido": prob["partido"],
+                "partido": record.partido,
                 "jornada": jornada,
                 "temporada": temporada,
             },
@@ -303,7 +292,8 @@ class Analyzer:
             "datos_destacados": detail.get("datos_destacados", []),
         }
 
-    def analyze_team(self, jornada: int, temporada: int, team_name: str) -> dict[str, Any] | None:
+    def analyze_team(self, jornada: int, temporada: int, team_name: str,
+                     frame: JornadaFrame | None = None) -> dict[str, Any] | None:
         """
         Analiza el rendimiento completo de un equipo.
 
@@ -316,9 +306,9 @@ class Analyzer:
         1. **Recuperación de datos**: Obtiene los detalles de todos los partidos de la jornada
            especificada mediante get_kiniela_matches_details().
 
-        2. **Localización del equipo**: Busca el equipo en los partidos de la jornada comparando
-           nombres (case-insensitive). Determina si juega como local o visitante analizando la
-           posición en el string "EQUIPO1 - EQUIPO2".
+        2. **Localización del equipo**: Resuelve el nombre con el TeamIndex de la jornada
+           (sin tildes ni puntuación, con alias como "Real Madrid" → "R.MADRID" y búsqueda
+           aproximada como último recurso), que indica el partido y si juega como local o visitante.
 
         3. **Extracción de datos contextuales**: Según la condición (local/visitante), extrae:
            - Clasificación actual (posición en tabla)
@@ -365,6 +355,8 @@ class Analyzer:
             Año de la temporada.
         team_name : str
             Nombre del equipo a analizar.
+        frame : JornadaFrame | None, optional
+            Registros de la jornada ya construidos. Si es None, se obtienen de data_source.
 
         Returns
         -------
@@ -381,30 +373,26 @@ class Analyzer:
         {'type': 'V', 'length': 5, 'description': '5 victorias consecutivas'}
         """
         # Obtener detalles de todos los partidos
-        details = data_source.get_kiniela_matches_details(jornada=jornada, temporada=temporada)
+        if frame is not None:
+            details = [frame.raw_detail(match_id=record.match_id) for record in frame]
+        else:
+            details = data_source.get_kiniela_matches_details(jornada=jornada, temporada=temporada)
 
         if details is None:
             return None
 
-        # Buscar el equipo en los partidos
-        team_match = None
-        is_local = False
-
-        for detail in details:
-            partido = detail.get("partido", "")
-            if team_name.upper() in partido.upper():
-                team_match = detail
-                # Determinar si es local o visitante
-                parts = partido.split(" | ")
-                if len(parts) == 2 and team_name.upper() in parts[0].upper():
-                    is_local = True
-                break
-
-        if team_match is None:
+        # Buscar el equipo en el índice de la jornada (normalizado, alias y búsqueda aproximada)
+        team_index = frame.team_index() if frame is not None else TeamIndex.from_details(details=details)
+        team_entry = team_index.lookup(team_name=team_name)
+
+        if team_entry is None or team_entry.match_id > len(details):
             return {
                 "error": f"Equipo '{team_name}' no encontrado en la jornada {jornada}",
             }
 
+        team_match = details[team_entry.match_id - 1]
+        is_local = team_entry.is_local
+
         # Extraer datos del equipo
         if is_local:
             classification = team_match.get("clasificacion_local", "N/A")
@@ -414,15 +402,7 @@ class Analyzer:
             classification_evol = team_match.get("evolucion_clasificacion_visitante", [])
 
         # Obtener últimos resultados
-        matches = team_match.get("ultimos_partidos", [])
-        last_matches = {
-            "local": [p for p in matches if p.get("tipo") in ["local_como_local", "local_como_visitante"]],
-            "visitante": [p for p in matches if p.get("tipo") in ["visitante_como_local", "visitante_como_visitante"]],
-            "local_como_local": [p for p in matches if p.get("tipo") == "local_como_local"],
-            "local_como_visitante": [p for p in matches if p.get("tipo") == "local_como_visitante"],
-            "visitante_como_local": [p for p in matches if p.get("tipo") == "visitante_como_local"],
-            "visitante_como_visitante": [p for p in matches if p.get("tipo") == "visitante_como_visitante"],
-        }
+        last_matches = self.__last_matches_by_tipo(detail=team_match)
         recent_results_last_matches = last_matches["local"] if is_local else last_matches["visitante"]
         recent_results_last_matches_as_local = (
             last_matches["local_como_local"] if is_local else last_matches["visitante_como_local"]
@@ -469,6 +449,152 @@ class Analyzer:
             "proximo_partido": team_match.get("partido", "N/A"),
         }
 
+    def analyze_team_history(self, team_name: str, temporada: int | None = None, window: int = 5,
+                             jornada: int | None = None,
+                             store: TeamHistoryStore | None = None) -> dict[str, Any] | None:
+        """
+        Analiza el rendimiento de un equipo a lo largo de una o varias temporadas.
+
+        A diferencia de analyze_team(), que solo ve los ~10 resultados recientes incluidos en una jornada
+        y solo para los equipos que la juegan, este método usa el histórico persistente de resultados
+        (TeamHistoryStore), construido con todas las jornadas descargadas y deduplicado. Aplica los mismos
+        análisis de tendencia y de rendimiento local/visitante sobre la temporada completa y añade la
+        forma móvil (puntos en los últimos `window` partidos tras cada jornada). Si el histórico tiene un
+        FormFeatureStore conectado, el registro, las tendencias y el rendimiento local/visitante se leen de sus
+        acumulados incrementales, sin recorrer los resultados del equipo.
+
+        Parameters
+        ----------
+        team_name : str
+            Nombre del equipo en cualquier formato ("R.MADRID", "Real Madrid", "Madrid").
+        temporada : int | None, optional
+            Temporada a analizar. Si es None, se usan todas las temporadas almacenadas.
+        window : int, optional
+            Tamaño de la ventana de la forma móvil en partidos (default: 5).
+        jornada : int | None, optional
+            Si se indica (junto con temporada), se descarga esa jornada y se añade al histórico antes
+            de analizar.
+        store : TeamHistoryStore | None, optional
+            Histórico a consultar. Si es None, se abre el histórico del directorio de caché (sin indicadores de
+            forma) y se cierra al terminar.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Análisis con claves: equipo, temporada, partidos_jugados, registro, ultimos_5_partidos,
+            racha_ultimos_5_partidos, tendencia_global, tendencia_como_local, tendencia_como_visitante,
+            analisis_rendimiento_como_local_y_como_visitante, forma_movil y forma_actual (indicadores
+            incrementales de FormFeatureStore si el histórico tiene uno conectado, None en otro caso).
+            Retorna un diccionario con "error" si no hay resultados del equipo, o None si falla la
+            descarga de la jornada indicada.
+
+        Examples
+        --------
+        >>> analyzer = Analyzer()
+        >>> analysis = analyzer.analyze_team_history(team_name="Real Madrid", temporada=2026)
+        >>> print(analysis["registro"])
+        10V-3E-3D (33pts)
+        """
+        owns_store = store is None
+        if store is None:
+            store = TeamHistoryStore()
+
+        try:
+            if (jornada is not None and temporada is not None
+                    and store.ingest_jornada(jornada=jornada, temporada=temporada) is None):
+                return None
+
+            if store.form is not None:
+                return self.__team_history_from_form(team_name=team_name, temporada=temporada, window=window,
+                                                     store=store, form=store.form)
+
+            results = store.team_results(team_name=team_name, temporada=temporada)
+
+            if not results:
+                return {
+                    "error": f"No hay resultados almacenados del equipo '{team_name}'",
+                }
+
+            cod_resultados = [r["cod_resultado"] for r in results]
+            resultados_local = [r["cod_resultado"] for r in results if r["es_local"]]
+            resultados_visitante = [r["cod_resultado"] for r in results if not r["es_local"]]
+
+            wins = cod_resultados.count("VICTORIA")
+            draws = cod_resultados.count("EMPATE")
+            losses = cod_resultados.count("DERROTA")
+
+            return {
+                "equipo": team_name,
+                "temporada": temporada,
+                "partidos_jugados": len(results),
+                "registro": f"{wins}V-{draws}E-{losses}D ({wins * 3 + draws}pts)",
+                "ultimos_5_partidos": results[-5:],
+                "racha_ultimos_5_partidos": cod_resultados[-5:],
+                "tendencia_global": self.__analyze_trend(last_results=cod_resultados),
+                "tendencia_como_local": self.__analyze_trend(last_results=resultados_local),
+                "tendencia_como_visitante": self.__analyze_trend(last_results=resultados_visitante),
+                "analisis_rendimiento_como_local_y_como_visitante": self.__analyze_home_away_performance(
+                    resultados_local=resultados_local, resultados_visitante=resultados_visitante
+                ),
+                "forma_movil": store.rolling_form(team_name=team_name, window=window, temporada=temporada),
+                "forma_actual": None,
+            }
+        finally:
+            if owns_store:
+                store.close()
+
+    def __team_history_from_form(self, team_name: str, temporada: int | None, window: int,
+                                 store: TeamHistoryStore, form: FormFeatureStore) -> dict[str, Any]:
+        """
+        Análisis de analyze_team_history leído de los acumulados incrementales del histórico (store.form).
+
+        El registro, las tendencias y el rendimiento local/visitante salen de FormFeatureStore sin recorrer los
+        resultados del equipo; del histórico solo se leen los últimos 5 partidos y la forma móvil.
+
+        Parameters
+        ----------
+        team_name : str
+            Nombre del equipo en cualquier formato.
+        temporada : int | None
+            Temporada a analizar, o None para todas.
+        window : int
+            Tamaño de la ventana de la forma móvil en partidos.
+        store : TeamHistoryStore
+            Histórico del que leer los últimos partidos y la forma móvil.
+        form : FormFeatureStore
+            Indicadores de forma conectados al histórico (store.form).
+
+        Returns
+        -------
+        dict[str, Any]
+            Análisis con el formato de analyze_team_history.
+        """
+        team = form.get_team(team_name=team_name, temporada=temporada)
+        if team is None:
+            return {
+                "error": f"No hay resultados almacenados del equipo '{team_name}'",
+            }
+
+        last_results = store.team_results(team_name=team_name, temporada=temporada, last=5)
+        wins, draws, losses = team.record
+
+        return {
+            "equipo": team_name,
+            "temporada": temporada,
+            "partidos_jugados": team.overall.matches,
+            "registro": f"{wins}V-{draws}E-{losses}D ({wins * 3 + draws}pts)",
+            "ultimos_5_partidos": last_results,
+            "racha_ultimos_5_partidos": [r["cod_resultado"] for r in last_results],
+            "tendencia_global": self.__trend_from_form(results=team.overall),
+            "tendencia_como_local": self.__trend_from_form(results=team.home_results),
+            "tendencia_como_visitante": self.__trend_from_form(results=team.away_results),
+            "analisis_rendimiento_como_local_y_como_visitante": self.__home_away_from_counts(
+                home_counts=team.home, away_counts=team.away
+            ),
+            "forma_movil": store.rolling_form(team_name=team_name, window=window, temporada=temporada),
+            "forma_actual": form.get_form(team_name=team_name, temporada=temporada),
+        }
+
     def __generate_prediction_with_reasoning(self, probs: dict[str, float],
                                              historical_analysis: dict[str, Any]) -> tuple[str, str, str]:
         """
@@ -627,6 +753,25 @@ class Analyzer:
         else:
             return "BAJA"
 
+    def __last_matches_by_tipo(self, detail: dict[str, Any]) -> dict[str, list]:
+        """
+        Devuelve los últimos partidos de un detalle agrupados por tipo.
+
+        La agrupación se calcula en un único pase sobre ultimos_partidos con data_source.group_ultimos_partidos.
+
+        Parameters
+        ----------
+        detail : dict[str, Any]
+            Detalle de un partido tal y como lo devuelve data_source.get_kiniela_matches_details.
+
+        Returns
+        -------
+        dict[str, list]
+            Grupos local, visitante, local_como_local, local_como_visitante, visitante_como_local y
+            visitante_como_visitante.
+        """
+        return data_source.group_ultimos_partidos(ultimos_partidos=detail.get("ultimos_partidos", []))
+
     def __analyze_trend(self, last_results: list[str]) -> dict[str, Any]:
         """
         Analiza la tendencia del equipo en sus últimos partidos.
@@ -686,14 +831,52 @@ class Analyzer:
         last_n = last_results[-5:] if len(last_results) >= 5 else last_results  # Usar todos si menos de 5
         points = sum(points_map.get(r, 0) for r in last_n)
 
-        # Calcular efectividad porcentual
-        max_points = len(last_n) * 3
-        effectiveness = (points / max_points * 100) if max_points > 0 else 0.0
-
         # Calcular puntos de los partidos anteriores para comparar
         previous_n = last_results[-10:-5] if len(last_results) >= 10 else []
         previous_points = sum(points_map.get(r, 0) for r in previous_n) if previous_n else points
 
+        return self.__classify_trend(last_n=last_n, points=points, previous_points=previous_points)
+
+    def __trend_from_form(self, results: ResultWindow) -> dict[str, Any]:
+        """
+        Tendencia con los criterios de __analyze_trend leída de los acumulados incrementales de FormFeatureStore.
+
+        Parameters
+        ----------
+        results : ResultWindow
+            Ventana de resultados del equipo en el contexto analizado (total, local o visitante).
+
+        Returns
+        -------
+        dict[str, Any]
+            Análisis de tendencia de __analyze_trend sobre los últimos resultados que conserva la ventana (al menos
+            form.TREND_RESULTS), de modo que compara los últimos 5 partidos con los 5 anteriores sea cual sea el
+            tamaño de la ventana del almacén de forma.
+        """
+        return self.__analyze_trend(last_results=list(results.results))
+
+    def __classify_trend(self, last_n: list[str], points: int, previous_points: int) -> dict[str, Any]:
+        """
+        Clasifica la tendencia a partir de los puntos de la ventana actual y de la anterior.
+
+        Parameters
+        ----------
+        last_n : list[str]
+            Resultados de la ventana actual.
+        points : int
+            Puntos de la ventana actual.
+        previous_points : int
+            Puntos de la ventana anterior (los de la actual si no hay ventana anterior completa).
+
+        Returns
+        -------
+        dict[str, Any]
+            Análisis de tendencia con el formato de __analyze_trend.
+        """
+        # Calcular efectividad porcentual
+        max_points = len(last_n) * 3
+        effectiveness = (points / max_points * 100) if max_points > 0 else 0.0
+
         # Determinar tendencia
         if points > previous_points:
             direction = "mejorando"
@@ -792,25 +975,46 @@ class Analyzer:
             indicando si el equipo rinde mejor en casa, fuera o equilibradamente.
             Retorna diccionario vacío si no hay suficientes datos.
         """
-        # Verificar que ambas listas tengan al menos 1 elemento
-        if not resultados_local or not resultados_visitante:
-            return {}
+        return self.__home_away_from_counts(
+            home_counts=[resultados_local.count(code) for code in RESULT_CODES],
+            away_counts=[resultados_visitante.count(code) for code in RESULT_CODES],
+            home_matches=len(resultados_local),
+            away_matches=len(resultados_visitante),
+        )
 
-        def analyze_context(results: list[str]) -> dict[str, Any]:
-            """Analiza resultados para un contexto específico."""
-            if not results:
-                return {
-                    "registro": "Sin datos",
-                    "puntos": 0,
-                    "porcentaje_puntos_conseguidos": 0.0,
-                    "calificacion": "Sin datos",
-                }
+    def __home_away_from_counts(self, home_counts: list[int], away_counts: list[int], home_matches: int | None = None,
+                                away_matches: int | None = None) -> dict[str, Any]:
+        """
+        Rendimiento local y visitante con los criterios de __analyze_home_away_performance a partir de los
+        registros de victorias, empates y derrotas (p. ej. los acumulados incrementales de FormFeatureStore).
+
+        Parameters
+        ----------
+        home_counts : list[int]
+            Victorias, empates y derrotas como local.
+        away_counts : list[int]
+            Victorias, empates y derrotas como visitante.
+        home_matches : int | None, optional
+            Partidos como local, incluidos los que no tienen código de resultado; son el denominador de la
+            efectividad, como en len(resultados_local). Si es None, se usa la suma de home_counts.
+        away_matches : int | None, optional
+            Partidos como visitante, con el mismo criterio. Si es None, se usa la suma de away_counts.
+
+        Returns
+        -------
+        dict[str, Any]
+            Análisis con el formato de __analyze_home_away_performance.
+        """
+        home_matches = sum(home_counts) if home_matches is None else home_matches
+        away_matches = sum(away_counts) if away_matches is None else away_matches
+
+        # Verificar que ambos contextos tengan al menos 1 partido
+        if not home_matches or not away_matches:
+            return {}
 
-            # Contar resultados
-            wins = results.count("VICTORIA")
-            draws = results.count("EMPATE")
-            losses = results.count("DERROTA")
-            total_matches = len(results)
+        def analyze_context(counts: list[int], total_matches: int) -> dict[str, Any]:
+            """Analiza el registro de un contexto específico."""
+            wins, draws, losses = counts
 
             # Calcular puntos
             points = wins * 3 + draws * 1 + losses * 0
@@ -839,8 +1043,8 @@ class Analyzer:
                 "calificacion": rating,
             }
 
-        home_analysis = analyze_context(resultados_local)
-        away_analysis = analyze_context(resultados_visitante)
+        home_analysis = analyze_context(home_counts, home_matches)
+        away_analysis = analyze_context(away_counts, away_matches)
 
         # Comparar rendimiento local vs visitante
         home_effectiveness = home_analysis["porcentaje_puntos_conseguidos"]
@@ -0,0 +1,405 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Backtests en paralelo del detector y del predictor para KinielaGPT.
+
+Los scores de divergencia de SurpriseDetector.compute_divergence_scores se calculan una sola vez para todas
+las jornadas (de una o varias temporadas) y, junto con los resultados reales, forman un conjunto de arrays
+(BacktestDataset). run_backtest copia esos arrays una única vez a un bloque de memoria compartida
+(multiprocessing.shared_memory) y reparte las combinaciones estrategia × umbral entre un pool de procesos:
+cada proceso se conecta al bloque al arrancar y lee los arrays como vistas de NumPy, sin copiarlos ni
+serializarlos en cada tarea. El resultado incluye el rendimiento de cada proceso (partidos evaluados por
+segundo).
+
+Las estrategias se evalúan directamente sobre los arrays:
+
+- conservadora: el signo favorito de LAE (la estrategia conservadora de KinielaPredictor).
+- sorpresa: el signo favorito salvo en los partidos con alerta del detector para el umbral evaluado, en los
+  que se juega el segundo signo más probable.
+"""
+
+import os
+import sys
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+
+from kinielagpt.detector import SurpriseDetector
+from kinielagpt.records import JornadaFrame
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+# Estrategias evaluables sobre los arrays del backtest
+BACKTEST_STRATEGIES = ("conservadora", "sorpresa")
+
+# Arrays del dataset, en el orden en que se colocan en la memoria compartida
+DATASET_FIELDS = ("jornada", "temporada", "match_id", "group", "actual", "max_sign", "second_sign", "max_prob",
+                  "best_score", "best_type")
+
+# Arrays del dataset conectados en cada proceso del pool (se rellena en __init_worker)
+__WORKER_STATE: dict[str, Any] = {}
+
+
+class SharedArrays:
+    """
+    Conjunto de arrays de NumPy colocados en un único bloque de memoria compartida.
+
+    El proceso que crea el bloque (create) es el responsable de liberarlo (unlink); los procesos que se
+    conectan (attach) sólo cierran su vista.
+
+    Attributes
+    ----------
+    spec : dict[str, Any]
+        Nombre del bloque y disposición de cada array (dtype, forma y desplazamiento), serializable para
+        pasarlo a otros procesos.
+    arrays : dict[str, np.ndarray]
+        Vistas de NumPy sobre el bloque, sin copia.
+    """
+
+    def __init__(self, shm: SharedMemory, spec: dict[str, Any], owner: bool) -> None:
+        self.__shm = shm
+        self.__owner = owner
+        self.spec = spec
+        self.arrays = {
+            name: np.ndarray(shape=tuple(shape), dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            for name, (dtype, shape, offset) in spec["layout"].items()
+        }
+
+    @classmethod
+    def create(cls, arrays: dict[str, np.ndarray]) -> "SharedArrays":
+        """
+        Crea un bloque de memoria compartida y copia en él los arrays.
+
+        Parameters
+        ----------
+        arrays : dict[str, np.ndarray]
+            Arrays a compartir.
+
+        Returns
+        -------
+        SharedArrays
+            Bloque creado, propiedad del proceso actual.
+        """
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            offset = -(-offset // 8) * 8
+            layout[name] = (array.dtype.str, list(array.shape), offset)
+            offset += array.nbytes
+
+        shm = SharedMemory(create=True, size=max(offset, 1))
+        shared = cls(shm=shm, spec={"name": shm.name, "layout": layout}, owner=True)
+        for name, array in arrays.items():
+            shared.arrays[name][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, spec: dict[str, Any]) -> "SharedArrays":
+        """
+        Se conecta a un bloque creado por otro proceso.
+
+        Parameters
+        ----------
+        spec : dict[str, Any]
+            Atributo spec del bloque original.
+
+        Returns
+        -------
+        SharedArrays
+            Vistas de solo lectura sobre el bloque.
+        """
+        shm = SharedMemory(name=spec["name"])
+        shared = cls(shm=shm, spec=spec, owner=False)
+        for array in shared.arrays.values():
+            array.flags.writeable = False
+        return shared
+
+    def close(self) -> None:
+        """
+        Cierra la vista del bloque y, si el proceso es su creador, lo libera.
+        """
+        self.arrays = {}
+        self.__shm.close()
+        if self.__owner:
+            self.__shm.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+class BacktestDataset:
+    """
+    Arrays alineados (un elemento por partido) con los scores del detector y los resultados reales.
+
+    Attributes
+    ----------
+    arrays : dict[str, np.ndarray]
+        Arrays de DATASET_FIELDS:
+        - jornada, temporada, match_id: Identificación del partido
+        - group: Índice de la jornada del partido (0..n_jornadas-1)
+        - actual: Signo real (0=1, 1=X, 2=2; -1 si no se conoce o no hay probabilidades 1X2)
+        - max_sign, second_sign, max_prob: Signo favorito, segundo signo y probabilidad del favorito
+        - best_score, best_type: Score e índice en INCONSISTENCY_TYPES de la inconsistencia más significativa
+    n_jornadas : int
+        Número de jornadas del dataset.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray]) -> None:
+        self.arrays = {name: np.ascontiguousarray(arrays[name]) for name in DATASET_FIELDS}
+        self.n_jornadas = int(self.arrays["group"].max()) + 1 if self.arrays["group"].size else 0
+
+    def __len__(self) -> int:
+        return int(self.arrays["match_id"].shape[0])
+
+    @classmethod
+    def from_frames(cls, frames: JornadaFrame | Sequence[JornadaFrame],
+                    results: dict[tuple[int, int], list[str | None]],
+                    detector: SurpriseDetector | None = None) -> "BacktestDataset":
+        """
+        Construye el dataset a partir de jornadas y de sus resultados reales.
+
+        Parameters
+        ----------
+        frames : JornadaFrame | Sequence[JornadaFrame]
+            Jornadas a evaluar (pueden ser de varias temporadas).
+        results : dict[tuple[int, int], list[str | None]]
+            Resultados reales por (jornada, temporada), con el mismo formato que
+            SurpriseDetector.sweep_thresholds.
+        detector : SurpriseDetector | None, optional
+            Detector con el que calcular los scores (default: SurpriseDetector()).
+
+        Returns
+        -------
+        BacktestDataset
+            Dataset listo para run_backtest.
+        """
+        if isinstance(frames, JornadaFrame):
+            frames = [frames]
+        scores = (detector or SurpriseDetector()).compute_divergence_scores(frames=frames)
+
+        sign_index = {"1": 0, "X": 1, "2": 2}
+        actual = np.full(len(scores["match_id"]), -1, dtype=np.int8)
+        second_sign = np.zeros(len(scores["match_id"]), dtype=np.int8)
+        group = np.zeros(len(scores["match_id"]), dtype=np.int32)
+        position = 0
+        for index, frame in enumerate(frames):
+            signs: list[str | None] = results.get((frame.jornada, frame.temporada), [])
+            for offset, record in enumerate(frame):
+                if record.match_id <= len(signs) and not record.is_exceptional:
+                    actual[position + offset] = sign_index.get(signs[record.match_id - 1] or "", -1)
+                probs = np.array([record.prob_1, record.prob_x, record.prob_2])
+                second_sign[position + offset] = np.argsort(-probs, kind="stable")[1]
+            group[position:position + len(frame)] = index
+            position += len(frame)
+
+        return cls(arrays={
+            "jornada": scores["jornada"],
+            "temporada": scores["temporada"],
+            "match_id": scores["match_id"].astype(np.int64),
+            "group": group,
+            "actual": actual,
+            "max_sign": scores["max_sign"].astype(np.int8),
+            "second_sign": second_sign,
+            "max_prob": scores["max_prob"].astype(np.float64),
+            "best_score": scores["best_score"].astype(np.float64),
+            "best_type": scores["best_type"].astype(np.int8),
+        })
+
+
+def evaluate(arrays: dict[str, np.ndarray], strategy: str, threshold: float) -> dict[str, Any]:
+    """
+    Evalúa una estrategia y un umbral de detección sobre los arrays de un BacktestDataset.
+
+    Parameters
+    ----------
+    arrays : dict[str, np.ndarray]
+        Arrays del dataset (BacktestDataset.arrays o sus vistas en memoria compartida).
+    strategy : str
+        Estrategia de BACKTEST_STRATEGIES.
+    threshold : float
+        Umbral de detección de sorpresas (0-100).
+
+    Returns
+    -------
+    dict[str, Any]
+        Diccionario con:
+        - strategy, threshold: Combinación evaluada
+        - alerts, hits, precision, recall: Alertas del detector y aciertos (mismo criterio que
+          SurpriseDetector.sweep_thresholds para el total "all")
+        - accuracy: Porcentaje de partidos evaluables acertados por la estrategia
+        - mean_hits, max_hits: Aciertos medios y máximos por jornada
+
+    Raises
+    ------
+    ValueError
+        Si la estrategia no es válida.
+    """
+    if strategy not in BACKTEST_STRATEGIES:
+        raise ValueError(f"Estrategia inválida: {strategy}. Debe ser una de {BACKTEST_STRATEGIES}")
+
+    actual = arrays["actual"]
+    evaluable = (actual >= 0) & (arrays["max_prob"] > 0)
+    surprise = evaluable & (actual != arrays["max_sign"])
+    alerted = (arrays["best_score"] >= threshold) & (arrays["best_type"] >= 0) & evaluable
+    alerts = int(alerted.sum())
+    hits = int((alerted & surprise).sum())
+    total_surprises = int(surprise.sum())
+
+    predicted = arrays["max_sign"]
+    if strategy == "sorpresa":
+        predicted = np.where(alerted, arrays["second_sign"], predicted)
+    correct = evaluable & (predicted == actual)
+
+    n_jornadas = int(arrays["group"].max()) + 1 if arrays["group"].size else 0
+    per_jornada = np.bincount(arrays["group"], weights=correct, minlength=n_jornadas)
+    with_results = np.bincount(arrays["group"], weights=evaluable, minlength=n_jornadas) > 0
+    total = int(evaluable.sum())
+
+    return {
+        "strategy": strategy,
+        "threshold": float(threshold),
+        "alerts": alerts,
+        "hits": hits,
+        "precision": round(hits / alerts, 4) if alerts else None,
+        "recall": round(hits / total_surprises, 4) if total_surprises else None,
+        "accuracy": round(100 * int(correct.sum()) / total, 2) if total else None,
+        "mean_hits": round(float(per_jornada[with_results].mean()), 2) if with_results.any() else None,
+        "max_hits": int(per_jornada.max()) if with_results.any() else None,
+    }
+
+
+def run_backtest(dataset: BacktestDataset, thresholds: Sequence[float] | None = None,
+                 strategies: Sequence[str] = BACKTEST_STRATEGIES, processes: int | None = None) -> dict[str, Any]:
+    """
+    Evalúa todas las combinaciones estrategia × umbral en un pool de procesos con memoria compartida.
+
+    Parameters
+    ----------
+    dataset : BacktestDataset
+        Dataset a evaluar.
+    thresholds : Sequence[float] | None, optional
+        Umbrales de detección. Si es None, de 0 a 100 en pasos de 5.
+    strategies : Sequence[str], optional
+        Estrategias a evaluar (default: BACKTEST_STRATEGIES).
+    processes : int | None, optional
+        Número de procesos. Si es None, os.cpu_count(); con 1 se evalúa en el proceso actual sin memoria
+        compartida.
+
+    Returns
+    -------
+    dict[str, Any]
+        Diccionario con:
+        - total_matches, total_jornadas: Tamaño del dataset
+        - results: Resultado de evaluate para cada combinación, en orden estrategia × umbral
+        - workers: Por proceso, pid, tasks, matches (partidos evaluados), seconds y matches_per_second
+        - elapsed: Segundos totales
+
+    Raises
+    ------
+    ValueError
+        Si alguna estrategia no es válida.
+    """
+    for strategy in strategies:
+        if strategy not in BACKTEST_STRATEGIES:
+            raise ValueError(f"Estrategia inválida: {strategy}. Debe ser una de {BACKTEST_STRATEGIES}")
+    if thresholds is None:
+        thresholds = range(0, 101, 5)
+
+    tasks = [(strategy, float(threshold)) for strategy in strategies for threshold in thresholds]
+    start = time.perf_counter()
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(tasks) <= 1:
+        __WORKER_STATE["arrays"] = dataset.arrays
+        try:
+            outputs = [__evaluate_task(task) for task in tasks]
+        finally:
+            __WORKER_STATE.clear()
+    else:
+        with (
+            SharedArrays.create(arrays=dataset.arrays) as shared,
+            ProcessPoolExecutor(max_workers=min(processes, len(tasks)), initializer=__init_worker,
+                                initargs=(shared.spec,)) as executor,
+        ):
+            outputs = list(executor.map(__evaluate_task, tasks))
+
+    workers: dict[int, dict[str, Any]] = {}
+    for _, pid, seconds, matches in outputs:
+        worker = workers.setdefault(pid, {"pid": pid, "tasks": 0, "matches": 0, "seconds": 0.0})
+        worker["tasks"] += 1
+        worker["matches"] += matches
+        worker["seconds"] += seconds
+    for worker in workers.values():
+        worker["matches_per_second"] = round(worker["matches"] / worker["seconds"]) if worker["seconds"] else None
+        worker["seconds"] = round(worker["seconds"], 4)
+
+    return {
+        "total_matches": len(dataset),
+        "total_jornadas": dataset.n_jornadas,
+        "results": [result for result, _, _, _ in outputs],
+        "workers": sorted(workers.values(), key=lambda w: w["pid"]),
+        "elapsed": round(time.perf_counter() - start, 4),
+    }
+
+
+def __init_worker(spec: dict[str, Any]) -> None:
+    """
+    Conecta un proceso del pool al bloque de memoria compartida del dataset.
+
+    Parameters
+    ----------
+    spec : dict[str, Any]
+        Atributo spec de SharedArrays.
+    """
+    shared = SharedArrays.attach(spec=spec)
+    __WORKER_STATE["shared"] = shared
+    __WORKER_STATE["arrays"] = shared.arrays
+
+
+def __evaluate_task(task: tuple[str, float]) -> tuple[dict[str, Any], int, float, int]:
+    """
+    Evalúa una combinación estrategia × umbral (función ejecutada en los procesos del pool).
+
+    Parameters
+    ----------
+    task : tuple[str, float]
+        Tupla (strategy, threshold).
+
+    Returns
+    -------
+    tuple[dict[str, Any], int, float, int]
+        Resultado de evaluate, pid del proceso, segundos empleados y partidos evaluados.
+    """
+    strategy, threshold = task
+    arrays = __WORKER_STATE["arrays"]
+    start = time.perf_counter()
+    result = evaluate(arrays=arrays, strategy=strategy, threshold=threshold)
+    return result, os.getpid(), time.perf_counter() - start, int(arrays["match_id"].shape[0])
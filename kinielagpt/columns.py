@@ -0,0 +1,292 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Columnas de quiniela codificadas en bits para KinielaGPT.
+
+Cada partido ocupa 2 bits con los códigos de value.SIGNOS (0 -> "1", 1 -> "X", 2 -> "2"): el partido k de la
+columna (k = 0 para el primero) está en los bits 2k y 2k+1. Las 14 columnas de la quiniela caben en un
+np.uint32, de modo que una cartera de un millón de columnas ocupa 4 MB y se compara con resultados reales o
+simulados con operaciones de bits vectorizadas:
+
+    fallos = popcount(((a ^ b) | ((a ^ b) >> 1)) & 0x55555555)
+
+Los fallos se cuentan con un popcount SWAR sobre uint32, sin depender de la versión de NumPy. El módulo incluye
+los conversores desde y hacia la lista predictions de KinielaPredictor y cadenas de signos ("1X21...").
+"""
+
+import copy
+from typing import Any
+
+import numpy as np
+
+from kinielagpt.value import SIGNOS
+
+# Número máximo de partidos que caben en una columna codificada (2 bits por partido en un uint32)
+MAX_PARTIDOS = 16
+
+# Bit bajo de cada campo de 2 bits
+MASCARA_PARTIDOS = np.uint32(0x55555555)
+
+# Columnas procesadas por bloque al comparar carteras grandes con muchos resultados
+TAMANO_BLOQUE = 1 << 12
+
+__CODES = {sign: code for code, sign in enumerate(SIGNOS)}
+
+
+def encode(codes: np.ndarray) -> np.ndarray:
+    """
+    Codifica columnas dadas como códigos enteros de signo.
+
+    Parameters
+    ----------
+    codes : np.ndarray
+        Matriz (columnas, partidos) con valores 0, 1 o 2 (una fila también es válida).
+
+    Returns
+    -------
+    np.ndarray
+        Vector np.uint32 con una columna codificada por fila.
+
+    Raises
+    ------
+    ValueError
+        Si hay más de MAX_PARTIDOS partidos o códigos fuera de 0-2.
+    """
+    codes = np.atleast_2d(np.asarray(codes))
+    if codes.shape[1] > MAX_PARTIDOS:
+        raise ValueError(f"Una columna codificada admite como mucho {MAX_PARTIDOS} partidos")
+    if codes.size and (codes.min() < 0 or codes.max() >= len(SIGNOS)):
+        raise ValueError("Los códigos de signo deben estar entre 0 y 2")
+    shifts = np.arange(codes.shape[1], dtype=np.uint32) * np.uint32(2)
+    return np.bitwise_or.reduce(codes.astype(np.uint32) << shifts, axis=1).astype(np.uint32)
+
+
+def decode(packed: np.ndarray, n_matches: int) -> np.ndarray:
+    """
+    Decodifica columnas a códigos enteros de signo.
+
+    Parameters
+    ----------
+    packed : np.ndarray
+        Columnas codificadas (vector np.uint32 o escalar).
+    n_matches : int
+        Número de partidos de cada columna.
+
+    Returns
+    -------
+    np.ndarray
+        Matriz np.uint8 (columnas, partidos).
+    """
+    packed = np.atleast_1d(np.asarray(packed, dtype=np.uint32))
+    shifts = np.arange(n_matches, dtype=np.uint32) * np.uint32(2)
+    return ((packed[:, None] >> shifts) & np.uint32(3)).astype(np.uint8)
+
+
+def encode_strings(columns: list[str]) -> np.ndarray:
+    """
+    Codifica columnas escritas como cadenas de signos (ej: "1X21X2...").
+
+    Parameters
+    ----------
+    columns : list[str]
+        Columnas con un carácter "1", "X" o "2" por partido, todas de la misma longitud.
+
+    Returns
+    -------
+    np.ndarray
+        Vector np.uint32 de columnas codificadas.
+
+    Raises
+    ------
+    ValueError
+        Si alguna columna contiene signos inválidos.
+    """
+    try:
+        codes = [[__CODES[sign] for sign in column] for column in columns]
+    except KeyError as e:
+        raise ValueError(f"Signo inválido en la columna: {e.args[0]}") from e
+    return encode(np.array(codes, dtype=np.uint8).reshape(len(columns), -1))
+
+
+def decode_strings(packed: np.ndarray, n_matches: int) -> list[str]:
+    """
+    Decodifica columnas a cadenas de signos.
+
+    Parameters
+    ----------
+    packed : np.ndarray
+        Columnas codificadas.
+    n_matches : int
+        Número de partidos de cada columna.
+
+    Returns
+    -------
+    list[str]
+        Columnas como cadenas de signos.
+    """
+    lookup = np.array(SIGNOS + ("?",))
+    return ["".join(row) for row in lookup[decode(packed=packed, n_matches=n_matches)]]
+
+
+def from_predictions(predictions: list[dict[str, Any]]) -> tuple[np.uint32, list[int]]:
+    """
+    Codifica la columna de una predicción de KinielaPredictor.
+
+    Parameters
+    ----------
+    predictions : list[dict[str, Any]]
+        Lista predictions de KinielaPredictor.predict. El pleno al 15 (marcador en lugar de signo) se ignora.
+
+    Returns
+    -------
+    tuple[np.uint32, list[int]]
+        Columna codificada y match_id de cada partido, en el orden de los bits.
+    """
+    normal = [pred for pred in predictions if pred["prediction"] in __CODES]
+    match_ids = [pred["match_id"] for pred in normal]
+    return encode(np.array([[__CODES[pred["prediction"]] for pred in normal]], dtype=np.uint8))[0], match_ids
+
+
+def to_predictions(packed: np.uint32, predictions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Aplica una columna codificada sobre una lista predictions de KinielaPredictor.
+
+    Parameters
+    ----------
+    packed : np.uint32
+        Columna codificada, con los partidos en el orden de from_predictions.
+    predictions : list[dict[str, Any]]
+        Lista predictions de referencia. No se modifica.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        Copia de predictions con prediction sustituido en los partidos con signo 1X2 (el pleno al 15 se
+        conserva tal cual).
+    """
+    result = copy.deepcopy(predictions)
+    normal = [pred for pred in result if pred["prediction"] in __CODES]
+    for pred, code in zip(normal, decode(packed=packed, n_matches=len(normal))[0]):
+        pred["prediction"] = SIGNOS[code]
+    return result
+
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    """
+    Cuenta los bits a 1 de cada elemento de un array np.uint32.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Valores np.uint32.
+
+    Returns
+    -------
+    np.ndarray
+        Número de bits a 1 (np.uint32) con la misma forma que values.
+    """
+    v = np.asarray(values, dtype=np.uint32)
+    v = v - ((v >> np.uint32(1)) & np.uint32(0x55555555))
+    v = (v & np.uint32(0x33333333)) + ((v >> np.uint32(2)) & np.uint32(0x33333333))
+    v = (v + (v >> np.uint32(4))) & np.uint32(0x0F0F0F0F)
+    return (v * np.uint32(0x01010101)) >> np.uint32(24)
+
+
+def count_hits(columns: np.ndarray, outcomes: np.ndarray, n_matches: int) -> np.ndarray:
+    """
+    Cuenta los aciertos de columnas frente a resultados, con difusión (broadcasting) de NumPy.
+
+    Parameters
+    ----------
+    columns : np.ndarray
+        Columnas codificadas.
+    outcomes : np.ndarray
+        Resultados codificados con la misma forma que columns o difundible con ella (p. ej. columns[:, None]
+        frente a outcomes[None, :] da la matriz de aciertos columnas × resultados).
+    n_matches : int
+        Número de partidos de cada columna.
+
+    Returns
+    -------
+    np.ndarray
+        Aciertos de cada par columna/resultado.
+    """
+    diff = np.bitwise_xor(np.asarray(columns, dtype=np.uint32), np.asarray(outcomes, dtype=np.uint32))
+    misses = popcount((diff | (diff >> np.uint32(1))) & MASCARA_PARTIDOS)
+    return (n_matches - misses.astype(np.int64)).astype(np.uint8)
+
+
+def best_hits(columns: np.ndarray, outcomes: np.ndarray, n_matches: int,
+              block_size: int = TAMANO_BLOQUE) -> np.ndarray:
+    """
+    Mejor número de aciertos de una cartera de columnas frente a cada resultado.
+
+    La matriz columnas × resultados se recorre por bloques de columnas para acotar la memoria.
+
+    Parameters
+    ----------
+    columns : np.ndarray
+        Cartera de columnas codificadas.
+    outcomes : np.ndarray
+        Resultados reales o simulados codificados.
+    n_matches : int
+        Número de partidos de cada columna.
+    block_size : int, optional
+        Columnas por bloque (default: TAMANO_BLOQUE).
+
+    Returns
+    -------
+    np.ndarray
+        Vector np.uint8 con los aciertos de la mejor columna para cada resultado.
+    """
+    columns = np.atleast_1d(np.asarray(columns, dtype=np.uint32))
+    outcomes = np.atleast_1d(np.asarray(outcomes, dtype=np.uint32))
+    best = np.zeros(outcomes.shape[0], dtype=np.uint8)
+    for start in range(0, columns.shape[0], block_size):
+        block = columns[start:start + block_size]
+        hits = count_hits(columns=block[:, None], outcomes=outcomes[None, :], n_matches=n_matches)
+        np.maximum(best, hits.max(axis=0), out=best)
+    return best
+
+
+def sample_outcomes(probabilities: np.ndarray, size: int, rng: np.random.Generator | None = None) -> np.ndarray:
+    """
+    Simula resultados de una jornada como columnas codificadas.
+
+    Parameters
+    ----------
+    probabilities : np.ndarray
+        Matriz (partidos, 3) de probabilidades 1/X/2 normalizadas (ver value.sign_matrix).
+    size : int
+        Número de resultados a simular.
+    rng : np.random.Generator | None, optional
+        Generador aleatorio (default: np.random.default_rng()).
+
+    Returns
+    -------
+    np.ndarray
+        Vector np.uint32 de resultados simulados.
+    """
+    rng = rng or np.random.default_rng()
+    cumulative = np.cumsum(probabilities, axis=1)
+    draws = rng.random((size, probabilities.shape[0]))
+    codes = (draws[:, :, None] >= cumulative[None, :, :-1]).sum(axis=2)
+    return encode(codes.astype(np.uint8))
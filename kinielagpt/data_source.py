@@ -17,7 +17,22 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import contextvars
+import copy
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import threading
 import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any
+from urllib.parse import urlparse
 
 import pandas as pd
 import requests
@@ -50,6 +65,574 @@ HEADER_DETAIL = {
                    "(KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36")
 }
 
+# Fuentes de probabilidades: estimación LAE y porcentaje de apuestas del público (Quinielista)
+PROBABILITY_SOURCES = ("lae", "quiniela")
+
+# Columnas con las probabilidades 1X2 de cada fuente que añade get_kiniela_probabilities(by_source=True)
+SOURCE_PROBABILITY_COLUMNS = tuple(
+    f"{sign}_Prob_{source}" for source in PROBABILITY_SOURCES for sign in ("1", "X", "2")
+)
+
+# Variable de entorno con el directorio de la caché en disco (histórico de equipos, series de probabilidades...)
+CACHE_DIR_ENV = "KINIELAGPT_CACHE_DIR"
+
+# Subdirectorio de la caché en disco con las jornadas descargadas: <cache>/jornadas/<temporada>/<jornada>.json
+JORNADAS_CACHE_SUBDIR = "jornadas"
+
+# Grupos de ultimos_partidos por tipo: combinados por equipo y por equipo/condición (casa o fuera)
+ULTIMOS_PARTIDOS_GRUPOS = (
+    'local',
+    'visitante',
+    'local_como_local',
+    'local_como_visitante',
+    'visitante_como_local',
+    'visitante_como_visitante',
+)
+
+# Prioridades de las peticiones HTTP, de mayor a menor: herramientas interactivas, sondeo en vivo y backfills
+REQUEST_PRIORITIES = ("interactive", "live", "backfill")
+
+# Presupuesto de peticiones por host y por proceso: (peticiones por segundo, ráfaga máxima)
+HOST_RATE_LIMITS = {
+    "www.quinielista.es": (2.0, 10),
+    "www.eduardolosilla.es": (1.0, 5),
+    "api.eduardolosilla.es": (1.0, 5),
+}
+
+# Presupuesto de los hosts sin entrada en HOST_RATE_LIMITS
+DEFAULT_RATE_LIMIT = (5.0, 10)
+
+# Caché HTTP por URL: validadores (ETag / Last-Modified), hash del contenido y JSON derivado
+__HTTP_CACHE: dict[str, dict[str, Any]] = {}
+
+# Caché de probabilidades fusionadas por (jornada, temporada, pesos), válida mientras no cambien los hashes
+# de los feeds
+__PROBABILITIES_CACHE: dict[tuple[int, int, tuple[float, ...] | None], dict[str, Any]] = {}
+
+# Caché de probabilidades por fuente (LAE y Quinielista por separado), con la misma validez por hashes
+__SOURCE_PROBABILITIES_CACHE: dict[tuple[int, int], dict[str, Any]] = {}
+
+
+def clear_cache() -> None:
+    """
+    Vacía las cachés en memoria de peticiones HTTP y de resultados derivados.
+
+    Tras llamar a esta función, la siguiente petición a cada URL se realiza sin cabeceras condicionales y los
+    resultados se vuelven a parsear y fusionar desde cero.
+
+    """
+    __HTTP_CACHE.clear()
+    __PROBABILITIES_CACHE.clear()
+    __SOURCE_PROBABILITIES_CACHE.clear()
+
+
+def get_cache_dir() -> str:
+    """
+    Devuelve el directorio de la caché persistente en disco.
+
+    Se toma de la variable de entorno KINIELAGPT_CACHE_DIR y, si no está definida, se usa ~/.cache/kinielagpt.
+    El directorio no se crea aquí; lo crean los almacenes que escriben en él.
+
+    Returns
+    -------
+    str
+        Ruta del directorio de caché.
+
+    """
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".cache", "kinielagpt")
+
+
+class TokenBucketScheduler:
+    """
+    Planificador de peticiones con un token bucket por host y cola de prioridades.
+
+    Cada host tiene un presupuesto de `rate` peticiones por segundo con ráfagas de hasta `burst`. Las peticiones
+    que no encuentran token esperan en una cola por host ordenada por prioridad (REQUEST_PRIORITIES) y orden de
+    llegada: sólo la primera de la cola puede consumir el siguiente token, de modo que una petición interactiva
+    adelanta a todas las de backfill que estén esperando. Es seguro entre hilos.
+
+    Attributes
+    ----------
+    __buckets : dict[str, dict[str, Any]]
+        Estado de cada host: presupuesto, tokens disponibles, cola de espera y métricas.
+    __condition : threading.Condition
+        Protege el estado y despierta a las peticiones en espera.
+
+    Examples
+    --------
+    >>> scheduler = TokenBucketScheduler(limits={"www.quinielista.es": (2.0, 10)})
+    >>> scheduler.acquire(host="www.quinielista.es", priority="backfill")
+    0.0
+    """
+
+    def __init__(self, limits: dict[str, tuple[float, int]] | None = None,
+                 default: tuple[float, int] = DEFAULT_RATE_LIMIT, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Crea el planificador.
+
+        Parameters
+        ----------
+        limits : dict[str, tuple[float, int]] | None, optional
+            Presupuesto (peticiones por segundo, ráfaga) por host. Si es None, HOST_RATE_LIMITS.
+        default : tuple[float, int], optional
+            Presupuesto de los hosts sin entrada en limits (default: DEFAULT_RATE_LIMIT).
+        clock : Callable[[], float], optional
+            Reloj monótono en segundos (default: time.monotonic).
+        """
+        self.__limits = dict(HOST_RATE_LIMITS if limits is None else limits)
+        self.__default = default
+        self.__clock = clock
+        self.__buckets: dict[str, dict[str, Any]] = {}
+        self.__condition = threading.Condition()
+        self.__sequence = itertools.count()
+
+    def configure(self, host: str, rate: float, burst: int) -> None:
+        """
+        Cambia el presupuesto de un host.
+
+        Parameters
+        ----------
+        host : str
+            Nombre del host (ej: "www.quinielista.es").
+        rate : float
+            Peticiones por segundo.
+        burst : int
+            Ráfaga máxima (tokens acumulables).
+
+        Raises
+        ------
+        ValueError
+            Si rate no es positivo o burst es menor que 1.
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate debe ser positivo y burst al menos 1")
+        with self.__condition:
+            self.__limits[host] = (rate, burst)
+            if host in self.__buckets:
+                bucket = self.__bucket(host=host)
+                bucket["rate"], bucket["burst"] = rate, burst
+                bucket["tokens"] = min(bucket["tokens"], burst)
+            self.__condition.notify_all()
+
+    def scale(self, factor: float) -> None:
+        """
+        Multiplica el ritmo de todos los hosts (p. ej. 1/n al repartir el presupuesto entre n procesos).
+
+        Parameters
+        ----------
+        factor : float
+            Factor aplicado a las peticiones por segundo de cada host y del presupuesto por defecto.
+        """
+        with self.__condition:
+            self.__default = (self.__default[0] * factor, self.__default[1])
+            for host, (rate, burst) in list(self.__limits.items()):
+                self.__limits[host] = (rate * factor, burst)
+            for bucket in self.__buckets.values():
+                bucket["rate"] *= factor
+
+    def acquire(self, host: str, priority: str = "interactive") -> float:
+        """
+        Espera hasta que haya un token para el host y lo consume.
+
+        Parameters
+        ----------
+        host : str
+            Host de la petición.
+        priority : str, optional
+            Prioridad de REQUEST_PRIORITIES (default: "interactive").
+
+        Returns
+        -------
+        float
+            Segundos de espera.
+
+        Raises
+        ------
+        ValueError
+            Si la prioridad no es válida.
+        """
+        if priority not in REQUEST_PRIORITIES:
+            raise ValueError(f"Prioridad inválida: {priority}. Debe ser una de {REQUEST_PRIORITIES}")
+
+        with self.__condition:
+            bucket = self.__bucket(host=host)
+            start = self.__clock()
+            waited = 0.0
+            ticket = (REQUEST_PRIORITIES.index(priority), next(self.__sequence))
+            heapq.heappush(bucket["waiters"], ticket)
+            bucket["max_queue_depth"] = max(bucket["max_queue_depth"], len(bucket["waiters"]))
+
+            try:
+                while True:
+                    self.__refill(bucket=bucket)
+                    if bucket["waiters"][0] == ticket and bucket["tokens"] >= 1:
+                        break
+                    self.__condition.wait(timeout=max((1 - bucket["tokens"]) / bucket["rate"], 0.001))
+                    waited = self.__clock() - start
+            except BaseException:
+                # Sin retirar el ticket, las peticiones posteriores al host esperarían para siempre
+                bucket["waiters"].remove(ticket)
+                heapq.heapify(bucket["waiters"])
+                self.__condition.notify_all()
+                raise
+
+            heapq.heappop(bucket["waiters"])
+            bucket["tokens"] -= 1
+
+            stats = bucket["priorities"].setdefault(priority, {"requests": 0, "total_wait": 0.0, "max_wait": 0.0})
+            for entry in (bucket, stats):
+                entry["requests"] += 1
+                entry["total_wait"] += waited
+                entry["max_wait"] = max(entry["max_wait"], waited)
+            self.__condition.notify_all()
+            return waited
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """
+        Métricas de cada host desde su primera petición.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            Por host: rate, burst, tokens disponibles, queue_depth (peticiones esperando ahora),
+            max_queue_depth, requests, total_wait, mean_wait y max_wait (segundos), y by_priority con
+            requests, total_wait, mean_wait y max_wait de cada prioridad.
+        """
+        def summary(entry: dict[str, Any]) -> dict[str, Any]:
+            return {
+                "requests": entry["requests"],
+                "total_wait": round(entry["total_wait"], 4),
+                "mean_wait": round(entry["total_wait"] / entry["requests"], 4) if entry["requests"] else 0.0,
+                "max_wait": round(entry["max_wait"], 4),
+            }
+
+        with self.__condition:
+            result = {}
+            for host, bucket in self.__buckets.items():
+                self.__refill(bucket=bucket)
+                result[host] = {
+                    "rate": bucket["rate"],
+                    "burst": bucket["burst"],
+                    "tokens": round(bucket["tokens"], 3),
+                    "queue_depth": len(bucket["waiters"]),
+                    "max_queue_depth": bucket["max_queue_depth"],
+                    **summary(bucket),
+                    "by_priority": {p: summary(bucket["priorities"][p])
+                                    for p in REQUEST_PRIORITIES if p in bucket["priorities"]},
+                }
+            return result
+
+    def __bucket(self, host: str) -> dict[str, Any]:
+        """
+        Devuelve (creándolo con el presupuesto completo si no existe) el estado de un host.
+        """
+        if host not in self.__buckets:
+            rate, burst = self.__limits.get(host, self.__default)
+            self.__buckets[host] = {
+                "rate": rate, "burst": burst, "tokens": float(burst), "updated": self.__clock(), "waiters": [],
+                "max_queue_depth": 0, "requests": 0, "total_wait": 0.0, "max_wait": 0.0, "priorities": {},
+            }
+        return self.__buckets[host]
+
+    def __refill(self, bucket: dict[str, Any]) -> None:
+        """
+        Añade los tokens generados desde la última actualización, sin superar la ráfaga.
+        """
+        now = self.__clock()
+        bucket["tokens"] = min(bucket["burst"], bucket["tokens"] + (now - bucket["updated"]) * bucket["rate"])
+        bucket["updated"] = now
+
+
+# Planificador compartido por todas las peticiones del proceso y prioridad del contexto actual. Cada proceso tiene
+# el suyo: los procesos hijos no deben hacer peticiones (season descarga las jornadas en el proceso principal)
+__SCHEDULER = TokenBucketScheduler()
+__REQUEST_PRIORITY: contextvars.ContextVar[str] = contextvars.ContextVar("request_priority", default="interactive")
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    Fija la prioridad de las peticiones HTTP realizadas dentro del bloque (en el hilo o tarea actual).
+
+    Parameters
+    ----------
+    priority : str
+        Prioridad de REQUEST_PRIORITIES. Fuera de cualquier bloque las peticiones son "interactive".
+
+    Raises
+    ------
+    ValueError
+        Si la prioridad no es válida.
+
+    Examples
+    --------
+    >>> with request_priority("backfill"):
+    ...     get_jornada(jornada=10, temporada=2025)
+    """
+    if priority not in REQUEST_PRIORITIES:
+        raise ValueError(f"Prioridad inválida: {priority}. Debe ser una de {REQUEST_PRIORITIES}")
+    token = __REQUEST_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        __REQUEST_PRIORITY.reset(token)
+
+
+def configure_rate_limit(host: str, rate: float, burst: int) -> None:
+    """
+    Cambia el presupuesto de peticiones de un host en el planificador compartido.
+
+    Parameters
+    ----------
+    host : str
+        Nombre del host (ej: "www.quinielista.es").
+    rate : float
+        Peticiones por segundo.
+    burst : int
+        Ráfaga máxima.
+    """
+    __SCHEDULER.configure(host=host, rate=rate, burst=burst)
+
+
+def scale_rate_limits(factor: float) -> None:
+    """
+    Multiplica el ritmo de todos los hosts del planificador compartido (p. ej. en cada proceso de un pool).
+
+    Parameters
+    ----------
+    factor : float
+        Factor aplicado a las peticiones por segundo.
+    """
+    __SCHEDULER.scale(factor=factor)
+
+
+def rate_limit_metrics() -> dict[str, dict[str, Any]]:
+    """
+    Métricas del planificador compartido: profundidad de cola y tiempos de espera por host y prioridad.
+
+    Returns
+    -------
+    dict[str, dict[str, Any]]
+        Métricas por host (ver TokenBucketScheduler.metrics).
+    """
+    return __SCHEDULER.metrics()
+
+
+def __http_get(url: str, session: requests.Session | None = None, **kwargs: Any) -> requests.Response:
+    """
+    Realiza una petición GET tras obtener un token del planificador para el host de la URL.
+
+    Parameters
+    ----------
+    url : str
+        URL de la petición.
+    session : requests.Session | None, optional
+        Sesión con la que hacer la petición. Si es None, requests.get.
+    **kwargs : Any
+        Argumentos adicionales de requests.get (headers, params...).
+
+    Returns
+    -------
+    requests.Response
+        Respuesta de la petición.
+    """
+    waited = __SCHEDULER.acquire(host=urlparse(url).hostname or "", priority=__REQUEST_PRIORITY.get())
+    if waited >= 1:
+        print(f"Rate limit: waited {waited:.1f}s for {urlparse(url).hostname}")
+    return (session or requests).get(url=url, **kwargs)
+
+
+def __fetch_conditional(url: str, headers: dict[str, str]) -> tuple[bytes, str, bool]:
+    """
+    Realiza una petición HTTP GET condicional reutilizando los validadores almacenados para la URL.
+
+    Si existe una respuesta previa para la URL se envían las cabeceras If-None-Match / If-Modified-Since con el
+    ETag / Last-Modified guardados. Un 304 Not Modified devuelve el contenido almacenado. En cualquier caso se
+    compara el hash SHA-256 del contenido con el anterior, de modo que los servidores que no soportan validadores
+    también permiten detectar payloads sin cambios.
+
+    Parameters
+    ----------
+    url : str
+        URL a consultar.
+    headers : dict[str, str]
+        Cabeceras base de la petición.
+
+    Returns
+    -------
+    tuple[bytes, str, bool]
+        Tupla (contenido, hash del contenido, cambiado) donde cambiado es False si el payload es idéntico al de la
+        última respuesta almacenada para la URL.
+
+    Raises
+    ------
+    requests.exceptions.RequestException
+        Si la petición HTTP falla o devuelve un código de estado de error.
+
+    """
+    entry = __HTTP_CACHE.get(url)
+    request_headers = dict(headers)
+    if entry is not None:
+        if entry.get('etag'):
+            request_headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            request_headers['If-Modified-Since'] = entry['last_modified']
+
+    response = __http_get(url=url, headers=request_headers)
+
+    if response.status_code == 304 and entry is not None:
+        return entry['content'], entry['content_hash'], False
+
+    response.raise_for_status()
+    content = response.content
+    content_hash = hashlib.sha256(content).hexdigest()
+    changed = entry is None or entry['content_hash'] != content_hash
+
+    if changed:
+        entry = {'content': content, 'content_hash': content_hash}
+        __HTTP_CACHE[url] = entry
+    entry['etag'] = response.headers.get('ETag', entry.get('etag'))
+    entry['last_modified'] = response.headers.get('Last-Modified', entry.get('last_modified'))
+
+    return content, content_hash, changed
+
+
+def __get_xml(url: str) -> tuple[dict | None, str | None]:
+    """
+    Obtiene y parsea el XML de una URL, reutilizando el JSON almacenado si el payload no ha cambiado.
+
+    Parameters
+    ----------
+    url : str
+        URL desde la que obtener el XML.
+
+    Returns
+    -------
+    tuple[dict | None, str | None]
+        Tupla (json, hash del contenido). El JSON devuelto es el almacenado en caché y no debe modificarse.
+        Devuelve (None, None) si la petición o el parseo fallan.
+
+    """
+    try:
+        print(f"Fetching XML from {url}...")
+        content, content_hash, changed = __fetch_conditional(url=url, headers=HEADERS_BASE)
+        entry = __HTTP_CACHE[url]
+
+        if not changed and 'json' in entry:
+            print("XML unchanged, reusing cached JSON")
+            return entry['json'], content_hash
+
+        # Parse XML and convert to dictionary (attr_prefix='' removes @ from attributes)
+        result = xmltodict.parse(content, attr_prefix='')
+        entry['json'] = result
+
+        print("XML converted to JSON successfully")
+        return result, content_hash
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching XML: {e}")
+        return None, None
+    except Exception as e:
+        print(f"Error parsing XML: {e}")
+        return None, None
+
+
+def extract_partidos(
+    content: bytes, chunk_size: int = 16 * 1024
+) -> tuple[dict[str, str], list[dict[str, str]]]:
+    """
+    Extrae los elementos partido de un XML de quinielista.es en un único pase en streaming.
+
+    A diferencia de xmltodict, no construye el árbol genérico de diccionarios del documento: alimenta el parser
+    incremental de ElementTree (XMLPullParser) por bloques y, tras cada bloque, consume los eventos de cierre ya
+    disponibles: toma los atributos del nodo porcentajes (jornada, temporada, ...) y convierte cada elemento partido
+    directamente en un registro compacto con sus atributos, liberando el elemento tras procesarlo. Así el árbol
+    retenido por el parser nunca contiene más que los partidos de un bloque.
+
+    Parameters
+    ----------
+    content : bytes
+        Contenido XML de un feed porcentajes.asp o porcentajes_lae.asp.
+    chunk_size : int, optional
+        Tamaño en bytes de cada bloque entregado al parser (por defecto 16 KiB).
+
+    Returns
+    -------
+    tuple[dict[str, str], list[dict[str, str]]]
+        Tupla (porcentajes, partidos):
+        - porcentajes: Atributos del nodo porcentajes (jornada, temporada, activo).
+        - partidos: Lista de registros con los atributos de cada partido (num, local, visitante, porc_1, ...),
+          idénticos a los que produce xmltodict con attr_prefix=''.
+
+    Raises
+    ------
+    xml.etree.ElementTree.ParseError
+        Si el XML no está bien formado.
+
+    """
+    porcentajes: dict[str, str] = {}
+    partidos: list[dict[str, str]] = []
+
+    parser = ET.XMLPullParser(events=('end',))
+
+    def drain() -> None:
+        nonlocal porcentajes
+        for _, elem in parser.read_events():
+            if elem.tag == 'partido':
+                partidos.append(dict(elem.attrib))
+                elem.clear()
+            elif elem.tag == 'porcentajes':
+                porcentajes = dict(elem.attrib)
+
+    view = memoryview(content)
+    for start in range(0, len(view), chunk_size):
+        parser.feed(view[start:start + chunk_size])
+        drain()
+    parser.close()
+    drain()
+
+    return porcentajes, partidos
+
+
+def __get_partidos(url: str) -> tuple[dict[str, str] | None, list[dict[str, str]] | None, str | None]:
+    """
+    Obtiene los registros de partidos de un feed XML, reutilizando la extracción previa si el payload no ha cambiado.
+
+    Parameters
+    ----------
+    url : str
+        URL desde la que obtener el XML.
+
+    Returns
+    -------
+    tuple[dict | None, list | None, str | None]
+        Tupla (porcentajes, partidos, hash del contenido). Los registros devueltos son los almacenados en caché y no
+        deben modificarse. Devuelve (None, None, None) si la petición o el parseo fallan.
+
+    """
+    try:
+        print(f"Fetching XML from {url}...")
+        content, content_hash, changed = __fetch_conditional(url=url, headers=HEADERS_BASE)
+        entry = __HTTP_CACHE[url]
+
+        if not changed and 'partidos' in entry:
+            print("XML unchanged, reusing cached records")
+            porcentajes, partidos = entry['partidos']
+            return porcentajes, partidos, content_hash
+
+        porcentajes, partidos = extract_partidos(content=content)
+        entry['partidos'] = (porcentajes, partidos)
+
+        print(f"XML parsed successfully: {len(partidos)} partidos")
+        return porcentajes, partidos, content_hash
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching XML: {e}")
+        return None, None, None
+    except Exception as e:
+        print(f"Error parsing XML: {e}")
+        return None, None, None
+
 
 def get_xml_as_json(url: str) -> dict | None:
     """
@@ -57,6 +640,8 @@ def get_xml_as_json(url: str) -> dict | None:
 
     Realiza una petición HTTP GET a la URL especificada, recupera el contenido XML de la API quinielista.es y lo parsea
     en una estructura de diccionario usando la librería xmltodict con prefijo de atributos personalizado.
+    Las peticiones son condicionales (ETag / If-Modified-Since) y si el payload no ha cambiado desde la última
+    petición se reutiliza el resultado ya parseado.
 
     Parameters
     ----------
@@ -76,23 +661,8 @@ def get_xml_as_json(url: str) -> dict | None:
         Si el parseo del XML falla.
 
     """
-    try:
-        print(f"Fetching XML from {url}...")
-        response = requests.get(url=url, headers=HEADERS_BASE)
-        response.raise_for_status()
-        
-        # Parse XML and convert to dictionary (attr_prefix='' removes @ from attributes)
-        result = xmltodict.parse(response.content, attr_prefix='')
-        
-        print("XML converted to JSON successfully")
-        return result
-        
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching XML: {e}")
-        return None
-    except Exception as e:
-        print(f"Error parsing XML: {e}")
-        return None
+    result, _ = __get_xml(url=url)
+    return copy.deepcopy(result) if result is not None else None
 
 def get_last_kiniela() -> tuple:
     """
@@ -111,13 +681,13 @@ def get_last_kiniela() -> tuple:
         - partidos (list or None): Lista de partidos con campos id y partido.
 
     """
-    json_data = get_xml_as_json(url=URL_BASE)
-    jornada = int(json_data['quinielista']['porcentajes']['jornada']) if json_data else None
-    temporada = int(json_data['quinielista']['porcentajes']['temporada']) if json_data else None
+    porcentajes, registros, _ = __get_partidos(url=URL_BASE)
+    jornada = int(porcentajes['jornada']) if porcentajes else None
+    temporada = int(porcentajes['temporada']) if porcentajes else None
     info = (f"Quiniela de la jornada {jornada} de la temporada {temporada-1}/{temporada}" 
             if temporada is not None and jornada is not None else None)
     partidos = [{'id': int(i['num']), 'partido': f"{i['local']} | {i['visitante']}"} 
-                for i in json_data['quinielista']['porcentajes']['partido']] if json_data else None
+                for i in registros] if registros is not None else None
 
     return info, jornada, temporada, partidos
 
@@ -145,20 +715,20 @@ def get_kiniela(jornada: int, temporada: int) -> tuple:
         - partidos (list or None): Lista de partidos con campos id y partido.
 
     """
-    json_data = get_xml_as_json(url=URL_LAE.format(jornada, temporada))
+    _, registros, _ = __get_partidos(url=URL_LAE.format(jornada, temporada))
 
-    if not json_data:
+    if not registros:
         print("No ha sido posible obtener información de la jornada solicitada.")
         return None, None, None, None
     else:
         info = (f"Quiniela de la jornada {jornada} de la temporada {temporada-1}/{temporada}" 
                 if temporada is not None and jornada is not None else None)
-        partidos = [{'id': int(i['num']), 'partido': f"{i['local']} | {i['visitante']}"} 
-                    for i in json_data['quinielista']['porcentajes']['partido']] if json_data else None
+        partidos = [{'id': int(i['num']), 'partido': f"{i['local']} | {i['visitante']}"} for i in registros]
 
         return info, jornada, temporada, partidos
     
-def get_kiniela_probabilities(jornada: int, temporada: int) -> list | None:
+def get_kiniela_probabilities(jornada: int, temporada: int, weights: dict[str, float] | None = None,
+                              by_source: bool = False) -> list | None:
     """
     Obtiene las probabilidades de quiniela para una jornada y temporada específicas.
 
@@ -172,6 +742,12 @@ def get_kiniela_probabilities(jornada: int, temporada: int) -> list | None:
         Número de jornada a consultar.
     temporada : int
         Año de temporada a consultar.
+    weights : dict[str, float] | None, optional
+        Peso de cada fuente (claves de PROBABILITY_SOURCES) en la fusión. Las fuentes ausentes pesan 0. Si es None
+        o ambos pesos son iguales, se usa la media simple.
+    by_source : bool, optional
+        Si es True, cada partido incluye además las probabilidades 1X2 de cada fuente por separado
+        (SOURCE_PROBABILITY_COLUMNS: 1_Prob_lae, ..., 2_Prob_quiniela) sin descargas adicionales.
 
     Returns
     -------
@@ -180,81 +756,245 @@ def get_kiniela_probabilities(jornada: int, temporada: int) -> list | None:
         Cada partido contiene campos id, partido y probabilidades (1_Prob, X_Prob, 2_Prob, probabilidades de goles 
         para equipos local y visitante). Valores redondeados a 1 decimal.
 
+    Raises
+    ------
+    ValueError
+        Si weights contiene fuentes desconocidas, pesos negativos o todos los pesos son 0.
+
     Process Detail
     --------------
-    1. Obtiene datos XML de los endpoints LAE y Quiniela.
-    2. Convierte el XML a pandas DataFrame para cada fuente.
+    1. Obtiene datos XML de los endpoints LAE y Quiniela y extrae los partidos en streaming (extract_partidos).
+    2. Convierte los registros de partidos a pandas DataFrame para cada fuente.
     3. Concatena ambos DataFrames y convierte las columnas de porcentajes a numérico.
-    4. Agrupa por número de partido ('num') y agrega: máximo para nombres de equipos, media para probabilidades.
+    4. Agrupa por número de partido ('num') y agrega: máximo para nombres de equipos, media (ponderada si se
+       indican weights) para probabilidades.
     5. Normaliza grupos de probabilidades para sumar 100% (resultado partido, goles local, goles visitante).
     6. Filtra valores cero y redondea a 1 decimal.
 
+    Si ninguno de los dos feeds ha cambiado desde la última llamada (mismo hash de contenido), se devuelve una copia
+    del resultado calculado previamente sin volver a parsear ni fusionar.
+
     """
-    json_lae = get_xml_as_json(url=URL_LAE.format(jornada, temporada))
-    json_quini = get_xml_as_json(url=URL_QUINI.format(jornada, temporada))
+    pesos = __validar_pesos(weights=weights)
 
-    pdf_lae = (pd.DataFrame(data=json_lae['quinielista']['porcentajes']['partido']).fillna(value=0.0) 
-               if json_lae else None)
-    pdf_quini = (pd.DataFrame(data=json_quini['quinielista']['porcentajes']['partido']).fillna(value=0.0) 
-                 if json_quini else None)
+    _, partidos_lae, hash_lae = __get_partidos(url=URL_LAE.format(jornada, temporada))
+    _, partidos_quini, hash_quini = __get_partidos(url=URL_QUINI.format(jornada, temporada))
 
-    if pdf_lae is not None and pdf_quini is not None:
-        # Unión de ambos DataFrames
-        pdf_union = pd.concat(objs=[pdf_lae, pdf_quini], ignore_index=True)
-        
-        # Convertir columna 'num' a entero y columnas de porcentajes a numéricas
-        pdf_union['num'] = (pd.to_numeric(arg=pdf_union['num'], errors='coerce')
-                            .fillna(value=0).astype(dtype=int))
-        porc_cols = [col for col in pdf_union.columns if col.startswith('porc_')]
-        pdf_union[porc_cols] = (pdf_union[porc_cols]
-                                .apply(pd.to_numeric, errors='coerce')
-                                .fillna(value=0.0))
-        
-        # Agrupar por 'num' y agregar: máximo para textos, media para porcentajes
+    if not partidos_lae or not partidos_quini:
+        return None
+
+    cached = __PROBABILITIES_CACHE.get((jornada, temporada, pesos))
+    if cached is None or cached['hashes'] != (hash_lae, hash_quini):
+        cached = {
+            'hashes': (hash_lae, hash_quini),
+            'result': __calcular_probabilidades(feeds=[partidos_lae, partidos_quini], weights=pesos),
+        }
+        __PROBABILITIES_CACHE[(jornada, temporada, pesos)] = cached
+
+    result = [dict(row) for row in cached['result']]
+
+    if by_source:
+        sources = __probabilidades_por_fuente(
+            jornada=jornada, temporada=temporada, feeds=[partidos_lae, partidos_quini], hashes=(hash_lae, hash_quini)
+        )
+        by_id = {source: {row['id']: row for row in rows} for source, rows in sources.items()}
+        for row in result:
+            for source in PROBABILITY_SOURCES:
+                source_row = by_id[source].get(row['id'], {})
+                for sign in ('1', 'X', '2'):
+                    if source_row.get(f'{sign}_Prob', 0) != 0:
+                        row[f'{sign}_Prob_{source}'] = source_row[f'{sign}_Prob']
+
+    return result
+
+
+def get_kiniela_probabilities_by_source(jornada: int, temporada: int) -> dict[str, list] | None:
+    """
+    Obtiene las probabilidades de quiniela de cada fuente por separado, sin promediarlas.
+
+    Mientras que get_kiniela_probabilities promedia los feeds LAE y Quinielista, esta función conserva ambos
+    para poder comparar la estimación LAE con el porcentaje de apuestas del público (Quinielista), que es lo que
+    determina el valor del premio de una columna.
+
+    Parameters
+    ----------
+    jornada : int
+        Número de jornada a consultar.
+    temporada : int
+        Año de temporada a consultar.
+
+    Returns
+    -------
+    dict[str, list] | None
+        Diccionario con una clave por fuente (PROBABILITY_SOURCES: "lae" y "quiniela"), cada una con una lista
+        de probabilidades con el mismo formato que get_kiniela_probabilities, normalizadas por fuente.
+        None si alguno de los dos feeds no está disponible.
+
+    """
+    _, partidos_lae, hash_lae = __get_partidos(url=URL_LAE.format(jornada, temporada))
+    _, partidos_quini, hash_quini = __get_partidos(url=URL_QUINI.format(jornada, temporada))
+
+    if not partidos_lae or not partidos_quini:
+        return None
+
+    sources = __probabilidades_por_fuente(
+        jornada=jornada, temporada=temporada, feeds=[partidos_lae, partidos_quini], hashes=(hash_lae, hash_quini)
+    )
+    return {source: [dict(row) for row in rows] for source, rows in sources.items()}
+
+
+def __probabilidades_por_fuente(jornada: int, temporada: int, feeds: list[list[dict[str, str]]],
+                                hashes: tuple[str, str]) -> dict[str, list]:
+    """
+    Calcula (o recupera de la caché) las probabilidades de cada fuente a partir de sus partidos ya descargados.
+
+    Parameters
+    ----------
+    jornada : int
+        Número de jornada.
+    temporada : int
+        Año de temporada.
+    feeds : list[list[dict[str, str]]]
+        Partidos de cada fuente, en el orden de PROBABILITY_SOURCES.
+    hashes : tuple[str, str]
+        Hashes del contenido de cada feed.
+
+    Returns
+    -------
+    dict[str, list]
+        Probabilidades por fuente. Es el objeto cacheado: no debe modificarse.
+
+    """
+    cached = __SOURCE_PROBABILITIES_CACHE.get((jornada, temporada))
+    if cached is None or cached['hashes'] != hashes:
+        cached = {
+            'hashes': hashes,
+            'result': {
+                source: __calcular_probabilidades(feeds=[partidos])
+                for source, partidos in zip(PROBABILITY_SOURCES, feeds)
+            },
+        }
+        __SOURCE_PROBABILITIES_CACHE[(jornada, temporada)] = cached
+    return cached['result']
+
+
+def __validar_pesos(weights: dict[str, float] | None) -> tuple[float, ...] | None:
+    """
+    Valida los pesos de las fuentes y los convierte en una tupla en el orden de PROBABILITY_SOURCES.
+
+    Parameters
+    ----------
+    weights : dict[str, float] | None
+        Peso de cada fuente. Las fuentes ausentes pesan 0.
+
+    Returns
+    -------
+    tuple[float, ...] | None
+        Pesos por fuente, o None si se debe usar la media simple (sin pesos o todos iguales).
+
+    Raises
+    ------
+    ValueError
+        Si hay fuentes desconocidas, pesos negativos o todos los pesos son 0.
+
+    """
+    if weights is None:
+        return None
+
+    unknown = set(weights) - set(PROBABILITY_SOURCES)
+    if unknown:
+        raise ValueError(f"Fuentes desconocidas: {sorted(unknown)}. Opciones: {list(PROBABILITY_SOURCES)}")
+
+    pesos = tuple(float(weights.get(source, 0.0)) for source in PROBABILITY_SOURCES)
+    if any(peso < 0 for peso in pesos) or sum(pesos) <= 0:
+        raise ValueError("Los pesos de las fuentes deben ser no negativos y no pueden ser todos 0")
+
+    return None if len(set(pesos)) == 1 else pesos
+
+
+def __calcular_probabilidades(feeds: list[list[dict[str, str]]], weights: tuple[float, ...] | None = None) -> list:
+    """
+    Convierte los partidos de uno o varios feeds en probabilidades normalizadas.
+
+    Si un mismo partido aparece en varios feeds, sus porcentajes se promedian.
+
+    Parameters
+    ----------
+    feeds : list[list[dict[str, str]]]
+        Partidos de cada feed, extraídos con extract_partidos.
+    weights : tuple[float, ...] | None, optional
+        Peso de cada feed en la media. Si es None, media simple.
+
+    Returns
+    -------
+    list
+        Probabilidades por partido con el formato de get_kiniela_probabilities.
+
+    """
+    # Unión de los DataFrames de cada feed
+    pdf_union = pd.concat(objs=[pd.DataFrame(data=partidos).fillna(value=0.0) for partidos in feeds],
+                          ignore_index=True)
+
+    # Convertir columna 'num' a entero y columnas de porcentajes a numéricas
+    pdf_union['num'] = (pd.to_numeric(arg=pdf_union['num'], errors='coerce')
+                        .fillna(value=0).astype(dtype=int))
+    porc_cols = [col for col in pdf_union.columns if col.startswith('porc_')]
+    pdf_union[porc_cols] = (pdf_union[porc_cols]
+                            .apply(pd.to_numeric, errors='coerce')
+                            .fillna(value=0.0))
+
+    # Agrupar por 'num' y agregar: máximo para textos, media para porcentajes
+    if weights is None:
         agg_dict = ({'local': 'max', 'visitante': 'max'} | {col: 'mean' for col in porc_cols})
         pdf = pdf_union.groupby(by='num').agg(func=agg_dict).reset_index()
-        
-        # Crear campo partido combinando local y visitante
-        pdf['partido'] = pdf.apply(lambda row: f"{row['local']} | {row['visitante']}", axis=1)
-        pdf = pdf.drop(columns=['local', 'visitante'])
-        
-        # Renombrar columnas de goles
-        pdf = pdf.rename(columns={
-            'porc_1': '1_Prob', 
-            'porc_X': 'X_Prob', 
-            'porc_2': '2_Prob',
-            'porc_15L_0': '0_Goles_Local_Prob',
-            'porc_15L_1': '1_Goles_Local_Prob',
-            'porc_15L_2': '2_Goles_Local_Prob',
-            'porc_15L_M': 'Mas_Goles_Local_Prob',
-            'porc_15V_0': '0_Goles_Visitante_Prob',
-            'porc_15V_1': '1_Goles_Visitante_Prob',
-            'porc_15V_2': '2_Goles_Visitante_Prob',
-            'porc_15V_M': 'Mas_Goles_Visitante_Prob'
-        })
-        
-        # Normalizar grupos de columnas en base 100 (salvo si todas son 0)
-        col_groups = [
-            ['1_Prob', 'X_Prob', '2_Prob'],
-            ['0_Goles_Local_Prob', '1_Goles_Local_Prob', '2_Goles_Local_Prob', 
-             'Mas_Goles_Local_Prob'],
-            ['0_Goles_Visitante_Prob', '1_Goles_Visitante_Prob', '2_Goles_Visitante_Prob', 
-             'Mas_Goles_Visitante_Prob']
-        ]
-        
-        for cols in col_groups:
-            if all(col in pdf.columns for col in cols):
-                row_sums = pdf[cols].sum(axis=1)
-                mask = row_sums != 0
-                pdf.loc[mask, cols] = pdf.loc[mask, cols].div(other=row_sums[mask], axis=0) * 100
-        
-        # Ordenar por 'num' y convertir a JSON eliminando claves con valor 0 y redondeando a 1 decimal
-        pdf = pdf.sort_values(by='num').reset_index(drop=True)
-        pdf = pdf.rename(columns={'num': 'id'})
-        return [{k: round(number=v, ndigits=1) if isinstance(v, float) 
-                 else v for k, v in row.items() if v != 0 and v != 0.0} for row in pdf.to_dict(orient='records')]
-    
-    return None
+    else:
+        # Media ponderada: suma de porcentajes por peso entre la suma de pesos de cada partido
+        pdf_union['_peso'] = [peso for peso, partidos in zip(weights, feeds) for _ in partidos]
+        pdf_union[porc_cols] = pdf_union[porc_cols].mul(other=pdf_union['_peso'], axis=0)
+        agg_dict = ({'local': 'max', 'visitante': 'max', '_peso': 'sum'} | {col: 'sum' for col in porc_cols})
+        pdf = pdf_union.groupby(by='num').agg(func=agg_dict).reset_index()
+        pdf[porc_cols] = pdf[porc_cols].div(other=pdf['_peso'].where(pdf['_peso'] > 0, 1.0), axis=0)
+        pdf = pdf.drop(columns=['_peso'])
+
+    # Crear campo partido combinando local y visitante
+    pdf['partido'] = pdf.apply(lambda row: f"{row['local']} | {row['visitante']}", axis=1)
+    pdf = pdf.drop(columns=['local', 'visitante'])
+
+    # Renombrar columnas de goles
+    pdf = pdf.rename(columns={
+        'porc_1': '1_Prob',
+        'porc_X': 'X_Prob',
+        'porc_2': '2_Prob',
+        'porc_15L_0': '0_Goles_Local_Prob',
+        'porc_15L_1': '1_Goles_Local_Prob',
+        'porc_15L_2': '2_Goles_Local_Prob',
+        'porc_15L_M': 'Mas_Goles_Local_Prob',
+        'porc_15V_0': '0_Goles_Visitante_Prob',
+        'porc_15V_1': '1_Goles_Visitante_Prob',
+        'porc_15V_2': '2_Goles_Visitante_Prob',
+        'porc_15V_M': 'Mas_Goles_Visitante_Prob'
+    })
+
+    # Normalizar grupos de columnas en base 100 (salvo si todas son 0)
+    col_groups = [
+        ['1_Prob', 'X_Prob', '2_Prob'],
+        ['0_Goles_Local_Prob', '1_Goles_Local_Prob', '2_Goles_Local_Prob',
+         'Mas_Goles_Local_Prob'],
+        ['0_Goles_Visitante_Prob', '1_Goles_Visitante_Prob', '2_Goles_Visitante_Prob',
+         'Mas_Goles_Visitante_Prob']
+    ]
+
+    for cols in col_groups:
+        if all(col in pdf.columns for col in cols):
+            row_sums = pdf[cols].sum(axis=1)
+            mask = row_sums != 0
+            pdf.loc[mask, cols] = pdf.loc[mask, cols].div(other=row_sums[mask], axis=0) * 100
+
+    # Ordenar por 'num' y convertir a JSON eliminando claves con valor 0 y redondeando a 1 decimal
+    pdf = pdf.sort_values(by='num').reset_index(drop=True)
+    pdf = pdf.rename(columns={'num': 'id'})
+    return [{k: round(number=v, ndigits=1) if isinstance(v, float)
+             else v for k, v in row.items() if v != 0 and v != 0.0} for row in pdf.to_dict(orient='records')]
 
 def get_kiniela_matches_details(jornada: int, temporada: int) -> list | None:
     """
@@ -290,7 +1030,7 @@ def get_kiniela_matches_details(jornada: int, temporada: int) -> list | None:
   
     try:
         print("Initializing session at www.eduardolosilla.es...")
-        response = session.get(url=URL_DETAILS_BASE, headers=HEADERS_BASE)
+        response = __http_get(url=URL_DETAILS_BASE, session=session, headers=HEADERS_BASE)
         response.raise_for_status() # Verify that the request was successful: Status code 200-299
     except requests.exceptions.RequestException as e:
         print(f"Error initializing session: {e}")
@@ -302,7 +1042,7 @@ def get_kiniela_matches_details(jornada: int, temporada: int) -> list | None:
 
     try:
         # Make GET request using the session
-        response = session.get(url=URL_DETAILS, params=params, headers=HEADER_DETAIL)
+        response = __http_get(url=URL_DETAILS, session=session, params=params, headers=HEADER_DETAIL)
         response.raise_for_status() # Verify that the request was successful: Status code 200-299
         data = response.json()['detallePartidos']
         
@@ -327,23 +1067,9 @@ def get_kiniela_matches_details(jornada: int, temporada: int) -> list | None:
                 equipo_visitante=dt.get('visitante')
             )
 
-            # Calcular rachas en un solo pase para optimizar
-            rachas = {
-                'local': [p['cod_resultado'] for p in ultimos_partidos_procesado 
-                         if p.get('cod_resultado') and p.get('tipo') in ['local_como_local', 'local_como_visitante']],
-                'visitante': [p['cod_resultado'] for p in ultimos_partidos_procesado 
-                             if p.get('cod_resultado') and 
-                             p.get('tipo') in ['visitante_como_local', 'visitante_como_visitante']],
-                'local_como_local': [p['cod_resultado'] for p in ultimos_partidos_procesado 
-                                    if p.get('cod_resultado') and p.get('tipo') == 'local_como_local'],
-                'visitante_como_visitante': [p['cod_resultado'] for p in ultimos_partidos_procesado 
-                                            if p.get('cod_resultado') and p.get('tipo') == 'visitante_como_visitante']
-            }
-            
-            loc = rachas['local'][-5:] if rachas['local'] else []
-            vist = rachas['visitante'][-5:] if rachas['visitante'] else []
-            loc_as_loc = rachas['local_como_local'][-5:] if rachas['local_como_local'] else []
-            vist_as_vist = rachas['visitante_como_visitante'][-5:] if rachas['visitante_como_visitante'] else []
+            rachas = __rachas_ultimos_partidos(ultimos_partidos=ultimos_partidos_procesado)
+            loc, vist = rachas['local'], rachas['visitante']
+            loc_as_loc, vist_as_vist = rachas['local_como_local'], rachas['visitante_como_visitante']
 
             partido_filtrado = {
                 'id': dt.get('orden'),
@@ -372,6 +1098,210 @@ def get_kiniela_matches_details(jornada: int, temporada: int) -> list | None:
         print(f"Error making request: {e}")
         return None
 
+def get_jornada(jornada: int, temporada: int, refresh: bool = False,
+                download: bool = True) -> tuple[list | None, list | None]:
+    """
+    Obtiene probabilidades y detalles de una jornada usando la caché en disco.
+
+    Si la jornada está en <cache>/jornadas/<temporada>/<jornada>.json (ver get_cache_dir) se lee de ahí sin
+    ninguna petición HTTP. Si no lo está, o si refresh es True, se descarga con get_kiniela_probabilities y
+    get_kiniela_matches_details y, cuando ambas fuentes responden, se guarda.
+
+    Parameters
+    ----------
+    jornada : int
+        Número de jornada.
+    temporada : int
+        Año de la temporada.
+    refresh : bool, optional
+        Si es True, descarga de nuevo la jornada y sobrescribe la caché (p. ej. jornada abierta). Por defecto False.
+    download : bool, optional
+        Si es False, solo se lee la caché (sin ninguna petición HTTP) y se devuelve (None, None) si la jornada no
+        está en ella. Por defecto True.
+
+    Returns
+    -------
+    tuple[list | None, list | None]
+        Tupla (probabilities, details) con el mismo formato que get_kiniela_probabilities y
+        get_kiniela_matches_details. Cada elemento es None si su fuente no está disponible.
+
+    """
+    path = __jornada_cache_path(jornada=jornada, temporada=temporada)
+
+    if not refresh and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            cached = json.load(f)
+        return cached['probabilities'], cached['details']
+
+    if not download:
+        return None, None
+
+    probabilities = get_kiniela_probabilities(jornada=jornada, temporada=temporada)
+    details = get_kiniela_matches_details(jornada=jornada, temporada=temporada)
+
+    if probabilities is not None and details is not None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = {
+            'jornada': jornada,
+            'temporada': temporada,
+            'probabilities': probabilities,
+            'details': details,
+        }
+        # Escritura atómica: un lector concurrente nunca ve un fichero a medias
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    return probabilities, details
+
+
+def list_cached_jornadas(temporada: int | None = None) -> list[tuple[int, int]]:
+    """
+    Lista las jornadas guardadas en la caché en disco.
+
+    Parameters
+    ----------
+    temporada : int | None, optional
+        Si se indica, sólo se listan las jornadas de esa temporada.
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        Pares (temporada, jornada) ordenados.
+
+    """
+    root = os.path.join(get_cache_dir(), JORNADAS_CACHE_SUBDIR)
+    if not os.path.isdir(root):
+        return []
+
+    temporadas = [str(temporada)] if temporada is not None else os.listdir(root)
+    cached = []
+    for nombre_temporada in temporadas:
+        directorio = os.path.join(root, nombre_temporada)
+        if not nombre_temporada.isdigit() or not os.path.isdir(directorio):
+            continue
+        for nombre in os.listdir(directorio):
+            jornada, extension = os.path.splitext(nombre)
+            if extension == '.json' and jornada.isdigit():
+                cached.append((int(nombre_temporada), int(jornada)))
+    return sorted(cached)
+
+
+def __jornada_cache_path(jornada: int, temporada: int) -> str:
+    """Ruta del fichero de la caché en disco de una jornada."""
+    return os.path.join(get_cache_dir(), JORNADAS_CACHE_SUBDIR, str(temporada), f"{jornada:02d}.json")
+
+
+def group_ultimos_partidos(ultimos_partidos: list) -> dict[str, list]:
+    """
+    Agrupa la lista plana de ultimos_partidos por tipo en un único pase.
+
+    Cada partido se añade a su grupo de tipo y al grupo combinado del equipo (local o visitante), conservando el
+    orden por jornada de la lista original. Los grupos contienen referencias a los mismos diccionarios, sin copias.
+
+    Parameters
+    ----------
+    ultimos_partidos : list
+        Lista de partidos tal y como la devuelve __procesar_ultimos_partidos.
+
+    Returns
+    -------
+    dict[str, list]
+        Diccionario con las claves de ULTIMOS_PARTIDOS_GRUPOS:
+        - local / visitante: Todos los partidos de cada equipo.
+        - local_como_local, local_como_visitante, visitante_como_local, visitante_como_visitante: Partidos de
+          cada equipo según haya jugado en casa o fuera.
+
+    """
+    grupos: dict[str, list] = {grupo: [] for grupo in ULTIMOS_PARTIDOS_GRUPOS}
+    for p in ultimos_partidos:
+        tipo = p.get('tipo')
+        grupo = grupos.get(tipo)
+        if grupo is None or tipo in ('local', 'visitante'):
+            continue
+        grupo.append(p)
+        grupos['local' if tipo.startswith('local_') else 'visitante'].append(p)
+    return grupos
+
+
+def __rachas_ultimos_partidos(ultimos_partidos: list, n: int = 5) -> dict[str, list[str]]:
+    """
+    Rachas de los últimos n partidos de cada equipo en un único pase sobre ultimos_partidos.
+
+    Cada partido con resultado se añade en O(1) a una ventana acotada (deque de n elementos) de su tipo y a la
+    del equipo, con el mismo criterio de agrupación que group_ultimos_partidos.
+
+    Parameters
+    ----------
+    ultimos_partidos : list
+        Lista de partidos tal y como la devuelve __procesar_ultimos_partidos, en orden por jornada.
+    n : int, optional
+        Longitud de las rachas (por defecto 5).
+
+    Returns
+    -------
+    dict[str, list[str]]
+        Códigos 'VICTORIA', 'EMPATE' o 'DERROTA' de los últimos n partidos con resultado para las claves
+        local, visitante, local_como_local y visitante_como_visitante.
+
+    """
+    rachas: dict[str, deque] = {
+        tipo: deque(maxlen=n) for tipo in ('local', 'visitante', 'local_como_local', 'visitante_como_visitante')
+    }
+    for p in ultimos_partidos:
+        tipo = p.get('tipo')
+        cod_resultado = p.get('cod_resultado')
+        if not cod_resultado or tipo not in ULTIMOS_PARTIDOS_GRUPOS or tipo in ('local', 'visitante'):
+            continue
+        if tipo in rachas:
+            rachas[tipo].append(cod_resultado)
+        rachas['local' if tipo.startswith('local_') else 'visitante'].append(cod_resultado)
+    return {tipo: list(racha) for tipo, racha in rachas.items()}
+
+
+# Lectura de la comparativa: (lista de partidos, tipo con resultado_casa, tipo con resultado_fuera)
+__COMPARATIVA_TIPOS = (
+    ('partidos_local', 'local_como_local', 'local_como_visitante'),
+    ('partidos_visitante', 'visitante_como_local', 'visitante_como_visitante'),
+)
+
+
+# Tamaño de la caché de códigos de resultado por marcador: en una temporada se repiten unas pocas decenas
+__CODIGOS_RESULTADO_MAX = 1024
+
+
+@lru_cache(maxsize=__CODIGOS_RESULTADO_MAX)
+def __codigos_resultado(resultado: str) -> tuple[str, str]:
+    """
+    Convierte un marcador "goles_casa-goles_fuera" en su código de resultado para cada equipo.
+
+    El resultado se memoiza con lru_cache (hasta __CODIGOS_RESULTADO_MAX marcadores distintos).
+
+    Parameters
+    ----------
+    resultado : str
+        Marcador ya validado (ej., "2-1").
+
+    Returns
+    -------
+    tuple[str, str]
+        (código del equipo de casa, código del equipo de fuera), cada uno 'VICTORIA', 'EMPATE' o 'DERROTA'.
+        ('', '') si el marcador no tiene dos enteros.
+
+    """
+    try:
+        goles_casa, goles_fuera = map(int, resultado.split('-'))
+    except ValueError:
+        return ('', '')
+
+    if goles_casa > goles_fuera:
+        return ('VICTORIA', 'DERROTA')
+    if goles_casa == goles_fuera:
+        return ('EMPATE', 'EMPATE')
+    return ('DERROTA', 'VICTORIA')
+
+
 def __procesar_ultimos_partidos(ultimos_partidos: dict, equipo_local: str, equipo_visitante: str) -> list:
     """
     Procesa los datos de ultimos_partidos para extraer resultados históricos de partidos de ambos equipos.
@@ -403,177 +1333,63 @@ def __procesar_ultimos_partidos(ultimos_partidos: dict, equipo_local: str, equip
     Process Detail
     --------------
     1. Itera a través de vuelta1 y vuelta2 en el diccionario comparativa (las vueltas no importan).
-    2. Procesa partidos_local: partidos jugados por equipo_local contra rival.
-       - Si resultado_casa válido: partido es "equipo_local | rival"
-       - Si resultado_fuera válido: partido es "rival | equipo_local"
-    3. Procesa partidos_visitante: partidos jugados por equipo_visitante contra rival.
-       - Si resultado_casa válido: partido es "equipo_visitante | rival"
-       - Si resultado_fuera válido: partido es "rival | equipo_visitante"
-    4. Filtra partidos con status=100 y resultados válidos (no vacíos tras strip, no '-').
-    5. Agrupa partidos por jornada, ordenando por equipo (local primero, visitante después).
-    6. Ordena la lista final por jornada (numérico) y orden interno.
+    2. Procesa partidos_local y partidos_visitante según la tabla __COMPARATIVA_TIPOS:
+       - Si resultado_casa válido: partido es "equipo | rival"
+       - Si resultado_fuera válido: partido es "rival | equipo"
+    3. Filtra partidos con status=100 y resultados válidos (no vacíos tras strip, no '-').
+    4. Obtiene el código de resultado del marcador con __codigos_resultado (memoizada).
+    5. Agrupa los partidos por jornada en orden de lectura (local primero, visitante después) y ordena una sola
+       vez las jornadas (numérico).
 
     Notes
     -----
     Esta es una función privada (prefijo __) usada internamente por get_kiniela_matches_details.
-    El campo orden se usa para ordenación interna y se elimina de la salida final.
 
     """
     if not ultimos_partidos:
         return []
-    
-    def __resultado_valido(resultado: str) -> bool:
-        """Comprueba si el resultado es válido (no vacío tras strip, no '-')."""
-        if not resultado:
-            return False
-        resultado_clean = resultado.strip()
-        return bool(resultado_clean and resultado_clean != '-')
-    
-    partidos_por_jornada = {}
-    
-    for vuelta in ['vuelta1', 'vuelta2']:
+
+    equipos = {'partidos_local': equipo_local, 'partidos_visitante': equipo_visitante}
+    partidos_por_jornada: dict[str, list[dict[str, str]]] = {}
+
+    for vuelta in ('vuelta1', 'vuelta2'):
         if vuelta not in ultimos_partidos:
             continue
-        
-        # Partidos del EQUIPO LOCAL (partidos_local)
-        # El equipo_local juega contra rival
-        for p in ultimos_partidos[vuelta].get('partidos_local', []):
-            if p.get('status') != 100:
-                continue
-            
-            resultado_casa = p.get('resultado_casa', '').strip()
-            resultado_fuera = p.get('resultado_fuera', '').strip()
-            rival = p.get('rival', '')
-            jornada = p.get('jornada')
-            
-            # Si hay resultado_casa válido: equipo_local | rival
-            if __resultado_valido(resultado=resultado_casa):
-                if jornada not in partidos_por_jornada:
-                    partidos_por_jornada[jornada] = []
-                orden = len(partidos_por_jornada[jornada])
-                try:
-                    goles_local, goles_rival = map(int, resultado_casa.split('-'))
-                except Exception:
-                    goles_local, goles_rival = None, None
-                if goles_local is not None and goles_rival is not None:
-                    if goles_local > goles_rival:
-                        signo = 'VICTORIA'
-                    elif goles_local == goles_rival:
-                        signo = 'EMPATE'
-                    else:
-                        signo = 'DERROTA'
-                else:
-                    signo = ''
-                partidos_por_jornada[jornada].append({
-                    'jornada': jornada,
-                    'partido': f"{equipo_local} | {rival}",
-                    'resultado': resultado_casa,
-                    'cod_resultado': signo,
-                    'tipo': 'local_como_local',
-                    'orden': orden
-                })
-            # Si hay resultado_fuera válido: rival | equipo_local
-            if __resultado_valido(resultado=resultado_fuera):
-                if jornada not in partidos_por_jornada:
-                    partidos_por_jornada[jornada] = []
-                orden = len(partidos_por_jornada[jornada])
-                try:
-                    goles_rival, goles_local = map(int, resultado_fuera.split('-'))
-                except Exception:
-                    goles_rival, goles_local = None, None
-                if goles_local is not None and goles_rival is not None:
-                    if goles_local > goles_rival:
-                        signo = 'VICTORIA'
-                    elif goles_local == goles_rival:
-                        signo = 'EMPATE'
-                    else:
-                        signo = 'DERROTA'
-                else:
-                    signo = ''
-                partidos_por_jornada[jornada].append({
-                    'jornada': jornada,
-                    'partido': f"{rival} | {equipo_local}",
-                    'resultado': resultado_fuera,
-                    'cod_resultado': signo,
-                    'tipo': 'local_como_visitante',
-                    'orden': orden
-                })
-        
-        # Partidos del EQUIPO VISITANTE (partidos_visitante)
-        # El equipo_visitante juega contra rival
-        for p in ultimos_partidos[vuelta].get('partidos_visitante', []):
-            if p.get('status') != 100:
-                continue
-            
-            resultado_casa = p.get('resultado_casa', '').strip()
-            resultado_fuera = p.get('resultado_fuera', '').strip()
-            rival = p.get('rival', '')
-            jornada = p.get('jornada')
-            
-            # Si hay resultado_casa válido: equipo_visitante | rival
-            if __resultado_valido(resultado=resultado_casa):
-                if jornada not in partidos_por_jornada:
-                    partidos_por_jornada[jornada] = []
-                orden = len(partidos_por_jornada[jornada])
-                try:
-                    goles_visitante, goles_rival = map(int, resultado_casa.split('-'))
-                except Exception:
-                    goles_visitante, goles_rival = None, None
-                if goles_visitante is not None and goles_rival is not None:
-                    if goles_visitante > goles_rival:
-                        signo = 'VICTORIA'
-                    elif goles_visitante == goles_rival:
-                        signo = 'EMPATE'
-                    else:
-                        signo = 'DERROTA'
-                else:
-                    signo = ''
-                partidos_por_jornada[jornada].append({
-                    'jornada': jornada,
-                    'partido': f"{equipo_visitante} | {rival}",
-                    'resultado': resultado_casa,
-                    'cod_resultado': signo,
-                    'tipo': 'visitante_como_local',
-                    'orden': orden
-                })
-            # Si hay resultado_fuera válido: rival | equipo_visitante
-            if __resultado_valido(resultado=resultado_fuera):
-                if jornada not in partidos_por_jornada:
-                    partidos_por_jornada[jornada] = []
-                orden = len(partidos_por_jornada[jornada])
-                try:
-                    goles_rival, goles_visitante = map(int, resultado_fuera.split('-'))
-                except Exception:
-                    goles_rival, goles_visitante = None, None
-                if goles_visitante is not None and goles_rival is not None:
-                    if goles_visitante > goles_rival:
-                        signo = 'VICTORIA'
-                    elif goles_visitante == goles_rival:
-                        signo = 'EMPATE'
-                    else:
-                        signo = 'DERROTA'
-                else:
-                    signo = ''
-                partidos_por_jornada[jornada].append({
-                    'jornada': jornada,
-                    'partido': f"{rival} | {equipo_visitante}",
-                    'resultado': resultado_fuera,
-                    'cod_resultado': signo,
-                    'tipo': 'visitante_como_visitante',
-                    'orden': orden
-                })
-    
-    # Ordenar por jornada y luego por orden
+
+        for lista, tipo_casa, tipo_fuera in __COMPARATIVA_TIPOS:
+            equipo = equipos[lista]
+            for p in ultimos_partidos[vuelta].get(lista, []):
+                if p.get('status') != 100:
+                    continue
+
+                resultado_casa = p.get('resultado_casa', '').strip()
+                resultado_fuera = p.get('resultado_fuera', '').strip()
+                rival = p.get('rival', '')
+                jornada = p.get('jornada')
+
+                # Si hay resultado_casa válido: equipo | rival
+                if resultado_casa and resultado_casa != '-':
+                    codigos = __codigos_resultado(resultado=resultado_casa)
+                    partidos_por_jornada.setdefault(jornada, []).append({
+                        'jornada': jornada,
+                        'partido': f"{equipo} | {rival}",
+                        'resultado': resultado_casa,
+                        'cod_resultado': codigos[0],
+                        'tipo': tipo_casa,
+                    })
+                # Si hay resultado_fuera válido: rival | equipo
+                if resultado_fuera and resultado_fuera != '-':
+                    codigos = __codigos_resultado(resultado=resultado_fuera)
+                    partidos_por_jornada.setdefault(jornada, []).append({
+                        'jornada': jornada,
+                        'partido': f"{rival} | {equipo}",
+                        'resultado': resultado_fuera,
+                        'cod_resultado': codigos[1],
+                        'tipo': tipo_fuera,
+                    })
+
+    # Un único sort (estable) de las jornadas; dentro de cada jornada se conserva el orden de lectura
     todos_partidos = []
-    for jornada in sorted(partidos_por_jornada.keys(), key=lambda x: int(x) if x.isdigit() else 0):
-        partidos_jornada = sorted(partidos_por_jornada[jornada], key=lambda x: x['orden'])
-        todos_partidos.extend(
-            [{'jornada': p['jornada'], 
-              'partido': p['partido'], 
-              'resultado': p['resultado'], 
-              'cod_resultado': p['cod_resultado'],
-              'tipo': p['tipo']}
-             for p in partidos_jornada]
-        )
-    
+    for jornada in sorted(partidos_por_jornada, key=lambda x: int(x) if x.isdigit() else 0):
+        todos_partidos.extend(partidos_por_jornada[jornada])
     return todos_partidos
@@ -24,9 +24,14 @@ Este módulo identifica partidos donde existe una inconsistencia significativa e
 las probabilidades LAE y el análisis contextual (histórico, rachas, clasificación).
 """
 
+from collections.abc import Iterable, Sequence
 from typing import Any
 
-from kinielagpt import data_source
+import numpy as np
+
+from kinielagpt.records import JornadaFrame, MatchRecord
+
+INCONSISTENCY_TYPES = ("streak_inconsistency", "historical_inconsistency", "classification_inconsistency")
 
 
 class SurpriseDetector:
@@ -37,7 +42,8 @@ class SurpriseDetector:
     podrían indicar resultados inesperados.
     """
 
-    def detect(self, jornada: int, temporada: int, threshold: float = 30.0) -> dict[str, Any] | None:
+    def detect(self, jornada: int, temporada: int, threshold: float = 30.0,
+               frame: JornadaFrame | None = None, match_ids: Iterable[int] | None = None) -> dict[str, Any] | None:
         """
         Detecta posibles sorpresas en una jornada.
         
@@ -97,6 +103,10 @@ class SurpriseDetector:
         threshold : float, optional
             Umbral de divergencia para considerar sorpresa (0-100, default: 30).
             Valores más bajos detectan más alertas, valores más altos solo alertas críticas.
+        frame : JornadaFrame | None, optional
+            Registros de la jornada ya construidos. Si es None, se obtienen de data_source.
+        match_ids : Iterable[int] | None, optional
+            Si se indica, sólo se analizan estos partidos (p. ej. los que han cambiado desde la última detección).
 
         Returns
         -------
@@ -107,7 +117,8 @@ class SurpriseDetector:
             - threshold: Umbral utilizado
             - total_surprises: Cantidad de partidos con alertas
             - surprises: Lista de sorpresas detectadas, cada una con match_id, match, alert_level,
-              inconsistency_type, description, probabilities, context_factors
+              inconsistency_type, description, probabilities, context_factors y, si los registros incluyen
+              probabilidades por fuente, source_disagreement (máxima diferencia en puntos entre LAE y Quinielista)
             Retorna None si hay algún error.
 
         Examples
@@ -121,32 +132,34 @@ class SurpriseDetector:
         VILLARREAL - GETAFE: ALERTA ROJA
         """
         # Obtener datos necesarios
-        probabilities = data_source.get_kiniela_probabilities(jornada=jornada, temporada=temporada)
-        details = data_source.get_kiniela_matches_details(jornada=jornada, temporada=temporada)
+        if frame is None:
+            frame = JornadaFrame.load(jornada=jornada, temporada=temporada)
 
-        if probabilities is None or details is None:
+        if frame is None:
             return None
 
         surprises = []
+        selected = set(match_ids) if match_ids is not None else None
+
+        for record in frame:
+            if selected is not None and record.match_id not in selected:
+                continue
 
-        for i, (prob, detail) in enumerate(iterable=zip(probabilities, details), start=1):
             # Analizar inconsistencias
-            inconsistencies = self.__analyze_inconsistencies(prob=prob, detail=detail, threshold=threshold)
+            inconsistencies = self.__analyze_inconsistencies(record=record, threshold=threshold)
 
             if inconsistencies:
                 surprise_data = {
-                    "match_id": i,
-                    "match": prob["partido"],
+                    "match_id": record.match_id,
+                    "match": record.partido,
                     "alert_level": inconsistencies["alert_level"],
                     "inconsistency_type": inconsistencies["type"],
                     "description": inconsistencies["description"],
-                    "probabilities": {
-                        "1": prob.get("1_Prob", 0),
-                        "X": prob.get("X_Prob", 0),
-                        "2": prob.get("2_Prob", 0),
-                    },
+                    "probabilities": record.probs,
                     "context_factors": inconsistencies["factors"],
                 }
+                if record.source_disagreement is not None:
+                    surprise_data["source_disagreement"] = record.source_disagreement
                 surprises.append(surprise_data)
 
         return {
@@ -157,8 +170,457 @@ class SurpriseDetector:
             "surprises": surprises,
         }
 
-    def __analyze_inconsistencies(self, prob: dict[str, Any], detail: dict[str, Any], 
-                                   threshold: float) -> dict[str, Any] | None:
+    def detect_vectorized(self, jornada: int, temporada: int, threshold: float = 30.0,
+                          frame: JornadaFrame | None = None) -> dict[str, Any] | None:
+        """
+        Detecta posibles sorpresas en una jornada calculando todas las divergencias de una vez.
+
+        Produce exactamente el mismo resultado que detect(), pero los tres scores de divergencia
+        (rachas, histórico y clasificación) de todos los partidos se calculan como arrays en una
+        única pasada mediante compute_divergence_scores(). Solo para los partidos que superan el
+        umbral se construyen después la descripción y los factores contextuales, reutilizando la
+        verificación escalar del tipo de inconsistencia seleccionado.
+
+        Parameters
+        ----------
+        jornada : int
+            Número de jornada a analizar.
+        temporada : int
+            Año de la temporada.
+        threshold : float, optional
+            Umbral de divergencia para considerar sorpresa (0-100, default: 30).
+        frame : JornadaFrame | None, optional
+            Registros de la jornada ya construidos. Si es None, se obtienen de data_source.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Mismo diccionario que detect(): jornada, temporada, threshold, total_surprises y surprises.
+            Retorna None si hay algún error.
+
+        Examples
+        --------
+        >>> detector = SurpriseDetector()
+        >>> surprises = detector.detect_vectorized(jornada=26, temporada=2025, threshold=25.0)
+        >>> surprises == detector.detect(jornada=26, temporada=2025, threshold=25.0)
+        True
+        """
+        if frame is None:
+            frame = JornadaFrame.load(jornada=jornada, temporada=temporada)
+
+        if frame is None:
+            return None
+
+        scores = self.compute_divergence_scores(frames=frame)
+        flagged = np.flatnonzero((scores["best_type"] >= 0) & (scores["best_score"] >= threshold))
+
+        surprises = []
+
+        for index in flagged:
+            record = frame.matches[index]
+            inconsistency = self.__build_inconsistency(record=record, type_index=int(scores["best_type"][index]))
+            divergence = inconsistency["divergence_score"]
+
+            if divergence >= 50:
+                alert_level = "🚨 ALERTA ROJA"
+            elif divergence >= 35:
+                alert_level = "⚠️ ALERTA MEDIA"
+            else:
+                alert_level = "⚠️ ALERTA"
+
+            surprise_data = {
+                "match_id": record.match_id,
+                "match": record.partido,
+                "alert_level": alert_level,
+                "inconsistency_type": inconsistency["type"],
+                "description": inconsistency["description"],
+                "probabilities": record.probs,
+                "context_factors": inconsistency["factors"],
+            }
+            if record.source_disagreement is not None:
+                surprise_data["source_disagreement"] = record.source_disagreement
+            surprises.append(surprise_data)
+
+        return {
+            "jornada": jornada,
+            "temporada": temporada,
+            "threshold": threshold,
+            "total_surprises": len(surprises),
+            "surprises": surprises,
+        }
+
+    def compute_divergence_scores(self, frames: JornadaFrame | Sequence[JornadaFrame]) -> dict[str, np.ndarray]:
+        """
+        Calcula los scores de divergencia de todos los partidos de una o varias jornadas.
+
+        Extrae una sola vez de cada registro las magnitudes que usan las verificaciones (rachas de
+        los últimos 5 partidos, empates en los últimos 3, histórico de enfrentamientos y posiciones
+        en la clasificación) y evalúa las tres reglas de inconsistencia con operaciones de numpy
+        sobre todos los partidos a la vez. Las reglas y sus umbrales son idénticos a los de
+        __check_streak_inconsistency(), __check_historical_inconsistency() y
+        __check_classification_inconsistency(), por lo que una temporada completa se puede puntuar
+        de una vez para análisis o ajuste del umbral.
+
+        Un score de 0 indica que la verificación correspondiente no detecta inconsistencia (todas
+        las divergencias detectadas son estrictamente positivas). Los partidos sin probabilidad
+        dominante (max_prob < 50) tienen los tres scores a 0.
+
+        Parameters
+        ----------
+        frames : JornadaFrame | Sequence[JornadaFrame]
+            Jornada o lista de jornadas a puntuar.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            Arrays alineados (un elemento por partido, en el orden de las jornadas):
+            - jornada, temporada, match_id: Identificación del partido
+            - streak, historical, classification: Score de cada tipo de inconsistencia
+            - best_score: Score de la inconsistencia más significativa (0 si no hay ninguna)
+            - best_type: Índice en INCONSISTENCY_TYPES de esa inconsistencia (-1 si no hay ninguna)
+            - max_sign, max_prob: Signo favorito (0=1, 1=X, 2=2) y su probabilidad
+            - source_disagreement: Discrepancia entre LAE y Quinielista (NaN si el registro no tiene
+              probabilidades por fuente)
+
+        Examples
+        --------
+        >>> detector = SurpriseDetector()
+        >>> scores = detector.compute_divergence_scores(frames=[frame_25, frame_26])
+        >>> int((scores["best_score"] >= 30).sum())
+        4
+        """
+        if isinstance(frames, JornadaFrame):
+            frames = [frames]
+
+        records = [record for frame in frames for record in frame]
+        features = self.__extract_features(records=records)
+
+        scores = self.__score_features(features=features)
+        scores["jornada"] = np.fromiter((f.jornada for f in frames for _ in f), dtype=np.int64, count=len(records))
+        scores["temporada"] = np.fromiter((f.temporada for f in frames for _ in f), dtype=np.int64,
+                                          count=len(records))
+        scores["match_id"] = features["match_id"]
+        scores["max_sign"] = features["max_sign"]
+        scores["max_prob"] = features["probs"][np.arange(len(records)), features["max_sign"]]
+        scores["source_disagreement"] = np.fromiter(
+            (np.nan if r.source_disagreement is None else r.source_disagreement for r in records),
+            dtype=np.float64, count=len(records),
+        )
+
+        return scores
+
+    def sweep_thresholds(self, frames: JornadaFrame | Sequence[JornadaFrame],
+                         results: dict[tuple[int, int], list[str | None]],
+                         thresholds: Sequence[float] | None = None) -> dict[str, Any]:
+        """
+        Evalúa un rango de umbrales de detección frente a los resultados reales de las jornadas.
+
+        Los scores de divergencia se calculan una única vez por partido con compute_divergence_scores()
+        y después se comparan con todos los umbrales a la vez, sin repetir las verificaciones. Para
+        cada umbral y cada tipo de inconsistencia (más el total "all") se cuentan las alertas que se
+        emitirían con detect() y cuántas acertaron, es decir, en cuántas el resultado real no fue el
+        signo favorito de LAE.
+
+        - precision: aciertos / alertas del tipo (None si no hay alertas)
+        - recall: aciertos / sorpresas reales, entendidas como partidos cuyo resultado no coincide
+          con el signo favorito (None si no hubo sorpresas)
+
+        Solo se evalúan los partidos con resultado 1X2 conocido y probabilidades 1X2 (se excluyen
+        los plenos al 15 y los partidos sin resultado).
+
+        Parameters
+        ----------
+        frames : JornadaFrame | Sequence[JornadaFrame]
+            Jornada o jornadas a evaluar (pueden ser de varias temporadas).
+        results : dict[tuple[int, int], list[str | None]]
+            Resultados reales por (jornada, temporada): lista de signos ("1", "X", "2") en el orden de
+            los partidos. Los valores None u otros textos se consideran resultado desconocido.
+        thresholds : Sequence[float] | None, optional
+            Umbrales a evaluar. Si es None, de 0 a 100 en pasos de 5.
+
+        Returns
+        -------
+        dict[str, Any]
+            Diccionario con:
+            - total_matches: Partidos evaluados
+            - total_surprises: Partidos cuyo resultado no fue el signo favorito
+            - thresholds: Lista con, para cada umbral, un diccionario por tipo de inconsistencia
+              (y "all") con alerts, hits, precision y recall
+
+        Examples
+        --------
+        >>> detector = SurpriseDetector()
+        >>> sweep = detector.sweep_thresholds(frames=[frame_25, frame_26], results=results)
+        >>> sweep["thresholds"][6]["all"]
+        {'alerts': 4, 'hits': 2, 'precision': 0.5, 'recall': 0.1111}
+        """
+        if isinstance(frames, JornadaFrame):
+            frames = [frames]
+        if thresholds is None:
+            thresholds = range(0, 101, 5)
+
+        scores = self.compute_divergence_scores(frames=frames)
+
+        # Signo real de cada partido (-1 si no se conoce)
+        sign_index = {"1": 0, "X": 1, "2": 2}
+        actual = np.full(len(scores["match_id"]), -1, dtype=np.int64)
+        position = 0
+        for frame in frames:
+            signs = results.get((frame.jornada, frame.temporada), [])
+            for offset, record in enumerate(frame):
+                if record.match_id <= len(signs):
+                    actual[position + offset] = sign_index.get(signs[record.match_id - 1], -1)  # type: ignore[arg-type]
+            position += len(frame)
+
+        evaluable = (actual >= 0) & (scores["max_prob"] > 0)
+        surprise = evaluable & (actual != scores["max_sign"])
+        total_surprises = int(surprise.sum())
+
+        # Matriz umbrales x partidos con las alertas que emitiría detect()
+        threshold_values = np.asarray(thresholds, dtype=np.float64)
+        alerted = (scores["best_score"][None, :] >= threshold_values[:, None]) & (scores["best_type"] >= 0) & evaluable
+        hits = alerted & surprise
+
+        def summarize(alert_mask: np.ndarray, hit_mask: np.ndarray) -> list[dict[str, Any]]:
+            alerts = alert_mask.sum(axis=1)
+            correct = hit_mask.sum(axis=1)
+            return [
+                {
+                    "alerts": int(a),
+                    "hits": int(h),
+                    "precision": round(h / a, 4) if a else None,
+                    "recall": round(h / total_surprises, 4) if total_surprises else None,
+                }
+                for a, h in zip(alerts, correct)
+            ]
+
+        by_type = {"all": summarize(alert_mask=alerted, hit_mask=hits)}
+        for index, name in enumerate(INCONSISTENCY_TYPES):
+            of_type = scores["best_type"] == index
+            by_type[name] = summarize(alert_mask=alerted & of_type, hit_mask=hits & of_type)
+
+        return {
+            "total_matches": int(evaluable.sum()),
+            "total_surprises": total_surprises,
+            "thresholds": [
+                {"threshold": float(threshold), **{name: rows[i] for name, rows in by_type.items()}}
+                for i, threshold in enumerate(threshold_values)
+            ],
+        }
+
+    def __extract_features(self, records: list[MatchRecord]) -> dict[str, np.ndarray]:
+        """
+        Extrae de los registros los valores numéricos que necesitan las reglas de inconsistencia.
+
+        Replica exactamente las lecturas de las verificaciones escalares: rachas con los 5 primeros
+        resultados, empates con los 3 primeros, y posiciones obtenidas de los textos "Nº XXpt".
+        Las posiciones no interpretables se marcan como no válidas (la verificación escalar
+        descarta el partido en ese caso).
+
+        Parameters
+        ----------
+        records : list[MatchRecord]
+            Registros de los partidos a puntuar.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            Arrays de probabilidades, signo dominante (0=1, 1=X, 2=2), rachas, empates, histórico
+            y posiciones, con un elemento por partido.
+        """
+        sign_index = {"1": 0, "X": 1, "2": 2}
+        rows = []
+
+        for record in records:
+            # Columnas: match_id, probs 1X2, signo, veces 1X2, rachas, empates, posiciones, flags
+            row = [record.match_id, record.prob_1, record.prob_x, record.prob_2, sign_index[record.max_sign],
+                   record.veces1, record.veces_x, record.veces2, 0, 0, 0, 0, 0, 0, False, False]
+
+            # Los partidos sin signo dominante no se puntúan: basta con sus probabilidades
+            if record.max_prob >= 50:
+                evolucion_local = record.evolucion_local
+                evolucion_visitor = record.evolucion_visitante
+                if evolucion_local and evolucion_visitor:
+                    row[8] = self.__calculate_streak_value(results=evolucion_local[:5])
+                    row[9] = self.__calculate_streak_value(results=evolucion_visitor[:5])
+                    row[10] = evolucion_local[:3].count("E")
+                    row[11] = evolucion_visitor[:3].count("E")
+                    row[14] = True
+
+                try:
+                    row[12] = int(record.clasificacion_local.split("º")[0])  # type: ignore[union-attr]
+                    row[13] = int(record.clasificacion_visitante.split("º")[0])  # type: ignore[union-attr]
+                    row[15] = True
+                except (ValueError, IndexError, AttributeError):
+                    pass
+
+            rows.append(row)
+
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), 16)
+
+        return {
+            "match_id": table[:, 0].astype(np.int64),
+            "probs": table[:, 1:4],
+            "max_sign": table[:, 4].astype(np.int64),
+            "veces": table[:, 5:8],
+            "streaks": table[:, 8:10],
+            "draws": table[:, 10:12],
+            "positions": table[:, 12:14],
+            "has_evolution": table[:, 14].astype(bool),
+            "has_positions": table[:, 15].astype(bool),
+        }
+
+    def __score_features(self, features: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """
+        Evalúa las tres reglas de inconsistencia sobre todos los partidos con operaciones vectoriales.
+
+        Parameters
+        ----------
+        features : dict[str, np.ndarray]
+            Arrays devueltos por __extract_features().
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            Scores streak, historical, classification, best_score y best_type por partido.
+        """
+        probs = features["probs"]
+        sign = features["max_sign"]
+        rows = np.arange(len(sign))
+        max_prob = probs[rows, sign]
+        dominant = max_prob >= 50
+
+        # Rachas: los tres escenarios son excluyentes (misma cadena if/elif que la versión escalar)
+        local_streak, visitor_streak = features["streaks"][:, 0], features["streaks"][:, 1]
+        draws_local, draws_visitor = features["draws"][:, 0], features["draws"][:, 1]
+        case_local = (sign == 0) & (max_prob >= 60)
+        case_visitor = (sign == 2) & (max_prob >= 60)
+        case_draw = ~case_local & ~case_visitor & (sign != 1) & (probs[:, 1] < 30)
+
+        streak = np.zeros(len(sign), dtype=np.float64)
+        mask = case_local & (local_streak < -6) & (visitor_streak > 6)
+        streak[mask] = np.minimum((max_prob - 50) + np.abs(local_streak) + visitor_streak, 100)[mask]
+        mask = case_visitor & (visitor_streak < -6) & (local_streak > 6)
+        streak[mask] = np.minimum((max_prob - 50) + np.abs(visitor_streak) + local_streak, 100)[mask]
+        mask = case_draw & (draws_local >= 2) & (draws_visitor >= 2)
+        streak[mask] = (25 + (draws_local + draws_visitor) * 3)[mask]
+        streak[~features["has_evolution"]] = 0
+
+        # Histórico: diferencia entre la probabilidad del favorito y su tasa histórica
+        veces = features["veces"]
+        total_historic = veces.sum(axis=1)
+        enough_history = total_historic >= 5
+        with np.errstate(divide="ignore", invalid="ignore"):
+            historical_rate = (veces[rows, sign] / total_historic) * 100
+        prob_diff = max_prob - historical_rate
+        historical = np.where(enough_history & (prob_diff > 30), prob_diff, 0.0)
+
+        # Clasificación: favorito claro mucho peor clasificado que su rival
+        pos_local, pos_visitor = features["positions"][:, 0], features["positions"][:, 1]
+        classification = np.zeros(len(sign), dtype=np.float64)
+        mask = (sign == 0) & (max_prob >= 65) & (pos_visitor < pos_local - 8)
+        classification[mask] = ((pos_local - pos_visitor) * 2.5)[mask]
+        mask = (sign == 2) & (max_prob >= 65) & (pos_local < pos_visitor - 8)
+        classification[mask] = ((pos_visitor - pos_local) * 2.5)[mask]
+        classification[~features["has_positions"] | (classification < 20)] = 0
+
+        stacked = np.stack([streak, historical, classification], axis=1)
+        stacked[~dominant] = 0
+
+        # argmax devuelve el primer máximo, igual que max() sobre la lista de verificaciones
+        best_type = np.argmax(stacked, axis=1)
+        best_score = stacked[rows, best_type]
+        best_type = np.where(best_score > 0, best_type, -1)
+
+        return {
+            "streak": stacked[:, 0],
+            "historical": stacked[:, 1],
+            "classification": stacked[:, 2],
+            "best_score": best_score,
+            "best_type": best_type,
+        }
+
+    def __build_inconsistency(self, record: MatchRecord, type_index: int) -> dict[str, Any]:
+        """
+        Construye la descripción y los factores de la inconsistencia seleccionada para un partido.
+
+        Parameters
+        ----------
+        record : MatchRecord
+            Registro del partido.
+        type_index : int
+            Índice en INCONSISTENCY_TYPES de la inconsistencia más significativa.
+
+        Returns
+        -------
+        dict[str, Any]
+            Resultado de la verificación escalar correspondiente (type, description, factors,
+            divergence_score).
+        """
+        if type_index == 0:
+            return self.__record_streak_inconsistency(record=record)  # type: ignore[return-value]
+        if type_index == 1:
+            return self.__record_historical_inconsistency(record=record)  # type: ignore[return-value]
+        return self.__record_classification_inconsistency(record=record)  # type: ignore[return-value]
+
+    def __record_streak_inconsistency(self, record: MatchRecord) -> dict[str, Any] | None:
+        """
+        Verificación de rachas (__streak_inconsistency) con los slots del registro.
+
+        Parameters
+        ----------
+        record : MatchRecord
+            Registro del partido.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Información de inconsistencia si se detecta, None en caso contrario.
+        """
+        return self.__streak_inconsistency(
+            max_sign=record.max_sign, max_prob=record.max_prob, probs=record.probs,
+            evolucion_local=record.evolucion_local, evolucion_visitor=record.evolucion_visitante,
+        )
+
+    def __record_historical_inconsistency(self, record: MatchRecord) -> dict[str, Any] | None:
+        """
+        Verificación del histórico (__historical_inconsistency) con los slots del registro.
+
+        Parameters
+        ----------
+        record : MatchRecord
+            Registro del partido.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Información de inconsistencia si se detecta, None en caso contrario.
+        """
+        return self.__historical_inconsistency(
+            max_sign=record.max_sign, probs=record.probs,
+            veces1=record.veces1, vecesX=record.veces_x, veces2=record.veces2,
+        )
+
+    def __record_classification_inconsistency(self, record: MatchRecord) -> dict[str, Any] | None:
+        """
+        Verificación de clasificación (__classification_inconsistency) con los slots del registro.
+
+        Parameters
+        ----------
+        record : MatchRecord
+            Registro del partido.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Información de inconsistencia si se detecta, None en caso contrario.
+        """
+        return self.__classification_inconsistency(
+            max_sign=record.max_sign, max_prob=record.max_prob,
+            clasificacion_local=record.clasificacion_local, clasificacion_visitor=record.clasificacion_visitante,
+        )
+
+    def __analyze_inconsistencies(self, record: MatchRecord, threshold: float) -> dict[str, Any] | None:
         """
         Analiza inconsistencias entre probabilidades y contexto.
         
@@ -168,8 +630,8 @@ class SurpriseDetector:
         determina si un partido merece una alerta.
         
         El proceso de análisis incluye:
-        1. **Extracción de probabilidades**: Obtiene las probabilidades LAE del partido y
-           identifica el signo dominante (con mayor probabilidad).
+        1. **Extracción de probabilidades**: Toma del registro del partido las probabilidades LAE
+           y el signo dominante (con mayor probabilidad), calculados una sola vez por jornada.
         
         2. **Filtro de relevancia**: Solo analiza partidos con probabilidad dominante >50%,
            ya que probabilidades equilibradas (ej: 35-33-32) no generan expectativas claras
@@ -216,10 +678,8 @@ class SurpriseDetector:
 
         Parameters
         ----------
-        prob : dict[str, Any]
-            Probabilidades LAE del partido.
-        detail : dict[str, Any]
-            Detalles del partido.
+        record : MatchRecord
+            Registro del partido con probabilidades LAE y detalles.
         threshold : float
             Umbral de divergencia.
 
@@ -229,25 +689,15 @@ class SurpriseDetector:
             Información de inconsistencia si se detecta, None en caso contrario.
             Diccionario incluye: alert_level, type, description, factors, divergence_score.
         """
-        probs = {
-            "1": prob.get("1_Prob", 0),
-            "X": prob.get("X_Prob", 0),
-            "2": prob.get("2_Prob", 0),
-        }
-
-        # Identificar signo con mayor probabilidad
-        max_sign = max(probs, key=lambda k: probs[k])
-        max_prob = probs[max_sign]
-
-        # Solo analizar si hay una probabilidad dominante (>50%)
-        if max_prob < 50:
+        # Solo analizar si hay una probabilidad dominante (>50%, precalculada en el registro)
+        if record.max_prob < 50:
             return None
 
         # Verificar diferentes tipos de inconsistencias
         inconsistency_checks = [
-            self.__check_streak_inconsistency(max_sign=max_sign, max_prob=max_prob, probs=probs, detail=detail),
-            self.__check_historical_inconsistency(max_sign=max_sign, probs=probs, detail=detail),
-            self.__check_classification_inconsistency(max_sign=max_sign, max_prob=max_prob, detail=detail),
+            self.__record_streak_inconsistency(record=record),
+            self.__record_historical_inconsistency(record=record),
+            self.__record_classification_inconsistency(record=record),
         ]
 
         # Filtrar inconsistencias válidas y calcular score total
@@ -351,9 +801,35 @@ class SurpriseDetector:
         dict[str, Any] | None
             Información de inconsistencia si se detecta, None en caso contrario.
         """
-        evolucion_local = detail.get("evolucionLocal", [])
-        evolucion_visitor = detail.get("evolucionVisitante", [])
+        return self.__streak_inconsistency(
+            max_sign=max_sign, max_prob=max_prob, probs=probs,
+            evolucion_local=detail.get("evolucionLocal", []), evolucion_visitor=detail.get("evolucionVisitante", []),
+        )
 
+    def __streak_inconsistency(self, max_sign: str, max_prob: float, probs: dict[str, float],
+                               evolucion_local: Sequence[str],
+                               evolucion_visitor: Sequence[str]) -> dict[str, Any] | None:
+        """
+        Verificación de __check_streak_inconsistency sobre los últimos resultados ya extraídos del partido.
+
+        Parameters
+        ----------
+        max_sign : str
+            Signo con mayor probabilidad LAE.
+        max_prob : float
+            Probabilidad del signo dominante.
+        probs : dict[str, float]
+            Probabilidades LAE del partido.
+        evolucion_local : Sequence[str]
+            Últimos resultados del local ('V', 'E', 'D'), del más reciente al más antiguo.
+        evolucion_visitor : Sequence[str]
+            Últimos resultados del visitante.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Información de inconsistencia si se detecta, None en caso contrario.
+        """
         if not evolucion_local or not evolucion_visitor:
             return None
 
@@ -487,9 +963,34 @@ class SurpriseDetector:
         dict[str, Any] | None
             Información de inconsistencia si se detecta, None en caso contrario.
         """
-        veces1 = detail.get("veces1", 0)
-        vecesX = detail.get("vecesX", 0)
-        veces2 = detail.get("veces2", 0)
+        return self.__historical_inconsistency(
+            max_sign=max_sign, probs=probs,
+            veces1=detail.get("veces1", 0), vecesX=detail.get("vecesX", 0), veces2=detail.get("veces2", 0),
+        )
+
+    def __historical_inconsistency(self, max_sign: str, probs: dict[str, float], veces1: int, vecesX: int,
+                                   veces2: int) -> dict[str, Any] | None:
+        """
+        Verificación de __check_historical_inconsistency sobre el histórico ya extraído del partido.
+
+        Parameters
+        ----------
+        max_sign : str
+            Signo con mayor probabilidad LAE.
+        probs : dict[str, float]
+            Probabilidades LAE del partido.
+        veces1 : int
+            Victorias locales en el histórico de enfrentamientos.
+        vecesX : int
+            Empates en el histórico de enfrentamientos.
+        veces2 : int
+            Victorias visitantes en el histórico de enfrentamientos.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Información de inconsistencia si se detecta, None en caso contrario.
+        """
         total_historic = veces1 + vecesX + veces2
 
         if total_historic < 5:  # Requiere al menos 5 enfrentamientos
@@ -615,10 +1116,34 @@ class SurpriseDetector:
         dict[str, Any] | None
             Información de inconsistencia si se detecta, None en caso contrario.
         """
-        try:
-            clasificacion_local = detail.get("clasificacionLocal", "")
-            clasificacion_visitor = detail.get("clasificacionVisitante", "")
+        return self.__classification_inconsistency(
+            max_sign=max_sign, max_prob=max_prob,
+            clasificacion_local=detail.get("clasificacionLocal", ""),
+            clasificacion_visitor=detail.get("clasificacionVisitante", ""),
+        )
+
+    def __classification_inconsistency(self, max_sign: str, max_prob: float, clasificacion_local: Any,
+                                       clasificacion_visitor: Any) -> dict[str, Any] | None:
+        """
+        Verificación de __check_classification_inconsistency sobre las clasificaciones ya extraídas del partido.
 
+        Parameters
+        ----------
+        max_sign : str
+            Signo con mayor probabilidad LAE.
+        max_prob : float
+            Probabilidad del signo dominante.
+        clasificacion_local : Any
+            Clasificación del local ("3º 45pt"). Cualquier otro valor (None incluido) descarta la verificación.
+        clasificacion_visitor : Any
+            Clasificación del visitante, con el mismo formato.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Información de inconsistencia si se detecta, None en caso contrario.
+        """
+        try:
             pos_local = int(clasificacion_local.split("º")[0])
             pos_visitor = int(clasificacion_visitor.split("º")[0])
 
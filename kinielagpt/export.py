@@ -0,0 +1,291 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Exportación del histórico de jornadas a un dataset columnar particionado.
+
+Convierte las jornadas guardadas en la caché en disco de data_source (data_source.get_jornada) en tres tablas
+columnares, particionadas por temporada y jornada con rutas estilo Hive:
+
+    <output_dir>/<tabla>/temporada=<temporada>/jornada=<jornada>/part.<arrow|parquet|csv>
+
+- probabilities: Una fila por partido con lo que devuelve get_kiniela_probabilities.
+- details: Una fila por partido con lo que devuelve get_kiniela_matches_details, salvo ultimos_partidos.
+- ultimos_partidos: Una fila por resultado reciente de cada partido (formato largo).
+
+Con pyarrow instalado el formato por defecto es Arrow IPC sin comprimir, que load_table lee sin volver a parsear
+JSON ni texto. Sin pyarrow se exporta en CSV.
+
+Ejecutar: kinielagpt-export <output_dir> [--temporada 2026] [--format arrow|parquet|csv] [--overwrite]
+"""
+
+import argparse
+import os
+from typing import Any
+
+import pandas as pd
+
+from kinielagpt import data_source
+from kinielagpt.season import COLUMNAR_FORMATS, flatten_analysis, has_parquet_support, write_columnar
+
+# Tablas del dataset exportado
+EXPORT_TABLES = ("probabilities", "details", "ultimos_partidos")
+
+# Columnas de la tabla ultimos_partidos
+ULTIMOS_PARTIDOS_COLUMNS = ("id", "jornada_resultado", "partido", "resultado", "cod_resultado", "tipo")
+
+# Formatos por orden de preferencia cuando una partición se ha exportado en varios formatos
+LOAD_FORMAT_PREFERENCE = ("arrow", "parquet", "csv")
+
+# Claves de los detalles que no se exportan en la tabla details (ultimos_partidos tiene su propia tabla)
+__DETAIL_EXCLUDED = ("ultimos_partidos",)
+
+
+def jornada_tables(probabilities: list[dict[str, Any]], details: list[dict[str, Any]]) -> dict[str, pd.DataFrame]:
+    """
+    Convierte las probabilidades y los detalles de una jornada en las tablas del dataset.
+
+    Los campos anidados se aplanan con season.flatten_analysis (las listas se guardan como JSON).
+
+    Parameters
+    ----------
+    probabilities : list[dict[str, Any]]
+        Probabilidades de la jornada (get_kiniela_probabilities).
+    details : list[dict[str, Any]]
+        Detalles de la jornada (get_kiniela_matches_details).
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        Un DataFrame por tabla de EXPORT_TABLES.
+    """
+    ultimos_partidos = [
+        (detail.get("id"), p.get("jornada"), p.get("partido"), p.get("resultado"), p.get("cod_resultado"),
+         p.get("tipo"))
+        for detail in details
+        for p in detail.get("ultimos_partidos", [])
+    ]
+    return {
+        "probabilities": pd.DataFrame([flatten_analysis(analysis=prob) for prob in probabilities]),
+        "details": pd.DataFrame([
+            flatten_analysis(analysis={k: v for k, v in detail.items() if k not in __DETAIL_EXCLUDED})
+            for detail in details
+        ]),
+        "ultimos_partidos": pd.DataFrame(ultimos_partidos, columns=list(ULTIMOS_PARTIDOS_COLUMNS)),
+    }
+
+
+def export_dataset(output_dir: str, temporada: int | None = None, file_format: str | None = None,
+                   overwrite: bool = False) -> dict[str, int]:
+    """
+    Exporta las jornadas de la caché en disco al dataset columnar particionado.
+
+    Las particiones ya exportadas se omiten salvo que overwrite sea True, de modo que exportar de nuevo tras
+    descargar jornadas nuevas sólo escribe éstas.
+
+    Parameters
+    ----------
+    output_dir : str
+        Directorio raíz del dataset.
+    temporada : int | None, optional
+        Si se indica, sólo se exporta esa temporada.
+    file_format : str | None, optional
+        'arrow', 'parquet' o 'csv'. Si es None, 'arrow' cuando pyarrow está disponible y 'csv' en otro caso.
+    overwrite : bool, optional
+        Si es True, se reescriben las particiones ya exportadas. Por defecto False.
+
+    Returns
+    -------
+    dict[str, int]
+        Número de jornadas exportadas ("exportadas") y omitidas por estar ya exportadas ("omitidas").
+
+    Raises
+    ------
+    ValueError
+        Si el formato no es uno de COLUMNAR_FORMATS.
+    ImportError
+        Si se pide Arrow o Parquet y pyarrow no está instalado.
+
+    Examples
+    --------
+    >>> export_dataset(output_dir="dataset", temporada=2026)
+    {'exportadas': 28, 'omitidas': 0}
+    """
+    if file_format is None:
+        file_format = "arrow" if has_parquet_support() else "csv"
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Formato '{file_format}' no soportado. Opciones: {', '.join(COLUMNAR_FORMATS)}")
+
+    summary = {"exportadas": 0, "omitidas": 0}
+    for cached_temporada, jornada in data_source.list_cached_jornadas(temporada=temporada):
+        paths = {
+            table: partition_path(
+                output_dir=output_dir, table=table, temporada=cached_temporada, jornada=jornada,
+                file_format=file_format,
+            )
+            for table in EXPORT_TABLES
+        }
+        if not overwrite and all(os.path.exists(path) for path in paths.values()):
+            summary["omitidas"] += 1
+            continue
+
+        probabilities, details = data_source.get_jornada(jornada=jornada, temporada=cached_temporada)
+        if probabilities is None or details is None:
+            continue
+
+        for table, df in jornada_tables(probabilities=probabilities, details=details).items():
+            write_columnar(df=df, path=paths[table], file_format=file_format)
+        summary["exportadas"] += 1
+
+    return summary
+
+
+def partition_path(output_dir: str, table: str, temporada: int, jornada: int, file_format: str) -> str:
+    """
+    Devuelve la ruta del fichero de una partición del dataset.
+
+    Parameters
+    ----------
+    output_dir : str
+        Directorio raíz del dataset.
+    table : str
+        Tabla (una de EXPORT_TABLES).
+    temporada : int
+        Año de la temporada.
+    jornada : int
+        Número de jornada.
+    file_format : str
+        Formato del fichero (uno de COLUMNAR_FORMATS), que determina la extensión.
+
+    Returns
+    -------
+    str
+        <output_dir>/<table>/temporada=<temporada>/jornada=<jornada>/part.<file_format>
+    """
+    return os.path.join(output_dir, table, f"temporada={temporada}", f"jornada={jornada}", f"part.{file_format}")
+
+
+def load_table(output_dir: str, table: str, temporada: int | None = None,
+               file_format: str | None = None) -> pd.DataFrame:
+    """
+    Lee una tabla del dataset exportado, añadiendo las columnas temporada y jornada de cada partición.
+
+    De cada partición se lee un único fichero, de modo que exportar el dataset en varios formatos no duplica
+    filas. Las particiones Arrow y Parquet requieren pyarrow; el DataFrame devuelto es una copia en memoria de
+    los datos.
+
+    Parameters
+    ----------
+    output_dir : str
+        Directorio raíz del dataset.
+    table : str
+        Tabla (una de EXPORT_TABLES).
+    temporada : int | None, optional
+        Si se indica, sólo se leen las particiones de esa temporada.
+    file_format : str | None, optional
+        Formato de los ficheros a leer (uno de COLUMNAR_FORMATS). Si es None, en cada partición se lee el primer
+        formato disponible según LOAD_FORMAT_PREFERENCE.
+
+    Returns
+    -------
+    pd.DataFrame
+        Filas de todas las particiones en orden de temporada y jornada. Vacío si no hay particiones.
+
+    Raises
+    ------
+    ValueError
+        Si file_format no es un formato soportado.
+    """
+    if file_format is not None and file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Formato no soportado: {file_format}. Opciones: {', '.join(COLUMNAR_FORMATS)}")
+    formats = LOAD_FORMAT_PREFERENCE if file_format is None else (file_format,)
+
+    partitions = []
+    table_dir = os.path.join(output_dir, table)
+    for temporada_dir in __list_partitions(directory=table_dir, key="temporada"):
+        if temporada is not None and temporada_dir[0] != temporada:
+            continue
+        for jornada_dir in __list_partitions(directory=temporada_dir[1], key="jornada"):
+            paths = [os.path.join(jornada_dir[1], f"part.{extension}") for extension in formats]
+            path = next((path for path in paths if os.path.exists(path)), None)
+            if path is None:
+                continue
+            df = __read_partition(path=path)
+            df.insert(0, "temporada", temporada_dir[0])
+            df.insert(1, "jornada", jornada_dir[0])
+            partitions.append(df)
+
+    if not partitions:
+        return pd.DataFrame()
+    return pd.concat(partitions, ignore_index=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Punto de entrada del script kinielagpt-export definido en pyproject.toml.
+
+    Parameters
+    ----------
+    argv : list[str] | None, optional
+        Argumentos de la línea de comandos. Si es None, se usan los de sys.argv.
+    """
+    parser = argparse.ArgumentParser(
+        prog="kinielagpt-export",
+        description="Exporta las jornadas de la caché de KinielaGPT a un dataset columnar particionado.",
+    )
+    parser.add_argument("output_dir", help="Directorio raíz del dataset")
+    parser.add_argument("--temporada", type=int, default=None, help="Exportar sólo esta temporada")
+    parser.add_argument("--format", dest="file_format", choices=COLUMNAR_FORMATS, default=None,
+                        help="Formato de los ficheros (por defecto arrow si pyarrow está instalado, si no csv)")
+    parser.add_argument("--overwrite", action="store_true", help="Reescribir las particiones ya exportadas")
+    args = parser.parse_args(argv)
+
+    summary = export_dataset(
+        output_dir=args.output_dir, temporada=args.temporada, file_format=args.file_format,
+        overwrite=args.overwrite,
+    )
+    print(f"Jornadas exportadas: {summary['exportadas']}, omitidas (ya exportadas): {summary['omitidas']}")
+
+
+def __list_partitions(directory: str, key: str) -> list[tuple[int, str]]:
+    """Subdirectorios <key>=<valor entero> de directory, ordenados por valor."""
+    if not os.path.isdir(directory):
+        return []
+    partitions = []
+    for name in os.listdir(directory):
+        prefix, _, value = name.partition("=")
+        path = os.path.join(directory, name)
+        if prefix == key and value.isdigit() and os.path.isdir(path):
+            partitions.append((int(value), path))
+    return sorted(partitions)
+
+
+def __read_partition(path: str) -> pd.DataFrame:
+    """Lee el fichero de una partición según su extensión (uno de COLUMNAR_FORMATS)."""
+    extension = os.path.splitext(path)[1].lstrip(".")
+    if extension == "arrow":
+        return pd.read_feather(path)
+    if extension == "parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Indicadores de forma de los equipos mantenidos de forma incremental.
+
+Cada resultado nuevo actualiza en O(1) los acumulados de su equipo (puntos, registro total, como local y
+como visitante, ventana móvil de puntos y racha actual), de modo que las consultas de forma nunca recorren
+el histórico. FormFeatureStore puede alimentarse directamente o conectarse a un TeamHistoryStore para que
+reciba cada resultado nuevo que se añade al histórico.
+"""
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from kinielagpt.teams import team_key
+
+POINTS = {"VICTORIA": 3, "EMPATE": 1, "DERROTA": 0}
+
+# Orden de los contadores de victorias, empates y derrotas
+RESULT_CODES = ("VICTORIA", "EMPATE", "DERROTA")
+
+# Resultados que conserva como mínimo cada ventana: las tendencias de Analyzer comparan siempre los últimos 5
+# partidos con los 5 anteriores, sea cual sea el tamaño de la ventana móvil
+TREND_RESULTS = 10
+
+
+@dataclass(slots=True)
+class ResultWindow:
+    """
+    Registro y últimos resultados de un equipo en un contexto (todos los partidos, como local o como visitante).
+
+    Guarda los resultados de las dos últimas ventanas de `size` partidos (y al menos los últimos TREND_RESULTS), de
+    modo que los puntos de la ventana actual y los de la anterior se actualizan en O(1) con cada resultado.
+
+    Attributes
+    ----------
+    size : int
+        Tamaño de la ventana en partidos.
+    counts : list[int]
+        Victorias, empates y derrotas totales del contexto.
+    results : deque[str]
+        Últimos max(2 * size, TREND_RESULTS) resultados ('VICTORIA', 'EMPATE', 'DERROTA').
+    points : int
+        Puntos de los últimos `size` resultados.
+    previous_points : int
+        Puntos de los `size` resultados anteriores a la ventana actual.
+    """
+
+    size: int
+    counts: list[int] = field(default_factory=lambda: [0, 0, 0])
+    results: deque = field(default_factory=deque)
+    points: int = 0
+    previous_points: int = 0
+
+    def add(self, cod_resultado: str) -> None:
+        """
+        Aplica un resultado en O(1).
+
+        Parameters
+        ----------
+        cod_resultado : str
+            'VICTORIA', 'EMPATE' o 'DERROTA' desde el punto de vista del equipo.
+        """
+        self.counts[RESULT_CODES.index(cod_resultado)] += 1
+        self.results.append(cod_resultado)
+        self.points += POINTS[cod_resultado]
+        if len(self.results) > self.size:
+            leaving = self.results[-self.size - 1]
+            self.points -= POINTS[leaving]
+            self.previous_points += POINTS[leaving]
+        if len(self.results) > 2 * self.size:
+            self.previous_points -= POINTS[self.results[-2 * self.size - 1]]
+        if len(self.results) > max(2 * self.size, TREND_RESULTS):
+            self.results.popleft()
+
+    @property
+    def matches(self) -> int:
+        """Partidos jugados en el contexto."""
+        return sum(self.counts)
+
+    @property
+    def last(self) -> list[str]:
+        """Resultados de la ventana actual, del más antiguo al más reciente."""
+        return list(self.results)[-self.size:]
+
+
+@dataclass(slots=True)
+class TeamForm:
+    """
+    Acumulados de forma de un equipo.
+
+    Attributes
+    ----------
+    name : str
+        Nombre del equipo del primer resultado recibido.
+    window : int
+        Tamaño de la ventana móvil en partidos.
+    last : tuple[int, int]
+        (temporada, jornada) del último resultado aplicado.
+    overall : ResultWindow
+        Registro y ventana móvil de todos los partidos.
+    home_results : ResultWindow
+        Registro y ventana móvil de los partidos como local.
+    away_results : ResultWindow
+        Registro y ventana móvil de los partidos como visitante.
+    streak_type : str
+        Resultado de la racha actual ('' si no hay resultados).
+    streak_length : int
+        Longitud de la racha actual.
+    """
+
+    name: str
+    window: int
+    last: tuple[int, int] = (0, 0)
+    overall: ResultWindow = field(init=False)
+    home_results: ResultWindow = field(init=False)
+    away_results: ResultWindow = field(init=False)
+    streak_type: str = ""
+    streak_length: int = 0
+
+    def __post_init__(self) -> None:
+        self.overall = ResultWindow(size=self.window)
+        self.home_results = ResultWindow(size=self.window)
+        self.away_results = ResultWindow(size=self.window)
+
+    @property
+    def record(self) -> list[int]:
+        """Victorias, empates y derrotas totales."""
+        return self.overall.counts
+
+    @property
+    def home(self) -> list[int]:
+        """Victorias, empates y derrotas como local."""
+        return self.home_results.counts
+
+    @property
+    def away(self) -> list[int]:
+        """Victorias, empates y derrotas como visitante."""
+        return self.away_results.counts
+
+    @property
+    def recent(self) -> list[str]:
+        """Últimos `window` resultados."""
+        return self.overall.last
+
+    @property
+    def window_points(self) -> int:
+        """Puntos de los resultados en `recent`."""
+        return self.overall.points
+
+    def add(self, cod_resultado: str, es_local: bool, temporada: int, jornada: int) -> bool:
+        """
+        Aplica un resultado nuevo en O(1).
+
+        Parameters
+        ----------
+        cod_resultado : str
+            'VICTORIA', 'EMPATE' o 'DERROTA' desde el punto de vista del equipo.
+        es_local : bool
+            True si el equipo jugó como local.
+        temporada : int
+            Año de la temporada del resultado.
+        jornada : int
+            Jornada de liga del resultado.
+
+        Returns
+        -------
+        bool
+            True si se aplicó; False si el resultado no es posterior al último aplicado (los acumulados
+            no cambian y, si es anterior, hay que reconstruir el equipo).
+        """
+        if (temporada, jornada) <= self.last:
+            return False
+
+        self.overall.add(cod_resultado=cod_resultado)
+        (self.home_results if es_local else self.away_results).add(cod_resultado=cod_resultado)
+
+        if cod_resultado == self.streak_type:
+            self.streak_length += 1
+        else:
+            self.streak_type, self.streak_length = cod_resultado, 1
+
+        self.last = (temporada, jornada)
+        return True
+
+
+class FormFeatureStore:
+    """
+    Indicadores de forma por equipo actualizados de forma incremental.
+
+    Cada equipo tiene unos acumulados de todas las temporadas y otros por temporada. Los resultados de cada
+    equipo deben llegar en orden cronológico (como los devuelve el histórico). Un resultado anterior al último
+    aplicado no se aplica; TeamHistoryStore reconstruye en ese caso solo el equipo afectado.
+
+    Examples
+    --------
+    >>> form = FormFeatureStore(window=5)
+    >>> history = TeamHistoryStore(form=form)
+    >>> history.ingest_jornada(jornada=28, temporada=2026)
+    >>> form.get_form(team_name="Real Madrid")["puntos_ventana"]
+    10
+    """
+
+    def __init__(self, window: int = 5) -> None:
+        """
+        Crea un almacén vacío.
+
+        Parameters
+        ----------
+        window : int, optional
+            Tamaño de la ventana móvil en partidos (default: 5).
+        """
+        self.window = window
+        # Acumulados por (clave del equipo, temporada); temporada None para todas las temporadas
+        self.__teams: dict[tuple[str, int | None], TeamForm] = {}
+
+    def __len__(self) -> int:
+        return sum(1 for _, temporada in self.__teams if temporada is None)
+
+    def __contains__(self, team_name: str) -> bool:
+        return (team_key(name=team_name), None) in self.__teams
+
+    def add_result(self, temporada: int, jornada: int, local: str, visitante: str, goles_local: int,
+                   goles_visitante: int) -> bool:
+        """
+        Aplica un resultado a los dos equipos del partido.
+
+        Parameters
+        ----------
+        temporada : int
+            Año de la temporada.
+        jornada : int
+            Jornada de liga.
+        local : str
+            Nombre del equipo local.
+        visitante : str
+            Nombre del equipo visitante.
+        goles_local : int
+            Goles del equipo local.
+        goles_visitante : int
+            Goles del equipo visitante.
+
+        Returns
+        -------
+        bool
+            True si se aplicó a ambos equipos; False si para alguno era anterior a su último resultado.
+        """
+        if goles_local > goles_visitante:
+            cod_local, cod_visitante = "VICTORIA", "DERROTA"
+        elif goles_local == goles_visitante:
+            cod_local, cod_visitante = "EMPATE", "EMPATE"
+        else:
+            cod_local, cod_visitante = "DERROTA", "VICTORIA"
+
+        applied = True
+        for season in (None, temporada):
+            applied &= self.__team(name=local, temporada=season).add(
+                cod_resultado=cod_local, es_local=True, temporada=temporada, jornada=jornada
+            )
+            applied &= self.__team(name=visitante, temporada=season).add(
+                cod_resultado=cod_visitante, es_local=False, temporada=temporada, jornada=jornada
+            )
+        return applied
+
+    def rebuild_team(self, team_name: str, results: Iterable[dict[str, Any]]) -> None:
+        """
+        Reconstruye desde cero los acumulados de un equipo (todas las temporadas y cada temporada).
+
+        Parameters
+        ----------
+        team_name : str
+            Nombre del equipo.
+        results : Iterable[dict[str, Any]]
+            Resultados del equipo de todas las temporadas en orden cronológico (TeamHistoryStore.team_results).
+        """
+        key = team_key(name=team_name)
+        for stale in [k for k in self.__teams if k[0] == key]:
+            del self.__teams[stale]
+
+        for r in results:
+            for season in (None, r["temporada"]):
+                self.__team(name=team_name, temporada=season).add(
+                    cod_resultado=r["cod_resultado"], es_local=r["es_local"], temporada=r["temporada"],
+                    jornada=r["jornada"],
+                )
+        if (key, None) not in self.__teams:
+            self.__team(name=team_name)
+
+    def get_team(self, team_name: str, temporada: int | None = None) -> TeamForm | None:
+        """
+        Devuelve los acumulados de un equipo.
+
+        Parameters
+        ----------
+        team_name : str
+            Nombre del equipo en cualquier formato.
+        temporada : int | None, optional
+            Si se indica, los acumulados de esa temporada. Si es None, los de todas las temporadas.
+
+        Returns
+        -------
+        TeamForm | None
+            Acumulados del equipo, o None si no hay resultados suyos (en la temporada indicada).
+        """
+        team = self.__teams.get((team_key(name=team_name), temporada))
+        if team is None or team.overall.matches == 0:
+            return None
+        return team
+
+    def get_form(self, team_name: str, temporada: int | None = None) -> dict[str, Any] | None:
+        """
+        Devuelve los indicadores de forma de un equipo sin recorrer su histórico.
+
+        Los criterios de calificación son los de Analyzer: forma por porcentaje de puntos de la ventana
+        (excelente ≥80, buena ≥60, regular ≥40, mala) y rendimiento local/visitante por porcentaje de
+        puntos (Excelente ≥70, Bueno ≥50, Regular ≥30, Malo).
+
+        Parameters
+        ----------
+        team_name : str
+            Nombre del equipo en cualquier formato.
+        temporada : int | None, optional
+            Si se indica, indicadores de esa temporada. Si es None, de todas las temporadas.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Indicadores de forma, o None si no hay resultados del equipo.
+        """
+        team = self.__teams.get((team_key(name=team_name), temporada))
+        if team is None:
+            return None
+
+        matches_window = len(team.recent)
+        effectiveness = team.window_points / (matches_window * 3) * 100 if matches_window else 0.0
+        if effectiveness >= 80:
+            form = "excelente"
+        elif effectiveness >= 60:
+            form = "buena"
+        elif effectiveness >= 40:
+            form = "regular"
+        else:
+            form = "mala"
+
+        return {
+            "equipo": team.name,
+            "partidos_jugados": sum(team.record),
+            "registro": self.__format_record(counts=team.record),
+            "ventana": self.window,
+            "partidos_ventana": matches_window,
+            "puntos_ventana": team.window_points,
+            "porcentaje_puntos_ventana": round(effectiveness, 1),
+            "forma": form,
+            "ultimos_resultados": list(team.recent),
+            "racha_actual": {"tipo": team.streak_type, "longitud": team.streak_length},
+            "local": self.__context(counts=team.home),
+            "visitante": self.__context(counts=team.away),
+            "ultima_jornada": {"temporada": team.last[0], "jornada": team.last[1]},
+        }
+
+    def __team(self, name: str, temporada: int | None = None) -> TeamForm:
+        """
+        Devuelve los acumulados de un equipo (en una temporada o en todas), creándolos si es su primer resultado.
+        """
+        key = (team_key(name=name), temporada)
+        team = self.__teams.get(key)
+        if team is None:
+            team = self.__teams[key] = TeamForm(name=name, window=self.window)
+        return team
+
+    def __format_record(self, counts: list[int]) -> str:
+        """
+        Formatea victorias, empates y derrotas como "xV-yE-zD (Npts)".
+        """
+        wins, draws, losses = counts
+        return f"{wins}V-{draws}E-{losses}D ({wins * 3 + draws}pts)"
+
+    def __context(self, counts: list[int]) -> dict[str, Any]:
+        """
+        Resume el rendimiento como local o visitante con los criterios de Analyzer.
+        """
+        total = sum(counts)
+        if total == 0:
+            return {
+                "registro": "Sin datos",
+                "puntos": 0,
+                "porcentaje_puntos_conseguidos": 0.0,
+                "calificacion": "Sin datos",
+            }
+
+        points = counts[0] * 3 + counts[1]
+        effectiveness = points / (total * 3) * 100
+        if effectiveness >= 70:
+            rating = "Excelente"
+        elif effectiveness >= 50:
+            rating = "Bueno"
+        elif effectiveness >= 30:
+            rating = "Regular"
+        else:
+            rating = "Malo"
+
+        return {
+            "registro": self.__format_record(counts=counts),
+            "puntos": points,
+            "porcentaje_puntos_conseguidos": round(effectiveness, 1),
+            "calificacion": rating,
+        }
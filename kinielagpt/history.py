@@ -0,0 +1,367 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Histórico persistente de resultados por equipo para KinielaGPT.
+
+Cada jornada descargada incluye en ultimos_partidos los ~10 últimos resultados de los dos equipos de cada
+partido, por lo que los mismos resultados se repiten en muchas jornadas. Este módulo los deduplica en una
+base de datos SQLite (en el directorio de caché de data_source) indexada por equipo, temporada y jornada,
+de modo que el histórico de un equipo a lo largo de una o varias temporadas se consulta en milisegundos,
+aunque el equipo no juegue en la jornada consultada.
+"""
+
+import os
+import sqlite3
+from collections.abc import Iterable
+from typing import Any
+
+from kinielagpt import data_source
+from kinielagpt.form import POINTS, FormFeatureStore
+from kinielagpt.teams import team_key
+
+HISTORY_FILENAME = "team_history.sqlite3"
+
+
+class TeamHistoryStore:
+    """
+    Almacén persistente e indexado de resultados por equipo.
+
+    Los resultados se identifican por (temporada, jornada, local, visitante) usando la clave canónica de
+    teams.team_key, de modo que el mismo partido escrito de formas distintas ("R.MADRID" / "Real Madrid")
+    o repetido en varias jornadas se guarda una sola vez.
+
+    Examples
+    --------
+    >>> store = TeamHistoryStore()
+    >>> store.ingest_jornada(jornada=28, temporada=2026)
+    212
+    >>> store.team_results(team_name="Real Madrid", temporada=2026, last=3)
+    [{'temporada': 2026, 'jornada': 25, 'partido': 'R.MADRID | Getafe', ...}, ...]
+    """
+
+    __SCHEMA = """
+    CREATE TABLE IF NOT EXISTS results (
+        temporada INTEGER NOT NULL,
+        jornada INTEGER NOT NULL,
+        local_key TEXT NOT NULL,
+        visitante_key TEXT NOT NULL,
+        local TEXT NOT NULL,
+        visitante TEXT NOT NULL,
+        goles_local INTEGER NOT NULL,
+        goles_visitante INTEGER NOT NULL,
+        PRIMARY KEY (temporada, jornada, local_key, visitante_key)
+    );
+    CREATE INDEX IF NOT EXISTS idx_results_local ON results (local_key, temporada, jornada);
+    CREATE INDEX IF NOT EXISTS idx_results_visitante ON results (visitante_key, temporada, jornada);
+    """
+
+    def __init__(self, path: str | None = None, form: FormFeatureStore | None = None) -> None:
+        """
+        Abre (o crea) la base de datos del histórico.
+
+        Parameters
+        ----------
+        path : str | None, optional
+            Ruta del fichero SQLite. Si es None, se usa team_history.sqlite3 en data_source.get_cache_dir().
+            Con ":memory:" el histórico solo vive en memoria.
+        form : FormFeatureStore | None, optional
+            Indicadores de forma a mantener actualizados. Se cargan una vez con los resultados ya
+            almacenados y después reciben solo los resultados nuevos de cada ingesta.
+        """
+        if path is None:
+            path = os.path.join(data_source.get_cache_dir(), HISTORY_FILENAME)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.__connection = sqlite3.connect(path)
+        self.__connection.executescript(self.__SCHEMA)
+
+        self.form = form
+        if form is not None:
+            for team in self.teams():
+                form.rebuild_team(team_name=team, results=self.team_results(team_name=team))
+
+    def close(self) -> None:
+        """
+        Cierra la conexión con la base de datos.
+        """
+        self.__connection.close()
+
+    def ingest_details(self, details: Iterable[dict[str, Any]], temporada: int) -> int:
+        """
+        Añade al histórico los resultados de ultimos_partidos de una jornada ya descargada.
+
+        Parameters
+        ----------
+        details : Iterable[dict[str, Any]]
+            Detalles de los partidos (get_kiniela_matches_details).
+        temporada : int
+            Año de la temporada a la que pertenecen los resultados.
+
+        Returns
+        -------
+        int
+            Número de resultados nuevos (los ya almacenados se ignoran).
+        """
+        rows = self.__rows_from_details(details=details, temporada=temporada)
+        new_rows = []
+        with self.__connection:
+            for row in sorted(set(rows), key=lambda r: (r[0], r[1])):
+                cursor = self.__connection.execute("INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+                if cursor.rowcount == 1:
+                    new_rows.append(row)
+
+        if self.form is not None:
+            self.__update_form(rows=new_rows)
+
+        return len(new_rows)
+
+    def ingest_jornada(self, jornada: int, temporada: int) -> int | None:
+        """
+        Descarga los detalles de una jornada y añade sus resultados al histórico.
+
+        Parameters
+        ----------
+        jornada : int
+            Número de jornada.
+        temporada : int
+            Año de la temporada.
+
+        Returns
+        -------
+        int | None
+            Número de resultados nuevos, o None si no se pudieron obtener los detalles.
+        """
+        details = data_source.get_kiniela_matches_details(jornada=jornada, temporada=temporada)
+        if details is None:
+            return None
+        return self.ingest_details(details=details, temporada=temporada)
+
+    def __len__(self) -> int:
+        return self.__connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def teams(self, temporada: int | None = None) -> list[str]:
+        """
+        Devuelve las claves canónicas de los equipos con resultados almacenados.
+
+        Parameters
+        ----------
+        temporada : int | None, optional
+            Si se indica, solo equipos con resultados en esa temporada.
+
+        Returns
+        -------
+        list[str]
+            Claves de equipo ordenadas alfabéticamente.
+        """
+        where, params = ("WHERE temporada = ?", (temporada, temporada)) if temporada is not None else ("", ())
+        query = (f"SELECT local_key FROM results {where} "
+                 f"UNION SELECT visitante_key FROM results {where} ORDER BY 1")
+        return [row[0] for row in self.__connection.execute(query, params)]
+
+    def team_results(self, team_name: str, temporada: int | None = None,
+                     last: int | None = None) -> list[dict[str, Any]]:
+        """
+        Devuelve los resultados de un equipo en orden cronológico.
+
+        Parameters
+        ----------
+        team_name : str
+            Nombre del equipo en cualquier formato ("R.MADRID", "Real Madrid", "Madrid").
+        temporada : int | None, optional
+            Si se indica, solo resultados de esa temporada. Si es None, todas las temporadas.
+        last : int | None, optional
+            Si se indica, solo los últimos N resultados.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Resultados con temporada, jornada, partido, resultado, es_local y cod_resultado
+            ('VICTORIA', 'EMPATE' o 'DERROTA' desde el punto de vista del equipo).
+        """
+        key = team_key(name=team_name)
+        season_filter = "AND temporada = ?" if temporada is not None else ""
+        season_params = (temporada,) if temporada is not None else ()
+        query = (
+            f"SELECT temporada, jornada, local, visitante, goles_local, goles_visitante, 1 FROM results "
+            f"WHERE local_key = ? {season_filter} "
+            f"UNION ALL "
+            f"SELECT temporada, jornada, local, visitante, goles_local, goles_visitante, 0 FROM results "
+            f"WHERE visitante_key = ? {season_filter} "
+        )
+        params: tuple = (key, *season_params, key, *season_params)
+        if last is not None:
+            # Solo los últimos N partidos, sin leer el resto del histórico del equipo
+            query = f"SELECT * FROM ({query} ORDER BY temporada DESC, jornada DESC LIMIT ?) "
+            params = (*params, max(last, 0))
+        rows = self.__connection.execute(f"{query} ORDER BY temporada, jornada", params).fetchall()
+
+        results = []
+        for temporada_row, jornada, local, visitante, goles_local, goles_visitante, es_local in rows:
+            goles_equipo, goles_rival = (goles_local, goles_visitante) if es_local else (goles_visitante, goles_local)
+            if goles_equipo > goles_rival:
+                cod_resultado = "VICTORIA"
+            elif goles_equipo == goles_rival:
+                cod_resultado = "EMPATE"
+            else:
+                cod_resultado = "DERROTA"
+            results.append({
+                "temporada": temporada_row,
+                "jornada": jornada,
+                "partido": f"{local} | {visitante}",
+                "resultado": f"{goles_local}-{goles_visitante}",
+                "es_local": bool(es_local),
+                "cod_resultado": cod_resultado,
+            })
+        return results
+
+    def scores(self, temporada: int | None = None) -> list[tuple[int, int]]:
+        """
+        Devuelve los marcadores (goles local, goles visitante) de todos los resultados almacenados.
+
+        Parameters
+        ----------
+        temporada : int | None, optional
+            Si se indica, solo resultados de esa temporada.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            Marcadores en orden cronológico.
+        """
+        where, params = ("WHERE temporada = ?", (temporada,)) if temporada is not None else ("", ())
+        query = f"SELECT goles_local, goles_visitante FROM results {where} ORDER BY temporada, jornada"
+        return [(row[0], row[1]) for row in self.__connection.execute(query, params)]
+
+    def rolling_form(self, team_name: str, window: int = 5, temporada: int | None = None) -> list[dict[str, Any]]:
+        """
+        Calcula la forma móvil de un equipo: puntos en los últimos `window` partidos tras cada jornada.
+
+        Parameters
+        ----------
+        team_name : str
+            Nombre del equipo en cualquier formato.
+        window : int, optional
+            Tamaño de la ventana en partidos (default: 5).
+        temporada : int | None, optional
+            Si se indica, solo resultados de esa temporada.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Un elemento por partido con temporada, jornada, cod_resultado, puntos, puntos_ventana,
+            partidos_ventana y porcentaje_puntos_ventana.
+        """
+        results = self.team_results(team_name=team_name, temporada=temporada)
+        points = [POINTS[r["cod_resultado"]] for r in results]
+
+        form = []
+        window_points = 0
+        for i, result in enumerate(results):
+            window_points += points[i]
+            if i >= window:
+                window_points -= points[i - window]
+            matches = min(i + 1, window)
+            form.append({
+                "temporada": result["temporada"],
+                "jornada": result["jornada"],
+                "cod_resultado": result["cod_resultado"],
+                "puntos": points[i],
+                "puntos_ventana": window_points,
+                "partidos_ventana": matches,
+                "porcentaje_puntos_ventana": round(window_points / (matches * 3) * 100, 1),
+            })
+        return form
+
+    def __parse_result(self, partido: str, resultado: str, jornada: Any) -> tuple[int, str, str, int, int] | None:
+        """
+        Convierte un elemento de ultimos_partidos en (jornada, local, visitante, goles_local, goles_visitante).
+
+        Parameters
+        ----------
+        partido : str
+            Partido en formato "LOCAL | VISITANTE".
+        resultado : str
+            Resultado en formato "goles_local-goles_visitante".
+        jornada : Any
+            Jornada de liga del partido (texto o entero).
+
+        Returns
+        -------
+        tuple[int, str, str, int, int] | None
+            Tupla con los datos del resultado, o None si algún campo no es válido.
+        """
+        try:
+            local, visitante = partido.split(" | ")
+            goles_local, goles_visitante = map(int, resultado.split("-"))
+            return int(jornada), local.strip(), visitante.strip(), goles_local, goles_visitante
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def __rows_from_details(self, details: Iterable[dict[str, Any]], temporada: int) -> list[tuple]:
+        """
+        Extrae las filas a insertar a partir de los ultimos_partidos de los detalles de una jornada.
+
+        Parameters
+        ----------
+        details : Iterable[dict[str, Any]]
+            Detalles de los partidos (get_kiniela_matches_details).
+        temporada : int
+            Año de la temporada.
+
+        Returns
+        -------
+        list[tuple]
+            Filas (temporada, jornada, local_key, visitante_key, local, visitante, goles_local, goles_visitante).
+        """
+        rows = []
+        for detail in details:
+            for p in detail.get("ultimos_partidos", []) or []:
+                parsed = self.__parse_result(partido=p.get("partido", ""), resultado=p.get("resultado", ""),
+                                             jornada=p.get("jornada"))
+                if parsed is None:
+                    continue
+                jornada, local, visitante, goles_local, goles_visitante = parsed
+                rows.append((temporada, jornada, team_key(name=local), team_key(name=visitante), local, visitante,
+                             goles_local, goles_visitante))
+        return rows
+
+    def __update_form(self, rows: list[tuple]) -> None:
+        """
+        Aplica los resultados nuevos a los indicadores de forma en orden cronológico.
+
+        Si algún resultado es anterior al último aplicado para uno de sus equipos (por ejemplo, un partido
+        aplazado que aparece más tarde), solo ese equipo se reconstruye desde el histórico.
+
+        Parameters
+        ----------
+        rows : list[tuple]
+            Filas recién insertadas, ordenadas por (temporada, jornada).
+        """
+        stale = set()
+        for temporada, jornada, local_key, visitante_key, local, visitante, goles_local, goles_visitante in rows:
+            if not self.form.add_result(temporada=temporada, jornada=jornada, local=local,  # type: ignore[union-attr]
+                                        visitante=visitante, goles_local=goles_local,
+                                        goles_visitante=goles_visitante):
+                stale.update((local_key, visitante_key))
+
+        for key in stale:
+            self.form.rebuild_team(team_name=key, results=self.team_results(team_name=key))  # type: ignore[union-attr]
@@ -0,0 +1,353 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Seguimiento en directo de la jornada abierta.
+
+Los porcentajes de quinielista.es cambian durante la semana. LivePoller vuelve a descargar periódicamente las
+probabilidades de la jornada abierta con un intervalo adaptativo (corto mientras hay cambios, creciente mientras
+no los hay), detecta qué partidos han cambiado, guarda sólo esos cambios en una serie temporal compacta y vuelve
+a ejecutar SurpriseDetector.detect únicamente sobre los partidos cuyas entradas han cambiado. Los detalles de los
+partidos (clasificación, rachas, histórico) cambian mucho menos, así que se vuelven a descargar con una cadencia
+más lenta y también se comparan partido a partido.
+"""
+
+import time
+from array import array
+from collections.abc import Callable
+from typing import Any
+
+from kinielagpt import data_source
+from kinielagpt.detector import SurpriseDetector
+from kinielagpt.records import JornadaFrame
+from kinielagpt.snapshots import PROBABILITY_FIELDS, ProbabilitySnapshotStore, probability_vector
+
+
+class ProbabilitySeries:
+    """
+    Serie temporal compacta de probabilidades por partido.
+
+    Sólo se guarda un punto cuando las probabilidades de un partido cambian. Cada partido guarda sus instantes
+    y sus valores en arrays planos de tipo 'd' (sin un diccionario por punto).
+
+    Examples
+    --------
+    >>> series = ProbabilitySeries()
+    >>> series.append(timestamp=1700000000.0, match_id=1, values=(60.0, 25.0, 15.0))
+    True
+    >>> series.append(timestamp=1700000600.0, match_id=1, values=(60.0, 25.0, 15.0))
+    False
+    >>> series.get(match_id=1)
+    [{'timestamp': 1700000000.0, '1_Prob': 60.0, 'X_Prob': 25.0, '2_Prob': 15.0, ...}]
+    """
+
+    def __init__(self, fields: tuple[str, ...] = PROBABILITY_FIELDS) -> None:
+        """
+        Crea una serie vacía.
+
+        Parameters
+        ----------
+        fields : tuple[str, ...], optional
+            Nombres de los valores de cada punto. Por defecto PROBABILITY_FIELDS.
+        """
+        self.fields = fields
+        self.__timestamps: dict[int, array] = {}
+        self.__values: dict[int, array] = {}
+
+    def append(self, timestamp: float, match_id: int, values: tuple[float, ...]) -> bool:
+        """
+        Añade un punto si los valores difieren del último guardado para el partido.
+
+        Parameters
+        ----------
+        timestamp : float
+            Instante (segundos desde epoch) de la descarga.
+        match_id : int
+            ID del partido dentro de la jornada (1-15).
+        values : tuple[float, ...]
+            Valores en el orden de fields (los que falten se completan con 0).
+
+        Returns
+        -------
+        bool
+            True si se ha añadido el punto, False si no había cambios.
+        """
+        values = tuple(values) + (0.0,) * (len(self.fields) - len(values))
+        if self.last(match_id=match_id) == values:
+            return False
+
+        self.__timestamps.setdefault(match_id, array("d")).append(timestamp)
+        self.__values.setdefault(match_id, array("d")).extend(values)
+        return True
+
+    def last(self, match_id: int) -> tuple[float, ...] | None:
+        """
+        Devuelve los últimos valores guardados de un partido.
+
+        Parameters
+        ----------
+        match_id : int
+            ID del partido dentro de la jornada.
+
+        Returns
+        -------
+        tuple[float, ...] | None
+            Últimos valores, o None si el partido no tiene puntos.
+        """
+        values = self.__values.get(match_id)
+        if not values:
+            return None
+        return tuple(values[-len(self.fields):])
+
+    def get(self, match_id: int) -> list[dict[str, float]]:
+        """
+        Devuelve los puntos de un partido en orden cronológico.
+
+        Parameters
+        ----------
+        match_id : int
+            ID del partido dentro de la jornada.
+
+        Returns
+        -------
+        list[dict[str, float]]
+            Un diccionario por punto con timestamp y un valor por campo.
+        """
+        timestamps = self.__timestamps.get(match_id, array("d"))
+        values = self.__values.get(match_id, array("d"))
+        width = len(self.fields)
+        return [
+            {"timestamp": timestamp} | dict(zip(self.fields, values[i * width:(i + 1) * width], strict=True))
+            for i, timestamp in enumerate(timestamps)
+        ]
+
+    def match_ids(self) -> list[int]:
+        """
+        Devuelve los partidos con al menos un punto.
+
+        Returns
+        -------
+        list[int]
+            IDs de partido ordenados.
+        """
+        return sorted(self.__timestamps)
+
+    def __len__(self) -> int:
+        return sum(len(timestamps) for timestamps in self.__timestamps.values())
+
+
+class LivePoller:
+    """
+    Sondeo adaptativo de la jornada abierta con detección de cambios.
+
+    Cada llamada a poll() descarga las probabilidades fusionadas de la jornada (peticiones condicionales de
+    data_source), las compara partido a partido con la descarga anterior, añade los cambios a la serie
+    temporal y vuelve a detectar sorpresas sólo en los partidos que han cambiado. Los detalles se vuelven a
+    descargar como mucho una vez cada details_interval segundos y cuentan como cambio los partidos cuyo detalle
+    difiere del anterior. El intervalo hasta el siguiente sondeo vuelve a min_interval cuando hay cambios y se
+    multiplica por backoff (hasta max_interval) cuando no los hay o la descarga falla.
+
+    Examples
+    --------
+    >>> poller = LivePoller(min_interval=120, max_interval=3600)
+    >>> update = poller.poll()
+    >>> update["changed"], update["interval"]
+    ([1, 2, ..., 15], 120)
+    >>> poller.run(max_polls=10, on_change=lambda update: print(update["surprises"]["total_surprises"]))
+    """
+
+    def __init__(self, jornada: int | None = None, temporada: int | None = None, threshold: float = 30.0,
+                 min_interval: float = 60.0, max_interval: float = 1800.0, backoff: float = 2.0,
+                 detector: SurpriseDetector | None = None, series: ProbabilitySeries | None = None,
+                 store: ProbabilitySnapshotStore | None = None, details_interval: float = 3600.0) -> None:
+        """
+        Configura el sondeo.
+
+        Parameters
+        ----------
+        jornada : int | None, optional
+            Jornada a seguir. Si jornada o temporada son None, se sigue la jornada abierta de quinielista.es
+            (data_source.get_last_kiniela) y el estado (incluida la serie temporal) se reinicia cuando ésta cambia.
+        temporada : int | None, optional
+            Año de la temporada a seguir.
+        threshold : float, optional
+            Umbral de SurpriseDetector.detect. Por defecto 30.0.
+        min_interval : float, optional
+            Intervalo (segundos) tras un sondeo con cambios. Por defecto 60.
+        max_interval : float, optional
+            Intervalo máximo (segundos) entre sondeos. Por defecto 1800.
+        backoff : float, optional
+            Factor de crecimiento del intervalo tras un sondeo sin cambios. Por defecto 2.0.
+        detector : SurpriseDetector | None, optional
+            Detector a usar. Si es None, se crea uno.
+        series : ProbabilitySeries | None, optional
+            Serie temporal en la que se guardan los cambios. Si es None, se crea una.
+        store : ProbabilitySnapshotStore | None, optional
+            Si se indica, cada descarga se guarda además en este almacén persistente.
+        details_interval : float, optional
+            Segundos mínimos entre descargas de los detalles de los partidos. Por defecto 3600.
+        """
+        self.follow_open = jornada is None or temporada is None
+        self.jornada = jornada
+        self.temporada = temporada
+        self.threshold = threshold
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.detector = detector if detector is not None else SurpriseDetector()
+        self.series = series if series is not None else ProbabilitySeries()
+        self.store = store
+        self.details_interval = details_interval
+        self.__reset()
+
+    def poll(self, now: float | None = None) -> dict[str, Any]:
+        """
+        Realiza un sondeo de la jornada.
+
+        Parameters
+        ----------
+        now : float | None, optional
+            Instante del sondeo (segundos desde epoch). Si es None, time.time().
+
+        Returns
+        -------
+        dict[str, Any]
+            - jornada, temporada: Jornada sondeada.
+            - timestamp: Instante del sondeo.
+            - changed: IDs de los partidos cuyas probabilidades (o detalles) han cambiado.
+            - interval: Segundos hasta el siguiente sondeo.
+            - surprises: Detección de sorpresas vigente, con el formato de SurpriseDetector.detect.
+            - error: Sólo si la descarga ha fallado.
+        """
+        timestamp = time.time() if now is None else now
+
+        if self.follow_open:
+            _, jornada, temporada, _ = data_source.get_last_kiniela()
+            if jornada is not None and (jornada, temporada) != (self.jornada, self.temporada):
+                self.jornada, self.temporada = jornada, temporada
+                self.series = ProbabilitySeries(fields=self.series.fields)
+                self.__reset()
+
+        probabilities = None
+        if self.jornada is not None and self.temporada is not None:
+            probabilities = data_source.get_kiniela_probabilities(jornada=self.jornada, temporada=self.temporada)
+        if probabilities is None:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+            return self.__update(timestamp=timestamp, changed=[]) | {"error": "No se pudieron obtener probabilidades"}
+
+        if self.store is not None:
+            self.store.append(
+                probabilities=probabilities, jornada=self.jornada, temporada=self.temporada, timestamp=timestamp
+            )
+
+        details_changed: set[int] = set()
+        if self.__details is None or timestamp - self.__details_timestamp >= self.details_interval:
+            details = data_source.get_kiniela_matches_details(jornada=self.jornada, temporada=self.temporada)
+            if details is not None:
+                previous = self.__details or []
+                details_changed = {
+                    match_id for match_id, detail in enumerate(details, start=1)
+                    if match_id > len(previous) or previous[match_id - 1] != detail
+                }
+                self.__details = details
+            self.__details_timestamp = timestamp
+
+        changed = []
+        for match_id, prob in enumerate(probabilities, start=1):
+            inputs = (prob.get("partido"), probability_vector(prob=prob))
+            if match_id in details_changed or self.__inputs.get(match_id) != inputs:
+                self.__inputs[match_id] = inputs
+                self.series.append(timestamp=timestamp, match_id=match_id, values=inputs[1])
+                changed.append(match_id)
+
+        if changed:
+            frame = JornadaFrame.from_sources(
+                jornada=self.jornada, temporada=self.temporada, probabilities=probabilities,
+                details=self.__details or [],
+            )
+            report = self.detector.detect(
+                jornada=self.jornada, temporada=self.temporada, threshold=self.threshold, frame=frame,
+                match_ids=changed,
+            )
+            for match_id in changed:
+                self.__surprises.pop(match_id, None)
+            for surprise in report["surprises"]:
+                self.__surprises[surprise["match_id"]] = surprise
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+
+        return self.__update(timestamp=timestamp, changed=changed)
+
+    def run(self, max_polls: int | None = None, on_change: Callable[[dict[str, Any]], None] | None = None,
+            sleep: Callable[[float], None] = time.sleep) -> None:
+        """
+        Sondea en bucle respetando el intervalo adaptativo.
+
+        Parameters
+        ----------
+        max_polls : int | None, optional
+            Número máximo de sondeos. Si es None, sondea indefinidamente.
+        on_change : Callable[[dict[str, Any]], None] | None, optional
+            Función llamada con el resultado de cada sondeo en el que algún partido ha cambiado.
+        sleep : Callable[[float], None], optional
+            Función de espera entre sondeos. Por defecto time.sleep.
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            # Las descargas del bucle ceden el turno a las peticiones interactivas (data_source.request_priority)
+            with data_source.request_priority("live"):
+                update = self.poll()
+            polls += 1
+            if update["changed"] and on_change is not None:
+                on_change(update)
+            if max_polls is None or polls < max_polls:
+                sleep(self.interval)
+
+    @property
+    def surprises(self) -> dict[str, Any]:
+        """Detección de sorpresas vigente, con el formato de SurpriseDetector.detect."""
+        surprises = [self.__surprises[match_id] for match_id in sorted(self.__surprises)]
+        return {
+            "jornada": self.jornada,
+            "temporada": self.temporada,
+            "threshold": self.threshold,
+            "total_surprises": len(surprises),
+            "surprises": surprises,
+        }
+
+    def __reset(self) -> None:
+        """Olvida las entradas, los detalles y las sorpresas de la jornada seguida."""
+        self.__inputs: dict[int, tuple[str, tuple[float, ...]]] = {}
+        self.__details: list[dict[str, Any]] | None = None
+        self.__details_timestamp = 0.0
+        self.__surprises: dict[int, dict[str, Any]] = {}
+
+    def __update(self, timestamp: float, changed: list[int]) -> dict[str, Any]:
+        """Resultado de un sondeo."""
+        return {
+            "jornada": self.jornada,
+            "temporada": self.temporada,
+            "timestamp": timestamp,
+            "changed": changed,
+            "interval": self.interval,
+            "surprises": self.surprises,
+        }
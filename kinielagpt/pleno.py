@@ -0,0 +1,323 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Motor del pleno al 15 para KinielaGPT.
+
+El pleno al 15 se acierta con el marcador exacto en cuatro categorías por equipo (0, 1, 2 y "Mas" goles), es
+decir, una de las 16 casillas de una matriz 4×4. data_source sólo publica las probabilidades marginales de
+goles de cada equipo, así que la matriz se construye como su producto exterior (independencia) y, opcionalmente,
+se corrige la dependencia entre los goles de ambos equipos al estilo Dixon–Coles: los marcadores bajos (0-0,
+1-0, 0-1 y 1-1) se multiplican por un factor τ que depende de un parámetro ρ ajustado por máxima verosimilitud
+sobre los resultados almacenados en el histórico (history.TeamHistoryStore).
+
+Con ρ = 0 la matriz es exactamente la de marginales independientes. Los marcadores se devuelven ordenados por
+probabilidad, con la probabilidad acumulada, para decidir cuántos marcadores cubrir con apuestas múltiples.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+
+# Categorías de goles de cada equipo, en el orden de las filas (local) y columnas (visitante) de la matriz
+GOLES = ("0", "1", "2", "Mas")
+
+# Goles asignados a cada categoría al calcular los goles esperados de la corrección Dixon–Coles ("Mas" = 3)
+GOLES_VALOR = np.array([0.0, 1.0, 2.0, 3.0])
+
+# Rejilla de valores de ρ evaluada al ajustar la corrección Dixon–Coles
+RHO_GRID = np.round(np.linspace(-0.3, 0.3, 121), 3)
+
+
+def goal_marginals(prob: dict[str, Any]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Extrae las probabilidades marginales de goles local y visitante de un partido.
+
+    Parameters
+    ----------
+    prob : dict[str, Any]
+        Probabilidades del partido (elemento de get_kiniela_probabilities) con claves "<g>_Goles_Local_Prob" y
+        "<g>_Goles_Visitante_Prob" para g en GOLES. Las claves ausentes se consideran 0.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Vectores de 4 elementos (en porcentaje, sin normalizar) de goles local y visitante.
+    """
+    local = np.array([prob.get(f"{g}_Goles_Local_Prob", 0) for g in GOLES], dtype=np.float64)
+    visitante = np.array([prob.get(f"{g}_Goles_Visitante_Prob", 0) for g in GOLES], dtype=np.float64)
+    return local, visitante
+
+
+def dixon_coles_tau(lam: float | np.ndarray, mu: float | np.ndarray, rho: float | np.ndarray) -> np.ndarray:
+    """
+    Calcula la matriz de factores τ de Dixon–Coles.
+
+    Parameters
+    ----------
+    lam : float | np.ndarray
+        Goles esperados del local.
+    mu : float | np.ndarray
+        Goles esperados del visitante.
+    rho : float | np.ndarray
+        Parámetro de dependencia. Con un array de n valores se devuelven n matrices.
+
+    Returns
+    -------
+    np.ndarray
+        Matriz (4, 4), o (n, 4, 4) si rho es un array, con τ en las casillas 0-0, 0-1, 1-0 y 1-1 y 1 en el resto.
+    """
+    rho = np.asarray(rho, dtype=np.float64)
+    tau = np.ones(rho.shape + (len(GOLES), len(GOLES)))
+    tau[..., 0, 0] = 1 - lam * mu * rho
+    tau[..., 0, 1] = 1 + lam * rho
+    tau[..., 1, 0] = 1 + mu * rho
+    tau[..., 1, 1] = 1 - rho
+    return tau
+
+
+def score_matrix(local: np.ndarray, visitante: np.ndarray, rho: float = 0.0) -> np.ndarray:
+    """
+    Construye la matriz 4×4 de probabilidades de marcador a partir de las marginales de goles.
+
+    Parameters
+    ----------
+    local : np.ndarray
+        Probabilidades de 0, 1, 2 y más goles del local (cualquier escala).
+    visitante : np.ndarray
+        Probabilidades de 0, 1, 2 y más goles del visitante (cualquier escala).
+    rho : float, optional
+        Parámetro de dependencia Dixon–Coles (default: 0, independencia).
+
+    Returns
+    -------
+    np.ndarray
+        Matriz (4, 4) que suma 1: filas goles del local y columnas goles del visitante. Si alguna marginal es
+        nula se devuelve una matriz de ceros.
+    """
+    matrix = np.outer(local, visitante)
+    if rho != 0.0:
+        lam = float(local @ GOLES_VALOR / max(local.sum(), 1e-12))
+        mu = float(visitante @ GOLES_VALOR / max(visitante.sum(), 1e-12))
+        matrix = matrix * np.clip(dixon_coles_tau(lam=lam, mu=mu, rho=rho), 0.0, None)
+    total = matrix.sum()
+    return matrix / total if total > 0 else matrix
+
+
+def fit_rho(scores: Iterable[tuple[int, int]], grid: np.ndarray = RHO_GRID) -> float:
+    """
+    Ajusta el parámetro ρ de Dixon–Coles por máxima verosimilitud sobre marcadores observados.
+
+    Las marginales se estiman con las frecuencias de goles local y visitante (categorías de GOLES) y la
+    verosimilitud de todos los valores de la rejilla se evalúa a la vez sobre la tabla de frecuencias 4×4.
+
+    Parameters
+    ----------
+    scores : Iterable[tuple[int, int]]
+        Marcadores (goles local, goles visitante), p. ej. TeamHistoryStore.scores().
+    grid : np.ndarray, optional
+        Valores de ρ candidatos (default: RHO_GRID, de -0.3 a 0.3).
+
+    Returns
+    -------
+    float
+        Valor de ρ con mayor verosimilitud, o 0.0 si no hay marcadores.
+    """
+    counts = np.zeros((len(GOLES), len(GOLES)))
+    for goles_local, goles_visitante in scores:
+        counts[min(goles_local, len(GOLES) - 1), min(goles_visitante, len(GOLES) - 1)] += 1
+
+    n = counts.sum()
+    if n == 0:
+        return 0.0
+
+    local = counts.sum(axis=1) / n
+    visitante = counts.sum(axis=0) / n
+    tau = dixon_coles_tau(lam=float(local @ GOLES_VALOR), mu=float(visitante @ GOLES_VALOR), rho=grid)
+
+    joint = tau * np.outer(local, visitante)
+    valid = (tau > 0).all(axis=(1, 2))
+    joint /= joint.sum(axis=(1, 2), keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_likelihood = np.where(counts > 0, counts * np.log(joint), 0.0).sum(axis=(1, 2))
+    log_likelihood[~valid] = -np.inf
+    return float(grid[int(np.argmax(log_likelihood))])
+
+
+def rank_scores(matrix: np.ndarray, top: int | None = None) -> list[dict[str, Any]]:
+    """
+    Ordena los marcadores de una matriz por probabilidad descendente.
+
+    Ante empates se mantiene el orden de la matriz (local 0..Mas, visitante 0..Mas).
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        Matriz (4, 4) de probabilidades (ver score_matrix).
+    top : int | None, optional
+        Número máximo de marcadores a devolver. Si es None, los 16.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        Marcadores con score ("1-1", "Mas-0"...), probability y cumulative (en porcentaje, 1 decimal).
+    """
+    flat = matrix.ravel()
+    order = np.argsort(-flat, kind="stable")[:top]
+    cumulative = np.cumsum(flat[order])
+    return [
+        {
+            "score": f"{GOLES[index // len(GOLES)]}-{GOLES[index % len(GOLES)]}",
+            "probability": round(float(flat[index]) * 100, 1),
+            "cumulative": round(float(total) * 100, 1),
+        }
+        for index, total in zip(order, cumulative)
+    ]
+
+
+class PlenoAl15Engine:
+    """
+    Motor de predicción del pleno al 15.
+
+    Attributes
+    ----------
+    rho : float
+        Parámetro de dependencia Dixon–Coles (0 = marginales independientes).
+
+    Examples
+    --------
+    >>> engine = PlenoAl15Engine.from_history(store=TeamHistoryStore(), temporada=2026)
+    >>> engine.predict(prob=frame.raw_prob(match_id=15), top=3)["ranking"]
+    [{'score': '1-1', 'probability': 14.2, 'cumulative': 14.2}, ...]
+    """
+
+    def __init__(self, rho: float = 0.0) -> None:
+        """
+        Crea el motor.
+
+        Parameters
+        ----------
+        rho : float, optional
+            Parámetro de dependencia Dixon–Coles (default: 0, independencia).
+        """
+        self.rho = rho
+
+    @classmethod
+    def from_history(cls, store: Any, temporada: int | None = None) -> "PlenoAl15Engine":
+        """
+        Crea el motor con la corrección Dixon–Coles ajustada sobre los resultados de un histórico.
+
+        Parameters
+        ----------
+        store : TeamHistoryStore
+            Histórico de resultados.
+        temporada : int | None, optional
+            Si se indica, sólo se usan los resultados de esa temporada.
+
+        Returns
+        -------
+        PlenoAl15Engine
+            Motor con rho ajustado (0.0 si el histórico está vacío).
+        """
+        return cls(rho=fit_rho(scores=store.scores(temporada=temporada)))
+
+    def matrix(self, prob: dict[str, Any]) -> np.ndarray:
+        """
+        Matriz 4×4 de probabilidades de marcador de un partido.
+
+        Parameters
+        ----------
+        prob : dict[str, Any]
+            Probabilidades del partido con las marginales de goles.
+
+        Returns
+        -------
+        np.ndarray
+            Matriz (4, 4) que suma 1 (o de ceros si faltan marginales).
+        """
+        local, visitante = goal_marginals(prob=prob)
+        return score_matrix(local=local, visitante=visitante, rho=self.rho)
+
+    def best_score(self, prob: dict[str, Any]) -> str:
+        """
+        Marcador más probable de un partido.
+
+        Parameters
+        ----------
+        prob : dict[str, Any]
+            Probabilidades del partido con las marginales de goles.
+
+        Returns
+        -------
+        str
+            Marcador ("1-1", "Mas-0"...), o "" si no hay probabilidades de goles.
+        """
+        return self.predict(prob=prob, top=1)["best"]
+
+    def predict(self, prob: dict[str, Any], top: int | None = None) -> dict[str, Any]:
+        """
+        Predicción completa del pleno al 15 de un partido.
+
+        Parameters
+        ----------
+        prob : dict[str, Any]
+            Probabilidades del partido con las marginales de goles.
+        top : int | None, optional
+            Número de marcadores del ranking. Si es None, los 16.
+
+        Returns
+        -------
+        dict[str, Any]
+            Diccionario con:
+            - rho: Parámetro de dependencia usado
+            - best: Marcador más probable ("" si no hay probabilidades de goles)
+            - matrix: Matriz 4×4 en porcentaje (filas goles local, columnas goles visitante, en el orden de GOLES)
+            - ranking: Marcadores ordenados con probability y cumulative
+        """
+        matrix = self.matrix(prob=prob)
+        ranking = rank_scores(matrix=matrix, top=top)
+        return {
+            "rho": self.rho,
+            "best": ranking[0]["score"] if ranking and matrix.any() else "",
+            "matrix": np.round(matrix * 100, 1).tolist(),
+            "ranking": ranking,
+        }
+
+    def coverage(self, prob: dict[str, Any], target: float) -> list[dict[str, Any]]:
+        """
+        Conjunto mínimo de marcadores cuya probabilidad conjunta alcanza un objetivo (apuestas múltiples).
+
+        Parameters
+        ----------
+        prob : dict[str, Any]
+            Probabilidades del partido con las marginales de goles.
+        target : float
+            Probabilidad objetivo en porcentaje (0-100).
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Marcadores más probables hasta alcanzar target (todos si no se alcanza).
+        """
+        ranking = rank_scores(matrix=self.matrix(prob=prob))
+        for i, score in enumerate(ranking, start=1):
+            if score["cumulative"] >= target:
+                return ranking[:i]
+        return ranking
@@ -0,0 +1,265 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Diversificación de carteras de columnas para KinielaGPT.
+
+Jugar muchas columnas parecidas desperdicia dinero: si una acierta 14, sus casi duplicadas aciertan 13 en los
+mismos resultados. Este módulo elige N columnas de un conjunto de candidatas maximizando la probabilidad de
+que al menos una alcance una categoría alta (min_hits aciertos), estimada sobre resultados simulados con las
+probabilidades de la jornada (columns.sample_outcomes), que recogen la estructura de correlación entre
+columnas sin calcularla explícitamente.
+
+La probabilidad de "al menos un acierto" es una función de cobertura, submodular, así que el voraz que añade
+en cada paso la columna que cubre más simulaciones aún no cubiertas tiene garantía (1 - 1/e). Una columna
+cubre una simulación si difieren en como mucho n_matches - min_hits partidos, de modo que la incidencia se
+construye desde las simulaciones: se generan sus vecinas de Hamming sobre la codificación en bits y se
+buscan entre las candidatas ordenadas. Al cubrir una simulación sólo cambian las ganancias de las candidatas
+que la cubren, y cada paso cuesta un argmax vectorizado, lo que permite elegir miles de columnas entre un
+millón de candidatas.
+"""
+
+import itertools
+from typing import Any
+
+import numpy as np
+
+from kinielagpt import columns
+from kinielagpt.value import SIGNOS
+
+# Número de resultados simulados por defecto para estimar la probabilidad de la cartera
+SIMULACIONES = 20_000
+
+# Número de candidatas muestreadas por defecto cuando no se proporcionan
+CANDIDATAS = 200_000
+
+# Fallos máximos admitidos (n_matches - min_hits): las bolas de Hamming de radio mayor son demasiado grandes
+MAX_FALLOS = 2
+
+
+def prediction_probabilities(predictions: list[dict[str, Any]]) -> tuple[np.ndarray, list[int]]:
+    """
+    Matriz de probabilidades 1/X/2 de los partidos con signo de una predicción de KinielaPredictor.
+
+    Parameters
+    ----------
+    predictions : list[dict[str, Any]]
+        Lista predictions de KinielaPredictor.predict.
+
+    Returns
+    -------
+    tuple[np.ndarray, list[int]]
+        Matriz (partidos, 3) normalizada y match_id de cada fila (el orden de columns.from_predictions).
+    """
+    normal = [pred for pred in predictions if pred["prediction"] in SIGNOS]
+    matrix = np.array([[pred["probabilities"].get(sign, 0.0) for sign in SIGNOS] for pred in normal], dtype=float)
+    totals = matrix.sum(axis=1, keepdims=True)
+    matrix = np.where(totals > 0, matrix / np.where(totals > 0, totals, 1.0), 1 / len(SIGNOS))
+    return matrix, [pred["match_id"] for pred in normal]
+
+
+def coverage_index(candidates: np.ndarray, outcomes: np.ndarray, n_matches: int, min_hits: int) -> np.ndarray:
+    """
+    Candidatas que cubren cada resultado simulado.
+
+    Parameters
+    ----------
+    candidates : np.ndarray
+        Columnas candidatas codificadas, ordenadas y sin repetidos.
+    outcomes : np.ndarray
+        Resultados codificados.
+    n_matches : int
+        Número de partidos de cada columna.
+    min_hits : int
+        Aciertos mínimos para considerar cubierto un resultado.
+
+    Returns
+    -------
+    np.ndarray
+        Matriz np.int32 (resultados, tamaño de bola) con la posición en candidates de cada vecina de Hamming
+        del resultado que es candidata, o -1.
+
+    Raises
+    ------
+    ValueError
+        Si n_matches - min_hits supera MAX_FALLOS.
+    """
+    errors = n_matches - min_hits
+    if errors < 0 or errors > MAX_FALLOS:
+        raise ValueError(f"min_hits debe estar entre {n_matches - MAX_FALLOS} y {n_matches}")
+
+    outcomes = np.asarray(outcomes, dtype=np.uint32)
+    codes = columns.decode(packed=outcomes, n_matches=n_matches).astype(np.uint32)
+    neighbours = [outcomes]
+    for size in range(1, errors + 1):
+        for positions in itertools.combinations(range(n_matches), size):
+            for shifts in itertools.product((1, 2), repeat=size):
+                neighbour = outcomes.copy()
+                for position, shift in zip(positions, shifts):
+                    changed = (codes[:, position] + np.uint32(shift)) % np.uint32(len(SIGNOS))
+                    neighbour ^= (changed ^ codes[:, position]) << np.uint32(2 * position)
+                neighbours.append(neighbour)
+
+    stacked = np.stack(neighbours, axis=1)
+    positions = np.searchsorted(candidates, stacked)
+    found = positions < candidates.shape[0]
+    found[found] = candidates[positions[found]] == stacked[found]
+    return np.where(found, positions, -1).astype(np.int32)
+
+
+def select_diverse(candidates: np.ndarray, outcomes: np.ndarray, n_columns: int, n_matches: int,
+                   min_hits: int = 13, weights: np.ndarray | None = None) -> dict[str, Any]:
+    """
+    Elige n_columns candidatas maximizando la probabilidad de al menos un premio de min_hits aciertos.
+
+    Parameters
+    ----------
+    candidates : np.ndarray
+        Columnas candidatas codificadas (ver columns.encode).
+    outcomes : np.ndarray
+        Resultados simulados codificados, equiprobables.
+    n_columns : int
+        Número de columnas de la cartera.
+    n_matches : int
+        Número de partidos de cada columna.
+    min_hits : int, optional
+        Aciertos de la categoría objetivo (default: 13, es decir, 13 o 14).
+    weights : np.ndarray | None, optional
+        Peso de cada candidata (p. ej. su probabilidad). Sólo desempata entre candidatas con la misma
+        ganancia, a favor de las de mayor peso.
+
+    Returns
+    -------
+    dict[str, Any]
+        Diccionario con:
+        - columns: Columnas elegidas codificadas (np.uint32), en el orden del voraz
+        - probability: Probabilidad estimada (%) de al menos un premio con la cartera
+        - curve: Probabilidad acumulada (%) tras añadir cada columna
+        - independent_probability: Probabilidad (%) con las n_columns candidatas de mayor cobertura individual,
+          sin diversificar, como referencia
+        La cartera puede tener menos de n_columns columnas si las restantes no cubren ninguna simulación.
+    """
+    candidates = np.asarray(candidates, dtype=np.uint32)
+    outcomes = np.asarray(outcomes, dtype=np.uint32)
+    weights = np.zeros(candidates.shape[0]) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    # Candidatas únicas ordenadas por peso descendente: argmax desempata hacia la primera (la de mayor peso)
+    unique, first = np.unique(candidates, return_index=True)
+    by_weight = np.argsort(-weights[first], kind="stable")
+    rank_of_sorted = np.empty_like(by_weight)
+    rank_of_sorted[by_weight] = np.arange(by_weight.shape[0])
+    ranked = unique[by_weight]
+
+    cover = coverage_index(candidates=unique, outcomes=outcomes, n_matches=n_matches, min_hits=min_hits)
+    cover = np.where(cover >= 0, rank_of_sorted[np.maximum(cover, 0)], -1)
+
+    # Incidencia inversa: simulaciones cubiertas por cada candidata (CSR por candidata)
+    flat = cover.ravel()
+    valid = flat >= 0
+    pair_candidate = flat[valid]
+    pair_outcome = np.repeat(np.arange(cover.shape[0]), cover.shape[1])[valid]
+    order = np.argsort(pair_candidate, kind="stable")
+    pair_outcome = pair_outcome[order]
+    starts = np.searchsorted(pair_candidate[order], np.arange(ranked.shape[0] + 1))
+
+    gains = np.diff(starts).astype(np.int64)
+    independent = np.argsort(-gains, kind="stable")[:n_columns]
+    independent_covered = np.zeros(outcomes.shape[0], dtype=bool)
+    for candidate in independent:
+        independent_covered[pair_outcome[starts[candidate]:starts[candidate + 1]]] = True
+
+    uncovered = np.ones(outcomes.shape[0], dtype=bool)
+    chosen = []
+    curve = []
+    covered = 0
+    for _ in range(n_columns):
+        candidate = int(np.argmax(gains))
+        if gains[candidate] == 0:
+            break
+        sims = pair_outcome[starts[candidate]:starts[candidate + 1]]
+        newly = sims[uncovered[sims]]
+        uncovered[newly] = False
+        affected = cover[newly].ravel()
+        np.subtract.at(gains, affected[affected >= 0], 1)
+        chosen.append(candidate)
+        covered += newly.shape[0]
+        curve.append(round(100 * covered / outcomes.shape[0], 2))
+
+    return {
+        "columns": ranked[np.array(chosen, dtype=np.int64)],
+        "probability": curve[-1] if curve else 0.0,
+        "curve": curve,
+        "independent_probability": round(100 * independent_covered.mean(), 2),
+    }
+
+
+def build_portfolio(predictions: list[dict[str, Any]], n_columns: int, min_hits: int = 13,
+                    candidates: np.ndarray | None = None, n_candidates: int = CANDIDATAS,
+                    n_simulations: int = SIMULACIONES, seed: int = 0) -> dict[str, Any]:
+    """
+    Construye una cartera diversificada de columnas a partir de una predicción de KinielaPredictor.
+
+    Parameters
+    ----------
+    predictions : list[dict[str, Any]]
+        Lista predictions de KinielaPredictor.predict (sus probabilidades 1/X/2 definen las simulaciones).
+    n_columns : int
+        Número de columnas de la cartera.
+    min_hits : int, optional
+        Aciertos de la categoría objetivo (default: 13).
+    candidates : np.ndarray | None, optional
+        Candidatas codificadas. Si es None, se muestrean n_candidates columnas con las mismas probabilidades;
+        la columna de la predicción se añade siempre.
+    n_candidates : int, optional
+        Candidatas muestreadas cuando no se proporcionan (default: CANDIDATAS).
+    n_simulations : int, optional
+        Resultados simulados (default: SIMULACIONES).
+    seed : int, optional
+        Semilla de las simulaciones y del muestreo de candidatas (default: 0).
+
+    Returns
+    -------
+    dict[str, Any]
+        Resultado de select_diverse con las columnas como cadenas de signos, más match_ids, min_hits,
+        n_simulations y candidates (número de candidatas distintas).
+    """
+    probabilities, match_ids = prediction_probabilities(predictions=predictions)
+    n_matches = len(match_ids)
+    rng = np.random.default_rng(seed)
+    outcomes = columns.sample_outcomes(probabilities=probabilities, size=n_simulations, rng=rng)
+
+    if candidates is None:
+        sampled = columns.sample_outcomes(probabilities=probabilities, size=n_candidates, rng=rng)
+        candidates = np.unique(np.append(sampled, columns.from_predictions(predictions)[0]))
+
+    log_probabilities = np.log(np.clip(probabilities, 1e-9, None))
+    codes = columns.decode(packed=candidates, n_matches=n_matches)
+    weights = log_probabilities[np.arange(n_matches), codes].sum(axis=1)
+
+    result = select_diverse(candidates=candidates, outcomes=outcomes, n_columns=n_columns, n_matches=n_matches,
+                            min_hits=min_hits, weights=weights)
+    result["columns"] = columns.decode_strings(packed=result["columns"], n_matches=n_matches)
+    result.update({
+        "match_ids": match_ids,
+        "min_hits": min_hits,
+        "n_simulations": n_simulations,
+        "candidates": int(np.unique(candidates).shape[0]),
+    })
+    return result
@@ -20,15 +20,20 @@
 """
 Motor de predicción de quiniela con múltiples estrategias.
 
-Este módulo implementa las tres estrategias de predicción:
+Este módulo implementa las estrategias de predicción:
 - Conservadora: Selecciona siempre el signo con mayor probabilidad
 - Arriesgada: Balancea probabilidades con análisis contextual
 - Personalizada: Optimiza según distribución de signos especificada por el usuario
+- Valor: Maximiza el valor esperado del premio (probabilidad LAE frente a porcentaje de apuestas del público)
 """
 
-from typing import Any
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, ClassVar
 
-from kinielagpt import data_source
+from kinielagpt import data_source, value
+from kinielagpt.pleno import PlenoAl15Engine
+from kinielagpt.records import JornadaFrame, MatchRecord
 
 
 class KinielaPredictor:
@@ -39,20 +44,52 @@ class KinielaPredictor:
     ----------
     __strategies : dict
         Diccionario mapeando nombres de estrategias a métodos de predicción.
+    __pleno : PlenoAl15Engine
+        Motor del pleno al 15 usado en los partidos excepcionales.
+    __match_cache : dict
+        Análisis memoizado por partido (contexto, probabilidades ajustadas, predicción arriesgada y scores de
+        la estrategia personalizada), indexado por las entradas del partido. Volver a predecir tras un cambio
+        en pocos partidos, o con otra estrategia, sólo recalcula los partidos cuyas entradas han cambiado.
     """
 
-    def __init__(self) -> None:
+    # Distribución de la estrategia personalizada cuando no se especifica otra
+    DEFAULT_CUSTOM_DISTRIBUTION: ClassVar[Mapping[str, int]] = MappingProxyType({"1": 7, "X": 4, "2": 4})
+
+    # Número de marcadores del ranking incluido en la predicción del pleno al 15
+    PLENO_RANKING_SIZE = 5
+
+    # Número máximo de partidos memoizados (se descartan los más antiguos)
+    MATCH_CACHE_SIZE = 1024
+
+    def __init__(self, pleno: PlenoAl15Engine | None = None) -> None:
         """
         Inicializa el predictor con las estrategias disponibles.
+
+        Parameters
+        ----------
+        pleno : PlenoAl15Engine | None, optional
+            Motor del pleno al 15. Si es None, se usan marginales de goles independientes (rho=0); con
+            PlenoAl15Engine.from_history se aplica la corrección Dixon–Coles ajustada sobre el histórico.
         """
+        self.__pleno = pleno or PlenoAl15Engine()
         self.__strategies = {
             "conservadora": self.__predict_conservative,
             "arriesgada": self.__predict_risky,
             "personalizada": self.__predict_custom,
+            "valor": self.__predict_value,
         }
+        self.__match_cache: dict[tuple, dict[str, Any]] = {}
+
+    def clear_cache(self) -> None:
+        """
+        Vacía el análisis memoizado por partido.
+        """
+        self.__match_cache.clear()
 
     def predict(self, jornada: int, temporada: int, strategy: str = "conservadora",
-                custom_distribution: dict[str, int] | None = None) -> dict[str, Any] | None:
+                custom_distribution: dict[str, int] | None = None,
+                frame: JornadaFrame | None = None,
+                sources: dict[str, list] | None = None) -> dict[str, Any] | None:
         """
         Genera una predicción completa de quiniela.
         
@@ -63,7 +100,7 @@ class KinielaPredictor:
         El proceso incluye:
         1. Validación de la estrategia y parámetros
         2. Obtención de probabilidades LAE y detalles de partidos
-        3. Ejecución de la estrategia seleccionada (conservadora, arriesgada o personalizada)
+        3. Ejecución de la estrategia seleccionada (conservadora, arriesgada, personalizada o valor)
         4. Cálculo del resumen con distribución final de signos
         5. Retorno del resultado completo con predicciones y metadatos
 
@@ -74,11 +111,18 @@ class KinielaPredictor:
         temporada : int
             Año de la temporada.
         strategy : str, optional
-            Estrategia de predicción: "conservadora", "arriesgada" o "personalizada" (default: "conservadora").
+            Estrategia de predicción: "conservadora", "arriesgada", "personalizada" o "valor"
+            (default: "conservadora").
         custom_distribution : dict[str, int] | None, optional
             Distribución personalizada para strategy="personalizada". Debe contener claves:
             "1", "X", "2". Si no se proporciona, usa distribución por defecto: {"1": 7, "X": 4, "2": 4}.
             Ejemplo: {"1": 8, "X": 4, "2": 3}.
+        frame : JornadaFrame | None, optional
+            Registros de la jornada ya construidos. Si es None, se obtienen de data_source.
+        sources : dict[str, list] | None, optional
+            Probabilidades por fuente (data_source.get_kiniela_probabilities_by_source) para strategy="valor".
+            Si es None, se usan las columnas por fuente de los registros (source_probs) y, si no las tienen,
+            se obtienen de data_source.
 
         Returns
         -------
@@ -91,7 +135,8 @@ class KinielaPredictor:
               confidence, reasoning, probabilities. Para partidos excepcionales con probabilidades de goles, 
               prediction es el marcador más probable (ej: "1-1"), confidence="N/A", 
               reasoning="Marcador más probable basado en probabilidades de goles", 
-              y probabilities contiene las probabilidades de goles.
+              probabilities contiene las probabilidades de goles y score_ranking los PLENO_RANKING_SIZE
+              marcadores más probables con probability y cumulative (ver pleno.PlenoAl15Engine).
             - summary: Resumen con distribución de signos (solo incluye partidos normales)
             Retorna None si hay algún error.
 
@@ -116,75 +161,227 @@ class KinielaPredictor:
         ...     custom_distribution={"1": 8, "X": 4, "2": 3}
         ... )
         """
+        self.__check_strategy(strategy=strategy, custom_distribution=custom_distribution)
+
+        # Obtener datos necesarios (la estrategia de valor necesita las probabilidades de cada fuente)
+        if frame is None:
+            frame = JornadaFrame.load(jornada=jornada, temporada=temporada, by_source=strategy == "valor")
+
+        if frame is None:
+            return None
+
+        if strategy == "valor" and sources is None and not self.__has_source_probs(frame=frame):
+            sources = data_source.get_kiniela_probabilities_by_source(jornada=jornada, temporada=temporada)
+
+        return self.__predict_frame(
+            frame=frame, jornada=jornada, temporada=temporada, strategy=strategy,
+            custom_distribution=custom_distribution, sources=sources,
+        )
+
+    def predict_many(self, jornada: int, temporada: int, strategies: list[str | dict[str, Any]],
+                     frame: JornadaFrame | None = None,
+                     sources: dict[str, list] | None = None) -> dict[str, Any] | None:
+        """
+        Genera en una sola pasada las predicciones de varias estrategias y compara en qué partidos difieren.
+
+        Los datos de la jornada se obtienen una única vez y el análisis contextual de cada partido se calcula
+        una sola vez y se comparte entre todas las estrategias (memoización por partido).
+
+        Parameters
+        ----------
+        jornada : int
+            Número de jornada a predecir.
+        temporada : int
+            Año de la temporada.
+        strategies : list[str | dict[str, Any]]
+            Estrategias a evaluar. Cada elemento es el nombre de una estrategia o un diccionario con las claves
+            "strategy" y, opcionalmente, "custom_distribution" (sólo para "personalizada").
+            Ejemplo: ["conservadora", "arriesgada", {"strategy": "personalizada",
+            "custom_distribution": {"1": 8, "X": 4, "2": 3}}].
+        frame : JornadaFrame | None, optional
+            Registros de la jornada ya construidos. Si es None, se obtienen de data_source.
+        sources : dict[str, list] | None, optional
+            Probabilidades por fuente para la estrategia "valor". Si es None y se pide esa estrategia, se usan
+            las columnas por fuente de los registros o se obtienen una sola vez de data_source.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Diccionario con:
+            - jornada: Número de jornada
+            - temporada: Año de temporada
+            - strategies: Etiquetas de las estrategias evaluadas, en orden (ej: "personalizada 8-4-3")
+            - predictions: Resultado de predict para cada etiqueta
+            - disagreements: Partidos en los que las estrategias no coinciden, con match_id, match y
+              la predicción de cada etiqueta
+            - agreement: Número de partidos en los que todas las estrategias coinciden
+            Retorna None si no se pueden obtener los datos de la jornada.
+
+        Raises
+        ------
+        ValueError
+            Si no se indica ninguna estrategia o alguna es inválida.
+        """
+        if not strategies:
+            raise ValueError("Debe indicarse al menos una estrategia")
+
+        # Validar todas las estrategias antes de descargar datos
+        specs: dict[str, tuple[str, dict[str, int] | None]] = {}
+        for item in strategies:
+            if isinstance(item, str):
+                strategy, custom_distribution = item, None
+            else:
+                strategy = item.get("strategy", "conservadora")
+                custom_distribution = item.get("custom_distribution")
+            self.__check_strategy(strategy=strategy, custom_distribution=custom_distribution)
+            if strategy == "personalizada":
+                distribution = custom_distribution or self.DEFAULT_CUSTOM_DISTRIBUTION
+                label = f"personalizada {distribution['1']}-{distribution['X']}-{distribution['2']}"
+            else:
+                label = strategy
+            specs.setdefault(label, (strategy, custom_distribution))
+
+        needs_sources = any(strategy == "valor" for strategy, _ in specs.values())
+        if frame is None:
+            frame = JornadaFrame.load(jornada=jornada, temporada=temporada, by_source=needs_sources)
+
+        if frame is None:
+            return None
+
+        if needs_sources and sources is None and not self.__has_source_probs(frame=frame):
+            sources = data_source.get_kiniela_probabilities_by_source(jornada=jornada, temporada=temporada)
+
+        results = {
+            label: self.__predict_frame(
+                frame=frame, jornada=jornada, temporada=temporada, strategy=strategy,
+                custom_distribution=custom_distribution, sources=sources,
+            )
+            for label, (strategy, custom_distribution) in specs.items()
+        }
+
+        # Comparar las predicciones partido a partido
+        disagreements = []
+        by_match: dict[int, dict[str, Any]] = {}
+        for label, result in results.items():
+            for pred in result["predictions"]:
+                entry = by_match.setdefault(pred["match_id"], {"match": pred["match"], "predictions": {}})
+                entry["predictions"][label] = pred["prediction"]
+        for match_id in sorted(by_match):
+            entry = by_match[match_id]
+            if len(set(entry["predictions"].values())) > 1:
+                disagreements.append(
+                    {"match_id": match_id, "match": entry["match"], "predictions": entry["predictions"]}
+                )
+
+        return {
+            "jornada": jornada,
+            "temporada": temporada,
+            "strategies": list(results),
+            "predictions": results,
+            "disagreements": disagreements,
+            "agreement": len(by_match) - len(disagreements),
+        }
+
+    def __has_source_probs(self, frame: JornadaFrame) -> bool:
+        """
+        Indica si todos los partidos normales de la jornada incluyen las probabilidades de cada fuente.
+
+        Parameters
+        ----------
+        frame : JornadaFrame
+            Registros de la jornada.
+
+        Returns
+        -------
+        bool
+            True si ningún partido normal tiene source_probs a None.
+        """
+        return all(record.source_probs is not None for record in frame if not record.is_exceptional)
+
+    def __check_strategy(self, strategy: str, custom_distribution: dict[str, int] | None) -> None:
+        """
+        Valida una estrategia y su distribución personalizada.
+
+        Parameters
+        ----------
+        strategy : str
+            Nombre de la estrategia.
+        custom_distribution : dict[str, int] | None
+            Distribución personalizada (sólo se valida para "personalizada").
+
+        Raises
+        ------
+        ValueError
+            Si la estrategia no es válida o custom_distribution es inválida.
+        """
         if strategy not in self.__strategies:
             raise ValueError(f"Estrategia desconocida: {strategy}. Opciones: {list(self.__strategies.keys())}")
 
-        if strategy == "personalizada":
-            if custom_distribution is not None and not self.__validate_custom_distribution(
-                distribution=custom_distribution
-            ):
-                raise ValueError("custom_distribution inválida. Debe sumar 15 y contener claves '1', 'X', '2'")
+        if (strategy == "personalizada" and custom_distribution is not None
+                and not self.__validate_custom_distribution(distribution=custom_distribution)):
+            raise ValueError("custom_distribution inválida. Debe sumar 15 y contener claves '1', 'X', '2'")
 
-        # Obtener datos necesarios
-        probabilities = data_source.get_kiniela_probabilities(jornada=jornada, temporada=temporada)
-        details = data_source.get_kiniela_matches_details(jornada=jornada, temporada=temporada)
+    def __predict_frame(self, frame: JornadaFrame, jornada: int, temporada: int, strategy: str,
+                        custom_distribution: dict[str, int] | None,
+                        sources: dict[str, list] | None = None) -> dict[str, Any]:
+        """
+        Ejecuta una estrategia ya validada sobre los registros de una jornada.
 
-        if probabilities is None or details is None:
-            return None
+        Parameters
+        ----------
+        frame : JornadaFrame
+            Registros de la jornada.
+        jornada : int
+            Número de jornada.
+        temporada : int
+            Año de la temporada.
+        strategy : str
+            Estrategia de predicción.
+        custom_distribution : dict[str, int] | None
+            Distribución personalizada para strategy="personalizada".
+        sources : dict[str, list] | None, optional
+            Probabilidades por fuente para strategy="valor".
 
+        Returns
+        -------
+        dict[str, Any]
+            Predicción completa con la estructura descrita en predict.
+        """
         # Separar partidos normales y excepcionales
-        normal_indices = []
-        exceptional_indices = []
-        for i, prob in enumerate(probabilities):
-            if "1_Prob" in prob:
-                normal_indices.append(i)
-            else:
-                exceptional_indices.append(i)
-
-        normal_probs = [probabilities[i] for i in normal_indices]
-        normal_details = [details[i] for i in normal_indices]
-        exceptional_probs = [probabilities[i] for i in exceptional_indices]
+        normal_records = [record for record in frame if not record.is_exceptional]
+        exceptional_records = [record for record in frame if record.is_exceptional]
 
         # Ejecutar estrategia para partidos normales
         predictions_normal = []
-        if normal_probs:
+        if normal_records:
             if strategy == "personalizada":
                 predictions_normal = self.__strategies[strategy](
-                    probabilities=normal_probs,
-                    details=normal_details,
+                    records=normal_records,
                     custom_distribution=custom_distribution,
                 )
+            elif strategy == "valor":
+                predictions_normal = self.__strategies[strategy](records=normal_records, sources=sources)
             else:
-                predictions_normal = self.__strategies[strategy](
-                    probabilities=normal_probs,
-                    details=normal_details,
-                )
+                predictions_normal = self.__strategies[strategy](records=normal_records)
             # Ajustar match_id
             for j, pred in enumerate(predictions_normal):
-                pred["match_id"] = normal_indices[j] + 1
+                pred["match_id"] = normal_records[j].match_id
 
         # Crear predicciones para partidos excepcionales
         predictions_exceptional = []
-        for j, prob in enumerate(exceptional_probs):
-            match_id = exceptional_indices[j] + 1
-            # Calcular marcador más probable
-            max_prob = 0
-            best_score = ""
-            for local in ["0", "1", "2", "Mas"]:
-                for visitor in ["0", "1", "2", "Mas"]:
-                    p_l = prob.get(f"{local}_Goles_Local_Prob", 0)
-                    p_v = prob.get(f"{visitor}_Goles_Visitante_Prob", 0)
-                    joint_prob = p_l * p_v
-                    if joint_prob > max_prob:
-                        max_prob = joint_prob
-                        best_score = f"{local}-{visitor}"
+        for record in exceptional_records:
+            match_id = record.match_id
+            prob = frame.raw_prob(match_id=match_id)
+            # Matriz 4x4 de marcadores y ranking (el primero es el marcador más probable)
+            pleno = self.__pleno.predict(prob=prob, top=self.PLENO_RANKING_SIZE)
             predictions_exceptional.append({
                 "match_id": match_id,
-                "match": prob["partido"],
-                "prediction": best_score,
+                "match": record.partido,
+                "prediction": pleno["best"],
                 "confidence": "N/A",
                 "reasoning": "Marcador más probable basado en probabilidades de goles",
                 "probabilities": prob,
+                "score_ranking": pleno["ranking"],
             })
 
         # Combinar todas las predicciones
@@ -202,8 +399,7 @@ class KinielaPredictor:
             "summary": summary,
         }
 
-    def __predict_conservative(self, probabilities: list[dict[str, Any]], 
-                               details: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def __predict_conservative(self, records: list[MatchRecord]) -> list[dict[str, Any]]:
         """
         Estrategia conservadora: Selecciona siempre el signo con mayor probabilidad.
         
@@ -222,10 +418,8 @@ class KinielaPredictor:
 
         Parameters
         ----------
-        probabilities : list[dict[str, Any]]
-            Lista de probabilidades de cada partido.
-        details : list[dict[str, Any]]
-            Lista de detalles de cada partido.
+        records : list[MatchRecord]
+            Registros de los partidos con probabilidades y detalles.
 
         Returns
         -------
@@ -234,15 +428,10 @@ class KinielaPredictor:
         """
         predictions = []
 
-        for i, (prob, detail) in enumerate(iterable=zip(probabilities, details), start=1):
-            # Determinar signo con mayor probabilidad
-            probs = {
-                "1": prob.get("1_Prob", 0),
-                "X": prob.get("X_Prob", 0),
-                "2": prob.get("2_Prob", 0),
-            }
-            predicted_sign = max(probs, key=lambda k: probs[k])
-            max_prob = probs[predicted_sign]
+        for i, record in enumerate(records, start=1):
+            # Signo con mayor probabilidad (precalculado en el registro)
+            predicted_sign = record.max_sign
+            max_prob = record.max_prob
 
             # Determinar nivel de confianza basado en probabilidad
             if max_prob >= 60:
@@ -258,18 +447,17 @@ class KinielaPredictor:
             predictions.append(
                 {
                     "match_id": i,
-                    "match": prob["partido"],
+                    "match": record.partido,
                     "prediction": predicted_sign,
                     "confidence": confidence,
                     "reasoning": reasoning,
-                    "probabilities": probs,
+                    "probabilities": record.probs,
                 }
             )
 
         return predictions
 
-    def __predict_risky(self, probabilities: list[dict[str, Any]], 
-                        details: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def __predict_risky(self, records: list[MatchRecord]) -> list[dict[str, Any]]:
         """
         Estrategia arriesgada: Balancea probabilidades con análisis contextual.
 
@@ -295,10 +483,8 @@ class KinielaPredictor:
 
         Parameters
         ----------
-        probabilities : list[dict[str, Any]]
-            Lista de probabilidades de cada partido.
-        details : list[dict[str, Any]]
-            Lista de detalles de cada partido.
+        records : list[MatchRecord]
+            Registros de los partidos con probabilidades y detalles.
 
         Returns
         -------
@@ -307,51 +493,26 @@ class KinielaPredictor:
         """
         predictions = []
 
-        for i, (prob, detail) in enumerate(iterable=zip(probabilities, details), start=1):
-            probs = {"1": prob.get("1_Prob", 0), "X": prob.get("X_Prob", 0), "2": prob.get("2_Prob", 0)}
-
-            # Análisis contextual
-            context_analysis = self.__analyze_context(detail=detail)
-
-            # Ajustar probabilidades según contexto
-            adjusted_probs = self.__adjust_probabilities(probs=probs, context=context_analysis)
-
-            # Seleccionar signo con mayor probabilidad ajustada
-            predicted_sign = max(adjusted_probs, key=lambda k: adjusted_probs[k])
-            final_prob = adjusted_probs[predicted_sign]
-
-            # Determinar confianza
-            if final_prob >= 55:
-                confidence = "ALTA"
-            elif 40 <= final_prob < 55:
-                confidence = "MEDIA"
-            else:
-                confidence = "BAJA"
-
-            # Generar justificación detallada
-            reasoning = self.__generate_reasoning(
-                predicted_sign=predicted_sign,
-                original_probs=probs,
-                adjusted_probs=adjusted_probs,
-                context=context_analysis,
-            )
+        for i, record in enumerate(records, start=1):
+            # Contexto, probabilidades ajustadas, signo, confianza y justificación (memoizados por partido)
+            analysis = self.__match_analysis(record=record)
 
             predictions.append(
                 {
                     "match_id": i,
-                    "match": prob["partido"],
-                    "prediction": predicted_sign,
-                    "confidence": confidence,
-                    "reasoning": reasoning,
-                    "probabilities": probs,
-                    "adjusted_probabilities": adjusted_probs,
-                    "context_factors": context_analysis,
+                    "match": record.partido,
+                    "prediction": analysis["risky_sign"],
+                    "confidence": analysis["risky_confidence"],
+                    "reasoning": analysis["risky_reasoning"],
+                    "probabilities": record.probs,
+                    "adjusted_probabilities": dict(analysis["adjusted"]),
+                    "context_factors": dict(analysis["context"]),
                 }
             )
 
         return predictions
 
-    def __predict_custom(self, probabilities: list[dict[str, Any]], details: list[dict[str, Any]],
+    def __predict_custom(self, records: list[MatchRecord],
                          custom_distribution: dict[str, int] | None = None) -> list[dict[str, Any]]:
         """
         Estrategia personalizada: Optimiza para alcanzar la distribución especificada.
@@ -377,10 +538,8 @@ class KinielaPredictor:
 
         Parameters
         ----------
-        probabilities : list[dict[str, Any]]
-            Lista de probabilidades de cada partido.
-        details : list[dict[str, Any]]
-            Lista de detalles de cada partido.
+        records : list[MatchRecord]
+            Registros de los partidos con probabilidades y detalles.
         custom_distribution : dict[str, int] | None
             Distribución deseada: {"1": N, "X": M, "2": K}.
             Si es None, usa distribución por defecto: {"1": 7, "X": 4, "2": 4}.
@@ -392,7 +551,7 @@ class KinielaPredictor:
         """
         if custom_distribution is None:
             # Distribución por defecto: 7 locales, 4 empates, 4 visitantes
-            custom_distribution = {"1": 7, "X": 4, "2": 4}
+            custom_distribution = dict(self.DEFAULT_CUSTOM_DISTRIBUTION)
 
         target_1 = custom_distribution["1"]
         target_X = custom_distribution["X"]
@@ -400,20 +559,14 @@ class KinielaPredictor:
 
         # Calcular scores para cada partido y cada signo
         match_scores = []
-        for i, (prob, detail) in enumerate(iterable=zip(probabilities, details), start=1):
-            context = self.__analyze_context(detail=detail)
+        for i, record in enumerate(records, start=1):
+            analysis = self.__match_analysis(record=record)
             scores = {
                 "match_id": i,
-                "match": prob["partido"],
-                "1": prob.get("1_Prob", 0) * (1 + context.get("local_strength", 0) / 100),
-                "X": prob.get("X_Prob", 0) * (1 + context.get("draw_tendency", 0) / 100),
-                "2": prob.get("2_Prob", 0) * (1 + context.get("visitor_strength", 0) / 100),
-                "probabilities": {
-                    "1": prob.get("1_Prob", 0),
-                    "X": prob.get("X_Prob", 0),
-                    "2": prob.get("2_Prob", 0),
-                },
-                "context": context,
+                "match": record.partido,
+                **analysis["custom_scores"],
+                "probabilities": record.probs,
+                "context": dict(analysis["context"]),
             }
             match_scores.append(scores)
 
@@ -426,6 +579,164 @@ class KinielaPredictor:
 
         return predictions
 
+    def __predict_value(self, records: list[MatchRecord],
+                        sources: dict[str, list] | None = None) -> list[dict[str, Any]]:
+        """
+        Estrategia de valor: Maximiza el valor esperado del premio de la columna.
+
+        El premio se reparte entre los acertantes, así que una columna muy apostada vale menos aunque sea más
+        probable. Esta estrategia compara la probabilidad estimada por LAE con el porcentaje de apuestas del
+        público (Quinielista) y elige la columna con mayor fracción esperada del bote, P / (1 + N·Q), donde P es
+        la probabilidad de acierto de la columna, Q su cuota de apuestas y N el número de apuestas estimado.
+
+        El algoritmo:
+        1. Construye las matrices de probabilidades LAE y de porcentajes del público por partido
+        2. Evalúa de forma vectorizada todas las combinaciones de los dos signos más probables de cada partido
+           (value.best_value_column)
+        3. Asigna nivel de confianza según la probabilidad LAE del signo elegido (mismos umbrales que la
+           estrategia conservadora)
+        4. Justifica cada signo con su probabilidad, su porcentaje de apuestas y el ratio entre ambos
+
+        Parameters
+        ----------
+        records : list[MatchRecord]
+            Registros de los partidos con probabilidades y detalles.
+        sources : dict[str, list] | None, optional
+            Probabilidades por fuente (data_source.get_kiniela_probabilities_by_source). Los partidos sin datos
+            en sources usan las columnas por fuente del registro (source_probs) y, si no las tiene, sus
+            probabilidades fusionadas.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Lista de predicciones, con las claves habituales más lae_probabilities, public_shares y value_ratio
+            (probabilidad LAE / porcentaje del público del signo elegido; None si nadie lo ha apostado).
+        """
+        sources = sources or {}
+        rows = {source: {row.get("id"): row for row in sources.get(source) or []} for source in ("lae", "quiniela")}
+
+        def source_row(record: MatchRecord, source: str) -> dict[str, Any]:
+            if record.match_id in rows[source]:
+                return rows[source][record.match_id]
+            probs = record.probs if record.source_probs is None else record.source_probs_of(source)
+            return {f"{sign}_Prob": p for sign, p in probs.items()}
+
+        probabilities = value.sign_matrix([source_row(record, "lae") for record in records])
+        shares = value.sign_matrix([source_row(record, "quiniela") for record in records])
+        best = value.best_value_column(probabilities=probabilities, shares=shares)
+
+        predictions = []
+
+        for i, (record, code) in enumerate(zip(records, best["column"]), start=1):
+            predicted_sign = value.SIGNOS[code]
+            prob = float(probabilities[i - 1, code]) * 100
+            share = float(shares[i - 1, code]) * 100
+            ratio = prob / share if share > 0 else None
+
+            # Determinar nivel de confianza basado en la probabilidad LAE
+            if prob >= 60:
+                confidence = "ALTA"
+            elif 45 <= prob < 60:
+                confidence = "MEDIA"
+            else:
+                confidence = "BAJA"
+
+            # Generar justificación
+            reasoning = f"Probabilidad LAE del {predicted_sign}: {prob:.1f}% frente a {share:.1f}% de apuestas"
+            if ratio is not None:
+                reasoning += f" (ratio {ratio:.2f})"
+            favourite = value.SIGNOS[int(probabilities[i - 1].argmax())]
+            if favourite != predicted_sign:
+                reasoning += f". Se descarta el {favourite} por estar sobreapostado respecto a su probabilidad"
+
+            predictions.append(
+                {
+                    "match_id": i,
+                    "match": record.partido,
+                    "prediction": predicted_sign,
+                    "confidence": confidence,
+                    "reasoning": reasoning,
+                    "probabilities": record.probs,
+                    "lae_probabilities": {
+                        sign: round(float(p) * 100, 1) for sign, p in zip(value.SIGNOS, probabilities[i - 1])
+                    },
+                    "public_shares": {
+                        sign: round(float(q) * 100, 1) for sign, q in zip(value.SIGNOS, shares[i - 1])
+                    },
+                    "value_ratio": round(ratio, 2) if ratio is not None else None,
+                }
+            )
+
+        return predictions
+
+    def __match_analysis(self, record: MatchRecord) -> dict[str, Any]:
+        """
+        Devuelve el análisis de un partido, calculándolo sólo si sus entradas no están memoizadas.
+
+        La clave son las entradas que usan __context_from_values y __adjust_probabilities: probabilidades 1/X/2,
+        clasificaciones e histórico de enfrentamientos, leídas de los slots del registro.
+
+        Parameters
+        ----------
+        record : MatchRecord
+            Registro del partido.
+
+        Returns
+        -------
+        dict[str, Any]
+            Análisis con claves context, adjusted, risky_sign, risky_confidence, risky_reasoning y custom_scores
+            (score de cada signo para la estrategia personalizada). No debe modificarse.
+        """
+        key = (
+            record.prob_1, record.prob_x, record.prob_2,
+            record.clasificacion_local, record.clasificacion_visitante,
+            record.veces1, record.veces_x, record.veces2,
+        )
+        analysis = self.__match_cache.get(key)
+        if analysis is not None:
+            return analysis
+
+        probs = record.probs
+
+        # Análisis contextual y ajuste de probabilidades
+        context = self.__context_from_values(
+            clasificacion_local=record.clasificacion_local, clasificacion_visitante=record.clasificacion_visitante,
+            veces1=record.veces1, vecesX=record.veces_x, veces2=record.veces2,
+        )
+        adjusted = self.__adjust_probabilities(probs=probs, context=context)
+
+        # Seleccionar signo con mayor probabilidad ajustada
+        predicted_sign = max(adjusted, key=lambda k: adjusted[k])
+        final_prob = adjusted[predicted_sign]
+
+        # Determinar confianza
+        if final_prob >= 55:
+            confidence = "ALTA"
+        elif 40 <= final_prob < 55:
+            confidence = "MEDIA"
+        else:
+            confidence = "BAJA"
+
+        analysis = {
+            "context": context,
+            "adjusted": adjusted,
+            "risky_sign": predicted_sign,
+            "risky_confidence": confidence,
+            "risky_reasoning": self.__generate_reasoning(
+                predicted_sign=predicted_sign, original_probs=probs, adjusted_probs=adjusted, context=context
+            ),
+            "custom_scores": {
+                "1": record.prob_1 * (1 + context.get("local_strength", 0) / 100),
+                "X": record.prob_x * (1 + context.get("draw_tendency", 0) / 100),
+                "2": record.prob_2 * (1 + context.get("visitor_strength", 0) / 100),
+            },
+        }
+
+        if len(self.__match_cache) >= self.MATCH_CACHE_SIZE:
+            self.__match_cache.pop(next(iter(self.__match_cache)))
+        self.__match_cache[key] = analysis
+        return analysis
+
     def __analyze_context(self, detail: dict[str, Any]) -> dict[str, Any]:
         """
         Analiza el contexto de un partido para ajustar probabilidades.
@@ -462,6 +773,35 @@ class KinielaPredictor:
             - recent_form_local: Forma reciente del local
             - recent_form_visitor: Forma reciente del visitante
         """
+        return self.__context_from_values(
+            clasificacion_local=detail.get("clasificacionLocal", "10"),
+            clasificacion_visitante=detail.get("clasificacionVisitante", "10"),
+            veces1=detail.get("veces1", 0), vecesX=detail.get("vecesX", 0), veces2=detail.get("veces2", 0),
+        )
+
+    def __context_from_values(self, clasificacion_local: str | int | None, clasificacion_visitante: str | int | None,
+                              veces1: int, vecesX: int, veces2: int) -> dict[str, Any]:
+        """
+        Calcula el análisis contextual de __analyze_context a partir de los valores ya extraídos del partido.
+
+        Parameters
+        ----------
+        clasificacion_local : str | int | None
+            Clasificación del local ("3º 45pt" o la posición). None equivale a la posición por defecto "10".
+        clasificacion_visitante : str | int | None
+            Clasificación del visitante. None equivale a la posición por defecto "10".
+        veces1 : int
+            Victorias locales en el histórico de enfrentamientos.
+        vecesX : int
+            Empates en el histórico de enfrentamientos.
+        veces2 : int
+            Victorias visitantes en el histórico de enfrentamientos.
+
+        Returns
+        -------
+        dict[str, Any]
+            Análisis contextual con las mismas claves que __analyze_context.
+        """
         context = {
             "local_strength": 0,
             "visitor_strength": 0,
@@ -472,8 +812,8 @@ class KinielaPredictor:
 
         # Analizar clasificación (si disponible)
         try:
-            pos_local_raw = detail.get("clasificacionLocal", "10")
-            pos_visitor_raw = detail.get("clasificacionVisitante", "10")
+            pos_local_raw = "10" if clasificacion_local is None else clasificacion_local
+            pos_visitor_raw = "10" if clasificacion_visitante is None else clasificacion_visitante
             
             # Convertir a string si es int
             if isinstance(pos_local_raw, int):
@@ -492,9 +832,6 @@ class KinielaPredictor:
             pass
 
         # Analizar histórico
-        veces1 = detail.get("veces1", 0)
-        vecesX = detail.get("vecesX", 0)
-        veces2 = detail.get("veces2", 0)
         total_historic = veces1 + vecesX + veces2
         if total_historic > 0:
             context["local_strength"] += (veces1 / total_historic - 0.33) * 30
@@ -0,0 +1,403 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Registros tipados de partidos para KinielaGPT.
+
+Este módulo define registros compactos (dataclasses con slots) que agrupan, una sola vez por jornada,
+las probabilidades y los detalles de cada partido. El predictor, el analizador y el detector consumen
+estos registros en lugar de consultar repetidamente los diccionarios devueltos por data_source; los
+diccionarios originales solo se conservan en la jornada (JornadaFrame.raw_prob / raw_detail).
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from kinielagpt import data_source
+from kinielagpt.teams import TeamIndex
+
+SIGNS = ("1", "X", "2")
+
+
+@dataclass(slots=True)
+class MatchRecord:
+    """
+    Registro compacto de un partido de la jornada.
+
+    Los valores numéricos se extraen una única vez de los diccionarios de probabilidades y detalles,
+    conservando los mismos valores por defecto que usaban los componentes (0 si falta la clave), de
+    modo que las salidas JSON no cambian.
+
+    Attributes
+    ----------
+    match_id : int
+        Posición del partido dentro de la jornada (1-15).
+    partido : str
+        Partido en formato "LOCAL | VISITANTE".
+    prob_1 : float
+        Probabilidad del signo 1 (0 si no está disponible).
+    prob_x : float
+        Probabilidad del signo X (0 si no está disponible).
+    prob_2 : float
+        Probabilidad del signo 2 (0 si no está disponible).
+    max_sign : str
+        Signo con mayor probabilidad (en caso de empate, el primero en el orden 1, X, 2).
+    max_prob : float
+        Probabilidad del signo dominante.
+    is_exceptional : bool
+        True si el partido no tiene probabilidades 1X2 (pleno al 15, solo probabilidades de goles).
+    veces1 : int
+        Victorias locales en el histórico de enfrentamientos.
+    veces_x : int
+        Empates en el histórico de enfrentamientos.
+    veces2 : int
+        Victorias visitantes en el histórico de enfrentamientos.
+    clasificacion_local : str | int | None
+        Clasificación del local tal como llega en el detalle ("3º 45pt" o la posición), o None si falta.
+    clasificacion_visitante : str | int | None
+        Clasificación del visitante tal como llega en el detalle, o None si falta.
+    evolucion_local : tuple[str, ...]
+        Últimos resultados del local ('V', 'E', 'D'), del más reciente al más antiguo.
+    evolucion_visitante : tuple[str, ...]
+        Últimos resultados del visitante ('V', 'E', 'D'), del más reciente al más antiguo.
+    racha_local : tuple[str, ...]
+        Códigos de resultado ('VICTORIA', 'EMPATE', 'DERROTA') de los últimos partidos del local, en orden por
+        jornada (grupos de data_source.group_ultimos_partidos).
+    racha_visitante : tuple[str, ...]
+        Códigos de resultado de los últimos partidos del visitante.
+    racha_local_como_local : tuple[str, ...]
+        Códigos de resultado de los últimos partidos del local jugando en casa.
+    racha_local_como_visitante : tuple[str, ...]
+        Códigos de resultado de los últimos partidos del local jugando fuera.
+    racha_visitante_como_local : tuple[str, ...]
+        Códigos de resultado de los últimos partidos del visitante jugando en casa.
+    racha_visitante_como_visitante : tuple[str, ...]
+        Códigos de resultado de los últimos partidos del visitante jugando fuera.
+    source_probs : tuple[float, ...] | None
+        Probabilidades 1X2 de cada fuente (LAE y Quinielista, en el orden de data_source.PROBABILITY_SOURCES)
+        como tupla plana de 6 valores, o None si las probabilidades no incluyen columnas por fuente.
+    """
+
+    match_id: int
+    partido: str
+    prob_1: float
+    prob_x: float
+    prob_2: float
+    max_sign: str
+    max_prob: float
+    is_exceptional: bool
+    veces1: int
+    veces_x: int
+    veces2: int
+    clasificacion_local: str | int | None
+    clasificacion_visitante: str | int | None
+    evolucion_local: tuple[str, ...]
+    evolucion_visitante: tuple[str, ...]
+    racha_local: tuple[str, ...]
+    racha_visitante: tuple[str, ...]
+    racha_local_como_local: tuple[str, ...]
+    racha_local_como_visitante: tuple[str, ...]
+    racha_visitante_como_local: tuple[str, ...]
+    racha_visitante_como_visitante: tuple[str, ...]
+    source_probs: tuple[float, ...] | None = None
+
+    @classmethod
+    def from_sources(cls, match_id: int, prob: dict[str, Any], detail: dict[str, Any]) -> "MatchRecord":
+        """
+        Construye el registro a partir de los diccionarios de probabilidades y detalles de un partido.
+
+        Parameters
+        ----------
+        match_id : int
+            Posición del partido dentro de la jornada (1-15).
+        prob : dict[str, Any]
+            Probabilidades del partido (elemento de get_kiniela_probabilities).
+        detail : dict[str, Any]
+            Detalles del partido (elemento de get_kiniela_matches_details).
+
+        Returns
+        -------
+        MatchRecord
+            Registro compacto del partido.
+        """
+        prob_1 = prob.get("1_Prob", 0)
+        prob_x = prob.get("X_Prob", 0)
+        prob_2 = prob.get("2_Prob", 0)
+
+        # Mismo criterio que max(probs, key=probs.get): ante empate gana el primer signo
+        max_sign, max_prob = "1", prob_1
+        if prob_x > max_prob:
+            max_sign, max_prob = "X", prob_x
+        if prob_2 > max_prob:
+            max_sign, max_prob = "2", prob_2
+
+        grupos = data_source.group_ultimos_partidos(ultimos_partidos=detail.get("ultimos_partidos", []))
+        rachas = {grupo: tuple(p["cod_resultado"] for p in partidos) for grupo, partidos in grupos.items()}
+
+        return cls(
+            match_id=match_id,
+            partido=prob.get("partido", detail.get("partido", "")),
+            prob_1=prob_1,
+            prob_x=prob_x,
+            prob_2=prob_2,
+            max_sign=max_sign,
+            max_prob=max_prob,
+            is_exceptional="1_Prob" not in prob,
+            veces1=detail.get("veces1", 0),
+            veces_x=detail.get("vecesX", 0),
+            veces2=detail.get("veces2", 0),
+            clasificacion_local=detail.get("clasificacionLocal"),
+            clasificacion_visitante=detail.get("clasificacionVisitante"),
+            evolucion_local=tuple(detail.get("evolucionLocal") or ()),
+            evolucion_visitante=tuple(detail.get("evolucionVisitante") or ()),
+            racha_local=rachas["local"],
+            racha_visitante=rachas["visitante"],
+            racha_local_como_local=rachas["local_como_local"],
+            racha_local_como_visitante=rachas["local_como_visitante"],
+            racha_visitante_como_local=rachas["visitante_como_local"],
+            racha_visitante_como_visitante=rachas["visitante_como_visitante"],
+            source_probs=(
+                tuple(prob.get(column, 0) for column in data_source.SOURCE_PROBABILITY_COLUMNS)
+                if any(column in prob for column in data_source.SOURCE_PROBABILITY_COLUMNS) else None
+            ),
+        )
+
+    @property
+    def probs(self) -> dict[str, float]:
+        """
+        Probabilidades 1X2 con las claves "1", "X" y "2" usadas en las salidas JSON.
+
+        Returns
+        -------
+        dict[str, float]
+            Nuevo diccionario {"1": prob_1, "X": prob_x, "2": prob_2}.
+        """
+        return {"1": self.prob_1, "X": self.prob_x, "2": self.prob_2}
+
+    def source_probs_of(self, source: str) -> dict[str, float] | None:
+        """
+        Probabilidades 1X2 de una fuente con las claves "1", "X" y "2".
+
+        Parameters
+        ----------
+        source : str
+            Fuente (elemento de data_source.PROBABILITY_SOURCES).
+
+        Returns
+        -------
+        dict[str, float] | None
+            Probabilidades de la fuente, o None si el registro no tiene columnas por fuente.
+        """
+        if self.source_probs is None:
+            return None
+        start = data_source.PROBABILITY_SOURCES.index(source) * len(SIGNS)
+        return dict(zip(SIGNS, self.source_probs[start:start + len(SIGNS)]))
+
+    @property
+    def source_disagreement(self) -> float | None:
+        """
+        Discrepancia entre fuentes: máxima diferencia absoluta (en puntos) entre LAE y Quinielista en 1, X o 2.
+
+        Returns
+        -------
+        float | None
+            Discrepancia, o None si el registro no tiene columnas por fuente.
+        """
+        if self.source_probs is None:
+            return None
+        lae, quiniela = self.source_probs[:len(SIGNS)], self.source_probs[len(SIGNS):]
+        return round(max(abs(a - b) for a, b in zip(lae, quiniela)), 1)
+
+    @property
+    def total_historic(self) -> int:
+        """
+        Número total de enfrentamientos en el histórico.
+
+        Returns
+        -------
+        int
+            veces1 + veces_x + veces2.
+        """
+        return self.veces1 + self.veces_x + self.veces2
+
+
+@dataclass(slots=True)
+class JornadaFrame:
+    """
+    Conjunto de registros de partidos de una jornada, construido una vez y compartido por los componentes.
+
+    Attributes
+    ----------
+    jornada : int
+        Número de jornada.
+    temporada : int
+        Año de la temporada.
+    matches : list[MatchRecord]
+        Registros de los partidos ordenados por match_id.
+    probabilities : list[dict[str, Any]]
+        Probabilidades originales de cada partido (get_kiniela_probabilities), para las salidas que las devuelven
+        tal cual.
+    details : list[dict[str, Any]]
+        Detalles originales de cada partido (get_kiniela_matches_details), para las salidas que los devuelven
+        tal cual.
+    """
+
+    jornada: int
+    temporada: int
+    matches: list[MatchRecord]
+    probabilities: list[dict[str, Any]] = field(default_factory=list, repr=False, compare=False)
+    details: list[dict[str, Any]] = field(default_factory=list, repr=False, compare=False)
+    _team_index: TeamIndex | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_sources(cls, jornada: int, temporada: int, probabilities: list[dict[str, Any]],
+                     details: list[dict[str, Any]]) -> "JornadaFrame":
+        """
+        Construye la jornada a partir de las listas de probabilidades y detalles.
+
+        Los partidos sin detalle asociado (lista de detalles más corta) reciben un detalle vacío.
+
+        Parameters
+        ----------
+        jornada : int
+            Número de jornada.
+        temporada : int
+            Año de la temporada.
+        probabilities : list[dict[str, Any]]
+            Probabilidades de cada partido (get_kiniela_probabilities).
+        details : list[dict[str, Any]]
+            Detalles de cada partido (get_kiniela_matches_details).
+
+        Returns
+        -------
+        JornadaFrame
+            Jornada con un registro por partido.
+        """
+        matches = [
+            MatchRecord.from_sources(match_id=i, prob=prob, detail=details[i - 1] if i <= len(details) else {})
+            for i, prob in enumerate(probabilities, start=1)
+        ]
+        return cls(jornada=jornada, temporada=temporada, matches=matches, probabilities=probabilities,
+                   details=details)
+
+    @classmethod
+    def load(cls, jornada: int, temporada: int, by_source: bool = False,
+             weights: dict[str, float] | None = None) -> "JornadaFrame | None":
+        """
+        Obtiene probabilidades y detalles de data_source y construye la jornada.
+
+        Parameters
+        ----------
+        jornada : int
+            Número de jornada.
+        temporada : int
+            Año de la temporada.
+        by_source : bool, optional
+            Si es True, los registros incluyen las probabilidades de cada fuente (source_probs).
+        weights : dict[str, float] | None, optional
+            Peso de cada fuente en la probabilidad fusionada (ver data_source.get_kiniela_probabilities).
+
+        Returns
+        -------
+        JornadaFrame | None
+            Jornada construida, o None si alguna de las fuentes no está disponible.
+        """
+        probabilities = data_source.get_kiniela_probabilities(
+            jornada=jornada, temporada=temporada, weights=weights, by_source=by_source
+        )
+        details = data_source.get_kiniela_matches_details(jornada=jornada, temporada=temporada)
+
+        if probabilities is None or details is None:
+            return None
+
+        return cls.from_sources(jornada=jornada, temporada=temporada, probabilities=probabilities, details=details)
+
+    def __len__(self) -> int:
+        return len(self.matches)
+
+    def __iter__(self) -> Iterator[MatchRecord]:
+        return iter(self.matches)
+
+    def get(self, match_id: int) -> MatchRecord | None:
+        """
+        Devuelve el registro de un partido por su posición en la jornada.
+
+        Parameters
+        ----------
+        match_id : int
+            ID del partido dentro de la jornada (1-15).
+
+        Returns
+        -------
+        MatchRecord | None
+            Registro del partido, o None si el ID está fuera de rango.
+        """
+        if match_id < 1 or match_id > len(self.matches):
+            return None
+        return self.matches[match_id - 1]
+
+    def raw_prob(self, match_id: int) -> dict[str, Any]:
+        """
+        Devuelve las probabilidades originales de un partido tal como las devuelve data_source.
+
+        Parameters
+        ----------
+        match_id : int
+            ID del partido dentro de la jornada (1-15).
+
+        Returns
+        -------
+        dict[str, Any]
+            Probabilidades del partido, o un diccionario vacío si no están disponibles.
+        """
+        if match_id < 1 or match_id > len(self.probabilities):
+            return {}
+        return self.probabilities[match_id - 1]
+
+    def raw_detail(self, match_id: int) -> dict[str, Any]:
+        """
+        Devuelve el detalle original de un partido tal como lo devuelve data_source.
+
+        Parameters
+        ----------
+        match_id : int
+            ID del partido dentro de la jornada (1-15).
+
+        Returns
+        -------
+        dict[str, Any]
+            Detalle del partido, o un diccionario vacío si no está disponible.
+        """
+        if match_id < 1 or match_id > len(self.details):
+            return {}
+        return self.details[match_id - 1]
+
+    def team_index(self) -> TeamIndex:
+        """
+        Devuelve el índice de equipos de la jornada, construyéndolo solo la primera vez.
+
+        Returns
+        -------
+        TeamIndex
+            Índice compartido por todos los componentes que reciben esta jornada.
+        """
+        if self._team_index is None:
+            self._team_index = TeamIndex(partidos=[record.partido for record in self.matches])
+        return self._team_index
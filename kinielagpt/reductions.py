@@ -0,0 +1,254 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Reducciones de quinielas para KinielaGPT.
+
+Un sistema múltiple con dobles y triples juega todas las combinaciones de sus signos: 8 triples y 3 dobles son
+52.488 columnas. Una reducción elige un subconjunto de esas columnas con una garantía: si el resultado real
+cae dentro de los signos elegidos (todos los partidos "acertados" por el sistema), al menos una columna de la
+reducción tiene como mucho `errors` fallos, p. ej. "13 si 14" con errors=1.
+
+Es un problema de recubrimiento: cada columna cubre la bola de Hamming de radio `errors` a su alrededor y hay
+que cubrir todas las combinaciones del sistema. Las combinaciones se numeran en base mixta (un dígito por
+partido variable, con base 2 o 3), las bolas se precalculan como una matriz de índices y el recubrimiento se
+busca con un voraz que mantiene, para cada columna candidata, cuántas combinaciones aún descubiertas cubriría.
+Como la bola es simétrica, al cubrir una combinación sólo cambian las ganancias de las columnas de su propia
+bola, de modo que cada paso cuesta O(tamaño de bola²) más un argmax vectorizado. Un último paso elimina las
+columnas redundantes.
+"""
+
+import itertools
+from typing import Any
+
+import numpy as np
+
+from kinielagpt.value import SIGNOS
+
+
+def choose_multiples(predictions: list[dict[str, Any]], triples: int = 0, dobles: int = 0) -> dict[int, str]:
+    """
+    Elige los partidos con dobles y triples a partir de una predicción de KinielaPredictor.
+
+    Los partidos más inciertos (menor probabilidad del signo más probable) reciben primero los triples y
+    después los dobles, que añaden el segundo signo más probable.
+
+    Parameters
+    ----------
+    predictions : list[dict[str, Any]]
+        Lista predictions de KinielaPredictor.predict. Sólo se consideran los partidos con probabilidades 1X2.
+    triples : int, optional
+        Número de triples (default: 0).
+    dobles : int, optional
+        Número de dobles (default: 0).
+
+    Returns
+    -------
+    dict[int, str]
+        Signos de cada partido múltiple por match_id (ej: {3: "1X2", 7: "1X"}).
+
+    Raises
+    ------
+    ValueError
+        Si hay más triples y dobles que partidos.
+    """
+    normal = [pred for pred in predictions if pred["prediction"] in SIGNOS]
+    if triples < 0 or dobles < 0 or triples + dobles > len(normal):
+        raise ValueError(f"No se pueden elegir {triples} triples y {dobles} dobles entre {len(normal)} partidos")
+
+    def certainty(pred: dict[str, Any]) -> float:
+        return max(pred["probabilities"].get(sign, 0.0) for sign in SIGNOS)
+
+    ranked = sorted(normal, key=certainty)
+    multiples = {pred["match_id"]: "".join(SIGNOS) for pred in ranked[:triples]}
+    for pred in ranked[triples:triples + dobles]:
+        top = sorted(SIGNOS, key=lambda sign: -pred["probabilities"].get(sign, 0.0))[:2]
+        if pred["prediction"] not in top:
+            top[1] = pred["prediction"]
+        multiples[pred["match_id"]] = "".join(sign for sign in SIGNOS if sign in top)
+    return multiples
+
+
+def hamming_balls(radices: list[int], errors: int = 1) -> np.ndarray:
+    """
+    Calcula la bola de Hamming de cada combinación de un sistema múltiple.
+
+    Parameters
+    ----------
+    radices : list[int]
+        Número de signos de cada partido variable (2 para dobles, 3 para triples).
+    errors : int, optional
+        Radio de la bola: número máximo de partidos distintos (default: 1).
+
+    Returns
+    -------
+    np.ndarray
+        Matriz (combinaciones, tamaño de bola) con los índices de las combinaciones a distancia <= errors de
+        cada una; la primera columna es la propia combinación.
+    """
+    radices_arr = np.asarray(radices, dtype=np.int64)
+    strides = np.concatenate(([1], np.cumprod(radices_arr)[:-1])).astype(np.int64)
+    total = int(np.prod(radices_arr))
+    index = np.arange(total, dtype=np.int64)
+    digits = (index[:, None] // strides) % radices_arr
+
+    neighbours = [index]
+    for size in range(1, min(errors, len(radices)) + 1):
+        for positions in itertools.combinations(range(len(radices)), size):
+            for shifts in itertools.product(*(range(1, radices[p]) for p in positions)):
+                neighbour = index.copy()
+                for position, shift in zip(positions, shifts):
+                    changed = (digits[:, position] + shift) % radices[position]
+                    neighbour += (changed - digits[:, position]) * strides[position]
+                neighbours.append(neighbour)
+    return np.stack(neighbours, axis=1)
+
+
+def covering_indices(radices: list[int], errors: int = 1, weights: np.ndarray | None = None) -> np.ndarray:
+    """
+    Busca un recubrimiento de radio errors de todas las combinaciones de un sistema múltiple.
+
+    Parameters
+    ----------
+    radices : list[int]
+        Número de signos de cada partido variable.
+    errors : int, optional
+        Fallos permitidos respecto a la combinación ganadora (default: 1, "13 si 14").
+    weights : np.ndarray | None, optional
+        Peso de cada combinación en [0, 1) (p. ej. su probabilidad relativa). Sólo desempata entre columnas
+        que cubren el mismo número de combinaciones, favoreciendo las más probables.
+
+    Returns
+    -------
+    np.ndarray
+        Índices (en base mixta) de las combinaciones elegidas, en orden creciente.
+    """
+    if errors <= 0 or not radices:
+        return np.arange(int(np.prod(radices)) if radices else 1, dtype=np.int64)
+
+    balls = hamming_balls(radices=radices, errors=errors)
+    total = balls.shape[0]
+    tiebreak = np.zeros(total) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    # gains[c]: combinaciones aún descubiertas dentro de la bola de c
+    gains = np.full(total, balls.shape[1], dtype=np.int64)
+    uncovered = np.ones(total, dtype=bool)
+    chosen = []
+    while True:
+        candidate = int(np.argmax(gains + tiebreak))
+        if gains[candidate] == 0:
+            break
+        ball = balls[candidate]
+        newly = ball[uncovered[ball]]
+        uncovered[newly] = False
+        np.subtract.at(gains, balls[newly].ravel(), 1)
+        chosen.append(candidate)
+
+    # Eliminar columnas cuyas combinaciones quedan cubiertas por otras (de las últimas a las primeras)
+    counts = np.bincount(balls[chosen].ravel(), minlength=total)
+    kept = []
+    for candidate in reversed(chosen):
+        ball = balls[candidate]
+        if (counts[ball] >= 2).all():
+            counts[ball] -= 1
+        else:
+            kept.append(candidate)
+    return np.sort(np.array(kept, dtype=np.int64))
+
+
+def reduce_system(predictions: list[dict[str, Any]], multiples: dict[int, str], errors: int = 1) -> dict[str, Any]:
+    """
+    Genera la reducción de un sistema con dobles y triples sobre una predicción de KinielaPredictor.
+
+    Parameters
+    ----------
+    predictions : list[dict[str, Any]]
+        Lista predictions de KinielaPredictor.predict. Los partidos sin múltiple juegan su signo predicho;
+        el pleno al 15 no forma parte de las columnas.
+    multiples : dict[int, str]
+        Signos de cada partido múltiple por match_id (ej: {3: "1X2", 7: "1X"}, ver choose_multiples).
+    errors : int, optional
+        Fallos permitidos (default: 1, garantía "13 si 14"). Con 0 se devuelve el sistema completo.
+
+    Returns
+    -------
+    dict[str, Any]
+        Diccionario con:
+        - match_ids: Partidos de las columnas, en orden
+        - columns: Columnas de la reducción como cadenas de signos (un carácter por partido)
+        - count: Número de columnas de la reducción
+        - full_count: Número de columnas del sistema completo
+        - triples, dobles: Partidos múltiples del sistema
+        - guarantee: Aciertos garantizados si se aciertan todos los partidos ("13 si 14")
+        - savings: Porcentaje de columnas ahorradas frente al sistema completo
+
+    Raises
+    ------
+    ValueError
+        Si algún partido múltiple no existe, no tiene probabilidades 1X2 o sus signos no son válidos.
+    """
+    normal = [pred for pred in predictions if pred["prediction"] in SIGNOS]
+    match_ids = [pred["match_id"] for pred in normal]
+    for match_id, signs in multiples.items():
+        if match_id not in match_ids:
+            raise ValueError(f"El partido {match_id} no tiene probabilidades 1X2 en la predicción")
+        if not signs or len(set(signs)) != len(signs) or any(sign not in SIGNOS for sign in signs):
+            raise ValueError(f"Signos inválidos para el partido {match_id}: {signs}")
+
+    signs_by_match = [
+        "".join(sign for sign in SIGNOS if sign in multiples.get(pred["match_id"], pred["prediction"]))
+        for pred in normal
+    ]
+    variable = [i for i, signs in enumerate(signs_by_match) if len(signs) > 1]
+    radices = [len(signs_by_match[i]) for i in variable]
+
+    # Probabilidad relativa de cada combinación para desempatar a favor de las columnas más probables
+    weights = None
+    if radices:
+        strides = np.concatenate(([1], np.cumprod(radices)[:-1])).astype(np.int64)
+        digits = (np.arange(int(np.prod(radices)))[:, None] // strides) % np.asarray(radices)
+        log_prob = np.zeros(digits.shape[0])
+        for k, i in enumerate(variable):
+            probs = np.array([normal[i]["probabilities"].get(sign, 0.0) for sign in signs_by_match[i]]) + 1e-3
+            log_prob += np.log(probs / probs.sum())[digits[:, k]]
+        weights = 0.5 * np.exp(log_prob - log_prob.max())
+
+    indices = covering_indices(radices=radices, errors=errors, weights=weights)
+
+    columns = []
+    for index in indices.tolist():
+        column = [signs[0] for signs in signs_by_match]
+        for i, radix in zip(variable, radices):
+            column[i] = signs_by_match[i][index % radix]
+            index //= radix
+        columns.append("".join(column))
+
+    full_count = int(np.prod(radices)) if radices else 1
+    n_matches = len(normal)
+    return {
+        "match_ids": match_ids,
+        "columns": columns,
+        "count": len(columns),
+        "full_count": full_count,
+        "triples": radices.count(3),
+        "dobles": radices.count(2),
+        "guarantee": f"{max(n_matches - max(errors, 0), 0)} si {n_matches}",
+        "savings": round(100 * (1 - len(columns) / full_count), 1),
+    }
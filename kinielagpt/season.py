@@ -0,0 +1,287 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Análisis masivo de temporadas para KinielaGPT.
+
+Ejecuta Analyzer.analyze_match sobre todos los partidos de un rango de jornadas de una temporada, leyendo cada
+jornada de la caché en disco de data_source (data_source.get_jornada) y repartiendo las jornadas entre un pool
+de procesos. Cada análisis se aplana en una fila (columnas con nombres "seccion.campo"), de modo que la
+temporada completa se obtiene como un DataFrame o como un fichero columnar (Parquet si pyarrow está
+instalado, CSV en otro caso) en lugar de cientos de documentos JSON anidados.
+"""
+
+import importlib.util
+import json
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import pandas as pd
+
+from kinielagpt import data_source
+from kinielagpt.analyzer import Analyzer
+from kinielagpt.records import JornadaFrame
+
+# Formatos de fichero soportados por write_columnar (arrow: IPC/Feather sin comprimir, mapeable en memoria)
+COLUMNAR_FORMATS = ("parquet", "arrow", "csv")
+
+
+def flatten_analysis(analysis: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """
+    Aplana un análisis anidado en una fila de columnas escalares.
+
+    Los diccionarios anidados se expanden con claves "seccion.campo" y las listas se serializan como JSON para
+    que todas las columnas tengan valores escalares (compatibles con Parquet y CSV).
+
+    Parameters
+    ----------
+    analysis : dict[str, Any]
+        Análisis tal y como lo devuelve Analyzer.analyze_match.
+    prefix : str, optional
+        Prefijo de las columnas (uso recursivo).
+
+    Returns
+    -------
+    dict[str, Any]
+        Fila con una columna por campo hoja del análisis.
+
+    Examples
+    --------
+    >>> flatten_analysis({"info_partido": {"id_partido": 1}, "probabilidades": {"1": 60.0}, "prediccion": "1"})
+    {'info_partido.id_partido': 1, 'probabilidades.1': 60.0, 'prediccion': '1'}
+    """
+    row: dict[str, Any] = {}
+    for key, value in analysis.items():
+        column = f"{prefix}{key}"
+        if isinstance(value, dict):
+            row.update(flatten_analysis(analysis=value, prefix=f"{column}."))
+        elif isinstance(value, (list, tuple)):
+            row[column] = json.dumps(value, ensure_ascii=False)
+        else:
+            row[column] = value
+    return row
+
+
+def iter_season_analyses(temporada: int, jornada_inicio: int = 1, jornada_fin: int | None = None,
+                         processes: int | None = None, refresh: bool = False) -> Iterator[dict[str, Any]]:
+    """
+    Genera, en streaming, el análisis aplanado de cada partido de un rango de jornadas.
+
+    Las jornadas se reparten entre un pool de procesos; cada proceso lee su jornada de la caché en disco y
+    analiza sus partidos. Las jornadas que no están en la caché (o todas, con refresh) se descargan antes en el
+    proceso actual, de modo que todas las peticiones HTTP pasan por su planificador con prioridad 'backfill'.
+    Las filas se devuelven en orden de jornada y partido a medida que terminan las jornadas. Las jornadas sin
+    datos se omiten.
+
+    Parameters
+    ----------
+    temporada : int
+        Año de la temporada.
+    jornada_inicio : int, optional
+        Primera jornada del rango (incluida). Por defecto 1.
+    jornada_fin : int | None, optional
+        Última jornada del rango (incluida). Si es None, la última jornada de la temporada en la caché.
+    processes : int | None, optional
+        Número de procesos. Si es None, os.cpu_count(); con 1 se analiza en el proceso actual.
+    refresh : bool, optional
+        Si es True, se descargan de nuevo las jornadas aunque estén en la caché.
+
+    Yields
+    ------
+    dict[str, Any]
+        Fila con el análisis aplanado de un partido (ver flatten_analysis).
+    """
+    if jornada_fin is None:
+        cached = [jornada for _, jornada in data_source.list_cached_jornadas(temporada=temporada)]
+        jornada_fin = max(cached, default=jornada_inicio - 1)
+
+    tasks = [(jornada, temporada, refresh) for jornada in range(jornada_inicio, jornada_fin + 1)]
+    if not tasks:
+        return
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(tasks) == 1:
+        for task in tasks:
+            yield from __analyze_jornada(task)
+        return
+
+    # El planificador de peticiones es de cada proceso: las descargas se hacen aquí, con prioridad 'backfill', y
+    # los procesos del pool solo leen la caché en disco. Cada jornada se envía al pool en cuanto está descargada
+    cached = set(data_source.list_cached_jornadas(temporada=temporada))
+    with ProcessPoolExecutor(max_workers=min(processes, len(tasks))) as executor:
+        futures = []
+        for jornada, _, _ in tasks:
+            if refresh or (temporada, jornada) not in cached:
+                with data_source.request_priority("backfill"):
+                    data_source.get_jornada(jornada=jornada, temporada=temporada, refresh=refresh)
+            futures.append(executor.submit(__analyze_jornada, (jornada, temporada, False), False))
+        for future in futures:
+            yield from future.result()
+
+
+def analyze_season(temporada: int, jornada_inicio: int = 1, jornada_fin: int | None = None,
+                   processes: int | None = None, refresh: bool = False, output: str | None = None,
+                   file_format: str | None = None) -> pd.DataFrame:
+    """
+    Analiza todos los partidos de un rango de jornadas y devuelve el resultado en formato columnar.
+
+    Parameters
+    ----------
+    temporada : int
+        Año de la temporada.
+    jornada_inicio : int, optional
+        Primera jornada del rango (incluida). Por defecto 1.
+    jornada_fin : int | None, optional
+        Última jornada del rango (incluida). Si es None, la última jornada de la temporada en la caché.
+    processes : int | None, optional
+        Número de procesos. Si es None, os.cpu_count(); con 1 se analiza en el proceso actual.
+    refresh : bool, optional
+        Si es True, se descargan de nuevo las jornadas aunque estén en la caché.
+    output : str | None, optional
+        Si se indica, ruta del fichero en el que se escribe el resultado (ver write_columnar).
+    file_format : str | None, optional
+        Formato del fichero de salida: 'parquet', 'arrow', 'csv' o None para deducirlo (ver write_columnar).
+
+    Returns
+    -------
+    pd.DataFrame
+        Una fila por partido analizado y una columna por campo del análisis.
+
+    Examples
+    --------
+    >>> df = analyze_season(temporada=2026, jornada_inicio=1, jornada_fin=10, output="temporada_2026.parquet")
+    >>> df[["info_partido.jornada", "info_partido.partido", "prediccion", "confianza"]].head()
+    """
+    df = pd.DataFrame(list(iter_season_analyses(
+        temporada=temporada, jornada_inicio=jornada_inicio, jornada_fin=jornada_fin, processes=processes,
+        refresh=refresh,
+    )))
+
+    if output is not None:
+        write_columnar(df=df, path=output, file_format=file_format)
+
+    return df
+
+
+def write_columnar(df: pd.DataFrame, path: str, file_format: str | None = None) -> str:
+    """
+    Escribe un DataFrame en un fichero columnar.
+
+    Parquet y Arrow requieren pyarrow (extra opcional: pip install kinielagpt[parquet]). Los ficheros Arrow se
+    escriben sin comprimir para poder leerlos con memory mapping. Si no se indica formato, se deduce de la
+    extensión de path (.parquet, .arrow o .csv) y, si no es ninguna de ellas, se usa Parquet cuando pyarrow está
+    disponible y CSV en otro caso.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Datos a escribir.
+    path : str
+        Ruta del fichero de salida. Los directorios intermedios se crean si no existen.
+    file_format : str | None, optional
+        'parquet', 'arrow', 'csv' o None para deducirlo.
+
+    Returns
+    -------
+    str
+        Formato con el que se ha escrito el fichero.
+
+    Raises
+    ------
+    ValueError
+        Si el formato no es uno de COLUMNAR_FORMATS.
+    ImportError
+        Si se pide Parquet o Arrow y pyarrow no está instalado.
+    """
+    if file_format is None:
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        if extension in COLUMNAR_FORMATS:
+            file_format = extension
+        else:
+            file_format = "parquet" if has_parquet_support() else "csv"
+
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Formato '{file_format}' no soportado. Opciones: {', '.join(COLUMNAR_FORMATS)}")
+    if file_format != "csv" and not has_parquet_support():
+        raise ImportError(f"El formato {file_format} requiere pyarrow: pip install kinielagpt[parquet]")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    if file_format == "parquet":
+        df.to_parquet(path, index=False)
+    elif file_format == "arrow":
+        df.to_feather(path, compression="uncompressed")
+    else:
+        df.to_csv(path, index=False)
+    return file_format
+
+
+def has_parquet_support() -> bool:
+    """
+    Indica si pyarrow está instalado y, por tanto, se pueden escribir y leer ficheros Parquet y Arrow.
+
+    Returns
+    -------
+    bool
+        True si pyarrow puede importarse.
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def __analyze_jornada(task: tuple[int, int, bool], download: bool = True) -> list[dict[str, Any]]:
+    """
+    Analiza todos los partidos de una jornada (función ejecutada en los procesos del pool).
+
+    Parameters
+    ----------
+    task : tuple[int, int, bool]
+        Tupla (jornada, temporada, refresh).
+    download : bool, optional
+        Si es False, la jornada solo se lee de la caché en disco, sin peticiones HTTP (procesos del pool).
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        Filas aplanadas de los partidos de la jornada; lista vacía si la jornada no tiene datos.
+    """
+    jornada, temporada, refresh = task
+    with data_source.request_priority("backfill"):
+        probabilities, details = data_source.get_jornada(
+            jornada=jornada, temporada=temporada, refresh=refresh, download=download
+        )
+    if probabilities is None or details is None:
+        print(f"Jornada {jornada} de {temporada} sin datos, se omite")
+        return []
+
+    frame = JornadaFrame.from_sources(
+        jornada=jornada, temporada=temporada, probabilities=probabilities, details=details
+    )
+    analyzer = Analyzer()
+    rows = []
+    for record in frame:
+        analysis = analyzer.analyze_match(
+            jornada=jornada, temporada=temporada, match_id=record.match_id, frame=frame
+        )
+        if analysis is not None:
+            rows.append(flatten_analysis(analysis=analysis))
+    return rows
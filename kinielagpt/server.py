@@ -32,10 +32,15 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
-from kinielagpt import data_source
+from kinielagpt import data_source, simulation
 from kinielagpt.analyzer import Analyzer
 from kinielagpt.detector import SurpriseDetector
+from kinielagpt.form import FormFeatureStore
+from kinielagpt.history import TeamHistoryStore
+from kinielagpt.pleno import PlenoAl15Engine
 from kinielagpt.predictor import KinielaPredictor
+from kinielagpt.records import JornadaFrame
+from kinielagpt.snapshots import ProbabilitySnapshotStore
 
 # Crear instancia del servidor MCP
 app = Server(name="kiniela-gpt")
@@ -45,6 +50,27 @@ predictor = KinielaPredictor()
 analyzer = Analyzer()
 surprise_detector = SurpriseDetector()
 
+# Histórico de resultados con indicadores de forma incrementales, compartido por todas las llamadas
+team_history: TeamHistoryStore | None = None
+
+
+def get_team_history() -> TeamHistoryStore:
+    """
+    Devuelve el histórico de resultados del servidor, abriéndolo en la primera llamada.
+
+    El histórico lleva conectado un FormFeatureStore: se carga una vez con los resultados almacenados y después
+    solo recibe los resultados nuevos de cada ingesta, de modo que las consultas de forma no recorren el histórico.
+
+    Returns
+    -------
+    TeamHistoryStore
+        Histórico persistente en el directorio de caché de data_source.
+    """
+    global team_history
+    if team_history is None:
+        team_history = TeamHistoryStore(form=FormFeatureStore())
+    return team_history
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
@@ -111,6 +137,25 @@ async def list_tools() -> list[Tool]:
                         "description": "Año de la temporada",
                         "minimum": 2026,
                     },
+                    "by_source": {
+                        "type": "boolean",
+                        "description": (
+                            "Si es true, incluye también las probabilidades 1X2 de cada fuente por separado "
+                            "(1_Prob_lae, ..., 2_Prob_quiniela)"
+                        ),
+                        "default": False,
+                    },
+                    "weights": {
+                        "type": "object",
+                        "description": (
+                            "Peso de cada fuente en la probabilidad fusionada (por defecto, media simple). "
+                            'Ejemplo: {"lae": 2, "quiniela": 1}'
+                        ),
+                        "properties": {
+                            "lae": {"type": "number", "minimum": 0},
+                            "quiniela": {"type": "number", "minimum": 0},
+                        },
+                    },
                 },
                 "required": ["jornada", "temporada"],
             },
@@ -119,8 +164,9 @@ async def list_tools() -> list[Tool]:
             name="predict_quiniela",
             description=(
                 "Genera una predicción completa de quiniela utilizando diferentes estrategias: "
-                "conservadora (mayor probabilidad), arriesgada (balancea probabilidad y contexto) "
-                "o personalizada (con distribución específica de 1-X-2)."
+                "conservadora (mayor probabilidad), arriesgada (balancea probabilidad y contexto), "
+                "personalizada (con distribución específica de 1-X-2) o valor (maximiza el valor esperado del "
+                "premio comparando la probabilidad LAE con el porcentaje de apuestas del público)."
             ),
             inputSchema={
                 "type": "object",
@@ -137,12 +183,13 @@ async def list_tools() -> list[Tool]:
                     },
                     "strategy": {
                         "type": "string",
-                        "enum": ["conservadora", "arriesgada", "personalizada"],
+                        "enum": ["conservadora", "arriesgada", "personalizada", "valor"],
                         "description": (
                             "Estrategia de predicción: "
                             "    'conservadora' (máxima probabilidad), "
                             "    'arriesgada' (balancea probabilidad y contexto), "
-                            "    'personalizada' (distribución personalizada)"
+                            "    'personalizada' (distribución personalizada), "
+                            "    'valor' (probabilidad LAE frente a apuestas del público)"
                         ),
                         "default": "conservadora",
                     },
@@ -178,6 +225,61 @@ async def list_tools() -> list[Tool]:
                 "required": ["jornada", "temporada", "strategy"],
             },
         ),
+        Tool(
+            name="predict_quiniela_many",
+            description=(
+                "Genera en una sola pasada las predicciones de varias estrategias (conservadora, arriesgada y "
+                "una o más distribuciones personalizadas) compartiendo el análisis contextual de cada partido, "
+                "y devuelve todas las predicciones junto con los partidos en los que no coinciden."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "jornada": {
+                        "type": "integer",
+                        "description": "Número de jornada",
+                        "minimum": 1,
+                    },
+                    "temporada": {
+                        "type": "integer",
+                        "description": "Año de la temporada",
+                        "minimum": 2000,
+                    },
+                    "strategies": {
+                        "type": "array",
+                        "description": (
+                            "Estrategias a comparar. Cada elemento indica la estrategia y, para 'personalizada', "
+                            'su distribución. Ejemplo: [{"strategy": "conservadora"}, {"strategy": "personalizada", '
+                            '"custom_distribution": {"1": 8, "X": 4, "2": 3}}]'
+                        ),
+                        "minItems": 1,
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "strategy": {
+                                    "type": "string",
+                                    "enum": ["conservadora", "arriesgada", "personalizada", "valor"],
+                                    "description": "Estrategia de predicción",
+                                },
+                                "custom_distribution": {
+                                    "type": "object",
+                                    "description": "Solo para strategy='personalizada': distribución de signos",
+                                    "properties": {
+                                        "1": {"type": "integer", "minimum": 0, "maximum": 15},
+                                        "X": {"type": "integer", "minimum": 0, "maximum": 15},
+                                        "2": {"type": "integer", "minimum": 0, "maximum": 15},
+                                    },
+                                    "required": ["1", "X", "2"],
+                                },
+                            },
+                            "required": ["strategy"],
+                        },
+                        "default": [{"strategy": "conservadora"}, {"strategy": "arriesgada"}],
+                    },
+                },
+                "required": ["jornada", "temporada"],
+            },
+        ),
         Tool(
             name="detect_surprises",
             description=(
@@ -281,6 +383,177 @@ async def list_tools() -> list[Tool]:
                 "required": ["jornada", "temporada", "team_name"],
             },
         ),
+        Tool(
+            name="analyze_team_history",
+            description=(
+                "Analiza el rendimiento de un equipo a lo largo de una temporada completa (o de varias) usando el "
+                "histórico de resultados de todas las jornadas descargadas: registro, tendencias, rendimiento "
+                "como local/visitante y forma móvil."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "team_name": {
+                        "type": "string",
+                        "description": "Nombre del equipo (admite alias, ej: 'Real Madrid' o 'R.MADRID')",
+                    },
+                    "temporada": {
+                        "type": "integer",
+                        "description": "Año de la temporada (opcional, por defecto todas las almacenadas)",
+                        "minimum": 2000,
+                    },
+                    "jornada": {
+                        "type": "integer",
+                        "description": "Jornada a descargar y añadir al histórico antes de analizar (opcional)",
+                        "minimum": 1,
+                    },
+                    "window": {
+                        "type": "integer",
+                        "description": "Tamaño de la ventana de la forma móvil en partidos (default: 5)",
+                        "minimum": 1,
+                        "default": 5,
+                    },
+                },
+                "required": ["team_name"],
+            },
+        ),
+        Tool(
+            name="get_probability_drift",
+            description=(
+                "Muestra cómo han evolucionado durante la semana las probabilidades 1/X/2 y de goles de un partido "
+                "de una jornada: valores inicial y actual, variación, mínimos, máximos y serie de cambios. Usa los "
+                "snapshots de probabilidades guardados con refresh (por defecto, uno en cada consulta)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "jornada": {
+                        "type": "integer",
+                        "description": "Número de jornada",
+                        "minimum": 1,
+                    },
+                    "temporada": {
+                        "type": "integer",
+                        "description": "Año de la temporada",
+                        "minimum": 2000,
+                    },
+                    "match_id": {
+                        "type": "integer",
+                        "description": "ID del partido (1-15)",
+                        "minimum": 1,
+                        "maximum": 15,
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": (
+                            "Descargar y guardar las probabilidades actuales antes de consultar (default: true)"
+                        ),
+                        "default": True,
+                    },
+                },
+                "required": ["jornada", "temporada", "match_id"],
+            },
+        ),
+        Tool(
+            name="predict_pleno_al_15",
+            description=(
+                "Predice el pleno al 15 de una jornada: matriz 4x4 de probabilidades de marcador (0, 1, 2 y más "
+                "goles por equipo), ranking de marcadores con probabilidad acumulada y, opcionalmente, el conjunto "
+                "mínimo de marcadores que cubre una probabilidad objetivo para apuestas múltiples. Puede aplicar una "
+                "corrección de dependencia Dixon–Coles ajustada sobre el histórico de resultados."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "jornada": {
+                        "type": "integer",
+                        "description": "Número de jornada",
+                        "minimum": 1,
+                    },
+                    "temporada": {
+                        "type": "integer",
+                        "description": "Año de la temporada",
+                        "minimum": 2000,
+                    },
+                    "dixon_coles": {
+                        "type": "boolean",
+                        "description": (
+                            "Ajustar la corrección Dixon–Coles con los resultados del histórico de la temporada "
+                            "(default: false, marginales independientes)"
+                        ),
+                        "default": False,
+                    },
+                    "top": {
+                        "type": "integer",
+                        "description": "Número de marcadores del ranking (default: 16)",
+                        "minimum": 1,
+                        "maximum": 16,
+                        "default": 16,
+                    },
+                    "coverage": {
+                        "type": "number",
+                        "description": "Probabilidad objetivo (0-100) a cubrir con el mínimo número de marcadores",
+                        "minimum": 0,
+                        "maximum": 100,
+                    },
+                },
+                "required": ["jornada", "temporada"],
+            },
+        ),
+        Tool(
+            name="simulate_jornada",
+            description=(
+                "Simula una jornada con las probabilidades 1/X/2 de cada partido y devuelve la distribución de "
+                "aciertos de una columna (indicada o la predicha con una estrategia), su media y la probabilidad "
+                "de cada categoría de premio (10 a 14 aciertos). Las simulaciones son deterministas para una "
+                "semilla y se guardan en caché, por lo que repetir la misma consulta es instantáneo."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "jornada": {
+                        "type": "integer",
+                        "description": "Número de jornada",
+                        "minimum": 1,
+                    },
+                    "temporada": {
+                        "type": "integer",
+                        "description": "Año de la temporada",
+                        "minimum": 2000,
+                    },
+                    "column": {
+                        "type": "string",
+                        "description": (
+                            "Columna a evaluar: un signo (1, X o 2) por partido con probabilidades 1X2 de la "
+                            "jornada (normalmente 14), ej: '1X21X1121X2112'. Si no se indica, se usa la columna "
+                            "predicha con strategy"
+                        ),
+                        "pattern": "^[12Xx]+$",
+                    },
+                    "strategy": {
+                        "type": "string",
+                        "enum": ["conservadora", "arriesgada", "valor"],
+                        "description": (
+                            "Estrategia de la columna predicha cuando no se indica column (default: conservadora)"
+                        ),
+                        "default": "conservadora",
+                    },
+                    "n_simulations": {
+                        "type": "integer",
+                        "description": "Número de simulaciones (default: 10000)",
+                        "minimum": 1,
+                        "maximum": 1000000,
+                        "default": 10000,
+                    },
+                    "seed": {
+                        "type": "integer",
+                        "description": "Semilla del generador aleatorio (default: 0)",
+                        "default": 0,
+                    },
+                },
+                "required": ["jornada", "temporada"],
+            },
+        ),
     ]
 
 
@@ -336,7 +609,12 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         elif name == "get_probabilities":
             jornada = arguments["jornada"]
             temporada = arguments["temporada"]
-            probabilities = data_source.get_kiniela_probabilities(jornada=jornada, temporada=temporada)
+            probabilities = data_source.get_kiniela_probabilities(
+                jornada=jornada,
+                temporada=temporada,
+                weights=arguments.get("weights"),
+                by_source=arguments.get("by_source", False),
+            )
 
             if probabilities is None:
                 error_msg = (
@@ -369,6 +647,23 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
             return [TextContent(type="text", text=json.dumps(obj=prediction, ensure_ascii=False, indent=2))]
 
+        elif name == "predict_quiniela_many":
+            jornada = arguments["jornada"]
+            temporada = arguments["temporada"]
+            strategies = arguments.get("strategies") or [{"strategy": "conservadora"}, {"strategy": "arriesgada"}]
+
+            comparison = predictor.predict_many(jornada=jornada, temporada=temporada, strategies=strategies)
+
+            if comparison is None:
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"Error: No se pudo generar predicción para jornada {jornada}, temporada {temporada}.",
+                    )
+                ]
+
+            return [TextContent(type="text", text=json.dumps(obj=comparison, ensure_ascii=False, indent=2))]
+
         elif name == "detect_surprises":
             jornada = arguments["jornada"]
             temporada = arguments["temporada"]
@@ -420,6 +715,133 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
             return [TextContent(type="text", text=json.dumps(obj=analysis, ensure_ascii=False, indent=2))]
 
+        elif name == "analyze_team_history":
+            team_name = arguments["team_name"]
+            temporada = arguments.get("temporada")
+            jornada = arguments.get("jornada")
+            window = arguments.get("window", 5)
+
+            analysis = analyzer.analyze_team_history(
+                team_name=team_name, temporada=temporada, window=window, jornada=jornada, store=get_team_history()
+            )
+
+            if analysis is None:
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"Error: No se pudo actualizar el histórico con la jornada {jornada}.",
+                    )
+                ]
+
+            return [TextContent(type="text", text=json.dumps(obj=analysis, ensure_ascii=False, indent=2))]
+
+        elif name == "get_probability_drift":
+            jornada = arguments["jornada"]
+            temporada = arguments["temporada"]
+            match_id = arguments["match_id"]
+            refresh = arguments.get("refresh", True)
+
+            store = ProbabilitySnapshotStore()
+            try:
+                if refresh:
+                    store.record(jornada=jornada, temporada=temporada)
+                drift = store.drift(jornada=jornada, temporada=temporada, match_id=match_id)
+            finally:
+                store.close()
+
+            if drift is None:
+                return [
+                    TextContent(
+                        type="text",
+                        text=(
+                            f"Error: No hay probabilidades guardadas del partido {match_id} de la jornada {jornada}, "
+                            f"temporada {temporada}."
+                        ),
+                    )
+                ]
+
+            return [TextContent(type="text", text=json.dumps(obj=drift, ensure_ascii=False, indent=2))]
+
+        elif name == "predict_pleno_al_15":
+            jornada = arguments["jornada"]
+            temporada = arguments["temporada"]
+            top = arguments.get("top", 16)
+            coverage = arguments.get("coverage")
+
+            if arguments.get("dixon_coles", False):
+                engine = PlenoAl15Engine.from_history(store=get_team_history(), temporada=temporada)
+            else:
+                engine = PlenoAl15Engine()
+
+            frame = JornadaFrame.load(jornada=jornada, temporada=temporada)
+            plenos = [record for record in frame if record.is_exceptional] if frame is not None else []
+
+            if not plenos:
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"Error: No hay pleno al 15 con probabilidades de goles en la jornada {jornada}, "
+                        f"temporada {temporada}.",
+                    )
+                ]
+
+            result = []
+            for record in plenos:
+                prediction = {"match_id": record.match_id, "match": record.partido}
+                prob = frame.raw_prob(match_id=record.match_id)  # type: ignore[union-attr]
+                prediction.update(engine.predict(prob=prob, top=top))
+                if coverage is not None:
+                    prediction["coverage"] = engine.coverage(prob=prob, target=coverage)
+                result.append(prediction)
+
+            response = {"jornada": jornada, "temporada": temporada, "plenos": result}
+            return [TextContent(type="text", text=json.dumps(obj=response, ensure_ascii=False, indent=2))]
+
+        elif name == "simulate_jornada":
+            jornada = arguments["jornada"]
+            temporada = arguments["temporada"]
+            column = arguments.get("column")
+            strategy = arguments.get("strategy", "conservadora")
+            n_simulations = arguments.get("n_simulations", 10_000)
+            seed = arguments.get("seed", 0)
+
+            unavailable = [
+                TextContent(
+                    type="text",
+                    text=f"Error: No se pudieron obtener las probabilidades de la jornada {jornada}, "
+                    f"temporada {temporada}.",
+                )
+            ]
+
+            if column is None:
+                prediction = predictor.predict(jornada=jornada, temporada=temporada, strategy=strategy)
+                if prediction is None:
+                    return unavailable
+                result = simulation.simulate_predictions(
+                    predictions=prediction["predictions"], n_simulations=n_simulations, seed=seed
+                )
+                response = {"jornada": jornada, "temporada": temporada, "strategy": strategy, **result}
+            else:
+                # Con una columna indicada basta con las probabilidades de la jornada: no se ejecuta ninguna estrategia
+                probabilities = data_source.get_kiniela_probabilities(jornada=jornada, temporada=temporada)
+                if probabilities is None:
+                    return unavailable
+                matrix, match_ids = simulation.feed_probabilities(probabilities=probabilities)
+                if len(column) != len(match_ids):
+                    return [
+                        TextContent(
+                            type="text",
+                            text=f"Error: La columna tiene {len(column)} signos, pero la jornada {jornada} de la "
+                            f"temporada {temporada} tiene {len(match_ids)} partidos con signo 1X2 (sin contar el "
+                            f"pleno al 15).",
+                        )
+                    ]
+                result = simulation.simulate(
+                    probabilities=matrix, column=column.upper(), n_simulations=n_simulations, seed=seed
+                )
+                response = {"jornada": jornada, "temporada": temporada, "match_ids": match_ids, **result}
+            return [TextContent(type="text", text=json.dumps(obj=response, ensure_ascii=False, indent=2))]
+
         else:
             raise ValueError(f"Herramienta desconocida: {name}")
 
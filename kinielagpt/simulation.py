@@ -0,0 +1,205 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Simulación de jornadas para KinielaGPT.
+
+Simula resultados de una jornada con las probabilidades 1/X/2 de cada partido (columns.sample_outcomes) y
+devuelve la distribución de aciertos de una columna. Las simulaciones son deterministas para una semilla:
+el mismo (probabilidades, columna, semilla, número de simulaciones) da siempre el mismo resultado, así que se
+memoizan en una caché en memoria indexada por (hash de las entradas, semilla, n) y las preguntas repetidas
+del asistente se responden sin volver a simular.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+
+from kinielagpt import columns
+from kinielagpt.portfolio import prediction_probabilities
+
+# Número máximo de simulaciones memoizadas (se descartan las más antiguas)
+SIMULATION_CACHE_SIZE = 256
+
+# Resultados simulados por bloque (acota la memoria con millones de simulaciones)
+TAMANO_BLOQUE = 1 << 16
+
+# Aciertos mínimos de las categorías de premio de la quiniela (sin contar el pleno al 15)
+CATEGORIAS = (14, 13, 12, 11, 10)
+
+__SIMULATION_CACHE: dict[tuple[str, int, int], dict[str, Any]] = {}
+
+
+def inputs_hash(probabilities: np.ndarray, column: str) -> str:
+    """
+    Hash de las entradas de una simulación.
+
+    Parameters
+    ----------
+    probabilities : np.ndarray
+        Matriz (partidos, 3) de probabilidades 1/X/2 normalizadas.
+    column : str
+        Columna evaluada como cadena de signos.
+
+    Returns
+    -------
+    str
+        Hash SHA-256 (hexadecimal) de las probabilidades redondeadas a 6 decimales y de la columna.
+    """
+    payload = json.dumps({"probabilities": np.round(probabilities, 6).tolist(), "column": column})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def simulate(probabilities: np.ndarray, column: str, n_simulations: int = 10_000, seed: int = 0) -> dict[str, Any]:
+    """
+    Distribución de aciertos de una columna sobre resultados simulados de la jornada.
+
+    Parameters
+    ----------
+    probabilities : np.ndarray
+        Matriz (partidos, 3) de probabilidades 1/X/2 normalizadas.
+    column : str
+        Columna evaluada como cadena de signos, un carácter por partido.
+    n_simulations : int, optional
+        Número de resultados simulados (default: 10.000).
+    seed : int, optional
+        Semilla del generador aleatorio (default: 0).
+
+    Returns
+    -------
+    dict[str, Any]
+        Diccionario con:
+        - column, n_simulations, seed, inputs_hash: Entradas de la simulación
+        - distribution: Para cada número de aciertos (0..partidos), count y probability (%)
+        - mean_hits, std_hits: Media y desviación típica de los aciertos
+        - prize_probabilities: Probabilidad (%) de alcanzar cada categoría de CATEGORIAS ("14", "13"...)
+        - cached: True si el resultado procede de la caché
+
+    Raises
+    ------
+    ValueError
+        Si la columna no tiene un signo válido por partido o n_simulations no es positivo.
+    """
+    if len(column) != probabilities.shape[0]:
+        raise ValueError(f"La columna debe tener {probabilities.shape[0]} signos y tiene {len(column)}")
+    if n_simulations <= 0:
+        raise ValueError("El número de simulaciones debe ser positivo")
+
+    key = (inputs_hash(probabilities=probabilities, column=column), seed, n_simulations)
+    if key in __SIMULATION_CACHE:
+        return {**__SIMULATION_CACHE[key], "cached": True}
+
+    n_matches = probabilities.shape[0]
+    packed = columns.encode_strings([column])[0]
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(n_matches + 1, dtype=np.int64)
+    for start in range(0, n_simulations, TAMANO_BLOQUE):
+        size = min(TAMANO_BLOQUE, n_simulations - start)
+        outcomes = columns.sample_outcomes(probabilities=probabilities, size=size, rng=rng)
+        hits = columns.count_hits(columns=packed, outcomes=outcomes, n_matches=n_matches)
+        counts += np.bincount(hits, minlength=n_matches + 1)
+
+    values = np.arange(n_matches + 1)
+    mean = float(counts @ values) / n_simulations
+    at_least = np.cumsum(counts[::-1])[::-1]
+    result = {
+        "column": column,
+        "n_simulations": n_simulations,
+        "seed": seed,
+        "inputs_hash": key[0],
+        "distribution": [
+            {"hits": int(hits), "count": int(count), "probability": round(100 * int(count) / n_simulations, 4)}
+            for hits, count in zip(values, counts)
+        ],
+        "mean_hits": round(mean, 4),
+        "std_hits": round(float(np.sqrt(counts @ (values - mean) ** 2 / n_simulations)), 4),
+        "prize_probabilities": {
+            str(category): round(100 * int(at_least[category]) / n_simulations, 4)
+            for category in CATEGORIAS if category <= n_matches
+        },
+    }
+
+    if len(__SIMULATION_CACHE) >= SIMULATION_CACHE_SIZE:
+        __SIMULATION_CACHE.pop(next(iter(__SIMULATION_CACHE)))
+    __SIMULATION_CACHE[key] = result
+    return {**result, "cached": False}
+
+
+def simulate_predictions(predictions: list[dict[str, Any]], column: str | None = None, n_simulations: int = 10_000,
+                         seed: int = 0) -> dict[str, Any]:
+    """
+    Simula una jornada con las probabilidades de una predicción de KinielaPredictor.
+
+    Parameters
+    ----------
+    predictions : list[dict[str, Any]]
+        Lista predictions de KinielaPredictor.predict.
+    column : str | None, optional
+        Columna a evaluar (un signo por partido con probabilidades 1X2, en orden de match_id). Si es None, se
+        usa la columna de la predicción.
+    n_simulations : int, optional
+        Número de resultados simulados (default: 10.000).
+    seed : int, optional
+        Semilla del generador aleatorio (default: 0).
+
+    Returns
+    -------
+    dict[str, Any]
+        Resultado de simulate, más match_ids.
+    """
+    probabilities, match_ids = prediction_probabilities(predictions=predictions)
+    if column is None:
+        column = columns.decode_strings(packed=columns.from_predictions(predictions)[0], n_matches=len(match_ids))[0]
+    result = simulate(probabilities=probabilities, column=column.upper(), n_simulations=n_simulations, seed=seed)
+    return {"match_ids": match_ids, **result}
+
+
+def feed_probabilities(probabilities: list[dict[str, Any]]) -> tuple[np.ndarray, list[int]]:
+    """
+    Matriz de probabilidades 1/X/2 de los partidos con signo de data_source.get_kiniela_probabilities.
+
+    Permite simular una columna indicada sin ejecutar ninguna estrategia de KinielaPredictor.
+
+    Parameters
+    ----------
+    probabilities : list[dict[str, Any]]
+        Probabilidades de la jornada tal y como las devuelve data_source.get_kiniela_probabilities.
+
+    Returns
+    -------
+    tuple[np.ndarray, list[int]]
+        Matriz (partidos, 3) normalizada y match_id (posición en la jornada) de cada fila. El pleno al 15 y los
+        partidos sin probabilidades 1X2 no forman parte de la matriz.
+    """
+    normal = [(match_id, prob) for match_id, prob in enumerate(probabilities, start=1) if "1_Prob" in prob]
+    matrix = np.array([[prob["1_Prob"], prob["X_Prob"], prob["2_Prob"]] for _, prob in normal], dtype=float)
+    matrix = matrix.reshape(len(normal), 3)
+    totals = matrix.sum(axis=1, keepdims=True)
+    matrix = np.where(totals > 0, matrix / np.where(totals > 0, totals, 1.0), 1 / 3)
+    return matrix, [match_id for match_id, _ in normal]
+
+
+def clear_cache() -> None:
+    """
+    Vacía la caché de simulaciones.
+    """
+    __SIMULATION_CACHE.clear()
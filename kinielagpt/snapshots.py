@@ -0,0 +1,342 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Almacén persistente de la evolución de las probabilidades de cada jornada.
+
+Cada descarga de get_kiniela_probabilities se guarda con su instante en una base de datos SQLite (en el
+directorio de caché de data_source) de sólo inserción: el snapshot completo comprimido con zlib y, además, un
+índice por partido con un punto compacto (valores en décimas como enteros de 16 bits) sólo cuando cambian sus
+probabilidades. La evolución de un partido se consulta recorriendo su índice, sin descomprimir snapshots.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any
+
+from kinielagpt import data_source
+
+SNAPSHOTS_FILENAME = "probability_snapshots.sqlite3"
+
+# Campos de probabilidad de get_kiniela_probabilities seguidos por partido (los ausentes valen 0)
+PROBABILITY_FIELDS = (
+    "1_Prob",
+    "X_Prob",
+    "2_Prob",
+    "0_Goles_Local_Prob",
+    "1_Goles_Local_Prob",
+    "2_Goles_Local_Prob",
+    "Mas_Goles_Local_Prob",
+    "0_Goles_Visitante_Prob",
+    "1_Goles_Visitante_Prob",
+    "2_Goles_Visitante_Prob",
+    "Mas_Goles_Visitante_Prob",
+)
+
+
+def probability_vector(prob: dict[str, Any]) -> tuple[float, ...]:
+    """
+    Devuelve las probabilidades de un partido en el orden de PROBABILITY_FIELDS.
+
+    Parameters
+    ----------
+    prob : dict[str, Any]
+        Probabilidades de un partido (elemento de get_kiniela_probabilities).
+
+    Returns
+    -------
+    tuple[float, ...]
+        Un valor por campo de PROBABILITY_FIELDS; 0.0 para los campos ausentes.
+    """
+    return tuple(float(prob.get(name, 0.0)) for name in PROBABILITY_FIELDS)
+
+
+class ProbabilitySnapshotStore:
+    """
+    Almacén de sólo inserción de snapshots de probabilidades con índice por partido.
+
+    Un snapshot idéntico al último de su jornada no se vuelve a guardar. Dentro de un snapshot nuevo sólo se
+    indexan los partidos cuyas probabilidades (o nombre) han cambiado respecto a su último punto. Ambas
+    comprobaciones se hacen contra la base de datos dentro de la misma transacción de escritura, así que varios
+    almacenes (o procesos) pueden escribir en el mismo fichero.
+
+    Examples
+    --------
+    >>> store = ProbabilitySnapshotStore()
+    >>> store.record(jornada=32, temporada=2026)
+    True
+    >>> store.drift(jornada=32, temporada=2026, match_id=5)["variacion"]["1_Prob"]
+    -4.3
+    """
+
+    __SCHEMA = """
+    CREATE TABLE IF NOT EXISTS snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        temporada INTEGER NOT NULL,
+        jornada INTEGER NOT NULL,
+        timestamp REAL NOT NULL,
+        digest TEXT NOT NULL,
+        data BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_snapshots_jornada ON snapshots (temporada, jornada, id);
+    CREATE TABLE IF NOT EXISTS match_points (
+        temporada INTEGER NOT NULL,
+        jornada INTEGER NOT NULL,
+        match_id INTEGER NOT NULL,
+        snapshot_id INTEGER NOT NULL,
+        timestamp REAL NOT NULL,
+        partido TEXT NOT NULL,
+        vector BLOB NOT NULL,
+        PRIMARY KEY (temporada, jornada, match_id, snapshot_id)
+    ) WITHOUT ROWID;
+    """
+
+    # Valores en décimas de punto porcentual como enteros de 16 bits (las probabilidades vienen con 1 decimal)
+    __VECTOR = struct.Struct(f"<{len(PROBABILITY_FIELDS)}h")
+
+    def __init__(self, path: str | None = None) -> None:
+        """
+        Abre (o crea) el almacén.
+
+        Parameters
+        ----------
+        path : str | None, optional
+            Ruta del fichero SQLite. Si es None, se usa probability_snapshots.sqlite3 en
+            data_source.get_cache_dir(). Con ":memory:" el almacén solo vive en memoria.
+        """
+        if path is None:
+            path = os.path.join(data_source.get_cache_dir(), SNAPSHOTS_FILENAME)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.__connection = sqlite3.connect(path)
+        self.__connection.executescript(self.__SCHEMA)
+
+    def close(self) -> None:
+        """
+        Cierra la conexión con la base de datos.
+        """
+        self.__connection.close()
+
+    def append(self, probabilities: list[dict[str, Any]], jornada: int, temporada: int,
+               timestamp: float | None = None) -> bool:
+        """
+        Guarda un snapshot de las probabilidades de una jornada.
+
+        Parameters
+        ----------
+        probabilities : list[dict[str, Any]]
+            Probabilidades de la jornada (get_kiniela_probabilities).
+        jornada : int
+            Número de jornada.
+        temporada : int
+            Año de la temporada.
+        timestamp : float | None, optional
+            Instante de la descarga (segundos desde epoch). Si es None, time.time().
+
+        Returns
+        -------
+        bool
+            True si se ha guardado, False si era idéntico al último snapshot de la jornada.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        data = json.dumps(probabilities, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self.__connection:
+            # Bloqueo de escritura antes de leer el último estado: otro almacén no puede escribir entre medias
+            self.__connection.execute("BEGIN IMMEDIATE")
+            last = self.__connection.execute(
+                "SELECT digest FROM snapshots WHERE temporada = ? AND jornada = ? ORDER BY id DESC LIMIT 1",
+                (temporada, jornada),
+            ).fetchone()
+            if last is not None and last[0] == digest:
+                return False
+
+            last_points = self.__load_last_points(jornada=jornada, temporada=temporada)
+            snapshot_id = self.__connection.execute(
+                "INSERT INTO snapshots (temporada, jornada, timestamp, digest, data) VALUES (?, ?, ?, ?, ?)",
+                (temporada, jornada, timestamp, digest, zlib.compress(data, 9)),
+            ).lastrowid
+            for match_id, prob in enumerate(probabilities, start=1):
+                point = (prob.get("partido", ""), self.__pack(values=probability_vector(prob=prob)))
+                if last_points.get(match_id) == point:
+                    continue
+                self.__connection.execute(
+                    "INSERT INTO match_points VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (temporada, jornada, match_id, snapshot_id, timestamp, point[0], point[1]),
+                )
+        return True
+
+    def record(self, jornada: int, temporada: int) -> bool | None:
+        """
+        Descarga las probabilidades de una jornada y guarda el snapshot.
+
+        Parameters
+        ----------
+        jornada : int
+            Número de jornada.
+        temporada : int
+            Año de la temporada.
+
+        Returns
+        -------
+        bool | None
+            Resultado de append, o None si no se pudieron obtener las probabilidades.
+        """
+        probabilities = data_source.get_kiniela_probabilities(jornada=jornada, temporada=temporada)
+        if probabilities is None:
+            return None
+        return self.append(probabilities=probabilities, jornada=jornada, temporada=temporada)
+
+    def snapshots(self, jornada: int, temporada: int) -> list[tuple[float, list[dict[str, Any]]]]:
+        """
+        Devuelve los snapshots completos de una jornada en orden cronológico.
+
+        Parameters
+        ----------
+        jornada : int
+            Número de jornada.
+        temporada : int
+            Año de la temporada.
+
+        Returns
+        -------
+        list[tuple[float, list[dict[str, Any]]]]
+            Pares (timestamp, probabilidades) descomprimidos.
+        """
+        rows = self.__connection.execute(
+            "SELECT timestamp, data FROM snapshots WHERE temporada = ? AND jornada = ? ORDER BY id",
+            (temporada, jornada),
+        )
+        return [(timestamp, json.loads(zlib.decompress(data))) for timestamp, data in rows]
+
+    def match_series(self, jornada: int, temporada: int, match_id: int) -> list[dict[str, Any]]:
+        """
+        Devuelve los puntos de un partido (uno por cambio) leyendo sólo su índice.
+
+        Parameters
+        ----------
+        jornada : int
+            Número de jornada.
+        temporada : int
+            Año de la temporada.
+        match_id : int
+            ID del partido dentro de la jornada (1-15).
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Puntos en orden cronológico con timestamp, partido y un valor por campo de PROBABILITY_FIELDS.
+        """
+        rows = self.__connection.execute(
+            "SELECT timestamp, partido, vector FROM match_points "
+            "WHERE temporada = ? AND jornada = ? AND match_id = ? ORDER BY snapshot_id",
+            (temporada, jornada, match_id),
+        )
+        return [
+            {"timestamp": timestamp, "partido": partido}
+            | dict(zip(PROBABILITY_FIELDS, self.__unpack(vector=vector)))
+            for timestamp, partido, vector in rows
+        ]
+
+    def drift(self, jornada: int, temporada: int, match_id: int) -> dict[str, Any] | None:
+        """
+        Resume cómo han evolucionado las probabilidades 1/X/2 y de goles de un partido.
+
+        Parameters
+        ----------
+        jornada : int
+            Número de jornada.
+        temporada : int
+            Año de la temporada.
+        match_id : int
+            ID del partido dentro de la jornada (1-15).
+
+        Returns
+        -------
+        dict[str, Any] | None
+            - id_partido, partido, jornada, temporada.
+            - snapshots: Snapshots guardados de la jornada; cambios: Puntos del partido.
+            - desde, hasta: Instantes (ISO 8601, UTC) del primer y último snapshot de la jornada.
+            - inicial, actual, variacion, minimo, maximo: Diccionarios con un valor por campo.
+            - serie: Puntos del partido con su instante en ISO 8601.
+            None si el partido no tiene puntos guardados.
+        """
+        series = self.match_series(jornada=jornada, temporada=temporada, match_id=match_id)
+        if not series:
+            return None
+
+        total, first, last = self.__connection.execute(
+            "SELECT COUNT(*), MIN(timestamp), MAX(timestamp) FROM snapshots WHERE temporada = ? AND jornada = ?",
+            (temporada, jornada),
+        ).fetchone()
+
+        initial, current = series[0], series[-1]
+        return {
+            "id_partido": match_id,
+            "partido": current["partido"],
+            "jornada": jornada,
+            "temporada": temporada,
+            "snapshots": total,
+            "cambios": len(series),
+            "desde": self.__isoformat(timestamp=first),
+            "hasta": self.__isoformat(timestamp=last),
+            "inicial": {name: initial[name] for name in PROBABILITY_FIELDS},
+            "actual": {name: current[name] for name in PROBABILITY_FIELDS},
+            "variacion": {name: round(current[name] - initial[name], 1) for name in PROBABILITY_FIELDS},
+            "minimo": {name: min(point[name] for point in series) for name in PROBABILITY_FIELDS},
+            "maximo": {name: max(point[name] for point in series) for name in PROBABILITY_FIELDS},
+            "serie": [
+                point | {"timestamp": self.__isoformat(timestamp=point["timestamp"])} for point in series
+            ],
+        }
+
+    def __len__(self) -> int:
+        return self.__connection.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+    def __load_last_points(self, jornada: int, temporada: int) -> dict[int, tuple[str, bytes]]:
+        """Último punto indexado de cada partido de la jornada, leído de la base de datos."""
+        rows = self.__connection.execute(
+            "SELECT match_id, partido, vector FROM match_points AS p WHERE temporada = ? AND jornada = ? "
+            "AND snapshot_id = (SELECT MAX(snapshot_id) FROM match_points "
+            "WHERE temporada = p.temporada AND jornada = p.jornada AND match_id = p.match_id)",
+            (temporada, jornada),
+        )
+        return {match_id: (partido, vector) for match_id, partido, vector in rows}
+
+    def __pack(self, values: tuple[float, ...]) -> bytes:
+        """Codifica los valores en décimas como enteros de 16 bits."""
+        return self.__VECTOR.pack(*(round(value * 10) for value in values))
+
+    def __unpack(self, vector: bytes) -> tuple[float, ...]:
+        """Decodifica un punto codificado con __pack."""
+        return tuple(value / 10 for value in self.__VECTOR.unpack(vector))
+
+    def __isoformat(self, timestamp: float) -> str:
+        """Instante en ISO 8601 (UTC, segundos)."""
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(timespec="seconds")
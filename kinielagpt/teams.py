@@ -0,0 +1,292 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Índice de nombres de equipos para KinielaGPT.
+
+Este módulo normaliza los nombres de los equipos (mayúsculas, sin tildes ni puntuación) y construye, una
+vez por jornada, un índice que resuelve el nombre introducido por el usuario al partido en el que juega
+el equipo. La resolución sigue un orden fijo para que sea determinista: nombre exacto, alias conocido,
+palabras completas, subcadena y, por último, coincidencia aproximada con difflib.
+"""
+
+import difflib
+import re
+import unicodedata
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+
+def normalize_team_name(name: str) -> str:
+    """
+    Normaliza un nombre de equipo para compararlo con otros.
+
+    Convierte a mayúsculas, elimina tildes y diacríticos (Á → A, Ñ → N, Ç → C) y sustituye cualquier
+    carácter no alfanumérico por un espacio, colapsando espacios repetidos.
+
+    Parameters
+    ----------
+    name : str
+        Nombre del equipo tal como aparece en los datos o lo escribe el usuario.
+
+    Returns
+    -------
+    str
+        Nombre normalizado (ej: "R.MADRID" → "R MADRID", "Alavés" → "ALAVES").
+
+    Examples
+    --------
+    >>> normalize_team_name("At. Madrid")
+    'AT MADRID'
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    without_marks = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r"[^A-Z0-9]+", " ", without_marks.upper()).strip()
+
+
+# Alias habituales de los nombres usados por quinielista.es (nombre del feed → otras formas de escribirlo)
+TEAM_ALIASES: dict[str, tuple[str, ...]] = {
+    "R.MADRID": ("REAL MADRID", "MADRID"),
+    "AT.MADRID": ("ATLETICO", "ATLETICO MADRID", "ATLETICO DE MADRID", "ATLETI"),
+    "ATH.CLUB": ("ATHLETIC", "ATHLETIC CLUB", "ATHLETIC BILBAO", "BILBAO"),
+    "BARCELONA": ("FC BARCELONA", "BARÇA", "BARSA"),
+    "BETIS": ("REAL BETIS", "R.BETIS"),
+    "R.SOCIEDAD": ("REAL SOCIEDAD", "LA REAL"),
+    "R.OVIEDO": ("REAL OVIEDO", "OVIEDO"),
+    "R.ZARAGOZA": ("REAL ZARAGOZA", "ZARAGOZA"),
+    "VALLADOLID": ("REAL VALLADOLID", "R.VALLADOLID"),
+    "RACING S.": ("RACING", "RACING SANTANDER", "RACING DE SANTANDER"),
+    "RAYO": ("RAYO VALLECANO",),
+    "CELTA": ("CELTA DE VIGO", "CELTA VIGO", "RC CELTA"),
+    "ESPANYOL": ("RCD ESPANYOL", "ESPAÑOL"),
+    "SPORTING": ("SPORTING GIJON", "SPORTING DE GIJON", "REAL SPORTING"),
+    "ALAVÉS": ("DEPORTIVO ALAVES",),
+    "DEPORTIVO": ("DEPOR", "DEPORTIVO DE LA CORUÑA", "RC DEPORTIVO"),
+    "ANDORRA FC": ("ANDORRA",),
+    "LAS PALMAS": ("UD LAS PALMAS",),
+    "SEVILLA": ("SEVILLA FC",),
+    "VALENCIA": ("VALENCIA CF",),
+    "VILLARREAL": ("VILLARREAL CF",),
+}
+
+# Alias normalizado → nombre normalizado del feed
+__ALIAS_INDEX: dict[str, str] = {
+    normalize_team_name(alias): normalize_team_name(name)
+    for name, aliases in TEAM_ALIASES.items()
+    for alias in aliases
+}
+
+
+def resolve_alias(name: str) -> str:
+    """
+    Devuelve el nombre normalizado del feed correspondiente a un alias conocido.
+
+    Parameters
+    ----------
+    name : str
+        Nombre o alias del equipo (normalizado o no).
+
+    Returns
+    -------
+    str
+        Nombre normalizado del feed si el nombre es un alias conocido; en otro caso, el propio
+        nombre normalizado.
+    """
+    normalized = normalize_team_name(name)
+    return __ALIAS_INDEX.get(normalized, normalized)
+
+
+# Siglas societarias que los distintos proveedores añaden o quitan del nombre ("Girona FC", "CD Castellón")
+__CLUB_AFFIXES = {"FC", "CF", "CD", "UD", "AD", "RC", "RCD", "SD", "SAD", "CA"}
+
+# Nombres normalizados de los feeds con alias conocidos
+__FEED_NAMES = {normalize_team_name(name) for name in TEAM_ALIASES}
+
+
+def team_key(name: str) -> str:
+    """
+    Devuelve una clave canónica para identificar al mismo equipo escrito de formas distintas.
+
+    Además de los alias conocidos, ignora las siglas societarias (FC, CF, CD, UD, AD...), de modo que
+    "FC Andorra", "ANDORRA FC" y "Andorra" comparten clave. Se usa para unir los resultados de distintos
+    proveedores, que escriben los nombres de forma diferente ("R.MADRID", "Real Madrid").
+
+    Parameters
+    ----------
+    name : str
+        Nombre del equipo en cualquier formato.
+
+    Returns
+    -------
+    str
+        Clave canónica del equipo (nombre normalizado del feed si es conocido).
+
+    Examples
+    --------
+    >>> team_key("Atlético de Madrid") == team_key("AT.MADRID")
+    True
+    """
+    normalized = normalize_team_name(name)
+    if normalized in __FEED_NAMES or normalized in __ALIAS_INDEX:
+        return __ALIAS_INDEX.get(normalized, normalized)
+
+    stripped = " ".join(token for token in normalized.split() if token not in __CLUB_AFFIXES) or normalized
+    return __ALIAS_INDEX.get(stripped, stripped)
+
+
+@dataclass(slots=True)
+class TeamEntry:
+    """
+    Posición de un equipo dentro de una jornada.
+
+    Attributes
+    ----------
+    name : str
+        Nombre del equipo tal como aparece en el partido (ej: "R.MADRID").
+    match_id : int
+        Posición del partido dentro de la jornada (1-15).
+    is_local : bool
+        True si el equipo juega como local.
+    """
+
+    name: str
+    match_id: int
+    is_local: bool
+
+
+class TeamIndex:
+    """
+    Índice de los equipos de una jornada con búsqueda normalizada, por alias y aproximada.
+
+    Se construye una vez a partir de los nombres de los partidos ("LOCAL | VISITANTE") y resuelve
+    cualquier nombre de equipo a su partido. El orden de resolución es fijo y, ante varios
+    candidatos en una misma etapa, gana el primero en el orden de la jornada (local antes que
+    visitante), de modo que el resultado es siempre el mismo:
+
+    1. Nombre normalizado exacto (búsqueda O(1)).
+    2. Alias conocido de TEAM_ALIASES (búsqueda O(1)).
+    3. Todas las palabras del nombre buscado presentes como palabras del nombre del equipo.
+    4. Nombre buscado contenido en el nombre del equipo (criterio anterior de analyze_team).
+    5. Coincidencia aproximada con difflib (cutoff 0.75).
+    """
+
+    def __init__(self, partidos: Iterable[str]) -> None:
+        """
+        Construye el índice a partir de los nombres de los partidos en el orden de la jornada.
+
+        Parameters
+        ----------
+        partidos : Iterable[str]
+            Nombres de los partidos en formato "LOCAL | VISITANTE", ordenados por match_id.
+        """
+        self.__entries: dict[str, TeamEntry] = {}
+
+        for match_id, partido in enumerate(partidos, start=1):
+            parts = partido.split(" | ")
+            if len(parts) != 2:
+                continue
+            for name, is_local in ((parts[0], True), (parts[1], False)):
+                key = normalize_team_name(name)
+                if key and key not in self.__entries:
+                    self.__entries[key] = TeamEntry(name=name.strip(), match_id=match_id, is_local=is_local)
+
+        self.__tokens = {key: set(key.split()) for key in self.__entries}
+
+    @classmethod
+    def from_details(cls, details: Iterable[dict[str, Any]]) -> "TeamIndex":
+        """
+        Construye el índice a partir de los detalles de los partidos de una jornada.
+
+        Parameters
+        ----------
+        details : Iterable[dict[str, Any]]
+            Detalles de los partidos (get_kiniela_matches_details), ordenados por match_id.
+
+        Returns
+        -------
+        TeamIndex
+            Índice de los equipos de la jornada.
+        """
+        return cls(partidos=[detail.get("partido", "") for detail in details])
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, team_name: str) -> bool:
+        return self.lookup(team_name=team_name) is not None
+
+    @property
+    def teams(self) -> list[TeamEntry]:
+        """
+        Equipos de la jornada en orden de partido (local antes que visitante).
+
+        Returns
+        -------
+        list[TeamEntry]
+            Entradas del índice.
+        """
+        return list(self.__entries.values())
+
+    def lookup(self, team_name: str) -> TeamEntry | None:
+        """
+        Resuelve un nombre de equipo a su entrada en la jornada.
+
+        Parameters
+        ----------
+        team_name : str
+            Nombre del equipo en cualquier formato (ej: "Real Madrid", "r.madrid", "Alaves").
+
+        Returns
+        -------
+        TeamEntry | None
+            Entrada del equipo, o None si no se encuentra en la jornada.
+
+        Examples
+        --------
+        >>> index = TeamIndex(partidos=["AT.MADRID | VALENCIA", "ALAVÉS | R.MADRID"])
+        >>> index.lookup("Real Madrid")
+        TeamEntry(name='R.MADRID', match_id=2, is_local=False)
+        """
+        query = normalize_team_name(team_name)
+        if not query:
+            return None
+
+        # 1-2. Nombre exacto o alias conocido
+        entry = self.__entries.get(query) or self.__entries.get(team_key(name=query))
+        if entry is not None:
+            return entry
+
+        # 3. Palabras completas
+        query_tokens = set(query.split())
+        for key, tokens in self.__tokens.items():
+            if query_tokens <= tokens:
+                return self.__entries[key]
+
+        # 4. Subcadena
+        for key, entry in self.__entries.items():
+            if query in key:
+                return entry
+
+        # 5. Coincidencia aproximada
+        close = difflib.get_close_matches(query, list(self.__entries), n=1, cutoff=0.75)
+        if close:
+            return self.__entries[close[0]]
+
+        return None
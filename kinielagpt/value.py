@@ -0,0 +1,168 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Valor esperado de columnas de quiniela frente al porcentaje de apuestas del público.
+
+El premio de una categoría se reparte entre todos los acertantes, de modo que una columna vale más cuanto
+menos apostada está. Para una columna con probabilidad de acierto P (estimación LAE) y cuota de apuestas Q
+(porcentaje del público en Quinielista, producto de los porcentajes de sus signos), con N apuestas en juego se
+esperan N·Q acertantes además de la propia columna. La fracción esperada del bote que gana la columna es:
+
+    valor = P / (1 + N·Q)
+
+Las columnas se representan como matrices de enteros (una fila por columna, una columna por partido) con los
+códigos de SIGNOS, y el valor se calcula vectorizado con NumPy, por bloques, sobre conjuntos de millones de
+columnas.
+"""
+
+from typing import Any
+
+import numpy as np
+
+# Signos de un partido, en el orden de los códigos enteros de las columnas (0 -> "1", 1 -> "X", 2 -> "2")
+SIGNOS = ("1", "X", "2")
+
+# Número de apuestas estimado en una jornada (sólo influye en el equilibrio entre probabilidad y popularidad)
+APUESTAS_ESTIMADAS = 5_000_000
+
+# Columnas evaluadas por bloque al recorrer conjuntos grandes de candidatas
+TAMANO_BLOQUE = 1 << 16
+
+
+def sign_matrix(rows: list[dict[str, Any]]) -> np.ndarray:
+    """
+    Construye la matriz de probabilidades 1/X/2 de una lista de partidos.
+
+    Parameters
+    ----------
+    rows : list[dict[str, Any]]
+        Probabilidades por partido con claves "1_Prob", "X_Prob" y "2_Prob" (en porcentaje). Las claves
+        ausentes se consideran 0, igual que en data_source.
+
+    Returns
+    -------
+    np.ndarray
+        Matriz (partidos, 3) con las probabilidades normalizadas a fracción (cada fila suma 1). Una fila sin
+        datos se reparte uniformemente.
+    """
+    matrix = np.array(
+        [[row.get(f"{sign}_Prob", 0.0) for sign in SIGNOS] for row in rows], dtype=np.float64
+    ).reshape(-1, len(SIGNOS))
+    totals = matrix.sum(axis=1, keepdims=True)
+    empty = totals[:, 0] <= 0
+    matrix[empty] = 1.0
+    totals[empty] = len(SIGNOS)
+    return matrix / totals
+
+
+def column_expected_values(columns: np.ndarray, probabilities: np.ndarray, shares: np.ndarray,
+                           apuestas: int = APUESTAS_ESTIMADAS) -> np.ndarray:
+    """
+    Calcula el valor esperado de un conjunto de columnas.
+
+    Parameters
+    ----------
+    columns : np.ndarray
+        Matriz (columnas, partidos) de códigos de signo (índices de SIGNOS).
+    probabilities : np.ndarray
+        Matriz (partidos, 3) de probabilidades estimadas (ver sign_matrix).
+    shares : np.ndarray
+        Matriz (partidos, 3) con el porcentaje de apuestas del público, como fracción.
+    apuestas : int, optional
+        Número de apuestas en juego (default: APUESTAS_ESTIMADAS).
+
+    Returns
+    -------
+    np.ndarray
+        Vector (columnas,) con la fracción esperada del bote que gana cada columna: P / (1 + apuestas·Q).
+    """
+    columns = np.atleast_2d(columns)
+    matches = np.arange(columns.shape[1])
+    with np.errstate(divide="ignore"):
+        log_p = np.log(probabilities)[matches, columns].sum(axis=1)
+        log_q = np.log(shares)[matches, columns].sum(axis=1)
+    return np.exp(log_p) / (1.0 + apuestas * np.exp(log_q))
+
+
+def best_value_column(probabilities: np.ndarray, shares: np.ndarray, top: int = 2,
+                      apuestas: int = APUESTAS_ESTIMADAS, block_size: int = TAMANO_BLOQUE) -> dict[str, Any]:
+    """
+    Busca la columna de mayor valor esperado entre las combinaciones de los signos más probables.
+
+    El valor de una columna no se descompone por partidos (depende del producto de probabilidades y de cuotas),
+    así que se evalúan todas las combinaciones de los `top` signos más probables de cada partido: top^partidos
+    columnas (16.384 con top=2 y 14 partidos, 4,8 millones con top=3), generadas y evaluadas por bloques.
+
+    Parameters
+    ----------
+    probabilities : np.ndarray
+        Matriz (partidos, 3) de probabilidades estimadas.
+    shares : np.ndarray
+        Matriz (partidos, 3) de porcentajes de apuestas del público.
+    top : int, optional
+        Número de signos candidatos por partido, de 1 a 3 (default: 2).
+    apuestas : int, optional
+        Número de apuestas en juego (default: APUESTAS_ESTIMADAS).
+    block_size : int, optional
+        Columnas evaluadas por bloque (default: TAMANO_BLOQUE).
+
+    Returns
+    -------
+    dict[str, Any]
+        Diccionario con:
+        - column: Vector (partidos,) de códigos de signo de la mejor columna
+        - value: Fracción esperada del bote de la mejor columna
+        - probability: Probabilidad de acierto de la mejor columna
+        - share: Cuota de apuestas del público de la mejor columna
+        - evaluated: Número de columnas evaluadas
+
+    Raises
+    ------
+    ValueError
+        Si top no está entre 1 y 3.
+    """
+    if not 1 <= top <= len(SIGNOS):
+        raise ValueError(f"top debe estar entre 1 y {len(SIGNOS)}")
+
+    n_matches = probabilities.shape[0]
+    candidates = np.argsort(-probabilities, axis=1, kind="stable")[:, :top]
+    powers = top ** np.arange(n_matches)
+    matches = np.arange(n_matches)
+    total = top ** n_matches
+
+    best_column = candidates[:, 0]
+    best_value = -1.0
+    for start in range(0, total, block_size):
+        index = np.arange(start, min(start + block_size, total))
+        columns = candidates[matches, (index[:, None] // powers) % top]
+        values = column_expected_values(columns=columns, probabilities=probabilities, shares=shares,
+                                        apuestas=apuestas)
+        position = int(np.argmax(values))
+        if values[position] > best_value:
+            best_value = float(values[position])
+            best_column = columns[position]
+
+    return {
+        "column": best_column,
+        "value": best_value,
+        "probability": float(np.prod(probabilities[matches, best_column])),
+        "share": float(np.prod(shares[matches, best_column])),
+        "evaluated": total,
+    }
@@ -0,0 +1,57 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Utilidades compartidas por los tests de KinielaGPT.
+"""
+
+import numpy as np
+
+
+def build_predictions(seed: int, alpha: tuple[float, float, float] = (4.0, 2.0, 2.0)) -> list[dict]:
+    """
+    Predicción de 14 partidos con probabilidades aleatorias más el pleno al 15.
+
+    Parameters
+    ----------
+    seed : int
+        Semilla del generador de probabilidades.
+    alpha : tuple[float, float, float], optional
+        Parámetros de la distribución de Dirichlet de las probabilidades 1/X/2 (default: (4.0, 2.0, 2.0)).
+
+    Returns
+    -------
+    list[dict]
+        Predicciones con el formato de Predictor.predict.
+    """
+    rng = np.random.default_rng(seed)
+    predictions = []
+    for match_id in range(1, 15):
+        probs = dict(zip(("1", "X", "2"), np.round(rng.dirichlet(alpha) * 100, 1).tolist(), strict=True))
+        predictions.append({
+            "match_id": match_id,
+            "match": f"LOCAL{match_id} | VISITANTE{match_id}",
+            "prediction": max(probs, key=probs.get),
+            "confidence": "MEDIA",
+            "probabilities": probs,
+        })
+    predictions.append({"match_id": 15, "match": "PLENO | AL 15", "prediction": "1-1", "confidence": "N/A",
+                        "probabilities": {}})
+    return predictions
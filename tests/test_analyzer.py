@@ -419,6 +419,35 @@ def test_analyze_home_away_performance_sin_datos() -> None:
     print("✅ Rendimiento sin datos manejado correctamente")
 
 
+def test_analyze_home_away_performance_sin_codigo() -> None:
+    """
+    Prueba que los partidos sin código de resultado cuentan en el denominador de la efectividad.
+
+    Un resultado que no se pudo interpretar llega como código vacío: no suma puntos ni entra en el registro, pero
+    sí en el número de partidos (len de la lista), igual que en el cálculo original.
+
+    Raises
+    ------
+    AssertionError
+        Si la efectividad se calcula solo sobre los partidos con código V/E/D.
+    """
+    print("=" * 80)
+    print("TEST: test_analyze_home_away_performance_sin_codigo()")
+    print("=" * 80)
+
+    resultados_local = ['VICTORIA', '']
+    resultados_visitante = ['']
+
+    performance = analyzer._Analyzer__analyze_home_away_performance(resultados_local, resultados_visitante)  # type: ignore
+
+    print(f"Output: {performance}")
+
+    assert performance['local']['registro'] == '1V-0E-0D (3pts)', "❌ Registro local incorrecto"
+    assert performance['local']['porcentaje_puntos_conseguidos'] == 50.0, "❌ El denominador debe ser len(resultados)"
+    assert performance['visitante']['porcentaje_puntos_conseguidos'] == 0.0, "❌ Efectividad visitante incorrecta"
+    print("✅ Partidos sin código incluidos en el denominador")
+
+
 if __name__ == "__main__":
     print("="*80)
     print("TESTS PARA KINIELAGPT ANALYZER")
@@ -447,6 +476,7 @@ if __name__ == "__main__":
     test_analyze_trend_datos_insuficientes()
     test_analyze_home_away_performance()
     test_analyze_home_away_performance_sin_datos()
+    test_analyze_home_away_performance_sin_codigo()
     
     print("\n" + "="*80)
     print("✅ TODOS LOS TESTS COMPLETADOS EXITOSAMENTE")
@@ -0,0 +1,165 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Tests para el módulo backtest.
+
+Ejecutar: python -m pytest tests/test_backtest.py -v -s
+"""
+
+import numpy as np
+import pytest
+
+from kinielagpt import backtest
+from kinielagpt.detector import SurpriseDetector
+from kinielagpt.records import JornadaFrame
+
+THRESHOLDS = [0.0, 20.0, 30.0, 45.0, 60.0]
+
+
+def build_frames() -> tuple[list[JornadaFrame], dict[tuple[int, int], list[str | None]]]:
+    """Tres jornadas sintéticas (una de otra temporada) con inconsistencias de cada tipo y sus resultados."""
+    probabilities = [
+        {"partido": "RACHA | TEST", "1_Prob": 75.0, "X_Prob": 15.0, "2_Prob": 10.0},
+        {"partido": "HISTORICO | TEST", "1_Prob": 10.0, "X_Prob": 20.0, "2_Prob": 70.0},
+        {"partido": "CLASIFICACION | TEST", "1_Prob": 68.0, "X_Prob": 20.0, "2_Prob": 12.0},
+        {"partido": "EMPATES | TEST", "1_Prob": 55.0, "X_Prob": 25.0, "2_Prob": 20.0},
+        {"partido": "EQUILIBRADO | TEST", "1_Prob": 40.0, "X_Prob": 30.0, "2_Prob": 30.0},
+        {"partido": "PLENO | TEST"},
+    ]
+    details = [
+        {"evolucionLocal": ["D", "D", "D", "D", "D"], "evolucionVisitante": ["V", "V", "V", "V", "V"]},
+        {"veces1": 6, "vecesX": 2, "veces2": 2},
+        {"clasificacionLocal": "18º 15pt", "clasificacionVisitante": "2º 55pt"},
+        {"evolucionLocal": ["E", "E", "V"], "evolucionVisitante": ["E", "E", "E"]},
+        {"veces1": 1, "vecesX": 1, "veces2": 8, "clasificacionLocal": 5, "clasificacionVisitante": "3º"},
+        {},
+    ]
+    keys = [(1, 2025), (2, 2025), (1, 2026)]
+    frames = [JornadaFrame.from_sources(jornada=j, temporada=t, probabilities=probabilities, details=details)
+              for j, t in keys]
+    results = {
+        (1, 2025): ["2", "2", "X", "1", "2", "2-1"],
+        (2, 2025): ["1", "1", "1", "X", "1", "0-0"],
+        (1, 2026): ["X", "2", None, "X", "2", "1-1"],
+    }
+    return frames, results
+
+
+def test_shared_arrays() -> None:
+    """
+    Prueba que los arrays se comparten sin copia entre el bloque creado y una conexión al mismo.
+
+    Raises
+    ------
+    AssertionError
+        Si los datos no coinciden, la conexión es escribible o no ve los cambios del creador.
+    """
+    print("=" * 80)
+    print("TEST: test_shared_arrays()")
+    print("=" * 80)
+
+    arrays = {"a": np.arange(10, dtype=np.int8), "b": np.linspace(0, 1, 7), "c": np.zeros((3, 4), dtype=np.int32)}
+    with backtest.SharedArrays.create(arrays=arrays) as shared:
+        attached = backtest.SharedArrays.attach(spec=shared.spec)
+        for name, array in arrays.items():
+            assert (attached.arrays[name] == array).all(), f"❌ El array {name} no coincide"
+            assert attached.arrays[name].ctypes.data % 8 == 0, f"❌ El array {name} debe estar alineado"
+        assert not attached.arrays["a"].flags.writeable, "❌ Las vistas conectadas deben ser de solo lectura"
+
+        shared.arrays["b"][0] = 42.0
+        assert attached.arrays["b"][0] == 42.0, "❌ La conexión debe ver el mismo bloque (sin copia)"
+        attached.close()
+    print("✅ Arrays compartidos sin copia y de solo lectura en la conexión")
+
+
+def test_evaluate_matches_sweep() -> None:
+    """
+    Prueba que las métricas del detector coinciden con SurpriseDetector.sweep_thresholds.
+
+    Raises
+    ------
+    AssertionError
+        Si las alertas, aciertos o los aciertos de las estrategias no son los esperados.
+    """
+    print("=" * 80)
+    print("TEST: test_evaluate_matches_sweep()")
+    print("=" * 80)
+
+    frames, results = build_frames()
+    dataset = backtest.BacktestDataset.from_frames(frames=frames, results=results)
+    sweep = SurpriseDetector().sweep_thresholds(frames=frames, results=results, thresholds=THRESHOLDS)
+
+    assert len(dataset) == 18 and dataset.n_jornadas == 3, "❌ Tamaño del dataset inesperado"
+    for row in sweep["thresholds"]:
+        result = backtest.evaluate(arrays=dataset.arrays, strategy="conservadora", threshold=row["threshold"])
+        expected = row["all"]
+        assert {k: result[k] for k in ("alerts", "hits", "precision", "recall")} == expected, (
+            f"❌ Métricas distintas con threshold={row['threshold']}: {result} != {expected}"
+        )
+
+    conservative = backtest.evaluate(arrays=dataset.arrays, strategy="conservadora", threshold=30.0)
+    assert conservative["accuracy"] == round(100 * 6 / 14, 2), f"❌ Precisión inesperada: {conservative}"
+    assert conservative["max_hits"] == 3, f"❌ Aciertos por jornada inesperados: {conservative}"
+
+    surprise = backtest.evaluate(arrays=dataset.arrays, strategy="sorpresa", threshold=1000.0)
+    assert {k: surprise[k] for k in ("accuracy", "mean_hits")} == {
+        k: conservative[k] for k in ("accuracy", "mean_hits")
+    }, "❌ Sin alertas la estrategia sorpresa debe jugar los favoritos"
+
+    with pytest.raises(ValueError):
+        backtest.evaluate(arrays=dataset.arrays, strategy="desconocida", threshold=30.0)
+    print(f"✅ Métricas idénticas a sweep_thresholds en {len(THRESHOLDS)} umbrales")
+
+
+def test_run_backtest_parallel() -> None:
+    """
+    Prueba que el backtest en paralelo con memoria compartida da el mismo resultado que en serie.
+
+    Raises
+    ------
+    AssertionError
+        Si los resultados difieren o falta el rendimiento por proceso.
+    """
+    print("=" * 80)
+    print("TEST: test_run_backtest_parallel()")
+    print("=" * 80)
+
+    frames, results = build_frames()
+    dataset = backtest.BacktestDataset.from_frames(frames=frames, results=results)
+
+    serial = backtest.run_backtest(dataset=dataset, thresholds=THRESHOLDS, processes=1)
+    parallel = backtest.run_backtest(dataset=dataset, thresholds=THRESHOLDS, processes=2)
+
+    assert serial["results"] == parallel["results"], "❌ El backtest en paralelo debe coincidir con el serie"
+    assert len(parallel["results"]) == len(THRESHOLDS) * len(backtest.BACKTEST_STRATEGIES), "❌ Faltan combinaciones"
+    assert sum(worker["tasks"] for worker in parallel["workers"]) == len(parallel["results"]), "❌ Tareas perdidas"
+    assert all(worker["matches"] == 18 * worker["tasks"] for worker in parallel["workers"]), "❌ Partidos por tarea"
+    assert all("matches_per_second" in worker for worker in parallel["workers"]), "❌ Falta el rendimiento"
+
+    with pytest.raises(ValueError):
+        backtest.run_backtest(dataset=dataset, strategies=["desconocida"], processes=1)
+    print(f"✅ {len(parallel['results'])} combinaciones en {len(parallel['workers'])} procesos")
+
+
+if __name__ == "__main__":
+    test_shared_arrays()
+    test_evaluate_matches_sweep()
+    test_run_backtest_parallel()
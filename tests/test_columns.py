@@ -0,0 +1,131 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Tests para el módulo columns.
+
+Ejecutar: python -m pytest tests/test_columns.py -v -s
+"""
+
+import numpy as np
+import pytest
+
+from kinielagpt import columns
+
+
+def test_encode_roundtrip() -> None:
+    """
+    Prueba la codificación y decodificación de columnas, cadenas y predicciones.
+
+    Raises
+    ------
+    AssertionError
+        Si alguna conversión pierde información.
+    """
+    print("=" * 80)
+    print("TEST: test_encode_roundtrip()")
+    print("=" * 80)
+
+    rng = np.random.default_rng(5)
+    codes = rng.integers(0, 3, size=(1000, 14))
+    packed = columns.encode(codes)
+
+    assert packed.dtype == np.uint32 and packed.shape == (1000,), "❌ Debe haber un uint32 por columna"
+    assert (columns.decode(packed=packed, n_matches=14) == codes).all(), "❌ decode debe invertir encode"
+    strings = columns.decode_strings(packed=packed[:3], n_matches=14)
+    assert (columns.encode_strings(strings) == packed[:3]).all(), "❌ Las cadenas deben conservar la columna"
+    assert columns.encode_strings(["1X2"])[0] == 0b100100, "❌ El partido k debe ocupar los bits 2k y 2k+1"
+
+    predictions = [{"match_id": i, "prediction": sign} for i, sign in enumerate("1X2X1", start=1)]
+    predictions.append({"match_id": 15, "prediction": "1-2"})
+    column, match_ids = columns.from_predictions(predictions)
+    assert match_ids == [1, 2, 3, 4, 5], "❌ El pleno al 15 no forma parte de la columna"
+    assert columns.decode_strings(packed=column, n_matches=5) == ["1X2X1"], "❌ Columna de predicción incorrecta"
+
+    changed = columns.to_predictions(packed=columns.encode_strings(["222X1"])[0], predictions=predictions)
+    assert [pred["prediction"] for pred in changed] == ["2", "2", "2", "X", "1", "1-2"], "❌ to_predictions falla"
+    assert predictions[0]["prediction"] == "1", "❌ to_predictions no debe modificar la lista original"
+
+    with pytest.raises(ValueError):
+        columns.encode_strings(["1Y2"])
+    with pytest.raises(ValueError):
+        columns.encode(np.zeros((1, 17), dtype=np.uint8))
+    print("✅ Codificación reversible para códigos, cadenas y predicciones")
+
+
+def test_count_hits() -> None:
+    """
+    Prueba el recuento vectorizado de aciertos frente al cálculo partido a partido.
+
+    Raises
+    ------
+    AssertionError
+        Si los aciertos o el popcount no coinciden.
+    """
+    print("=" * 80)
+    print("TEST: test_count_hits()")
+    print("=" * 80)
+
+    values = np.array([0, 1, 0xFFFFFFFF, 0x55555555, 123456789], dtype=np.uint32)
+    expected = [int(v).bit_count() for v in values]
+    assert columns.popcount(values).tolist() == expected, "❌ popcount incorrecto"
+
+    rng = np.random.default_rng(9)
+    codes = rng.integers(0, 3, size=(500, 14))
+    outcomes = rng.integers(0, 3, size=(40, 14))
+    packed, packed_outcomes = columns.encode(codes), columns.encode(outcomes)
+
+    hits = columns.count_hits(columns=packed[:, None], outcomes=packed_outcomes[None, :], n_matches=14)
+    naive = (codes[:, None, :] == outcomes[None, :, :]).sum(axis=2)
+    assert (hits == naive).all(), "❌ La matriz de aciertos no coincide con el recuento partido a partido"
+
+    best = columns.best_hits(columns=packed, outcomes=packed_outcomes, n_matches=14, block_size=64)
+    assert (best == naive.max(axis=0)).all(), "❌ best_hits debe dar el máximo por resultado"
+    print(f"✅ {hits.size} comparaciones correctas, mejor acierto medio {best.mean():.2f}")
+
+
+def test_sample_outcomes() -> None:
+    """
+    Prueba que los resultados simulados siguen las probabilidades de cada partido.
+
+    Raises
+    ------
+    AssertionError
+        Si las frecuencias simuladas se alejan de las probabilidades o la semilla no es reproducible.
+    """
+    print("=" * 80)
+    print("TEST: test_sample_outcomes()")
+    print("=" * 80)
+
+    probabilities = np.random.default_rng(1).dirichlet([3.0, 2.0, 2.0], size=14)
+    outcomes = columns.sample_outcomes(probabilities=probabilities, size=50_000, rng=np.random.default_rng(2))
+    codes = columns.decode(packed=outcomes, n_matches=14)
+    frequencies = np.stack([(codes == code).mean(axis=0) for code in range(3)], axis=1)
+
+    assert np.abs(frequencies - probabilities).max() < 0.02, "❌ Frecuencias simuladas alejadas de las esperadas"
+    again = columns.sample_outcomes(probabilities=probabilities, size=50_000, rng=np.random.default_rng(2))
+    assert (outcomes == again).all(), "❌ La misma semilla debe dar los mismos resultados"
+    print(f"✅ Desviación máxima de frecuencias {np.abs(frequencies - probabilities).max():.4f}")
+
+
+if __name__ == "__main__":
+    test_encode_roundtrip()
+    test_count_hits()
+    test_sample_outcomes()
@@ -24,6 +24,10 @@ Ejecutar: python -m pytest tests/test_data_source.py -v -s
 """
 
 import json
+import threading
+import time
+
+import pytest
 
 import kinielagpt.data_source as ds_module
 from kinielagpt import data_source
@@ -34,6 +38,41 @@ JORNADA_TEST = 28
 TEMPORADA_TEST = 2026
 
 
+class FakeResponse:
+    """
+    Respuesta HTTP simulada para probar la caché condicional sin acceso a red.
+    """
+
+    def __init__(self, content: bytes, status_code: int = 200, headers: dict | None = None) -> None:
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise ds_module.requests.exceptions.HTTPError(f"HTTP {self.status_code}")
+
+
+def load_sample_feeds() -> dict[str, bytes]:
+    """
+    Carga los XML grabados de LAE y Quinielista indexados por la URL que los sirve.
+    """
+    with open("tests/data_source_samples/quiniela_probs_lae.xml", "rb") as f:
+        xml_lae = f.read()
+    with open("tests/data_source_samples/quiniela_probs.xml", "rb") as f:
+        xml_quini = f.read()
+    return {URL_TEST_1: xml_lae, URL_TEST_2: xml_quini}
+
+
+@pytest.fixture(autouse=True)
+def unthrottled_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Sustituye el planificador compartido por uno sin límite efectivo: las respuestas simuladas no deben esperar
+    al presupuesto por host.
+    """
+    monkeypatch.setattr(ds_module, "__SCHEDULER", ds_module.TokenBucketScheduler(limits={}, default=(1e6, 1000)))
+
+
 def test_get_xml_as_json() -> None:
     """
     Prueba la función get_xml_as_json validando la obtención y conversión de XML a JSON.
@@ -410,8 +449,537 @@ def test_procesar_ultimos_partidos() -> None:
     print("✅ Todos los partidos procesados coinciden con los esperados")
 
 
+def test_procesar_ultimos_partidos_golden() -> None:
+    """
+    Prueba __procesar_ultimos_partidos sobre todos los partidos grabados frente a la salida de referencia.
+
+    Procesa la comparativa de cada partido de match_details_raw.json y compara la lista completa (orden, partidos,
+    resultados, códigos y tipos) con ultimos_partidos de match_details_process.json. También comprueba los
+    códigos memoizados de marcadores válidos, inválidos y repetidos.
+
+    Raises
+    ------
+    AssertionError
+        Si la salida de algún partido o algún código de resultado difiere de lo esperado.
+    """
+    print("\n" + "=" * 80)
+    print("TEST: __procesar_ultimos_partidos() golden")
+    print("=" * 80)
+
+    with open("tests/data_source_samples/match_details_raw.json", encoding="utf-8") as f:
+        partidos_raw = json.load(f)['detallePartidos']
+    with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+        partidos_process = json.load(f)
+
+    procesar_func = getattr(ds_module, '__procesar_ultimos_partidos')
+    for raw, process in zip(partidos_raw, partidos_process, strict=True):
+        result = procesar_func(
+            ultimos_partidos=raw.get('comparativa', {}),
+            equipo_local=raw.get('local'),
+            equipo_visitante=raw.get('visitante')
+        )
+        assert result == process['ultimos_partidos'], f"❌ Salida distinta en {process['partido']}"
+    print(f"✅ {len(partidos_raw)} comparativas idénticas a la referencia")
+
+    codigos_func = getattr(ds_module, '__codigos_resultado')
+    assert codigos_func(resultado='2-1') == ('VICTORIA', 'DERROTA'), "❌ Código de 2-1 incorrecto"
+    assert codigos_func(resultado='1-1') == ('EMPATE', 'EMPATE'), "❌ Código de 1-1 incorrecto"
+    assert codigos_func(resultado='0-3') == ('DERROTA', 'VICTORIA'), "❌ Código de 0-3 incorrecto"
+    assert codigos_func(resultado='a-b') == ('', ''), "❌ Un marcador no numérico debe dar códigos vacíos"
+    assert codigos_func(resultado='2-1') is codigos_func(resultado='2-1'), "❌ El código no se memoiza"
+    print("✅ Códigos de resultado memoizados correctos")
+
+
+def test_conditional_requests_reuse_cached_xml(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba que get_xml_as_json envía peticiones condicionales y no vuelve a parsear un payload sin cambios.
+
+    La primera petición devuelve el XML con un ETag; la segunda debe enviar If-None-Match y, al recibir un 304,
+    devolver el mismo JSON sin invocar xmltodict.parse.
+
+    Raises
+    ------
+    AssertionError
+        Si no se envían las cabeceras condicionales o si se vuelve a parsear el XML.
+    """
+    print("\n" + "=" * 80)
+    print("TEST: get_xml_as_json() con peticiones condicionales")
+    print("=" * 80)
+
+    data_source.clear_cache()
+    feeds = load_sample_feeds()
+    sent_headers = []
+
+    def fake_get(url: str, headers: dict) -> FakeResponse:
+        sent_headers.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(content=b"", status_code=304)
+        return FakeResponse(content=feeds[url], headers={"ETag": '"v1"', "Last-Modified": "Sun, 01 Mar 2026"})
+
+    parse_calls = []
+    original_parse = ds_module.xmltodict.parse
+
+    def counting_parse(*args, **kwargs):
+        parse_calls.append(1)
+        return original_parse(*args, **kwargs)
+
+    monkeypatch.setattr(ds_module.requests, "get", fake_get)
+    monkeypatch.setattr(ds_module.xmltodict, "parse", counting_parse)
+
+    first = data_source.get_xml_as_json(url=URL_TEST_1)
+    second = data_source.get_xml_as_json(url=URL_TEST_1)
+
+    assert first == second, "❌ El JSON cacheado debe coincidir con el original"
+    assert "If-None-Match" not in sent_headers[0], "❌ La primera petición no debe ser condicional"
+    assert sent_headers[1].get("If-None-Match") == '"v1"', "❌ No se envió If-None-Match"
+    assert sent_headers[1].get("If-Modified-Since") == "Sun, 01 Mar 2026", "❌ No se envió If-Modified-Since"
+    assert len(parse_calls) == 1, f"❌ El XML se parseó {len(parse_calls)} veces, se esperaba 1"
+    print("✅ Segunda petición condicional (304) resuelta sin volver a parsear")
+
+    data_source.clear_cache()
+
+
+def test_probabilities_short_circuit_when_unchanged(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba que get_kiniela_probabilities no repite la fusión de pandas si ambos feeds no han cambiado.
+
+    El servidor simulado no soporta validadores (siempre 200), por lo que la detección se basa en el hash del
+    contenido. Cuando el feed de Quinielista cambia, la fusión debe recalcularse.
+
+    Raises
+    ------
+    AssertionError
+        Si se repite la fusión con payloads idénticos o no se recalcula al cambiar un feed.
+    """
+    print("\n" + "=" * 80)
+    print("TEST: get_kiniela_probabilities() sin cambios en los feeds")
+    print("=" * 80)
+
+    data_source.clear_cache()
+    feeds = load_sample_feeds()
+
+    def fake_get(url: str, headers: dict) -> FakeResponse:
+        return FakeResponse(content=feeds[url])
+
+    concat_calls = []
+    original_concat = ds_module.pd.concat
+
+    def counting_concat(*args, **kwargs):
+        concat_calls.append(1)
+        return original_concat(*args, **kwargs)
+
+    monkeypatch.setattr(ds_module.requests, "get", fake_get)
+    monkeypatch.setattr(ds_module.pd, "concat", counting_concat)
+
+    first = data_source.get_kiniela_probabilities(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST)
+    second = data_source.get_kiniela_probabilities(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST)
+
+    assert first is not None and len(first) == 15, "❌ Se esperaban 15 partidos"
+    assert first == second, "❌ El resultado cacheado debe ser idéntico"
+    assert first[0] is not second[0], "❌ Se debe devolver una copia del resultado cacheado"
+    assert len(concat_calls) == 1, f"❌ La fusión se ejecutó {len(concat_calls)} veces, se esperaba 1"
+    print("✅ Payload sin cambios: resultado reutilizado sin fusionar de nuevo")
+
+    feeds[URL_TEST_2] = feeds[URL_TEST_2].replace(b'porc_1="78.85"', b'porc_1="80.85"')
+    third = data_source.get_kiniela_probabilities(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST)
+
+    assert len(concat_calls) == 2, "❌ La fusión debe recalcularse cuando cambia un feed"
+    assert third is not None and third[0]["1_Prob"] != first[0]["1_Prob"], "❌ El resultado debe reflejar el cambio"
+    print("✅ Payload modificado: fusión recalculada")
+
+    data_source.clear_cache()
+
+
+def test_get_kiniela_probabilities_by_source(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba que get_kiniela_probabilities_by_source conserva LAE y Quinielista por separado.
+
+    Cada fuente se normaliza por su cuenta y la probabilidad fusionada de get_kiniela_probabilities queda entre
+    los valores de ambas fuentes.
+
+    Raises
+    ------
+    AssertionError
+        Si faltan fuentes, no están normalizadas o no son coherentes con el valor fusionado.
+    """
+    print("\n" + "=" * 80)
+    print("TEST: get_kiniela_probabilities_by_source()")
+    print("=" * 80)
+
+    data_source.clear_cache()
+    feeds = load_sample_feeds()
+
+    def fake_get(url: str, headers: dict) -> FakeResponse:
+        return FakeResponse(content=feeds[url])
+
+    monkeypatch.setattr(ds_module.requests, "get", fake_get)
+
+    sources = data_source.get_kiniela_probabilities_by_source(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST)
+    merged = data_source.get_kiniela_probabilities(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST)
+
+    assert sources is not None and merged is not None, "❌ Se esperaban probabilidades"
+    assert tuple(sources) == data_source.PROBABILITY_SOURCES, f"❌ Fuentes inesperadas: {list(sources)}"
+    assert all(len(rows) == 15 for rows in sources.values()), "❌ Se esperaban 15 partidos por fuente"
+
+    differing = 0
+    for lae, quini, row in zip(sources["lae"], sources["quiniela"], merged):
+        assert lae["id"] == quini["id"] == row["id"], "❌ Los partidos deben estar alineados por id"
+        for source_row in (lae, quini):
+            total = sum(source_row.get(f"{sign}_Prob", 0) for sign in ("1", "X", "2"))
+            assert total == 0 or abs(total - 100) <= 0.2, f"❌ Probabilidades no normalizadas: {total}"
+        for sign in ("1", "X", "2"):
+            low, high = sorted((lae.get(f"{sign}_Prob", 0), quini.get(f"{sign}_Prob", 0)))
+            assert low - 0.2 <= row.get(f"{sign}_Prob", 0) <= high + 0.2, "❌ El valor fusionado no es intermedio"
+        differing += lae.get("1_Prob") != quini.get("1_Prob")
+
+    assert differing > 0, "❌ Las fuentes deberían diferir en algún partido"
+    print(f"✅ Fuentes separadas y normalizadas: {differing} partidos con 1_Prob distinto entre LAE y Quinielista")
+
+    data_source.clear_cache()
+
+
+def test_get_kiniela_probabilities_weighted_by_source(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba las columnas por fuente y la ponderación de fuentes de get_kiniela_probabilities.
+
+    Raises
+    ------
+    AssertionError
+        Si las columnas por fuente no coinciden con cada fuente o los pesos no se aplican.
+    """
+    print("\n" + "=" * 80)
+    print("TEST: get_kiniela_probabilities(weights, by_source)")
+    print("=" * 80)
+
+    data_source.clear_cache()
+    feeds = load_sample_feeds()
+
+    def fake_get(url: str, headers: dict) -> FakeResponse:
+        return FakeResponse(content=feeds[url])
+
+    monkeypatch.setattr(ds_module.requests, "get", fake_get)
+
+    merged = data_source.get_kiniela_probabilities(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST)
+    with_sources = data_source.get_kiniela_probabilities(
+        jornada=JORNADA_TEST, temporada=TEMPORADA_TEST, by_source=True
+    )
+    sources = data_source.get_kiniela_probabilities_by_source(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST)
+
+    assert merged is not None and with_sources is not None and sources is not None, "❌ Se esperaban datos"
+    for row, extended, lae, quini in zip(merged, with_sources, sources["lae"], sources["quiniela"]):
+        source_columns = {k: v for k, v in extended.items() if k in data_source.SOURCE_PROBABILITY_COLUMNS}
+        assert {k: v for k, v in extended.items() if k not in source_columns} == row, "❌ La fusión no debe cambiar"
+        for sign in ("1", "X", "2"):
+            assert source_columns.get(f"{sign}_Prob_lae", 0) == lae.get(f"{sign}_Prob", 0), "❌ Columna LAE"
+            assert source_columns.get(f"{sign}_Prob_quiniela", 0) == quini.get(f"{sign}_Prob", 0), "❌ Columna Quini"
+    print("✅ Columnas por fuente añadidas sin alterar la probabilidad fusionada")
+
+    only_lae = data_source.get_kiniela_probabilities(
+        jornada=JORNADA_TEST, temporada=TEMPORADA_TEST, weights={"lae": 1.0}
+    )
+    equal = data_source.get_kiniela_probabilities(
+        jornada=JORNADA_TEST, temporada=TEMPORADA_TEST, weights={"lae": 2.0, "quiniela": 2.0}
+    )
+    skewed = data_source.get_kiniela_probabilities(
+        jornada=JORNADA_TEST, temporada=TEMPORADA_TEST, weights={"lae": 3.0, "quiniela": 1.0}
+    )
+    assert only_lae == sources["lae"], "❌ Con peso sólo en LAE debe coincidir con la fuente LAE"
+    assert equal == merged, "❌ Con pesos iguales debe coincidir con la media simple"
+    assert skewed is not None and merged[0]["1_Prob"] < skewed[0]["1_Prob"] < only_lae[0]["1_Prob"], (
+        "❌ Con más peso en LAE el valor debe acercarse a LAE"
+    )
+    print(f"✅ Ponderación aplicada: 1_Prob del partido 1 = {skewed[0]['1_Prob']} con pesos 3:1")
+
+    for weights in ({"otra": 1.0}, {"lae": -1.0}, {"lae": 0.0, "quiniela": 0.0}):
+        with pytest.raises(ValueError):
+            data_source.get_kiniela_probabilities(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST, weights=weights)
+    print("✅ Pesos inválidos rechazados")
+
+    data_source.clear_cache()
+
+
+def test_extract_partidos_equivalent_to_xmltodict() -> None:
+    """
+    Prueba que extract_partidos produce los mismos registros que xmltodict sobre los feeds grabados.
+
+    Compara, para los XML de LAE y Quinielista guardados en data_source_samples, los atributos del nodo porcentajes
+    y la lista de partidos extraídos en streaming con la estructura ['quinielista']['porcentajes'] de xmltodict.
+
+    Raises
+    ------
+    AssertionError
+        Si algún registro o atributo difiere entre ambos métodos de parseo.
+    """
+    print("\n" + "=" * 80)
+    print("TEST: extract_partidos() vs xmltodict")
+    print("=" * 80)
+
+    for url, content in load_sample_feeds().items():
+        porcentajes, partidos = data_source.extract_partidos(content=content)
+        esperado = ds_module.xmltodict.parse(content, attr_prefix='')['quinielista']['porcentajes']
+
+        assert porcentajes == {k: v for k, v in esperado.items() if k != 'partido'}, (
+            f"❌ Atributos de porcentajes distintos para {url}"
+        )
+        assert partidos == esperado['partido'], f"❌ Registros de partidos distintos para {url}"
+        print(f"✅ {len(partidos)} partidos idénticos a xmltodict ({url.split('/')[-1]})")
+
+        # Con bloques diminutos los elementos quedan partidos entre varias llamadas a feed
+        assert data_source.extract_partidos(content=content, chunk_size=7) == (porcentajes, partidos), (
+            f"❌ El resultado depende del tamaño de bloque para {url}"
+        )
+        print("✅ Mismo resultado alimentando el parser en bloques de 7 bytes")
+
+
+def test_group_ultimos_partidos() -> None:
+    """
+    Prueba que group_ultimos_partidos agrupa en un pase lo mismo que el filtrado por tipo grupo a grupo.
+
+    Para cada partido de match_details_process.json compara los seis grupos con las listas filtradas por tipo
+    (mismo orden y mismos objetos) y comprueba que las rachas de los últimos 5 partidos, derivadas de los grupos o
+    calculadas en un pase con __rachas_ultimos_partidos, coinciden con las grabadas en la muestra.
+
+    Raises
+    ------
+    AssertionError
+        Si algún grupo o racha difiere de lo esperado.
+    """
+    print("\n" + "=" * 80)
+    print("TEST: group_ultimos_partidos()")
+    print("=" * 80)
+
+    with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+        details = json.load(f)
+
+    tipos_por_grupo = {
+        'local': ('local_como_local', 'local_como_visitante'),
+        'visitante': ('visitante_como_local', 'visitante_como_visitante'),
+        'local_como_local': ('local_como_local',),
+        'local_como_visitante': ('local_como_visitante',),
+        'visitante_como_local': ('visitante_como_local',),
+        'visitante_como_visitante': ('visitante_como_visitante',),
+    }
+    rachas = {
+        'local': 'racha_local_ultimos_5_partidos',
+        'visitante': 'racha_visitante_ultimos_5_partidos',
+        'local_como_local': 'racha_local_como_local_ultimos_5_partidos',
+        'visitante_como_visitante': 'racha_visitante_como_visitante_ultimos_5_partidos',
+    }
+
+    rachas_func = getattr(ds_module, '__rachas_ultimos_partidos')
+
+    for detail in details:
+        partidos = detail['ultimos_partidos']
+        grupos = data_source.group_ultimos_partidos(ultimos_partidos=partidos)
+        rachas_incrementales = rachas_func(ultimos_partidos=partidos)
+
+        assert tuple(grupos) == data_source.ULTIMOS_PARTIDOS_GRUPOS, "❌ Claves de grupos incorrectas"
+        for grupo, tipos in tipos_por_grupo.items():
+            esperado = [p for p in partidos if p.get('tipo') in tipos]
+            assert len(grupos[grupo]) == len(esperado), f"❌ Tamaño de {grupo} distinto en {detail['partido']}"
+            assert all(a is b for a, b in zip(grupos[grupo], esperado)), (
+                f"❌ Orden u objetos de {grupo} distintos en {detail['partido']}"
+            )
+        for grupo, clave in rachas.items():
+            racha = [p['cod_resultado'] for p in grupos[grupo] if p.get('cod_resultado')][-5:]
+            assert racha == detail[clave], f"❌ {clave} distinta en {detail['partido']}"
+            assert rachas_incrementales[grupo] == detail[clave], (
+                f"❌ {clave} incremental distinta en {detail['partido']}"
+            )
+
+    print(f"✅ Grupos y rachas correctos en {len(details)} partidos")
+
+
+def test_get_kiniela_matches_details_schema(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba que get_kiniela_matches_details devuelve las claves de siempre, sin agrupaciones auxiliares.
+
+    Raises
+    ------
+    AssertionError
+        Si algún detalle tiene claves distintas de las documentadas.
+    """
+    print("=" * 80)
+    print("TEST: test_get_kiniela_matches_details_schema()")
+    print("=" * 80)
+
+    with open("tests/data_source_samples/match_details_raw.json", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    class FakeSession:
+        def get(self, url: str, **kwargs) -> FakeResponse:
+            response = FakeResponse(content=b"")
+            response.json = lambda: raw
+            return response
+
+    monkeypatch.setattr(ds_module.requests, "Session", FakeSession)
+    details = data_source.get_kiniela_matches_details(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST)
+
+    expected = [
+        'id', 'partido', 'division', 'clasificacion_local', 'clasificacion_visitante',
+        'evolucion_clasificacion_local', 'evolucion_clasificacion_visitante', 'historico_10_years',
+        'veces1', 'vecesX', 'veces2', 'datos_destacados', 'ultimos_partidos',
+        'racha_local_ultimos_5_partidos', 'racha_visitante_ultimos_5_partidos',
+        'racha_local_como_local_ultimos_5_partidos', 'racha_visitante_como_visitante_ultimos_5_partidos',
+    ]
+    assert details is not None and len(details) == len(raw['detallePartidos']), "❌ Número de detalles incorrecto"
+    for detail in details:
+        assert list(detail) == expected, f"❌ Claves inesperadas en {detail['partido']}: {list(detail)}"
+    print(f"✅ {len(details)} detalles con las {len(expected)} claves documentadas")
+
+
+def test_token_bucket_rate_and_burst() -> None:
+    """
+    Prueba que el token bucket permite la ráfaga inicial y después limita al ritmo configurado.
+
+    Raises
+    ------
+    AssertionError
+        Si las peticiones superan el ritmo o las métricas no reflejan las esperas.
+    """
+    print("=" * 80)
+    print("TEST: test_token_bucket_rate_and_burst()")
+    print("=" * 80)
+
+    scheduler = data_source.TokenBucketScheduler(limits={"host.test": (50.0, 2)})
+    start = time.monotonic()
+    waits = [scheduler.acquire(host="host.test") for _ in range(6)]
+    elapsed = time.monotonic() - start
+
+    assert waits[:2] == [0.0, 0.0], f"❌ La ráfaga inicial no debe esperar: {waits}"
+    assert elapsed >= 4 / 50 * 0.9, f"❌ 4 peticiones por encima de la ráfaga a 50/s no pueden tardar {elapsed:.3f}s"
+
+    metrics = scheduler.metrics()["host.test"]
+    assert metrics["requests"] == 6 and metrics["queue_depth"] == 0, f"❌ Métricas inesperadas: {metrics}"
+    assert metrics["max_wait"] > 0 and metrics["by_priority"]["interactive"]["requests"] == 6, "❌ Esperas"
+    assert scheduler.acquire(host="otro.test") == 0.0, "❌ Cada host tiene su propio presupuesto"
+
+    with pytest.raises(ValueError):
+        scheduler.acquire(host="host.test", priority="urgente")
+    with pytest.raises(ValueError):
+        scheduler.configure(host="host.test", rate=0, burst=1)
+    print(f"✅ 6 peticiones en {elapsed:.3f}s con espera máxima {metrics['max_wait']}s")
+
+
+def test_token_bucket_priorities() -> None:
+    """
+    Prueba que una petición interactiva adelanta a las de backfill que ya esperan en la cola.
+
+    Raises
+    ------
+    AssertionError
+        Si la petición interactiva no es la primera en obtener token o la cola no se refleja en las métricas.
+    """
+    print("=" * 80)
+    print("TEST: test_token_bucket_priorities()")
+    print("=" * 80)
+
+    scheduler = data_source.TokenBucketScheduler(limits={"host.test": (5.0, 1)})
+    scheduler.acquire(host="host.test")
+    order = []
+
+    def request(priority: str) -> None:
+        scheduler.acquire(host="host.test", priority=priority)
+        order.append(priority)
+
+    threads = [threading.Thread(target=request, args=("backfill",)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while scheduler.metrics()["host.test"]["queue_depth"] < 3:
+        time.sleep(0.005)
+    interactive = threading.Thread(target=request, args=("interactive",))
+    interactive.start()
+    for thread in threads + [interactive]:
+        thread.join()
+
+    metrics = scheduler.metrics()["host.test"]
+    assert order[0] == "interactive", f"❌ La petición interactiva debe adelantar al backfill: {order}"
+    assert metrics["max_queue_depth"] == 4, f"❌ Profundidad máxima de cola inesperada: {metrics}"
+    assert metrics["by_priority"]["backfill"]["requests"] == 3, "❌ Métricas por prioridad incorrectas"
+    print(f"✅ Orden de servicio {order}")
+
+
+def test_token_bucket_releases_interrupted_waiter() -> None:
+    """
+    Prueba que una espera interrumpida retira su ticket de la cola y no bloquea las peticiones posteriores.
+
+    Raises
+    ------
+    AssertionError
+        Si el ticket queda en la cola o la petición siguiente no obtiene token.
+    """
+    print("=" * 80)
+    print("TEST: test_token_bucket_releases_interrupted_waiter()")
+    print("=" * 80)
+
+    class Interrupted(BaseException):
+        pass
+
+    state = {"calls_until_failure": None}
+
+    def clock() -> float:
+        if state["calls_until_failure"] is not None:
+            state["calls_until_failure"] -= 1
+            if state["calls_until_failure"] == 0:
+                state["calls_until_failure"] = None
+                raise Interrupted
+        return time.monotonic()
+
+    scheduler = data_source.TokenBucketScheduler(limits={"host.test": (100.0, 1)}, clock=clock)
+    scheduler.acquire(host="host.test")
+
+    # La primera llamada al reloj fija el inicio de la espera; la segunda (dentro del bucle) falla
+    state["calls_until_failure"] = 2
+    with pytest.raises(Interrupted):
+        scheduler.acquire(host="host.test", priority="backfill")
+    assert scheduler.metrics()["host.test"]["queue_depth"] == 0, "❌ El ticket interrumpido sigue en la cola"
+
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: (scheduler.acquire(host="host.test"), done.set()), daemon=True)
+    thread.start()
+    assert done.wait(timeout=2.0), "❌ La petición posterior a la interrupción no obtiene token"
+    print("✅ La espera interrumpida libera la cola del host")
+
+
+def test_request_priority_context(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba que las peticiones de data_source pasan por el planificador con la prioridad del contexto.
+
+    Raises
+    ------
+    AssertionError
+        Si las peticiones no se contabilizan con su prioridad por host.
+    """
+    print("=" * 80)
+    print("TEST: test_request_priority_context()")
+    print("=" * 80)
+
+    feeds = load_sample_feeds()
+    monkeypatch.setattr(ds_module.requests, "get", lambda url, headers=None, **kwargs: FakeResponse(feeds[url]))
+    data_source.clear_cache()
+
+    data_source.get_kiniela_probabilities(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST)
+    with data_source.request_priority("backfill"):
+        data_source.clear_cache()
+        data_source.get_kiniela_probabilities(jornada=JORNADA_TEST, temporada=TEMPORADA_TEST)
+    data_source.clear_cache()
+
+    metrics = data_source.rate_limit_metrics()["www.quinielista.es"]
+    assert metrics["by_priority"]["interactive"]["requests"] == 2, f"❌ Peticiones interactivas: {metrics}"
+    assert metrics["by_priority"]["backfill"]["requests"] == 2, f"❌ Peticiones de backfill: {metrics}"
+    with pytest.raises(ValueError), data_source.request_priority("urgente"):
+        pass
+    print(f"✅ Peticiones por prioridad: {metrics['by_priority']}")
+
+
 if __name__ == "__main__":
     test_get_xml_as_json()
     test_get_kiniela()
     test_get_kiniela_probabilities()
     test_procesar_ultimos_partidos()
+    test_procesar_ultimos_partidos_golden()
+    test_extract_partidos_equivalent_to_xmltodict()
+    test_group_ultimos_partidos()
+    test_token_bucket_rate_and_burst()
+    test_token_bucket_priorities()
+    test_token_bucket_releases_interrupted_waiter()
@@ -25,7 +25,10 @@ Ejecutar: python -m pytest tests/test_detector.py -v -s
 
 import json
 
+import numpy as np
+
 from kinielagpt.detector import SurpriseDetector
+from kinielagpt.records import JornadaFrame, MatchRecord
 
 # Instancia global del detector para los tests
 detector = SurpriseDetector()
@@ -915,7 +918,9 @@ def test_analyze_inconsistencies_alert_roja():
         "clasificacion": {"local": {"posicion": 18, "puntos": 15}, "visitante": {"posicion": 2, "puntos": 55}},
     }
 
-    result = detector._SurpriseDetector__analyze_inconsistencies(prob, detail, threshold=25.0) # type: ignore
+    result = detector._SurpriseDetector__analyze_inconsistencies(  # type: ignore
+        MatchRecord.from_sources(match_id=1, prob=prob, detail=detail), threshold=25.0
+    )
 
     assert result is not None, "❌ No se generó análisis"
     assert result["alert_level"] == "🚨 ALERTA ROJA", (
@@ -958,7 +963,9 @@ def test_analyze_inconsistencies_alert_media():
         "clasificacion": {"local": {"posicion": 12, "puntos": 25}, "visitante": {"posicion": 6, "puntos": 40}},
     }
 
-    result = detector._SurpriseDetector__analyze_inconsistencies(prob, detail, threshold=25.0) # type: ignore
+    result = detector._SurpriseDetector__analyze_inconsistencies(  # type: ignore
+        MatchRecord.from_sources(match_id=1, prob=prob, detail=detail), threshold=25.0
+    )
 
     assert result is not None, "❌ No se generó análisis"
     assert result["alert_level"] == "⚠️ ALERTA MEDIA", (
@@ -998,7 +1005,9 @@ def test_analyze_inconsistencies_alert_normal():
         "clasificacion": {"local": {"posicion": 10, "puntos": 30}, "visitante": {"posicion": 8, "puntos": 35}},
     }
 
-    result = detector._SurpriseDetector__analyze_inconsistencies(prob, detail, threshold=25.0) # type: ignore
+    result = detector._SurpriseDetector__analyze_inconsistencies(  # type: ignore
+        MatchRecord.from_sources(match_id=1, prob=prob, detail=detail), threshold=25.0
+    )
 
     if result is not None:
         assert result["alert_level"] == "⚠️ ALERTA", f"❌ Nivel esperado '⚠️ ALERTA', obtenido '{result['alert_level']}'"
@@ -1038,12 +1047,209 @@ def test_analyze_inconsistencies_no_alert():
         "clasificacion": {"local": {"posicion": 8, "puntos": 35}, "visitante": {"posicion": 12, "puntos": 25}},
     }
 
-    result = detector._SurpriseDetector__analyze_inconsistencies(prob, detail, threshold=25.0) # type: ignore
+    result = detector._SurpriseDetector__analyze_inconsistencies(  # type: ignore
+        MatchRecord.from_sources(match_id=1, prob=prob, detail=detail), threshold=25.0
+    )
 
     assert result is None, f"❌ Se generó alerta inesperada: {result}"
     print("✅ No se generó alerta en caso consistente")
 
 
+# ===========================
+# Tests de detección vectorizada
+# ===========================
+
+
+def build_detection_frame(jornada: int) -> JornadaFrame:
+    """
+    Construye una jornada sintética con un partido por cada tipo de inconsistencia y partidos sin alerta.
+    """
+    probabilities = [
+        {"partido": "RACHA | TEST", "1_Prob": 75.0, "X_Prob": 15.0, "2_Prob": 10.0},
+        {"partido": "HISTORICO | TEST", "1_Prob": 10.0, "X_Prob": 20.0, "2_Prob": 70.0},
+        {"partido": "CLASIFICACION | TEST", "1_Prob": 68.0, "X_Prob": 20.0, "2_Prob": 12.0},
+        {"partido": "EMPATES | TEST", "1_Prob": 55.0, "X_Prob": 25.0, "2_Prob": 20.0},
+        {"partido": "EQUILIBRADO | TEST", "1_Prob": 40.0, "X_Prob": 30.0, "2_Prob": 30.0},
+        {"partido": "PLENO | TEST"},
+    ]
+    details = [
+        {"evolucionLocal": ["D", "D", "D", "D", "D"], "evolucionVisitante": ["V", "V", "V", "V", "V"]},
+        {"veces1": 6, "vecesX": 2, "veces2": 2},
+        {"clasificacionLocal": "18º 15pt", "clasificacionVisitante": "2º 55pt"},
+        {"evolucionLocal": ["E", "E", "V"], "evolucionVisitante": ["E", "E", "E"]},
+        {"veces1": 1, "vecesX": 1, "veces2": 8, "clasificacionLocal": 5, "clasificacionVisitante": "3º"},
+        {},
+    ]
+    return JornadaFrame.from_sources(jornada=jornada, temporada=2025, probabilities=probabilities, details=details)
+
+
+def test_detect_vectorized_matches_detect():
+    """
+    Test: La detección vectorizada produce exactamente la misma salida que detect().
+
+    Caso: Jornada sintética con inconsistencias de rachas, histórico y clasificación, un partido
+    equilibrado y un pleno al 15 sin probabilidades 1X2, evaluada con varios umbrales.
+
+    Expected
+    --------
+    detect_vectorized() == detect() para todos los umbrales
+
+    Verifications
+    -------------
+    - Las salidas coinciden para umbrales de 0 a 60
+    - Con threshold=20 se detectan los cuatro tipos de casos
+    """
+    print("=" * 80)
+    print("TEST: test_detect_vectorized_matches_detect()")
+    print("=" * 80)
+
+    frame = build_detection_frame(jornada=1)
+
+    for threshold in [0.0, 20.0, 30.0, 45.0, 60.0]:
+        expected = detector.detect(jornada=1, temporada=2025, threshold=threshold, frame=frame)
+        result = detector.detect_vectorized(jornada=1, temporada=2025, threshold=threshold, frame=frame)
+        assert result == expected, f"❌ Salidas distintas con threshold={threshold}: {result} != {expected}"
+
+    result = detector.detect_vectorized(jornada=1, temporada=2025, threshold=20.0, frame=frame)
+    types = [surprise["inconsistency_type"] for surprise in result["surprises"]]  # type: ignore
+    assert types == [
+        "streak_inconsistency", "historical_inconsistency", "classification_inconsistency", "streak_inconsistency"
+    ], f"❌ Tipos detectados inesperados: {types}"
+    print(f"✅ Salida idéntica a detect() ({len(types)} sorpresas con threshold=20)")
+
+
+def test_compute_divergence_scores_multiple_jornadas():
+    """
+    Test: Cálculo de scores de divergencia para varias jornadas a la vez.
+
+    Caso: Dos jornadas sintéticas idénticas puntuadas en una sola llamada.
+
+    Expected
+    --------
+    Arrays alineados con un elemento por partido y scores esperados por tipo
+
+    Verifications
+    -------------
+    - Los arrays tienen un elemento por partido de todas las jornadas
+    - Los identificadores de jornada y partido son correctos
+    - Los scores y tipos coinciden con las verificaciones escalares
+    - Los partidos sin probabilidad dominante tienen best_type = -1
+    """
+    print("=" * 80)
+    print("TEST: test_compute_divergence_scores_multiple_jornadas()")
+    print("=" * 80)
+
+    frames = [build_detection_frame(jornada=1), build_detection_frame(jornada=2)]
+    scores = detector.compute_divergence_scores(frames=frames)
+
+    assert len(scores["best_score"]) == 12, f"❌ Se esperaban 12 partidos, obtenidos {len(scores['best_score'])}"
+    assert scores["jornada"].tolist() == [1] * 6 + [2] * 6, f"❌ Jornadas incorrectas: {scores['jornada']}"
+    assert scores["match_id"].tolist() == [1, 2, 3, 4, 5, 6] * 2, f"❌ IDs incorrectos: {scores['match_id']}"
+    assert scores["streak"][0] == 50.0, f"❌ Score de racha esperado 50, obtenido {scores['streak'][0]}"
+    assert scores["historical"][1] == 50.0, f"❌ Score histórico esperado 50, obtenido {scores['historical'][1]}"
+    assert scores["classification"][2] == 40.0, (
+        f"❌ Score de clasificación esperado 40, obtenido {scores['classification'][2]}"
+    )
+    assert scores["streak"][3] == 40.0, f"❌ Score de empates esperado 40, obtenido {scores['streak'][3]}"
+    assert scores["best_type"].tolist() == [0, 1, 2, 0, -1, -1] * 2, f"❌ Tipos incorrectos: {scores['best_type']}"
+    print("✅ Scores de divergencia correctos para 2 jornadas")
+
+
+def test_sweep_thresholds_precision_recall():
+    """
+    Test: Barrido de umbrales con precisión y recall por tipo de inconsistencia.
+
+    Caso: Jornada sintética con resultados reales conocidos: la alerta de rachas (match 1) y la de
+    clasificación (match 3) aciertan, la histórica (match 2) y la de empates (match 4) fallan, y el
+    partido equilibrado (match 5) es una sorpresa no detectada. El pleno al 15 se excluye.
+
+    Expected
+    --------
+    Conteos de alertas coherentes con detect() y métricas calculadas por tipo
+
+    Verifications
+    -------------
+    - Se evalúan 5 partidos con 3 sorpresas reales
+    - Para cada umbral, las alertas totales coinciden con total_surprises de detect()
+    - Precisión y recall correctos para threshold=30 y threshold=45
+    - Tipos sin alertas tienen precisión None
+    """
+    print("=" * 80)
+    print("TEST: test_sweep_thresholds_precision_recall()")
+    print("=" * 80)
+
+    frame = build_detection_frame(jornada=1)
+    results = {(1, 2025): ["2", "2", "X", "1", "2", "2-1"]}
+
+    sweep = detector.sweep_thresholds(frames=[frame], results=results, thresholds=[30.0, 45.0, 60.0])
+
+    assert sweep["total_matches"] == 5, f"❌ Se esperaban 5 partidos evaluados, obtenidos {sweep['total_matches']}"
+    assert sweep["total_surprises"] == 3, f"❌ Se esperaban 3 sorpresas, obtenidas {sweep['total_surprises']}"
+
+    for row in sweep["thresholds"]:
+        expected = detector.detect(jornada=1, temporada=2025, threshold=row["threshold"], frame=frame)
+        assert row["all"]["alerts"] == expected["total_surprises"], (  # type: ignore
+            f"❌ Alertas distintas de detect() con threshold={row['threshold']}"
+        )
+
+    at_30, at_45 = sweep["thresholds"][0], sweep["thresholds"][1]
+    assert at_30["all"] == {"alerts": 4, "hits": 2, "precision": 0.5, "recall": 0.6667}, f"❌ Total: {at_30['all']}"
+    assert at_30["classification_inconsistency"] == {"alerts": 1, "hits": 1, "precision": 1.0, "recall": 0.3333}, (
+        f"❌ Clasificación: {at_30['classification_inconsistency']}"
+    )
+    assert at_45["streak_inconsistency"] == {"alerts": 1, "hits": 1, "precision": 1.0, "recall": 0.3333}, (
+        f"❌ Rachas: {at_45['streak_inconsistency']}"
+    )
+    assert at_45["historical_inconsistency"]["precision"] == 0.0, (
+        f"❌ Histórico: {at_45['historical_inconsistency']}"
+    )
+    assert at_45["classification_inconsistency"]["precision"] is None, (
+        f"❌ Clasificación sin alertas: {at_45['classification_inconsistency']}"
+    )
+    print(f"✅ Barrido correcto (threshold=30): {at_30['all']}")
+
+
+def test_source_disagreement_feature():
+    """
+    Test: La discrepancia entre fuentes se expone en las sorpresas y en los scores de divergencia.
+
+    Caso: Jornada sintética en la que sólo el primer partido incluye probabilidades por fuente.
+
+    Expected
+    --------
+    source_disagreement en la sorpresa del primer partido y NaN en los scores de los demás
+
+    Verifications
+    -------------
+    - detect() y detect_vectorized() siguen coincidiendo
+    - Los partidos sin columnas por fuente no incluyen la clave
+    """
+    print("=" * 80)
+    print("TEST: test_source_disagreement_feature()")
+    print("=" * 80)
+
+    frame = build_detection_frame(jornada=1)
+    frame.matches[0] = MatchRecord.from_sources(
+        match_id=1,
+        prob=frame.raw_prob(match_id=1) | {"1_Prob_lae": 80.0, "X_Prob_lae": 12.0, "2_Prob_lae": 8.0,
+                           "1_Prob_quiniela": 70.0, "X_Prob_quiniela": 18.0, "2_Prob_quiniela": 12.0},
+        detail=frame.raw_detail(match_id=1),
+    )
+
+    expected = detector.detect(jornada=1, temporada=2025, threshold=20.0, frame=frame)
+    result = detector.detect_vectorized(jornada=1, temporada=2025, threshold=20.0, frame=frame)
+    assert result == expected, "❌ detect_vectorized() debe coincidir con detect()"
+
+    surprises = result["surprises"]  # type: ignore
+    assert surprises[0]["source_disagreement"] == 10.0, "❌ Discrepancia esperada 10.0 en el primer partido"
+    assert all("source_disagreement" not in s for s in surprises[1:]), "❌ Sin fuentes no debe incluirse la clave"
+
+    scores = detector.compute_divergence_scores(frames=frame)
+    assert scores["source_disagreement"][0] == 10.0, "❌ Score de discrepancia incorrecto"
+    assert np.isnan(scores["source_disagreement"][1:]).all(), "❌ Sin fuentes la discrepancia debe ser NaN"
+    print("✅ Discrepancia entre fuentes disponible como feature del detector")
+
+
 if __name__ == "__main__":
     test_calculate_streak_value_all_wins()
     test_calculate_streak_value_all_losses()
@@ -1075,3 +1281,7 @@ if __name__ == "__main__":
     test_analyze_inconsistencies_alert_media()
     test_analyze_inconsistencies_alert_normal()
     test_analyze_inconsistencies_no_alert()
+    test_detect_vectorized_matches_detect()
+    test_compute_divergence_scores_multiple_jornadas()
+    test_sweep_thresholds_precision_recall()
+    test_source_disagreement_feature()
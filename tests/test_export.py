@@ -0,0 +1,198 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Tests para el módulo export.
+
+Ejecutar: python -m pytest tests/test_export.py -v -s
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from kinielagpt import export
+from tests.test_season import JORNADAS_TEST, TEMPORADA_TEST, build_probabilities, populate_cache
+
+with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+    match_details_process = json.load(f)
+
+
+def test_jornada_tables() -> None:
+    """
+    Prueba la conversión de una jornada en las tablas probabilities, details y ultimos_partidos.
+
+    Raises
+    ------
+    AssertionError
+        Si el número de filas o las columnas de alguna tabla no son las esperadas.
+    """
+    print("=" * 80)
+    print("TEST: test_jornada_tables()")
+    print("=" * 80)
+
+    tables = export.jornada_tables(probabilities=build_probabilities(jornada=1), details=match_details_process)
+    n_ultimos = sum(len(d["ultimos_partidos"]) for d in match_details_process)
+
+    assert set(tables) == set(export.EXPORT_TABLES), f"❌ Tablas incorrectas: {list(tables)}"
+    assert len(tables["probabilities"]) == len(match_details_process), "❌ Filas de probabilities"
+    assert len(tables["details"]) == len(match_details_process), "❌ Filas de details"
+    assert "ultimos_partidos" not in tables["details"].columns, "❌ details no debe incluir ultimos_partidos"
+    assert json.loads(tables["details"]["racha_local_ultimos_5_partidos"][0]) == (
+        match_details_process[0]["racha_local_ultimos_5_partidos"]
+    ), "❌ Las listas deben guardarse como JSON"
+    assert len(tables["ultimos_partidos"]) == n_ultimos, "❌ Filas de ultimos_partidos"
+    assert tuple(tables["ultimos_partidos"].columns) == export.ULTIMOS_PARTIDOS_COLUMNS, "❌ Columnas"
+    print(f"✅ {len(match_details_process)} partidos y {n_ultimos} resultados recientes por jornada")
+
+
+def test_export_dataset_csv_partitions(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """
+    Prueba la exportación en CSV particionada por temporada/jornada y su lectura con load_table.
+
+    Raises
+    ------
+    AssertionError
+        Si faltan particiones, si una segunda exportación no las omite o si los datos leídos no coinciden.
+    """
+    print("=" * 80)
+    print("TEST: test_export_dataset_csv_partitions()")
+    print("=" * 80)
+
+    populate_cache(monkeypatch=monkeypatch, cache_dir=str(tmp_path / "cache"))
+    output_dir = str(tmp_path / "dataset")
+
+    summary = export.export_dataset(output_dir=output_dir, file_format="csv")
+    assert summary == {"exportadas": len(JORNADAS_TEST), "omitidas": 0}, f"❌ Resumen incorrecto: {summary}"
+    for table in export.EXPORT_TABLES:
+        for jornada in JORNADAS_TEST:
+            path = export.partition_path(
+                output_dir=output_dir, table=table, temporada=TEMPORADA_TEST, jornada=jornada, file_format="csv"
+            )
+            assert os.path.exists(path), f"❌ Falta la partición {path}"
+
+    again = export.export_dataset(output_dir=output_dir, file_format="csv")
+    assert again == {"exportadas": 0, "omitidas": len(JORNADAS_TEST)}, f"❌ Reexportación: {again}"
+    print(f"✅ {len(JORNADAS_TEST)} jornadas exportadas y omitidas en la segunda exportación")
+
+    probabilities = export.load_table(output_dir=output_dir, table="probabilities")
+    expected = pd.concat([
+        pd.DataFrame(build_probabilities(jornada=j)).assign(temporada=TEMPORADA_TEST, jornada=j)
+        for j in JORNADAS_TEST
+    ], ignore_index=True)
+    assert list(probabilities["jornada"]) == list(expected["jornada"]), "❌ Particiones desordenadas"
+    for column in ("id", "partido", "1_Prob", "X_Prob", "2_Prob"):
+        assert list(probabilities[column]) == list(expected[column]), f"❌ Columna {column} distinta"
+
+    ultimos = export.load_table(output_dir=output_dir, table="ultimos_partidos", temporada=TEMPORADA_TEST)
+    n_ultimos = sum(len(d["ultimos_partidos"]) for d in match_details_process)
+    assert len(ultimos) == n_ultimos * len(JORNADAS_TEST), f"❌ Filas de ultimos_partidos: {len(ultimos)}"
+    assert export.load_table(output_dir=output_dir, table="details", temporada=1999).empty, (
+        "❌ Una temporada sin particiones debe devolver un DataFrame vacío"
+    )
+    print(f"✅ load_table: {len(probabilities)} probabilidades y {len(ultimos)} resultados recientes")
+
+
+def test_export_main(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """
+    Prueba el script kinielagpt-export (export.main) con formato Arrow si pyarrow está instalado o CSV.
+
+    Raises
+    ------
+    AssertionError
+        Si el script no escribe las particiones o la tabla leída no tiene las filas esperadas.
+    """
+    print("=" * 80)
+    print("TEST: test_export_main()")
+    print("=" * 80)
+
+    populate_cache(monkeypatch=monkeypatch, cache_dir=str(tmp_path / "cache"))
+    output_dir = str(tmp_path / "dataset")
+    file_format = "arrow" if export.has_parquet_support() else "csv"
+
+    export.main([output_dir, "--temporada", str(TEMPORADA_TEST), "--format", file_format])
+
+    details = export.load_table(output_dir=output_dir, table="details")
+    assert len(details) == len(match_details_process) * len(JORNADAS_TEST), f"❌ Filas: {len(details)}"
+    assert list(details["partido"][:len(match_details_process)]) == [d["partido"] for d in match_details_process], (
+        "❌ Partidos distintos en la primera jornada"
+    )
+    print(f"✅ kinielagpt-export ({file_format}): {len(details)} detalles")
+
+
+def test_load_table_single_format(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """
+    Prueba que load_table lee un único fichero por partición cuando el dataset se ha exportado en varios formatos.
+
+    Raises
+    ------
+    AssertionError
+        Si se duplican filas, si no se respeta el orden de preferencia o file_format, o si se acepta un formato
+        no soportado.
+    """
+    print("=" * 80)
+    print("TEST: test_load_table_single_format()")
+    print("=" * 80)
+
+    populate_cache(monkeypatch=monkeypatch, cache_dir=str(tmp_path / "cache"))
+    output_dir = str(tmp_path / "dataset")
+    export.export_dataset(output_dir=output_dir, file_format="csv")
+
+    # Segunda exportación simulada: copia de cada partición con extensión .parquet (leída como CSV)
+    for jornada in JORNADAS_TEST:
+        path = export.partition_path(
+            output_dir=output_dir, table="probabilities", temporada=TEMPORADA_TEST, jornada=jornada, file_format="csv"
+        )
+        with open(path, encoding="utf-8") as src, open(path[:-len("csv")] + "parquet", "w", encoding="utf-8") as dst:
+            dst.write(src.read())
+
+    read = []
+
+    def read_partition(path: str) -> pd.DataFrame:
+        read.append(os.path.splitext(path)[1])
+        return pd.read_csv(path)
+
+    monkeypatch.setattr(export, "__read_partition", read_partition)
+
+    probabilities = export.load_table(output_dir=output_dir, table="probabilities")
+    expected_rows = len(build_probabilities(jornada=1)) * len(JORNADAS_TEST)
+    assert len(probabilities) == expected_rows, f"❌ Filas duplicadas: {len(probabilities)} de {expected_rows}"
+    assert read == [".parquet"] * len(JORNADAS_TEST), f"❌ Debe leerse sólo el formato preferido: {read}"
+
+    read.clear()
+    csv = export.load_table(output_dir=output_dir, table="probabilities", file_format="csv")
+    assert len(csv) == expected_rows and read == [".csv"] * len(JORNADAS_TEST), f"❌ file_format='csv': {read}"
+    print(f"✅ {expected_rows} filas leídas de un único formato por partición")
+
+    with pytest.raises(ValueError):
+        export.load_table(output_dir=output_dir, table="probabilities", file_format="xlsx")
+    print("✅ Formato no soportado rechazado")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    test_jornada_tables()
+    for test in (test_export_dataset_csv_partitions, test_export_main, test_load_table_single_format):
+        with tempfile.TemporaryDirectory() as tmp_dir, pytest.MonkeyPatch.context() as mp:
+            test(monkeypatch=mp, tmp_path=pathlib.Path(tmp_dir))
@@ -0,0 +1,206 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests para el módulo form.
+
+Ejecutar: python -m pytest tests/test_form.py -v -s
+"""
+
+import copy
+import json
+
+from kinielagpt.analyzer import Analyzer
+from kinielagpt.form import FormFeatureStore, TeamForm
+from kinielagpt.history import TeamHistoryStore
+
+with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+    match_details_process = json.load(f)
+
+
+def test_team_form_incremental_updates() -> None:
+    """
+    Prueba la actualización incremental de los acumulados de un equipo.
+
+    Verifica la ventana móvil de puntos, la racha actual, los registros como local y visitante, y que
+    un resultado anterior al último aplicado se rechaza sin modificar los acumulados.
+
+    Raises
+    ------
+    AssertionError
+        Si algún acumulado no coincide con el esperado.
+    """
+    print("=" * 80)
+    print("TEST: test_team_form_incremental_updates()")
+    print("=" * 80)
+
+    team = TeamForm(name="TEST", window=3)
+    sequence = [("VICTORIA", True), ("DERROTA", False), ("VICTORIA", True), ("VICTORIA", False), ("EMPATE", True)]
+    for jornada, (cod, es_local) in enumerate(sequence, start=1):
+        assert team.add(cod_resultado=cod, es_local=es_local, temporada=2026, jornada=jornada), "❌ No aplicado"
+
+    assert list(team.recent) == ["VICTORIA", "VICTORIA", "EMPATE"], f"❌ Ventana incorrecta: {list(team.recent)}"
+    assert team.window_points == 7, f"❌ Puntos de la ventana esperados 7, obtenidos {team.window_points}"
+    assert (team.streak_type, team.streak_length) == ("EMPATE", 1), "❌ Racha actual incorrecta"
+    assert team.home == [2, 1, 0] and team.away == [1, 0, 1], f"❌ Registros incorrectos: {team.home} {team.away}"
+
+    assert not team.add(cod_resultado="DERROTA", es_local=True, temporada=2026, jornada=2), (
+        "❌ Un resultado anterior no debe aplicarse"
+    )
+    assert team.record == [3, 1, 1], f"❌ El resultado rechazado no debe contar: {team.record}"
+    print("✅ Acumulados incrementales correctos")
+
+
+def test_form_store_matches_analyzer_criteria() -> None:
+    """
+    Prueba que los indicadores mantenidos por el histórico coinciden con los que calcula Analyzer.
+
+    Se alimenta el almacén de forma a través de TeamHistoryStore y, para cada equipo, se compara con
+    el análisis de tendencia y de rendimiento local/visitante calculado desde las listas completas.
+
+    Raises
+    ------
+    AssertionError
+        Si algún indicador difiere del cálculo completo.
+    """
+    print("=" * 80)
+    print("TEST: test_form_store_matches_analyzer_criteria()")
+    print("=" * 80)
+
+    form = FormFeatureStore(window=5)
+    history = TeamHistoryStore(path=":memory:", form=form)
+    history.ingest_details(details=match_details_process, temporada=2026)
+    analyzer = Analyzer()
+
+    assert len(form) == len(history.teams()), f"❌ Se esperaban {len(history.teams())} equipos, hay {len(form)}"
+
+    for team in history.teams():
+        results = history.team_results(team_name=team)
+        cods = [r["cod_resultado"] for r in results]
+        features = form.get_form(team_name=team)
+
+        assert features["partidos_jugados"] == len(results), f"❌ Partidos de {team} incorrectos"
+        assert features["ultimos_resultados"] == cods[-5:], f"❌ Últimos resultados de {team} incorrectos"
+        if len(cods) >= 3:
+            trend = analyzer._Analyzer__analyze_trend(last_results=cods)  # type: ignore
+            assert features["puntos_ventana"] == trend["puntos_ultimos_partidos"], f"❌ Puntos de {team}"
+            assert features["forma"] == trend["forma"], f"❌ Forma de {team}"
+
+        home = [r["cod_resultado"] for r in results if r["es_local"]]
+        away = [r["cod_resultado"] for r in results if not r["es_local"]]
+        if home and away:
+            performance = analyzer._Analyzer__analyze_home_away_performance(  # type: ignore
+                resultados_local=home, resultados_visitante=away
+            )
+            assert features["local"] == performance["local"], f"❌ Rendimiento local de {team}"
+            assert features["visitante"] == performance["visitante"], f"❌ Rendimiento visitante de {team}"
+
+    history.close()
+    print(f"✅ Indicadores de {len(form)} equipos coherentes con Analyzer")
+
+
+def test_out_of_order_results_rebuild_team() -> None:
+    """
+    Prueba que un resultado antiguo que llega tarde reconstruye solo el equipo afectado.
+
+    Primero se ingestan los resultados de la jornada 10 en adelante y después la muestra completa;
+    los indicadores finales deben coincidir con los de una ingesta en orden.
+
+    Raises
+    ------
+    AssertionError
+        Si los indicadores tras la ingesta desordenada difieren de la ingesta en orden.
+    """
+    print("=" * 80)
+    print("TEST: test_out_of_order_results_rebuild_team()")
+    print("=" * 80)
+
+    late = copy.deepcopy(match_details_process)
+    for detail in late:
+        detail["ultimos_partidos"] = [p for p in detail["ultimos_partidos"] if int(p["jornada"]) >= 10]
+
+    unordered = FormFeatureStore(window=5)
+    history = TeamHistoryStore(path=":memory:", form=unordered)
+    history.ingest_details(details=late, temporada=2026)
+    history.ingest_details(details=match_details_process, temporada=2026)
+
+    ordered = FormFeatureStore(window=5)
+    TeamHistoryStore(path=":memory:", form=ordered).ingest_details(details=match_details_process, temporada=2026)
+
+    teams = history.teams()
+    for team in teams:
+        got, expected = unordered.get_form(team_name=team), ordered.get_form(team_name=team)
+        got.pop("equipo"), expected.pop("equipo")
+        assert got == expected, f"❌ Indicadores de {team} distintos tras ingesta desordenada"
+
+    history.close()
+    print(f"✅ {len(teams)} equipos coherentes tras resultados fuera de orden")
+
+
+def test_analyze_team_history_reads_form_store() -> None:
+    """
+    Prueba que analyze_team_history con un FormFeatureStore conectado coincide con el cálculo desde las listas.
+
+    La muestra se ingesta en dos temporadas y se compara, para cada equipo, el análisis de cada temporada y el de
+    todas las temporadas leído de los acumulados incrementales con el calculado recorriendo los resultados. Se usan
+    ventanas de forma de 3, 5 y 8 partidos: las tendencias comparan siempre los últimos 5 con los 5 anteriores.
+
+    Raises
+    ------
+    AssertionError
+        Si algún análisis difiere o falta la forma actual.
+    """
+    print("=" * 80)
+    print("TEST: test_analyze_team_history_reads_form_store()")
+    print("=" * 80)
+
+    plain = TeamHistoryStore(path=":memory:")
+    plain.ingest_details(details=match_details_process, temporada=2025)
+    plain.ingest_details(details=match_details_process, temporada=2026)
+    analyzer = Analyzer()
+
+    teams = plain.teams()
+    for form_window in (3, 5, 8):
+        with_form = TeamHistoryStore(path=":memory:", form=FormFeatureStore(window=form_window))
+        with_form.ingest_details(details=match_details_process, temporada=2025)
+        with_form.ingest_details(details=match_details_process, temporada=2026)
+
+        for team in teams:
+            for temporada in (2025, 2026, None):
+                got = analyzer.analyze_team_history(team_name=team, temporada=temporada, store=with_form)
+                expected = analyzer.analyze_team_history(team_name=team, temporada=temporada, store=plain)
+                current = got.pop("forma_actual")
+                expected.pop("forma_actual")
+                assert got == expected, (
+                    f"❌ Análisis de {team} ({temporada}, ventana {form_window}) distinto al calculado desde las listas"
+                )
+                assert current["partidos_jugados"] == got["partidos_jugados"], f"❌ Forma actual de {team}"
+
+        missing = analyzer.analyze_team_history(team_name="EQUIPO_INEXISTENTE", store=with_form)
+        assert "error" in missing, "❌ Un equipo sin datos debe devolver error"
+        with_form.close()
+    plain.close()
+    print(f"✅ Análisis de {len(teams)} equipos leídos de FormFeatureStore idénticos al cálculo completo")
+
+
+if __name__ == "__main__":
+    test_team_form_incremental_updates()
+    test_form_store_matches_analyzer_criteria()
+    test_out_of_order_results_rebuild_team()
+    test_analyze_team_history_reads_form_store()
@@ -0,0 +1,193 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests para el módulo history.
+
+Ejecutar: python -m pytest tests/test_history.py -v -s
+"""
+
+import json
+import time
+
+import pytest
+
+from kinielagpt import analyzer as analyzer_module
+from kinielagpt.analyzer import Analyzer
+from kinielagpt.history import TeamHistoryStore
+
+with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+    match_details_process = json.load(f)
+
+
+def test_ingest_deduplicates_and_persists(tmp_path) -> None:
+    """
+    Prueba la ingesta deduplicada y persistente de los resultados de una jornada.
+
+    Los ultimos_partidos de la muestra repiten partidos entre detalles y con nombres distintos
+    ("R.MADRID" / "Real Madrid"); cada resultado debe guardarse una sola vez y seguir disponible al
+    reabrir el fichero.
+
+    Raises
+    ------
+    AssertionError
+        Si se duplican resultados o no se persisten.
+    """
+    print("=" * 80)
+    print("TEST: test_ingest_deduplicates_and_persists()")
+    print("=" * 80)
+
+    path = str(tmp_path / "history.sqlite3")
+    raw = sum(len(d["ultimos_partidos"]) for d in match_details_process)
+
+    store = TeamHistoryStore(path=path)
+    inserted = store.ingest_details(details=match_details_process, temporada=2026)
+    repeated = store.ingest_details(details=match_details_process, temporada=2026)
+    store.close()
+
+    assert 0 < inserted < raw, f"❌ Se esperaban menos de {raw} resultados únicos, insertados {inserted}"
+    assert repeated == 0, f"❌ Reingestar la misma jornada no debe añadir resultados, añadidos {repeated}"
+
+    reopened = TeamHistoryStore(path=path)
+    assert len(reopened) == inserted, f"❌ Tras reabrir se esperaban {inserted} resultados, hay {len(reopened)}"
+    reopened.close()
+    print(f"✅ {raw} resultados en bruto → {inserted} únicos persistidos")
+
+
+def test_team_results_and_rolling_form() -> None:
+    """
+    Prueba las consultas por equipo: orden cronológico, punto de vista del equipo y forma móvil.
+
+    Raises
+    ------
+    AssertionError
+        Si los resultados no están ordenados, el código de resultado no corresponde al equipo o la
+        ventana de la forma móvil es incorrecta.
+    """
+    print("=" * 80)
+    print("TEST: test_team_results_and_rolling_form()")
+    print("=" * 80)
+
+    store = TeamHistoryStore(path=":memory:")
+    store.ingest_details(details=match_details_process, temporada=2026)
+
+    start = time.perf_counter()
+    results = store.team_results(team_name="Real Madrid", temporada=2026)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    assert results == store.team_results(team_name="R.MADRID"), "❌ Alias y nombre del feed deben coincidir"
+    assert [r["jornada"] for r in results] == sorted(r["jornada"] for r in results), "❌ Orden no cronológico"
+    for r in results:
+        goles_local, goles_visitante = map(int, r["resultado"].split("-"))
+        goles_equipo, goles_rival = (goles_local, goles_visitante) if r["es_local"] else (goles_visitante, goles_local)
+        expected = "VICTORIA" if goles_equipo > goles_rival else "EMPATE" if goles_equipo == goles_rival else "DERROTA"
+        assert r["cod_resultado"] == expected, f"❌ Resultado mal interpretado: {r}"
+
+    last_three = store.team_results(team_name="Real Madrid", last=3)
+    assert last_three == results[-3:], "❌ last=3 debe devolver los 3 últimos"
+
+    form = store.rolling_form(team_name="Real Madrid", window=5)
+    points = [f["puntos"] for f in form]
+    assert len(form) == len(results), "❌ Debe haber un punto de forma por partido"
+    assert all(f["puntos_ventana"] == sum(points[max(0, i - 4):i + 1]) for i, f in enumerate(form)), (
+        "❌ Puntos de la ventana móvil incorrectos"
+    )
+    assert store.team_results(team_name="EQUIPO_INEXISTENTE") == [], "❌ Un equipo sin datos debe devolver []"
+    store.close()
+    print(f"✅ {len(results)} resultados de R.MADRID consultados en {elapsed_ms:.2f} ms")
+
+
+def test_analyze_team_history() -> None:
+    """
+    Prueba el análisis de temporada completa de un equipo con Analyzer.analyze_team_history.
+
+    Raises
+    ------
+    AssertionError
+        Si el análisis no incluye todos los partidos del histórico o el registro es incoherente.
+    """
+    print("=" * 80)
+    print("TEST: test_analyze_team_history()")
+    print("=" * 80)
+
+    store = TeamHistoryStore(path=":memory:")
+    store.ingest_details(details=match_details_process, temporada=2026)
+
+    analysis = Analyzer().analyze_team_history(team_name="Betis", temporada=2026, window=3, store=store)
+
+    assert analysis is not None and "error" not in analysis, f"❌ Análisis no generado: {analysis}"
+    results = store.team_results(team_name="BETIS", temporada=2026)
+    assert analysis["partidos_jugados"] == len(results), "❌ Debe analizar todos los partidos almacenados"
+    wins, draws, losses = (sum(r["cod_resultado"] == c for r in results) for c in ("VICTORIA", "EMPATE", "DERROTA"))
+    assert analysis["registro"] == f"{wins}V-{draws}E-{losses}D ({wins * 3 + draws}pts)", (
+        f"❌ Registro incorrecto: {analysis['registro']}"
+    )
+    assert analysis["forma_movil"][-1]["partidos_ventana"] == 3, "❌ La ventana de forma debe ser de 3 partidos"
+
+    missing = Analyzer().analyze_team_history(team_name="EQUIPO_INEXISTENTE", store=store)
+    assert missing is not None and "error" in missing, "❌ Un equipo sin datos debe devolver error"
+    store.close()
+    print(f"✅ Temporada de BETIS: {analysis['registro']}")
+
+
+def test_analyze_team_history_closes_own_store(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """
+    Prueba que analyze_team_history cierra el histórico que abre cuando no se le pasa uno.
+
+    Raises
+    ------
+    AssertionError
+        Si el histórico abierto por el analizador queda sin cerrar.
+    """
+    print("=" * 80)
+    print("TEST: test_analyze_team_history_closes_own_store()")
+    print("=" * 80)
+
+    monkeypatch.setenv("KINIELAGPT_CACHE_DIR", str(tmp_path))
+    seed = TeamHistoryStore()
+    seed.ingest_details(details=match_details_process, temporada=2026)
+    seed.close()
+
+    closed = []
+
+    class TrackedStore(TeamHistoryStore):
+        def close(self) -> None:
+            closed.append(self.path)
+            super().close()
+
+    monkeypatch.setattr(analyzer_module, "TeamHistoryStore", TrackedStore)
+
+    analysis = Analyzer().analyze_team_history(team_name="Betis", temporada=2026)
+    missing = Analyzer().analyze_team_history(team_name="EQUIPO_INEXISTENTE")
+
+    assert "error" not in analysis and "error" in missing, "❌ Análisis inesperados"
+    assert len(closed) == 2, f"❌ Se esperaban 2 históricos cerrados, cerrados {len(closed)}"
+    print("✅ El histórico abierto por el analizador se cierra en cada llamada")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_ingest_deduplicates_and_persists(tmp_path=pathlib.Path(tmp_dir))
+    test_team_results_and_rolling_form()
+    test_analyze_team_history()
+    with tempfile.TemporaryDirectory() as tmp_dir, pytest.MonkeyPatch.context() as mp:
+        test_analyze_team_history_closes_own_store(monkeypatch=mp, tmp_path=pathlib.Path(tmp_dir))
@@ -0,0 +1,216 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Tests para el módulo live.
+
+Ejecutar: python -m pytest tests/test_live.py -v -s
+"""
+
+import json
+from collections.abc import Iterable
+from typing import Any
+
+import pytest
+
+from kinielagpt import data_source
+from kinielagpt.detector import SurpriseDetector
+from kinielagpt.live import PROBABILITY_FIELDS, LivePoller, ProbabilitySeries, probability_vector
+from kinielagpt.records import JornadaFrame
+from tests.test_season import build_probabilities
+
+with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+    match_details_process = json.load(f)
+
+
+class CountingDetector(SurpriseDetector):
+    """Detector que registra los partidos analizados en cada llamada a detect."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[int] | None] = []
+
+    def detect(self, jornada: int, temporada: int, threshold: float = 30.0, frame: JornadaFrame | None = None,
+               match_ids: Iterable[int] | None = None) -> dict[str, Any] | None:
+        self.calls.append(sorted(match_ids) if match_ids is not None else None)
+        return super().detect(
+            jornada=jornada, temporada=temporada, threshold=threshold, frame=frame, match_ids=match_ids
+        )
+
+
+def patch_sources(monkeypatch: pytest.MonkeyPatch, snapshots: list[list[dict]], jornadas: list[int]) -> None:
+    """Sirve snapshots (uno por sondeo) como probabilidades de la jornada abierta jornadas[i]."""
+    state = {"poll": -1}
+
+    def get_last_kiniela() -> tuple:
+        state["poll"] += 1
+        return None, jornadas[min(state["poll"], len(jornadas) - 1)], 2026, None
+
+    def get_probabilities(jornada: int, temporada: int) -> list[dict]:
+        return [dict(row) for row in snapshots[min(state["poll"], len(snapshots) - 1)]]
+
+    monkeypatch.setattr(data_source, "get_last_kiniela", get_last_kiniela)
+    monkeypatch.setattr(data_source, "get_kiniela_probabilities", get_probabilities)
+    monkeypatch.setattr(data_source, "get_kiniela_matches_details", lambda jornada, temporada: match_details_process)
+
+
+def test_probability_series() -> None:
+    """
+    Prueba que la serie temporal sólo guarda puntos cuando cambian los valores de un partido.
+
+    Raises
+    ------
+    AssertionError
+        Si se guardan puntos repetidos o los puntos leídos no coinciden con los añadidos.
+    """
+    print("=" * 80)
+    print("TEST: test_probability_series()")
+    print("=" * 80)
+
+    series = ProbabilitySeries()
+    first = probability_vector(prob={"1_Prob": 60.0, "X_Prob": 25.0, "2_Prob": 15.0, "0_Goles_Local_Prob": 30.0})
+    second = probability_vector(prob={"1_Prob": 55.0, "X_Prob": 28.0, "2_Prob": 17.0, "0_Goles_Local_Prob": 30.0})
+
+    assert series.append(timestamp=100.0, match_id=1, values=first), "❌ El primer punto debe guardarse"
+    assert not series.append(timestamp=200.0, match_id=1, values=first), "❌ Un punto repetido no se guarda"
+    assert series.append(timestamp=300.0, match_id=1, values=second), "❌ Un cambio debe guardarse"
+    assert series.append(timestamp=300.0, match_id=4, values=(50.0, 30.0, 20.0)), "❌ Valores parciales"
+
+    points = series.get(match_id=1)
+    assert len(series) == 3 and series.match_ids() == [1, 4], f"❌ Puntos: {len(series)}, {series.match_ids()}"
+    assert [p["timestamp"] for p in points] == [100.0, 300.0], "❌ Instantes incorrectos"
+    assert points[1]["1_Prob"] == 55.0 and points[1]["0_Goles_Local_Prob"] == 30.0, f"❌ Valores: {points[1]}"
+    assert series.last(match_id=4) == (50.0, 30.0, 20.0) + (0.0,) * (len(PROBABILITY_FIELDS) - 3), "❌ Relleno"
+    assert series.last(match_id=9) is None, "❌ Un partido sin puntos no tiene último valor"
+    print(f"✅ {len(series)} puntos guardados de 4 añadidos")
+
+
+def test_poll_redetects_only_changed_matches(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba que cada sondeo sólo vuelve a detectar sorpresas en los partidos que han cambiado.
+
+    Tres sondeos: el primero ve todos los partidos como nuevos, el segundo no tiene cambios (el intervalo
+    crece) y el tercero cambia las probabilidades de dos partidos. La detección vigente debe coincidir con
+    SurpriseDetector.detect sobre la jornada completa.
+
+    Raises
+    ------
+    AssertionError
+        Si los partidos cambiados, las llamadas al detector, el intervalo o las sorpresas no son los esperados.
+    """
+    print("=" * 80)
+    print("TEST: test_poll_redetects_only_changed_matches()")
+    print("=" * 80)
+
+    base = build_probabilities(jornada=1)
+    moved = [dict(row) for row in base]
+    for i in (2, 9):
+        moved[i]["1_Prob"], moved[i]["2_Prob"] = 75.0, round(100 - 75.0 - moved[i]["X_Prob"], 1)
+    patch_sources(monkeypatch=monkeypatch, snapshots=[base, base, moved], jornadas=[28])
+
+    detector = CountingDetector()
+    poller = LivePoller(threshold=10.0, min_interval=60, max_interval=600, backoff=3.0, detector=detector)
+
+    first = poller.poll(now=1000.0)
+    second = poller.poll(now=1060.0)
+    third = poller.poll(now=1240.0)
+
+    assert first["changed"] == list(range(1, 16)), f"❌ Primer sondeo: {first['changed']}"
+    assert second["changed"] == [] and second["interval"] == 180, f"❌ Segundo sondeo: {second}"
+    assert third["changed"] == [3, 10] and third["interval"] == 60, f"❌ Tercer sondeo: {third['changed']}"
+    assert detector.calls == [list(range(1, 16)), [3, 10]], f"❌ Llamadas al detector: {detector.calls}"
+    print("✅ Sólo se vuelven a analizar los partidos 3 y 10")
+
+    frame = JornadaFrame.from_sources(jornada=28, temporada=2026, probabilities=moved, details=match_details_process)
+    expected = SurpriseDetector().detect(jornada=28, temporada=2026, threshold=10.0, frame=frame)
+    assert third["surprises"] == expected, "❌ La detección incremental difiere de la completa"
+    assert len(poller.series) == 17, f"❌ Puntos en la serie: {len(poller.series)}"
+    print(f"✅ {expected['total_surprises']} sorpresas vigentes, idénticas a detect() completo")
+
+
+def test_poll_refreshes_details(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba que los detalles se vuelven a descargar cada details_interval y que sus cambios cuentan como cambios.
+
+    Las probabilidades no cambian entre sondeos; el detalle del partido 5 cambia entre la primera y la segunda
+    descarga de detalles.
+
+    Raises
+    ------
+    AssertionError
+        Si los detalles se descargan con otra cadencia o los partidos cambiados no son los esperados.
+    """
+    print("=" * 80)
+    print("TEST: test_poll_refreshes_details()")
+    print("=" * 80)
+
+    base = build_probabilities(jornada=1)
+    patch_sources(monkeypatch=monkeypatch, snapshots=[base], jornadas=[28])
+    updated = [dict(detail) for detail in match_details_process]
+    updated[4]["veces1"] = updated[4]["veces1"] + 1
+    fetches = []
+
+    def get_details(jornada: int, temporada: int) -> list[dict]:
+        fetches.append(jornada)
+        return match_details_process if len(fetches) == 1 else updated
+
+    monkeypatch.setattr(data_source, "get_kiniela_matches_details", get_details)
+
+    detector = CountingDetector()
+    poller = LivePoller(threshold=10.0, detector=detector, details_interval=600)
+    changes = [poller.poll(now=now)["changed"] for now in (1000.0, 1300.0, 1600.0, 1700.0)]
+
+    assert len(fetches) == 2, f"❌ Descargas de detalles: {len(fetches)}"
+    assert changes == [list(range(1, 16)), [], [5], []], f"❌ Partidos cambiados: {changes}"
+    assert detector.calls == [list(range(1, 16)), [5]], f"❌ Llamadas al detector: {detector.calls}"
+    print("✅ Detalles descargados 2 veces; sólo el partido 5 se vuelve a analizar")
+
+
+def test_run_follows_open_jornada(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba el bucle de sondeo: esperas adaptativas, avisos de cambios y cambio de jornada abierta.
+
+    Raises
+    ------
+    AssertionError
+        Si las esperas, los avisos o el reinicio al cambiar de jornada no son los esperados.
+    """
+    print("=" * 80)
+    print("TEST: test_run_follows_open_jornada()")
+    print("=" * 80)
+
+    base = build_probabilities(jornada=1)
+    patch_sources(monkeypatch=monkeypatch, snapshots=[base, base, base, build_probabilities(jornada=2)],
+                  jornadas=[28, 28, 28, 29])
+
+    waits, updates = [], []
+    poller = LivePoller(min_interval=60, max_interval=200, backoff=2.0)
+    poller.run(max_polls=4, on_change=updates.append, sleep=waits.append)
+
+    assert waits == [60, 120, 200], f"❌ Esperas incorrectas: {waits}"
+    assert [(u["jornada"], len(u["changed"])) for u in updates] == [(28, 15), (29, 15)], "❌ Avisos incorrectos"
+    assert len(poller.series) == 15, "❌ La serie debe reiniciarse al cambiar de jornada"
+    print(f"✅ Esperas {waits} y reinicio al pasar a la jornada {poller.jornada}")
+
+
+if __name__ == "__main__":
+    test_probability_series()
+    for test in (test_poll_redetects_only_changed_matches, test_poll_refreshes_details, test_run_follows_open_jornada):
+        with pytest.MonkeyPatch.context() as mp:
+            test(monkeypatch=mp)
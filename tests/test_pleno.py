@@ -0,0 +1,145 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Tests para el módulo pleno.
+
+Ejecutar: python -m pytest tests/test_pleno.py -v -s
+"""
+
+import json
+
+import numpy as np
+
+from kinielagpt import pleno
+from kinielagpt.history import TeamHistoryStore
+
+with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+    match_details_process = json.load(f)
+
+PLENO_PROB = {
+    "0_Goles_Local_Prob": 20.0, "1_Goles_Local_Prob": 35.0, "2_Goles_Local_Prob": 25.0, "Mas_Goles_Local_Prob": 20.0,
+    "0_Goles_Visitante_Prob": 30.0, "1_Goles_Visitante_Prob": 40.0, "2_Goles_Visitante_Prob": 20.0,
+    "Mas_Goles_Visitante_Prob": 10.0,
+}
+
+
+def test_score_matrix_independent() -> None:
+    """
+    Prueba que con rho = 0 la matriz es el producto exterior normalizado de las marginales.
+
+    Raises
+    ------
+    AssertionError
+        Si la matriz o el marcador más probable no coinciden con el cálculo casilla a casilla.
+    """
+    print("=" * 80)
+    print("TEST: test_score_matrix_independent()")
+    print("=" * 80)
+
+    local, visitante = pleno.goal_marginals(prob=PLENO_PROB)
+    matrix = pleno.score_matrix(local=local, visitante=visitante)
+
+    expected = np.array([[local[i] * visitante[j] for j in range(4)] for i in range(4)])
+    assert np.allclose(matrix, expected / expected.sum()), "❌ La matriz debe ser el producto exterior normalizado"
+    assert np.isclose(matrix.sum(), 1.0), "❌ La matriz debe sumar 1"
+
+    best = max(((i, j) for i in range(4) for j in range(4)), key=lambda ij: local[ij[0]] * visitante[ij[1]])
+    assert pleno.PlenoAl15Engine().best_score(prob=PLENO_PROB) == f"{pleno.GOLES[best[0]]}-{pleno.GOLES[best[1]]}", (
+        "❌ El mejor marcador debe coincidir con el máximo casilla a casilla"
+    )
+    assert not pleno.score_matrix(local=np.zeros(4), visitante=visitante).any(), "❌ Sin datos la matriz es nula"
+    assert pleno.PlenoAl15Engine().best_score(prob={}) == "", "❌ Sin probabilidades de goles no hay marcador"
+    print(f"✅ Matriz independiente correcta, mejor marcador {pleno.PlenoAl15Engine().best_score(prob=PLENO_PROB)}")
+
+
+def test_fit_rho() -> None:
+    """
+    Prueba el ajuste de rho sobre marcadores independientes y con exceso de empates bajos.
+
+    Raises
+    ------
+    AssertionError
+        Si el ajuste no detecta la dependencia o no devuelve 0 sin datos.
+    """
+    print("=" * 80)
+    print("TEST: test_fit_rho()")
+    print("=" * 80)
+
+    rng = np.random.default_rng(11)
+    independent = list(zip(rng.poisson(1.5, size=4000).tolist(), rng.poisson(1.1, size=4000).tolist()))
+    rho_independent = pleno.fit_rho(scores=independent)
+    assert abs(rho_independent) <= 0.05, f"❌ Con goles independientes rho debe ser ~0: {rho_independent}"
+
+    low_draws = independent + [(0, 0)] * 250 + [(1, 1)] * 250
+    rho_draws = pleno.fit_rho(scores=low_draws)
+    assert rho_draws < rho_independent - 0.05, f"❌ El exceso de 0-0 y 1-1 debe dar rho negativo: {rho_draws}"
+    assert pleno.fit_rho(scores=[]) == 0.0, "❌ Sin marcadores rho debe ser 0"
+
+    local, visitante = pleno.goal_marginals(prob=PLENO_PROB)
+    corrected = pleno.score_matrix(local=local, visitante=visitante, rho=rho_draws)
+    independent_matrix = pleno.score_matrix(local=local, visitante=visitante)
+    assert np.isclose(corrected.sum(), 1.0), "❌ La matriz corregida debe sumar 1"
+    assert corrected[0, 0] > independent_matrix[0, 0], "❌ Con rho negativo el 0-0 debe ganar probabilidad"
+    print(f"✅ rho independiente {rho_independent}, con empates bajos {rho_draws}")
+
+
+def test_engine_ranking_and_coverage() -> None:
+    """
+    Prueba el ranking, la cobertura y la creación del motor desde el histórico.
+
+    Raises
+    ------
+    AssertionError
+        Si el ranking no está ordenado, la cobertura no es mínima o el motor no usa el histórico.
+    """
+    print("=" * 80)
+    print("TEST: test_engine_ranking_and_coverage()")
+    print("=" * 80)
+
+    engine = pleno.PlenoAl15Engine()
+    result = engine.predict(prob=PLENO_PROB, top=5)
+
+    probabilities = [score["probability"] for score in result["ranking"]]
+    assert len(result["ranking"]) == 5, "❌ El ranking debe respetar top"
+    assert probabilities == sorted(probabilities, reverse=True), "❌ El ranking debe estar ordenado"
+    assert result["best"] == result["ranking"][0]["score"], "❌ best debe ser el primero del ranking"
+    assert np.isclose(sum(map(sum, result["matrix"])), 100.0, atol=1.0), "❌ La matriz debe estar en porcentaje"
+
+    covered = engine.coverage(prob=PLENO_PROB, target=50.0)
+    assert covered[-1]["cumulative"] >= 50.0, "❌ La cobertura debe alcanzar el objetivo"
+    assert len(covered) == 1 or covered[-2]["cumulative"] < 50.0, "❌ La cobertura debe ser mínima"
+    assert len(engine.coverage(prob=PLENO_PROB, target=100.0)) <= 16, "❌ Nunca hay más de 16 marcadores"
+
+    store = TeamHistoryStore(path=":memory:")
+    store.ingest_details(details=match_details_process, temporada=2026)
+    scores = store.scores(temporada=2026)
+    assert scores and all(isinstance(g, int) for score in scores for g in score), "❌ scores debe dar enteros"
+    fitted = pleno.PlenoAl15Engine.from_history(store=store, temporada=2026)
+    assert fitted.rho == pleno.fit_rho(scores=scores), "❌ from_history debe ajustar rho con el histórico"
+    assert pleno.PlenoAl15Engine.from_history(store=store, temporada=1999).rho == 0.0, "❌ Temporada vacía: rho 0"
+    store.close()
+    print(f"✅ Ranking y cobertura ({len(covered)} marcadores para 50%), rho del histórico {fitted.rho}")
+
+
+if __name__ == "__main__":
+    test_score_matrix_independent()
+    test_fit_rho()
+    test_engine_ranking_and_coverage()
@@ -0,0 +1,127 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Tests para el módulo portfolio.
+
+Ejecutar: python -m pytest tests/test_portfolio.py -v -s
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from kinielagpt import columns, portfolio
+from tests.conftest import build_predictions
+
+
+def test_coverage_index() -> None:
+    """
+    Prueba que la incidencia por vecinas de Hamming coincide con el recuento directo de aciertos.
+
+    Raises
+    ------
+    AssertionError
+        Si alguna candidata cubre (o deja de cubrir) un resultado erróneamente.
+    """
+    print("=" * 80)
+    print("TEST: test_coverage_index()")
+    print("=" * 80)
+
+    rng = np.random.default_rng(6)
+    candidates = np.unique(columns.encode(rng.integers(0, 3, size=(3000, 6))))
+    outcomes = columns.encode(rng.integers(0, 3, size=(200, 6)))
+
+    for min_hits in (6, 5, 4):
+        cover = portfolio.coverage_index(candidates=candidates, outcomes=outcomes, n_matches=6, min_hits=min_hits)
+        hits = columns.count_hits(columns=candidates[None, :], outcomes=outcomes[:, None], n_matches=6)
+        for i in range(outcomes.shape[0]):
+            expected = set(np.flatnonzero(hits[i] >= min_hits).tolist())
+            assert set(cover[i][cover[i] >= 0].tolist()) == expected, f"❌ Cobertura incorrecta ({min_hits})"
+        print(f"✅ Cobertura con {min_hits} aciertos: {(cover >= 0).sum()} pares candidata/resultado")
+
+    with pytest.raises(ValueError):
+        portfolio.coverage_index(candidates=candidates, outcomes=outcomes, n_matches=6, min_hits=3)
+
+
+def test_select_diverse() -> None:
+    """
+    Prueba que la cartera voraz cubre más resultados que las columnas de mayor cobertura individual.
+
+    Raises
+    ------
+    AssertionError
+        Si la probabilidad estimada no coincide con los aciertos reales o no mejora la referencia.
+    """
+    print("=" * 80)
+    print("TEST: test_select_diverse()")
+    print("=" * 80)
+
+    probabilities, match_ids = portfolio.prediction_probabilities(build_predictions(seed=4))
+    rng = np.random.default_rng(8)
+    outcomes = columns.sample_outcomes(probabilities=probabilities, size=5000, rng=rng)
+    candidates = columns.sample_outcomes(probabilities=probabilities, size=100_000, rng=rng)
+
+    result = portfolio.select_diverse(candidates=candidates, outcomes=outcomes, n_columns=50, n_matches=14)
+    best = columns.best_hits(columns=result["columns"], outcomes=outcomes, n_matches=14)
+
+    assert len(match_ids) == 14 and len(set(result["columns"].tolist())) == 50, "❌ 50 columnas distintas"
+    assert np.isclose(result["probability"], round(100 * (best >= 13).mean(), 2)), "❌ Probabilidad incorrecta"
+    assert result["curve"] == sorted(result["curve"]), "❌ La probabilidad acumulada no puede bajar"
+    assert result["probability"] > result["independent_probability"], "❌ Diversificar debe mejorar la cobertura"
+    print(f"✅ Cartera diversificada {result['probability']}% frente a {result['independent_probability']}%")
+
+
+def test_build_portfolio_scale() -> None:
+    """
+    Prueba la construcción de una cartera de miles de columnas entre un millón de candidatas.
+
+    Raises
+    ------
+    AssertionError
+        Si la cartera no es reproducible o tarda demasiado.
+    """
+    print("=" * 80)
+    print("TEST: test_build_portfolio_scale()")
+    print("=" * 80)
+
+    predictions = build_predictions(seed=4)
+    candidates = columns.encode(np.random.default_rng(2).integers(0, 3, size=(1_000_000, 14)))
+
+    start = time.perf_counter()
+    result = portfolio.build_portfolio(predictions=predictions, n_columns=2000, candidates=candidates)
+    elapsed = time.perf_counter() - start
+
+    assert len(result["columns"]) == 2000 and len(result["columns"][0]) == 14, "❌ Tamaño de cartera inesperado"
+    assert result["match_ids"] == list(range(1, 15)), "❌ El pleno al 15 no forma parte de las columnas"
+    assert elapsed < 30, f"❌ La cartera ha tardado {elapsed:.1f}s"
+
+    small = portfolio.build_portfolio(predictions=predictions, n_columns=20, n_candidates=20_000, seed=3)
+    again = portfolio.build_portfolio(predictions=predictions, n_columns=20, n_candidates=20_000, seed=3)
+    assert small["columns"] == again["columns"], "❌ La misma semilla debe dar la misma cartera"
+    print(f"✅ {len(result['columns'])} de {result['candidates']} candidatas en {elapsed:.2f}s: "
+          f"{result['probability']}% de al menos un 13")
+
+
+if __name__ == "__main__":
+    test_coverage_index()
+    test_select_diverse()
+    test_build_portfolio_scale()
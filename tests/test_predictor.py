@@ -40,6 +40,7 @@ español, incluyendo probabilidades LAE y detalles de clasificación histórica.
 import json
 
 from kinielagpt.predictor import KinielaPredictor
+from kinielagpt.records import JornadaFrame
 
 # Instancia global del predictor para los tests
 predictor = KinielaPredictor()
@@ -90,7 +91,10 @@ def test_predict_conservative():
         {"clasificacionLocal": 2, "clasificacionVisitante": 1, "veces1": 2, "vecesX": 5, "veces2": 3},
     ]
 
-    preds = predictor._KinielaPredictor__predict_conservative(sample_probs, sample_details)  # type: ignore
+    records = JornadaFrame.from_sources(
+        jornada=1, temporada=2026, probabilities=sample_probs, details=sample_details
+    ).matches
+    preds = predictor._KinielaPredictor__predict_conservative(records)  # type: ignore
 
     # Verificaciones
     assert preds[0]["prediction"] == "1", "❌ Primera predicción debería ser '1'"
@@ -137,7 +141,10 @@ def test_predict_risky():
         {"clasificacionLocal": 2, "clasificacionVisitante": 1, "veces1": 2, "vecesX": 5, "veces2": 3},
     ]
 
-    preds = predictor._KinielaPredictor__predict_risky(sample_probs, sample_details)  # type: ignore
+    records = JornadaFrame.from_sources(
+        jornada=1, temporada=2026, probabilities=sample_probs, details=sample_details
+    ).matches
+    preds = predictor._KinielaPredictor__predict_risky(records)  # type: ignore
 
     # Verificaciones
     assert len(preds) == 2, "❌ Deberían haber 2 predicciones"
@@ -176,7 +183,10 @@ def test_predict_custom():
     ]
     custom_dist = {"1": 1, "X": 1, "2": 0}  # 1 uno, 1 empate, 0 doses
 
-    preds = predictor._KinielaPredictor__predict_custom(sample_probs, sample_details, custom_dist)  # type: ignore
+    records = JornadaFrame.from_sources(
+        jornada=1, temporada=2026, probabilities=sample_probs, details=sample_details
+    ).matches
+    preds = predictor._KinielaPredictor__predict_custom(records, custom_dist)  # type: ignore
 
     # Verificaciones
     assert len(preds) == 2, "❌ Deberían haber 2 predicciones"
@@ -429,6 +439,208 @@ def test_calculate_summary():
     print(f"   Resumen obtenido: {summary}")
 
 
+def test_match_cache():
+    """
+    Prueba la memoización del análisis por partido.
+
+    Tras una primera predicción, volver a predecir con otra estrategia no recalcula ningún contexto, y cambiar
+    las probabilidades de un único partido sólo recalcula ese partido.
+
+    Expected
+    --------
+    - 2 análisis contextuales en la primera predicción, 0 al cambiar de estrategia y 1 al cambiar un partido
+    - Las predicciones memoizadas coinciden con las de un predictor sin caché
+
+    Verifications
+    -------------
+    - Se cuentan las llamadas a __context_from_values
+    - Modificar la salida no altera el análisis memoizado
+    """
+    print("=" * 80)
+    print("TEST: test_match_cache()")
+    print("=" * 80)
+
+    sample_probs = [
+        {"1_Prob": 60.0, "X_Prob": 25.0, "2_Prob": 15.0, "partido": "A | B"},
+        {"1_Prob": 30.0, "X_Prob": 40.0, "2_Prob": 30.0, "partido": "C | D"},
+    ]
+    sample_details = [
+        {"clasificacionLocal": 1, "clasificacionVisitante": 2, "veces1": 5, "vecesX": 3, "veces2": 2},
+        {"clasificacionLocal": 2, "clasificacionVisitante": 1, "veces1": 2, "vecesX": 5, "veces2": 3},
+    ]
+
+    cached = KinielaPredictor()
+    context_from_values = cached._KinielaPredictor__context_from_values  # type: ignore
+    calls = []
+
+    def counting_context_from_values(**values):
+        calls.append(values)
+        return context_from_values(**values)
+
+    cached._KinielaPredictor__context_from_values = counting_context_from_values  # type: ignore
+
+    def frame(probs):
+        return JornadaFrame.from_sources(jornada=1, temporada=2026, probabilities=probs, details=sample_details)
+
+    records = frame(sample_probs).matches
+    first = cached._KinielaPredictor__predict_risky(records)  # type: ignore
+    assert len(calls) == 2, f"❌ Deberían calcularse 2 contextos, calculados {len(calls)}"
+
+    first[0]["context_factors"]["local_strength"] = 999
+    cached._KinielaPredictor__predict_custom(records, {"1": 1, "X": 1, "2": 0})  # type: ignore
+    again = cached._KinielaPredictor__predict_risky(records)  # type: ignore
+    assert len(calls) == 2, "❌ Cambiar de estrategia no debería recalcular contextos"
+    assert again[0]["context_factors"]["local_strength"] != 999, "❌ La salida no debe compartir la caché"
+
+    changed_probs = [sample_probs[0], {**sample_probs[1], "1_Prob": 45.0, "2_Prob": 15.0}]
+    changed = cached._KinielaPredictor__predict_risky(frame(changed_probs).matches)  # type: ignore
+    assert len(calls) == 3, f"❌ Sólo debería recalcularse el partido modificado, calculados {len(calls) - 2}"
+
+    fresh = KinielaPredictor()._KinielaPredictor__predict_risky(frame(changed_probs).matches)  # type: ignore
+    assert changed == fresh, "❌ Las predicciones memoizadas deberían coincidir con las recalculadas"
+
+    print("✅ Memoización por partido: sólo se recalculan los partidos modificados")
+    print(f"   Contextos calculados: {len(calls)}")
+
+
+def test_predict_many():
+    """
+    Prueba la predicción de varias estrategias en una sola pasada.
+
+    Expected
+    --------
+    - Una predicción por estrategia, idéntica a la de predict con la misma estrategia
+    - Discrepancias sólo en los partidos en los que las estrategias difieren
+    - Un único análisis contextual por partido para todas las estrategias
+
+    Verifications
+    -------------
+    - Se comparan los resultados con predict
+    - Se cuentan las llamadas a __context_from_values
+    """
+    print("=" * 80)
+    print("TEST: test_predict_many()")
+    print("=" * 80)
+
+    sample_probs = [
+        {"1_Prob": 40.0 + i, "X_Prob": 30.0 - i, "2_Prob": 30.0, "partido": f"L{i} | V{i}"} for i in range(15)
+    ]
+    sample_details = [
+        {"clasificacionLocal": 1 + i, "clasificacionVisitante": 15 - i, "veces1": i, "vecesX": 3, "veces2": 2}
+        for i in range(15)
+    ]
+    frame = JornadaFrame.from_sources(
+        jornada=1, temporada=2026, probabilities=sample_probs, details=sample_details
+    )
+    custom = {"1": 5, "X": 5, "2": 5}
+
+    many = KinielaPredictor()
+    context_from_values = many._KinielaPredictor__context_from_values  # type: ignore
+    calls = []
+
+    def counting_context_from_values(**values):
+        calls.append(values)
+        return context_from_values(**values)
+
+    many._KinielaPredictor__context_from_values = counting_context_from_values  # type: ignore
+
+    comparison = many.predict_many(
+        jornada=1, temporada=2026, frame=frame,
+        strategies=["conservadora", "arriesgada", {"strategy": "personalizada", "custom_distribution": custom}],
+    )
+
+    # Verificaciones
+    assert comparison is not None, "❌ La comparación no debería ser None"
+    labels = ["conservadora", "arriesgada", "personalizada 5-5-5"]
+    assert comparison["strategies"] == labels, f"❌ Etiquetas inesperadas: {comparison['strategies']}"
+    assert len(calls) == 15, f"❌ Debería calcularse un contexto por partido, calculados {len(calls)}"
+
+    single = KinielaPredictor()
+    strategies = ["conservadora", "arriesgada", "personalizada"]
+    for label, strategy, distribution in zip(labels, strategies, [None, None, custom]):
+        expected = single.predict(
+            jornada=1, temporada=2026, strategy=strategy, custom_distribution=distribution, frame=frame
+        )
+        assert comparison["predictions"][label] == expected, f"❌ La predicción de {label} debería coincidir"
+
+    signs = {
+        label: [p["prediction"] for p in comparison["predictions"][label]["predictions"]] for label in labels
+    }
+    expected_ids = [i + 1 for i in range(15) if len({signs[label][i] for label in labels}) > 1]
+    assert [d["match_id"] for d in comparison["disagreements"]] == expected_ids, "❌ Discrepancias incorrectas"
+    assert comparison["agreement"] == 15 - len(expected_ids), "❌ Número de coincidencias incorrecto"
+
+    try:
+        many.predict_many(jornada=1, temporada=2026, frame=frame, strategies=["inexistente"])
+        raise AssertionError("❌ Una estrategia desconocida debería lanzar ValueError")
+    except ValueError:
+        pass
+
+    print("✅ Predicción multiestrategia: contexto compartido y discrepancias correctas")
+    print(f"   Partidos con discrepancias: {expected_ids}")
+
+
+def test_predict_value():
+    """
+    Prueba la estrategia de valor (probabilidad LAE frente a porcentaje de apuestas del público).
+
+    Con ambas fuentes iguales en todos los partidos salvo el primero, cuyo favorito está sobreapostado por el
+    público, la estrategia debe descartar ese favorito y mantener los favoritos del resto.
+
+    Expected
+    --------
+    - Partido 1: 'X' (25% LAE frente a 6% de apuestas) en lugar del '1' sobreapostado
+    - Resto de partidos: '1' (favorito con ratio 1.00)
+
+    Verifications
+    -------------
+    - Se comprueban los signos, el ratio de valor y las probabilidades por fuente
+    """
+    print("=" * 80)
+    print("TEST: test_predict_value()")
+    print("=" * 80)
+
+    lae = [
+        {"id": i + 1, "1_Prob": 55.0, "X_Prob": 25.0, "2_Prob": 20.0, "partido": f"L{i} | V{i}"} for i in range(14)
+    ]
+    quiniela = [dict(row) for row in lae]
+    quiniela[0].update({"1_Prob": 90.0, "X_Prob": 6.0, "2_Prob": 4.0})
+    frame = JornadaFrame.from_sources(
+        jornada=1, temporada=2026, probabilities=lae, details=[{} for _ in lae]
+    )
+
+    result = KinielaPredictor().predict(
+        jornada=1, temporada=2026, strategy="valor", frame=frame, sources={"lae": lae, "quiniela": quiniela}
+    )
+
+    # Verificaciones
+    assert result is not None, "❌ La predicción no debería ser None"
+    preds = result["predictions"]
+    assert [p["prediction"] for p in preds] == ["X"] + ["1"] * 13, "❌ Signos inesperados"
+    assert preds[0]["value_ratio"] == 4.17, f"❌ Ratio de valor inesperado: {preds[0]['value_ratio']}"
+    assert preds[0]["public_shares"] == {"1": 90.0, "X": 6.0, "2": 4.0}, "❌ Porcentajes del público incorrectos"
+    assert preds[1]["value_ratio"] == 1.0, "❌ Con fuentes iguales el ratio debe ser 1"
+    assert result["summary"] == {"1": 13, "X": 1, "2": 0}, f"❌ Resumen inesperado: {result['summary']}"
+
+    # Con columnas por fuente en los registros no hace falta pasar sources
+    by_source = {"lae": lae, "quiniela": quiniela}
+    with_sources = [
+        row | {f"{sign}_Prob_{source}": rows[i][f"{sign}_Prob"] for source, rows in by_source.items() for sign in "1X2"}
+        for i, row in enumerate(lae)
+    ]
+    frame_sources = JornadaFrame.from_sources(
+        jornada=1, temporada=2026, probabilities=with_sources, details=[{} for _ in lae]
+    )
+    from_records = KinielaPredictor().predict(jornada=1, temporada=2026, strategy="valor", frame=frame_sources)
+    assert from_records is not None, "❌ La predicción no debería ser None"
+    assert [p["prediction"] for p in from_records["predictions"]] == [p["prediction"] for p in preds], (
+        "❌ Las columnas por fuente de los registros deben dar la misma predicción"
+    )
+
+    print("✅ Estrategia de valor: descarta el favorito sobreapostado")
+    print(f"   Partido 1: {preds[0]['reasoning']}")
+
+
 if __name__ == "__main__":
     print("\n" + "=" * 80)
     print("TESTS DE PREDICTOR - KinielaPredictor")
@@ -443,6 +655,9 @@ if __name__ == "__main__":
     test_optimize_distribution()
     test_validate_custom_distribution()
     test_calculate_summary()
+    test_match_cache()
+    test_predict_many()
+    test_predict_value()
 
     print("\n" + "=" * 80)
     print("✅ TODOS LOS TESTS DEL PREDICTOR COMPLETADOS EXITOSAMENTE")
@@ -0,0 +1,168 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests para el módulo records.
+
+Ejecutar: python -m pytest tests/test_records.py -v -s
+"""
+
+import json
+
+from kinielagpt import data_source
+from kinielagpt.records import JornadaFrame, MatchRecord
+
+with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+    match_details_process = json.load(f)
+
+
+def test_match_record_from_sources() -> None:
+    """
+    Prueba la construcción de un MatchRecord a partir de probabilidades y detalles.
+
+    Verifica que se extraen las probabilidades, el signo dominante y el histórico de enfrentamientos,
+    y que el diccionario probs coincide con el que construían los componentes.
+
+    Raises
+    ------
+    AssertionError
+        Si algún campo del registro no coincide con los datos de origen.
+    """
+    print("=" * 80)
+    print("TEST: test_match_record_from_sources()")
+    print("=" * 80)
+
+    prob = {"id": 1, "partido": "AT.MADRID | VALENCIA", "1_Prob": 82.9, "X_Prob": 12.8, "2_Prob": 4.3}
+    detail = match_details_process[0]
+
+    record = MatchRecord.from_sources(match_id=1, prob=prob, detail=detail)
+
+    assert record.partido == "AT.MADRID | VALENCIA", f"❌ Partido incorrecto: {record.partido}"
+    assert record.probs == {"1": 82.9, "X": 12.8, "2": 4.3}, f"❌ Probabilidades incorrectas: {record.probs}"
+    assert record.max_sign == "1" and record.max_prob == 82.9, "❌ Signo dominante incorrecto"
+    assert not record.is_exceptional, "❌ El partido no debe ser excepcional"
+    assert (record.veces1, record.veces_x, record.veces2) == (9, 1, 0), "❌ Histórico incorrecto"
+    assert record.total_historic == 10, f"❌ Total histórico esperado 10, obtenido {record.total_historic}"
+    print(f"✅ Registro construido: {record.partido} → {record.max_sign} ({record.max_prob}%)")
+
+
+def test_match_record_tie_and_exceptional() -> None:
+    """
+    Prueba el desempate del signo dominante y la detección de partidos excepcionales.
+
+    Ante probabilidades empatadas debe elegirse el primer signo en el orden 1, X, 2 (igual que
+    max() sobre el diccionario). Un partido sin 1_Prob (pleno al 15) debe marcarse como excepcional
+    con probabilidades 1X2 a 0.
+
+    Raises
+    ------
+    AssertionError
+        Si el desempate o la marca de partido excepcional no son correctos.
+    """
+    print("=" * 80)
+    print("TEST: test_match_record_tie_and_exceptional()")
+    print("=" * 80)
+
+    tie = MatchRecord.from_sources(
+        match_id=2, prob={"partido": "A | B", "1_Prob": 30.0, "X_Prob": 40.0, "2_Prob": 40.0}, detail={}
+    )
+    assert tie.max_sign == "X", f"❌ Ante empate X/2 se esperaba 'X', obtenido '{tie.max_sign}'"
+    print("✅ Empate de probabilidades resuelto en orden 1, X, 2")
+
+    pleno = MatchRecord.from_sources(
+        match_id=15,
+        prob={"partido": "C | D", "0_Goles_Local_Prob": 20.0, "1_Goles_Local_Prob": 40.0},
+        detail={},
+    )
+    assert pleno.is_exceptional, "❌ El partido sin 1_Prob debe ser excepcional"
+    assert pleno.probs == {"1": 0, "X": 0, "2": 0}, f"❌ Probabilidades por defecto incorrectas: {pleno.probs}"
+    assert pleno.total_historic == 0, "❌ Sin detalle el histórico debe ser 0"
+    print("✅ Pleno al 15 marcado como excepcional")
+
+
+def test_jornada_frame_from_sources() -> None:
+    """
+    Prueba la construcción de un JornadaFrame y el acceso por match_id.
+
+    Raises
+    ------
+    AssertionError
+        Si el número de registros o el acceso por ID no son correctos.
+    """
+    print("=" * 80)
+    print("TEST: test_jornada_frame_from_sources()")
+    print("=" * 80)
+
+    probabilities = [
+        {"id": i, "partido": d["partido"], "1_Prob": 50.0, "X_Prob": 30.0, "2_Prob": 20.0}
+        for i, d in enumerate(match_details_process, start=1)
+    ]
+    frame = JornadaFrame.from_sources(
+        jornada=28, temporada=2026, probabilities=probabilities, details=match_details_process
+    )
+
+    assert len(frame) == 15, f"❌ Se esperaban 15 registros, obtenidos {len(frame)}"
+    assert [r.match_id for r in frame] == list(range(1, 16)), "❌ Los match_id deben ser 1..15"
+    assert frame.raw_detail(match_id=3) is match_details_process[2], "❌ El registro 3 debe usar el detalle 3"
+    grupos = data_source.group_ultimos_partidos(ultimos_partidos=match_details_process[2]["ultimos_partidos"])
+    assert frame.get(match_id=3).racha_local == tuple(p["cod_resultado"] for p in grupos["local"]), (
+        "❌ La racha del local debe salir de los últimos partidos del detalle 3"
+    )
+    assert not hasattr(frame.get(match_id=3), "detail"), "❌ El registro no debe guardar el detalle original"
+    assert frame.get(match_id=0) is None and frame.get(match_id=16) is None, "❌ IDs fuera de rango deben ser None"
+    print(f"✅ JornadaFrame con {len(frame)} registros")
+
+
+def test_match_record_source_probs() -> None:
+    """
+    Prueba las probabilidades por fuente de un MatchRecord y la discrepancia entre fuentes.
+
+    Raises
+    ------
+    AssertionError
+        Si las columnas por fuente no se empaquetan o la discrepancia no es correcta.
+    """
+    print("=" * 80)
+    print("TEST: test_match_record_source_probs()")
+    print("=" * 80)
+
+    prob = {
+        "id": 1, "partido": "AT.MADRID | VALENCIA", "1_Prob": 82.9, "X_Prob": 12.8, "2_Prob": 4.2,
+        "1_Prob_lae": 87.0, "X_Prob_lae": 9.0, "2_Prob_lae": 4.0,
+        "1_Prob_quiniela": 78.9, "X_Prob_quiniela": 16.7, "2_Prob_quiniela": 4.5,
+    }
+    record = MatchRecord.from_sources(match_id=1, prob=prob, detail={})
+
+    assert record.source_probs == (87.0, 9.0, 4.0, 78.9, 16.7, 4.5), f"❌ source_probs: {record.source_probs}"
+    assert record.source_probs_of("quiniela") == {"1": 78.9, "X": 16.7, "2": 4.5}, "❌ Fuente quiniela incorrecta"
+    assert record.source_disagreement == 8.1, f"❌ Discrepancia esperada 8.1, obtenida {record.source_disagreement}"
+    assert record.probs == {"1": 82.9, "X": 12.8, "2": 4.2}, "❌ La probabilidad fusionada no debe cambiar"
+
+    merged_only = MatchRecord.from_sources(match_id=2, prob={"partido": "A | B", "1_Prob": 50.0}, detail={})
+    assert merged_only.source_probs is None and merged_only.source_disagreement is None, (
+        "❌ Sin columnas por fuente no debe haber source_probs"
+    )
+    print(f"✅ Probabilidades por fuente empaquetadas, discrepancia {record.source_disagreement} puntos")
+
+
+if __name__ == "__main__":
+    test_match_record_from_sources()
+    test_match_record_tie_and_exceptional()
+    test_jornada_frame_from_sources()
+    test_match_record_source_probs()
@@ -0,0 +1,142 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Tests para el módulo reductions.
+
+Ejecutar: python -m pytest tests/test_reductions.py -v -s
+"""
+
+import itertools
+import time
+
+import numpy as np
+import pytest
+
+from kinielagpt import reductions
+from tests.conftest import build_predictions
+
+
+def max_hits_missing(columns: list[str], systems: list[str]) -> int:
+    """Mayor número de fallos de la mejor columna frente a cualquier combinación del sistema completo."""
+    worst = 0
+    for combination in itertools.product(*systems):
+        worst = max(worst, min(sum(a != b for a, b in zip(column, combination)) for column in columns))
+    return worst
+
+
+def test_covering_indices() -> None:
+    """
+    Prueba que el recubrimiento cubre todas las combinaciones con el radio pedido.
+
+    Raises
+    ------
+    AssertionError
+        Si alguna combinación queda a más de errors fallos o el tamaño no es el esperado.
+    """
+    print("=" * 80)
+    print("TEST: test_covering_indices()")
+    print("=" * 80)
+
+    for radices, errors in (([3, 3, 3, 3], 1), ([3, 3, 2, 2, 2], 1), ([3, 3, 3, 2, 2], 2)):
+        indices = reductions.covering_indices(radices=radices, errors=errors)
+        digits = [[(index // int(np.prod(radices[:k]))) % radix for k, radix in enumerate(radices)]
+                  for index in indices]
+        worst = 0
+        for combination in itertools.product(*(range(radix) for radix in radices)):
+            worst = max(worst, min(sum(a != b for a, b in zip(column, combination)) for column in digits))
+        assert worst <= errors, f"❌ {radices}: hay combinaciones a {worst} fallos"
+        print(f"✅ {radices} con {errors} fallos: {len(indices)} de {int(np.prod(radices))} columnas")
+
+    assert len(reductions.covering_indices(radices=[3, 3, 3, 3])) == 9, "❌ 4 triples al 13 deben ser 9 columnas"
+    assert len(reductions.covering_indices(radices=[2] * 7)) == 16, "❌ 7 dobles al 13 deben ser 16 columnas"
+    assert len(reductions.covering_indices(radices=[3, 2], errors=0)) == 6, "❌ Sin fallos es el sistema completo"
+
+
+def test_reduce_system() -> None:
+    """
+    Prueba la reducción sobre una predicción con dobles y triples elegidos automáticamente.
+
+    Raises
+    ------
+    AssertionError
+        Si las columnas no respetan los signos del sistema o la garantía.
+    """
+    print("=" * 80)
+    print("TEST: test_reduce_system()")
+    print("=" * 80)
+
+    predictions = build_predictions(seed=3, alpha=(3.0, 2.0, 2.0))
+    multiples = reductions.choose_multiples(predictions=predictions, triples=3, dobles=3)
+    assert list(multiples.values()).count("1X2") == 3 and len(multiples) == 6, "❌ Deben elegirse 3T y 3D"
+
+    fixed = {pred["match_id"]: pred["prediction"] for pred in predictions if pred["match_id"] <= 14}
+    for match_id, signs in multiples.items():
+        assert fixed[match_id] in signs, f"❌ El múltiple del partido {match_id} debe incluir el signo predicho"
+
+    result = reductions.reduce_system(predictions=predictions, multiples=multiples)
+    systems = [multiples.get(match_id, fixed[match_id]) for match_id in result["match_ids"]]
+
+    assert result["match_ids"] == list(range(1, 15)), "❌ El pleno al 15 no forma parte de las columnas"
+    assert result["full_count"] == 27 * 8 and result["count"] < result["full_count"], "❌ Tamaños inesperados"
+    assert result["guarantee"] == "13 si 14", f"❌ Garantía inesperada: {result['guarantee']}"
+    assert all(c in s for column in result["columns"] for c, s in zip(column, systems)), "❌ Signos fuera del sistema"
+    assert max_hits_missing(result["columns"], systems) <= 1, "❌ No se cumple la garantía 13 si 14"
+    print(f"✅ {result['count']} columnas de {result['full_count']} ({result['savings']}% de ahorro)")
+
+    with pytest.raises(ValueError):
+        reductions.reduce_system(predictions=predictions, multiples={15: "1X"})
+    with pytest.raises(ValueError):
+        reductions.reduce_system(predictions=predictions, multiples={1: "1Y"})
+    with pytest.raises(ValueError):
+        reductions.choose_multiples(predictions=predictions, triples=10, dobles=5)
+    print("✅ Múltiples inválidos rechazados")
+
+
+def test_reduction_eight_triples() -> None:
+    """
+    Prueba que una reducción de 8 triples y 3 dobles se calcula en pocos segundos.
+
+    Raises
+    ------
+    AssertionError
+        Si la búsqueda es lenta o deja combinaciones sin cubrir.
+    """
+    print("=" * 80)
+    print("TEST: test_reduction_eight_triples()")
+    print("=" * 80)
+
+    radices = [3] * 8 + [2] * 3
+    start = time.perf_counter()
+    indices = reductions.covering_indices(radices=radices)
+    elapsed = time.perf_counter() - start
+
+    covered = np.zeros(int(np.prod(radices)), dtype=bool)
+    covered[reductions.hamming_balls(radices=radices)[indices]] = True
+    assert covered.all(), "❌ Quedan combinaciones sin cubrir"
+    assert elapsed < 10, f"❌ La reducción ha tardado {elapsed:.1f}s"
+    assert len(indices) < covered.size / 10, "❌ La reducción debe ahorrar al menos un 90% de columnas"
+    print(f"✅ {len(indices)} columnas de {covered.size} en {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    test_covering_indices()
+    test_reduce_system()
+    test_reduction_eight_triples()
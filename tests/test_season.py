@@ -0,0 +1,228 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Tests para el módulo season.
+
+Ejecutar: python -m pytest tests/test_season.py -v -s
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from kinielagpt import data_source, season
+from kinielagpt.analyzer import Analyzer
+from kinielagpt.records import JornadaFrame
+
+with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+    match_details_process = json.load(f)
+
+TEMPORADA_TEST = 2026
+JORNADAS_TEST = (1, 2, 3)
+
+
+def build_probabilities(jornada: int) -> list[dict]:
+    """Probabilidades sintéticas (distintas en cada jornada) para los partidos de la muestra."""
+    probabilities = []
+    for i, detail in enumerate(match_details_process):
+        p1 = 20.0 + (7 * i + 11 * jornada) % 50
+        px = 10.0 + (3 * i + jornada) % 20
+        probabilities.append({
+            "id": i + 1, "partido": detail["partido"], "1_Prob": p1, "X_Prob": px, "2_Prob": round(100 - p1 - px, 1),
+        })
+    return probabilities
+
+
+def populate_cache(monkeypatch: pytest.MonkeyPatch, cache_dir: str) -> None:
+    """Guarda JORNADAS_TEST en la caché en disco de cache_dir sin peticiones HTTP."""
+    monkeypatch.setenv(data_source.CACHE_DIR_ENV, cache_dir)
+    monkeypatch.setattr(
+        data_source, "get_kiniela_probabilities", lambda jornada, temporada: build_probabilities(jornada=jornada)
+    )
+    monkeypatch.setattr(
+        data_source, "get_kiniela_matches_details",
+        lambda jornada, temporada: json.loads(json.dumps(match_details_process)),
+    )
+    for jornada in JORNADAS_TEST:
+        data_source.get_jornada(jornada=jornada, temporada=TEMPORADA_TEST)
+
+    # A partir de aquí cualquier descarga es un error: todo debe leerse de la caché
+    def fail(jornada: int, temporada: int) -> None:
+        raise AssertionError("❌ Petición HTTP inesperada")
+
+    monkeypatch.setattr(data_source, "get_kiniela_probabilities", fail)
+    monkeypatch.setattr(data_source, "get_kiniela_matches_details", fail)
+
+
+def test_flatten_analysis() -> None:
+    """
+    Prueba el aplanado de un análisis anidado en columnas escalares.
+
+    Raises
+    ------
+    AssertionError
+        Si las claves anidadas no se expanden o las listas no se serializan como JSON.
+    """
+    print("=" * 80)
+    print("TEST: test_flatten_analysis()")
+    print("=" * 80)
+
+    row = season.flatten_analysis(analysis={
+        "info_partido": {"id_partido": 3, "partido": "A | B"},
+        "tendencias_local": {"tendencia_general": {"direccion": "MEJORANDO", "puntos": 9}},
+        "datos_destacados": ["dato 1", "dato 2"],
+        "prediccion": "1",
+    })
+
+    assert row == {
+        "info_partido.id_partido": 3,
+        "info_partido.partido": "A | B",
+        "tendencias_local.tendencia_general.direccion": "MEJORANDO",
+        "tendencias_local.tendencia_general.puntos": 9,
+        "datos_destacados": '["dato 1", "dato 2"]',
+        "prediccion": "1",
+    }, f"❌ Fila aplanada incorrecta: {row}"
+    print(f"✅ {len(row)} columnas escalares")
+
+
+def test_iter_season_analyses_from_cache(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """
+    Prueba que el análisis masivo lee la caché y coincide con analyze_match partido a partido.
+
+    Raises
+    ------
+    AssertionError
+        Si se hace alguna petición HTTP, si faltan filas o si alguna difiere del análisis individual.
+    """
+    print("=" * 80)
+    print("TEST: test_iter_season_analyses_from_cache()")
+    print("=" * 80)
+
+    populate_cache(monkeypatch=monkeypatch, cache_dir=str(tmp_path))
+    cached = data_source.list_cached_jornadas(temporada=TEMPORADA_TEST)
+    assert cached == [(TEMPORADA_TEST, j) for j in JORNADAS_TEST], f"❌ Jornadas en caché incorrectas: {cached}"
+
+    rows = list(season.iter_season_analyses(temporada=TEMPORADA_TEST, processes=1))
+    assert len(rows) == len(JORNADAS_TEST) * len(match_details_process), f"❌ Filas: {len(rows)}"
+
+    analyzer = Analyzer()
+    for jornada in JORNADAS_TEST:
+        frame = JornadaFrame.from_sources(
+            jornada=jornada, temporada=TEMPORADA_TEST, probabilities=build_probabilities(jornada=jornada),
+            details=match_details_process,
+        )
+        for record in frame:
+            expected = season.flatten_analysis(analysis=analyzer.analyze_match(
+                jornada=jornada, temporada=TEMPORADA_TEST, match_id=record.match_id, frame=frame
+            ))
+            row = rows[(jornada - 1) * len(match_details_process) + record.match_id - 1]
+            assert row == expected, f"❌ Análisis distinto en jornada {jornada}, partido {record.match_id}"
+    print(f"✅ {len(rows)} análisis leídos de la caché, idénticos a analyze_match")
+
+
+def test_analyze_season_process_pool_to_csv(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """
+    Prueba el análisis con un pool de procesos y su escritura en un fichero columnar CSV.
+
+    Raises
+    ------
+    AssertionError
+        Si el resultado del pool difiere del secuencial o el fichero no contiene las mismas filas.
+    """
+    print("=" * 80)
+    print("TEST: test_analyze_season_process_pool_to_csv()")
+    print("=" * 80)
+
+    populate_cache(monkeypatch=monkeypatch, cache_dir=str(tmp_path / "cache"))
+    output = str(tmp_path / "out" / "temporada.csv")
+
+    sequential = season.analyze_season(temporada=TEMPORADA_TEST, processes=1)
+    parallel = season.analyze_season(temporada=TEMPORADA_TEST, jornada_fin=3, processes=2, output=output)
+
+    pd.testing.assert_frame_equal(sequential, parallel)
+    assert list(parallel["info_partido.jornada"].unique()) == list(JORNADAS_TEST), "❌ Jornadas desordenadas"
+
+    written = pd.read_csv(output)
+    assert written.shape == parallel.shape, f"❌ Forma del CSV {written.shape} vs {parallel.shape}"
+    assert list(written.columns) == list(parallel.columns), "❌ Columnas del CSV distintas"
+    print(f"✅ {parallel.shape[0]} filas x {parallel.shape[1]} columnas con 2 procesos, escritas en CSV")
+
+    with pytest.raises(ValueError):
+        season.write_columnar(df=parallel, path=output, file_format="xlsx")
+    print("✅ Formato no soportado rechazado")
+
+
+def test_process_pool_downloads_in_parent(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """
+    Prueba que, con un pool de procesos, las jornadas que faltan se descargan en el proceso principal.
+
+    Raises
+    ------
+    AssertionError
+        Si algún proceso del pool hace una petición HTTP, si las descargas no usan la prioridad 'backfill' o si
+        el resultado difiere del análisis secuencial.
+    """
+    print("=" * 80)
+    print("TEST: test_process_pool_downloads_in_parent()")
+    print("=" * 80)
+
+    monkeypatch.setenv(data_source.CACHE_DIR_ENV, str(tmp_path))
+    parent_pid = os.getpid()
+    request_priority = getattr(data_source, "__REQUEST_PRIORITY")
+    downloads = []
+
+    def download(source: str, jornada: int) -> None:
+        assert os.getpid() == parent_pid, f"❌ Descarga de la jornada {jornada} en un proceso del pool"
+        downloads.append((source, jornada, request_priority.get()))
+
+    def fake_probabilities(jornada: int, temporada: int) -> list[dict]:
+        download(source="probabilities", jornada=jornada)
+        return build_probabilities(jornada=jornada)
+
+    def fake_details(jornada: int, temporada: int) -> list[dict]:
+        download(source="details", jornada=jornada)
+        return json.loads(json.dumps(match_details_process))
+
+    monkeypatch.setattr(data_source, "get_kiniela_probabilities", fake_probabilities)
+    monkeypatch.setattr(data_source, "get_kiniela_matches_details", fake_details)
+
+    parallel = season.analyze_season(temporada=TEMPORADA_TEST, jornada_fin=3, processes=2)
+    expected = [(source, jornada, "backfill") for jornada in JORNADAS_TEST for source in ("probabilities", "details")]
+    assert downloads == expected, f"❌ Descargas en el proceso principal: {downloads}"
+    print(f"✅ {len(downloads)} descargas en el proceso principal con prioridad 'backfill'")
+
+    sequential = season.analyze_season(temporada=TEMPORADA_TEST, processes=1)
+    assert len(downloads) == len(expected), "❌ El análisis secuencial no debe descargar jornadas ya guardadas"
+    pd.testing.assert_frame_equal(sequential, parallel)
+    print(f"✅ {parallel.shape[0]} filas idénticas al análisis secuencial")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    test_flatten_analysis()
+    for test in (test_iter_season_analyses_from_cache, test_analyze_season_process_pool_to_csv,
+                 test_process_pool_downloads_in_parent):
+        with tempfile.TemporaryDirectory() as tmp_dir, pytest.MonkeyPatch.context() as mp:
+            test(monkeypatch=mp, tmp_path=pathlib.Path(tmp_dir))
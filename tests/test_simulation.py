@@ -0,0 +1,177 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Tests para el módulo simulation.
+
+Ejecutar: python -m pytest tests/test_simulation.py -v -s
+"""
+
+import numpy as np
+import pytest
+
+from kinielagpt import portfolio, simulation
+from tests.conftest import build_predictions
+
+
+def test_simulate_distribution() -> None:
+    """
+    Prueba que la distribución simulada de aciertos se ajusta a la esperada y es reproducible.
+
+    Raises
+    ------
+    AssertionError
+        Si la media o la desviación se alejan de las teóricas o la semilla no es determinista.
+    """
+    print("=" * 80)
+    print("TEST: test_simulate_distribution()")
+    print("=" * 80)
+
+    simulation.clear_cache()
+    probabilities = np.random.default_rng(3).dirichlet([4.0, 2.0, 2.0], size=14)
+    column = "".join("1X2"[code] for code in probabilities.argmax(axis=1))
+    p_hit = probabilities.max(axis=1)
+
+    result = simulation.simulate(probabilities=probabilities, column=column, n_simulations=100_000, seed=1)
+    counts = [row["count"] for row in result["distribution"]]
+
+    assert sum(counts) == 100_000 and len(counts) == 15, "❌ La distribución debe cubrir 0-14 aciertos"
+    assert abs(result["mean_hits"] - p_hit.sum()) < 0.03, f"❌ Media inesperada: {result['mean_hits']}"
+    assert abs(result["std_hits"] - np.sqrt((p_hit * (1 - p_hit)).sum())) < 0.03, "❌ Desviación inesperada"
+    assert list(result["prize_probabilities"]) == ["14", "13", "12", "11", "10"], "❌ Categorías inesperadas"
+    assert result["prize_probabilities"]["10"] >= result["prize_probabilities"]["14"], "❌ Categorías acumuladas"
+
+    simulation.clear_cache()
+    again = simulation.simulate(probabilities=probabilities, column=column, n_simulations=100_000, seed=1)
+    assert again["distribution"] == result["distribution"], "❌ La misma semilla debe dar la misma distribución"
+    print(f"✅ Media {result['mean_hits']} (teórica {p_hit.sum():.4f}), "
+          f"P(>=10) {result['prize_probabilities']['10']}%")
+
+
+def test_simulation_cache() -> None:
+    """
+    Prueba la caché por (hash de entradas, semilla, n) y su límite de tamaño.
+
+    Raises
+    ------
+    AssertionError
+        Si una consulta repetida no sale de la caché o la caché crece sin límite.
+    """
+    print("=" * 80)
+    print("TEST: test_simulation_cache()")
+    print("=" * 80)
+
+    simulation.clear_cache()
+    probabilities = np.full((14, 3), 1 / 3)
+    first = simulation.simulate(probabilities=probabilities, column="1" * 14, n_simulations=5000, seed=7)
+    second = simulation.simulate(probabilities=probabilities, column="1" * 14, n_simulations=5000, seed=7)
+
+    assert not first["cached"] and second["cached"], "❌ La segunda consulta debe salir de la caché"
+    assert {**first, "cached": True} == second, "❌ El resultado en caché debe ser idéntico"
+    assert not simulation.simulate(probabilities=probabilities, column="1" * 14, n_simulations=5000,
+                                   seed=8)["cached"], "❌ Otra semilla es otra simulación"
+    assert not simulation.simulate(probabilities=probabilities, column="X" * 14, n_simulations=5000,
+                                   seed=7)["cached"], "❌ Otra columna cambia el hash de las entradas"
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(simulation, "SIMULATION_CACHE_SIZE", 2)
+        for seed in range(5):
+            simulation.simulate(probabilities=probabilities, column="2" * 14, n_simulations=100, seed=seed)
+        assert simulation.simulate(probabilities=probabilities, column="2" * 14, n_simulations=100,
+                                   seed=4)["cached"], "❌ La última simulación debe seguir en caché"
+        assert not simulation.simulate(probabilities=probabilities, column="2" * 14, n_simulations=100,
+                                       seed=0)["cached"], "❌ Las simulaciones antiguas deben descartarse"
+    simulation.clear_cache()
+    print("✅ Caché por entradas, semilla y número de simulaciones")
+
+
+def test_simulate_predictions() -> None:
+    """
+    Prueba la simulación a partir de una predicción de KinielaPredictor.
+
+    Raises
+    ------
+    AssertionError
+        Si no se usa la columna predicha o no se validan las columnas.
+    """
+    print("=" * 80)
+    print("TEST: test_simulate_predictions()")
+    print("=" * 80)
+
+    predictions = build_predictions(seed=12)
+    predicted = "".join(pred["prediction"] for pred in predictions[:14])
+
+    result = simulation.simulate_predictions(predictions=predictions, n_simulations=2000)
+    assert result["column"] == predicted, f"❌ Debe usarse la columna predicha: {result['column']}"
+    assert result["match_ids"] == list(range(1, 15)), "❌ El pleno al 15 no forma parte de la columna"
+
+    custom = simulation.simulate_predictions(predictions=predictions, column="x" * 14, n_simulations=2000)
+    assert custom["column"] == "X" * 14 and custom["mean_hits"] < result["mean_hits"], "❌ Columna indicada"
+
+    with pytest.raises(ValueError):
+        simulation.simulate_predictions(predictions=predictions, column="1" * 13)
+    with pytest.raises(ValueError):
+        simulation.simulate_predictions(predictions=predictions, column="1" * 13 + "Y")
+    simulation.clear_cache()
+    print(f"✅ Columna predicha {predicted}: {result['mean_hits']} aciertos de media")
+
+
+def test_feed_probabilities() -> None:
+    """
+    Prueba la matriz de probabilidades construida directamente con las probabilidades de data_source.
+
+    Raises
+    ------
+    AssertionError
+        Si la matriz o los match_id difieren de los de la predicción equivalente o se incluye el pleno al 15.
+    """
+    print("=" * 80)
+    print("TEST: test_feed_probabilities()")
+    print("=" * 80)
+
+    predictions = build_predictions(seed=12)
+    feed = [
+        {"partido": f"LOCAL{pred['match_id']} | VISITANTE{pred['match_id']}", "1_Prob": pred["probabilities"]["1"],
+         "X_Prob": pred["probabilities"]["X"], "2_Prob": pred["probabilities"]["2"]}
+        for pred in predictions[:14]
+    ]
+    feed.append({"partido": "PLENO | AL 15", "goles_local": {}, "goles_visitante": {}})
+
+    matrix, match_ids = simulation.feed_probabilities(probabilities=feed)
+    expected, expected_ids = portfolio.prediction_probabilities(predictions=predictions)
+    assert match_ids == expected_ids == list(range(1, 15)), f"❌ match_id inesperados: {match_ids}"
+    np.testing.assert_allclose(matrix, expected, err_msg="❌ Matriz distinta de la de la predicción")
+
+    column = "1X2" * 4 + "11"
+    from_feed = simulation.simulate(probabilities=matrix, column=column, n_simulations=2000)
+    from_predictions = simulation.simulate_predictions(predictions=predictions, column=column, n_simulations=2000)
+    assert from_feed["inputs_hash"] == from_predictions["inputs_hash"], "❌ Las entradas simuladas deben coincidir"
+
+    empty, empty_ids = simulation.feed_probabilities(probabilities=feed[14:])
+    assert empty.shape == (0, 3) and empty_ids == [], f"❌ Jornada sin partidos 1X2: {empty.shape}"
+    simulation.clear_cache()
+    print(f"✅ {len(match_ids)} partidos con signo sin ejecutar ninguna estrategia")
+
+
+if __name__ == "__main__":
+    test_simulate_distribution()
+    test_simulation_cache()
+    test_simulate_predictions()
+    test_feed_probabilities()
@@ -0,0 +1,214 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Tests para el módulo snapshots.
+
+Ejecutar: python -m pytest tests/test_snapshots.py -v -s
+"""
+
+import json
+
+import pytest
+
+from kinielagpt import data_source
+from kinielagpt.live import LivePoller
+from kinielagpt.snapshots import PROBABILITY_FIELDS, ProbabilitySnapshotStore
+from tests.test_season import build_probabilities
+
+with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+    match_details_process = json.load(f)
+
+
+def build_snapshots() -> list[list[dict]]:
+    """Tres snapshots de una jornada: inicial, con el partido 1 movido y con los partidos 1 y 2 movidos."""
+    initial = build_probabilities(jornada=1)
+    for prob in initial:
+        prob.update({"0_Goles_Local_Prob": 30.0, "1_Goles_Local_Prob": 40.0, "2_Goles_Local_Prob": 20.0,
+                     "Mas_Goles_Local_Prob": 10.0})
+    second = [dict(prob) for prob in initial]
+    second[0].update({"1_Prob": second[0]["1_Prob"] - 4.3, "X_Prob": second[0]["X_Prob"] + 4.3})
+    third = [dict(prob) for prob in second]
+    third[0].update({"0_Goles_Local_Prob": 35.5, "1_Goles_Local_Prob": 34.5})
+    third[1].update({"2_Prob": third[1]["2_Prob"] + 1.0, "X_Prob": third[1]["X_Prob"] - 1.0})
+    return [initial, second, third]
+
+
+def test_append_only_deduplicated_and_persistent(tmp_path) -> None:
+    """
+    Prueba que los snapshots se guardan comprimidos, sin repetir el último y persisten al reabrir.
+
+    Raises
+    ------
+    AssertionError
+        Si se guardan snapshots repetidos, no se recuperan idénticos o no persisten.
+    """
+    print("=" * 80)
+    print("TEST: test_append_only_deduplicated_and_persistent()")
+    print("=" * 80)
+
+    path = str(tmp_path / "snapshots.sqlite3")
+    snapshots = build_snapshots()
+
+    store = ProbabilitySnapshotStore(path=path)
+    added = [store.append(probabilities=s, jornada=28, temporada=2026, timestamp=1000.0 + i * 3600)
+             for i, s in enumerate(snapshots)]
+    repeated = store.append(probabilities=snapshots[-1], jornada=28, temporada=2026, timestamp=99999.0)
+    other = store.append(probabilities=snapshots[-1], jornada=29, temporada=2026, timestamp=99999.0)
+    store.close()
+
+    assert added == [True, True, True] and not repeated, f"❌ Snapshots guardados: {added}, repetido: {repeated}"
+    assert other, "❌ El mismo snapshot en otra jornada debe guardarse"
+
+    reopened = ProbabilitySnapshotStore(path=path)
+    stored = reopened.snapshots(jornada=28, temporada=2026)
+    assert len(reopened) == 4, f"❌ Tras reabrir se esperaban 4 snapshots, hay {len(reopened)}"
+    assert [s for _, s in stored] == snapshots, "❌ Los snapshots descomprimidos no coinciden"
+    assert [t for t, _ in stored] == [1000.0, 4600.0, 8200.0], "❌ Instantes incorrectos"
+    reopened.close()
+    print(f"✅ {len(stored)} snapshots de la jornada 28 persistidos, el repetido descartado")
+
+
+def test_append_deduplicates_against_database(tmp_path) -> None:
+    """
+    Prueba que dos almacenes sobre el mismo fichero comparan cada partido con su último punto en la base de datos.
+
+    El almacén 1 guarda A, el almacén 2 guarda B y el almacén 1 vuelve a guardar A: el último punto de cada
+    partido movido debe ser el de A, aunque el almacén 1 ya hubiera visto esos valores.
+
+    Raises
+    ------
+    AssertionError
+        Si se omite algún punto o un snapshot no se guarda.
+    """
+    print("=" * 80)
+    print("TEST: test_append_deduplicates_against_database()")
+    print("=" * 80)
+
+    path = str(tmp_path / "snapshots.sqlite3")
+    first, second, _ = build_snapshots()
+    store1 = ProbabilitySnapshotStore(path=path)
+    store2 = ProbabilitySnapshotStore(path=path)
+
+    added = [
+        store1.append(probabilities=first, jornada=28, temporada=2026, timestamp=1000.0),
+        store2.append(probabilities=second, jornada=28, temporada=2026, timestamp=2000.0),
+        store1.append(probabilities=first, jornada=28, temporada=2026, timestamp=3000.0),
+        store2.append(probabilities=first, jornada=28, temporada=2026, timestamp=4000.0),
+    ]
+    series = store1.match_series(jornada=28, temporada=2026, match_id=1)
+    store1.close()
+    store2.close()
+
+    assert added == [True, True, True, False], f"❌ Snapshots guardados: {added}"
+    assert [point["timestamp"] for point in series] == [1000.0, 2000.0, 3000.0], (
+        f"❌ Puntos del partido 1: {[point['timestamp'] for point in series]}"
+    )
+    assert series[-1]["1_Prob"] == first[0]["1_Prob"], f"❌ El último punto debe ser A: {series[-1]['1_Prob']}"
+    print("✅ El último punto del partido 1 vuelve a ser el de A tras escribir desde otro almacén")
+
+
+def test_drift_from_match_index(tmp_path) -> None:
+    """
+    Prueba la serie por partido (sólo cambios) y el resumen de evolución de 1/X/2 y goles.
+
+    Raises
+    ------
+    AssertionError
+        Si el índice guarda puntos sin cambios o la evolución calculada no es la esperada.
+    """
+    print("=" * 80)
+    print("TEST: test_drift_from_match_index()")
+    print("=" * 80)
+
+    snapshots = build_snapshots()
+    store = ProbabilitySnapshotStore(path=str(tmp_path / "snapshots.sqlite3"))
+    for i, snapshot in enumerate(snapshots):
+        store.append(probabilities=snapshot, jornada=28, temporada=2026, timestamp=1000.0 + i * 3600)
+
+    assert len(store.match_series(jornada=28, temporada=2026, match_id=1)) == 3, "❌ Puntos del partido 1"
+    assert len(store.match_series(jornada=28, temporada=2026, match_id=2)) == 2, "❌ Puntos del partido 2"
+    assert len(store.match_series(jornada=28, temporada=2026, match_id=5)) == 1, "❌ Puntos del partido 5"
+
+    drift = store.drift(jornada=28, temporada=2026, match_id=1)
+    assert drift["partido"] == match_details_process[0]["partido"], f"❌ Partido: {drift['partido']}"
+    assert (drift["snapshots"], drift["cambios"]) == (3, 3), "❌ Conteos incorrectos"
+    assert drift["variacion"]["1_Prob"] == -4.3 and drift["variacion"]["X_Prob"] == 4.3, "❌ Variación 1X2"
+    assert drift["variacion"]["0_Goles_Local_Prob"] == 5.5, "❌ Variación de goles"
+    assert drift["actual"] == {name: float(snapshots[-1][0].get(name, 0.0)) for name in PROBABILITY_FIELDS}, (
+        "❌ Valores actuales incorrectos"
+    )
+    assert drift["minimo"]["1_Goles_Local_Prob"] == 34.5 and drift["maximo"]["1_Goles_Local_Prob"] == 40.0, (
+        "❌ Mínimo/máximo incorrectos"
+    )
+    assert drift["desde"] == "1970-01-01T00:16:40+00:00", f"❌ Instante inicial: {drift['desde']}"
+    assert store.drift(jornada=28, temporada=2026, match_id=99) is None, "❌ Un partido sin datos devuelve None"
+    store.close()
+    variacion = drift["variacion"]
+    print(f"✅ Evolución de {drift['partido']}: 1 {variacion['1_Prob']:+}, X {variacion['X_Prob']:+}")
+
+
+def test_live_poller_records_snapshots(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """
+    Prueba que LivePoller guarda cada descarga en el almacén persistente.
+
+    Raises
+    ------
+    AssertionError
+        Si el número de snapshots guardados no corresponde a las descargas con cambios.
+    """
+    print("=" * 80)
+    print("TEST: test_live_poller_records_snapshots()")
+    print("=" * 80)
+
+    snapshots = build_snapshots()
+    state = {"poll": -1}
+
+    def get_probabilities(jornada: int, temporada: int) -> list[dict]:
+        state["poll"] += 1
+        return [dict(prob) for prob in snapshots[min(state["poll"], len(snapshots) - 1)]]
+
+    monkeypatch.setattr(data_source, "get_kiniela_probabilities", get_probabilities)
+    monkeypatch.setattr(data_source, "get_kiniela_matches_details", lambda jornada, temporada: match_details_process)
+
+    store = ProbabilitySnapshotStore(path=str(tmp_path / "snapshots.sqlite3"))
+    poller = LivePoller(jornada=28, temporada=2026, store=store)
+    for i in range(5):
+        poller.poll(now=1000.0 + i * 600)
+
+    assert len(store) == len(snapshots), f"❌ Se esperaban {len(snapshots)} snapshots, hay {len(store)}"
+    drift = store.drift(jornada=28, temporada=2026, match_id=2)
+    assert drift["cambios"] == 2, f"❌ Cambios del partido 2: {drift['cambios']}"
+    store.close()
+    print(f"✅ 5 sondeos → {len(snapshots)} snapshots guardados")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_append_only_deduplicated_and_persistent(tmp_path=pathlib.Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_append_deduplicates_against_database(tmp_path=pathlib.Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_drift_from_match_index(tmp_path=pathlib.Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir, pytest.MonkeyPatch.context() as mp:
+        test_live_poller_records_snapshots(monkeypatch=mp, tmp_path=pathlib.Path(tmp_dir))
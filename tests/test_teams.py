@@ -0,0 +1,148 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests para el módulo teams.
+
+Ejecutar: python -m pytest tests/test_teams.py -v -s
+"""
+
+import json
+
+from kinielagpt.analyzer import Analyzer
+from kinielagpt.records import JornadaFrame
+from kinielagpt.teams import TeamIndex, normalize_team_name
+
+with open("tests/data_source_samples/match_details_process.json", encoding="utf-8") as f:
+    match_details_process = json.load(f)
+
+
+def test_normalize_team_name() -> None:
+    """
+    Prueba la normalización de nombres de equipos.
+
+    Verifica que se eliminan tildes y diacríticos, se pasa a mayúsculas y la puntuación se sustituye
+    por espacios simples.
+
+    Raises
+    ------
+    AssertionError
+        Si algún nombre no se normaliza como se espera.
+    """
+    print("=" * 80)
+    print("TEST: test_normalize_team_name()")
+    print("=" * 80)
+
+    cases = {
+        "R.MADRID": "R MADRID",
+        "Alavés": "ALAVES",
+        "  at. madrid ": "AT MADRID",
+        "RACING S.": "RACING S",
+        "Barça": "BARCA",
+        "Leganés": "LEGANES",
+    }
+    for name, expected in cases.items():
+        result = normalize_team_name(name)
+        assert result == expected, f"❌ '{name}' → esperado '{expected}', obtenido '{result}'"
+    print(f"✅ {len(cases)} nombres normalizados correctamente")
+
+
+def test_team_index_lookup_aliases_and_fuzzy() -> None:
+    """
+    Prueba la resolución de nombres en el índice de una jornada real.
+
+    Verifica la búsqueda exacta, por alias, por palabras completas y aproximada, la desambiguación
+    de "MADRID" (Real Madrid, no Atlético) y que los equipos inexistentes devuelven None.
+
+    Raises
+    ------
+    AssertionError
+        Si algún nombre se resuelve al partido o condición incorrectos.
+    """
+    print("=" * 80)
+    print("TEST: test_team_index_lookup_aliases_and_fuzzy()")
+    print("=" * 80)
+
+    index = TeamIndex.from_details(details=match_details_process)
+
+    assert len(index) == 30, f"❌ Se esperaban 30 equipos, obtenidos {len(index)}"
+
+    cases = {
+        "AT.MADRID": (1, True),
+        "Real Madrid": (8, False),
+        "madrid": (8, False),
+        "Atlético de Madrid": (1, True),
+        "Athletic": (6, False),
+        "alaves": (8, True),
+        "Real Betis": (15, False),
+        "Racing": (11, True),
+        "Las Palmas": (14, False),
+        "VILLAREAL": (7, False),
+    }
+    for team_name, (match_id, is_local) in cases.items():
+        entry = index.lookup(team_name=team_name)
+        assert entry is not None, f"❌ '{team_name}' no encontrado"
+        assert (entry.match_id, entry.is_local) == (match_id, is_local), (
+            f"❌ '{team_name}' → esperado {(match_id, is_local)}, obtenido {(entry.match_id, entry.is_local)}"
+        )
+
+    assert index.lookup(team_name="EQUIPO_INEXISTENTE") is None, "❌ Un equipo inexistente debe devolver None"
+    assert "Real Oviedo" in index, "❌ 'Real Oviedo' debe estar en el índice"
+    print(f"✅ {len(cases)} nombres resueltos correctamente")
+
+
+def test_analyze_team_uses_frame_index() -> None:
+    """
+    Prueba que analyze_team resuelve el equipo con el índice compartido de la jornada.
+
+    Verifica que un alias ("Real Madrid") encuentra al visitante del partido 8 y que el índice se
+    construye una única vez por JornadaFrame.
+
+    Raises
+    ------
+    AssertionError
+        Si el análisis no corresponde al equipo o el índice no se reutiliza.
+    """
+    print("=" * 80)
+    print("TEST: test_analyze_team_uses_frame_index()")
+    print("=" * 80)
+
+    probabilities = [
+        {"id": i, "partido": d["partido"], "1_Prob": 50.0, "X_Prob": 30.0, "2_Prob": 20.0}
+        for i, d in enumerate(match_details_process, start=1)
+    ]
+    frame = JornadaFrame.from_sources(
+        jornada=28, temporada=2026, probabilities=probabilities, details=match_details_process
+    )
+
+    analysis = Analyzer().analyze_team(jornada=28, temporada=2026, team_name="Real Madrid", frame=frame)
+
+    assert analysis is not None and "error" not in analysis, f"❌ Análisis no generado: {analysis}"
+    assert analysis["juega_en_casa"] is False, "❌ R.MADRID juega como visitante en el partido 8"
+    assert frame.team_index() is frame.team_index(), "❌ El índice debe construirse una sola vez por jornada"
+
+    missing = Analyzer().analyze_team(jornada=28, temporada=2026, team_name="EQUIPO_INEXISTENTE", frame=frame)
+    assert missing is not None and "error" in missing, "❌ Un equipo inexistente debe devolver error"
+    print(f"✅ Análisis de {analysis['equipo']} (visitante) con índice compartido")
+
+
+if __name__ == "__main__":
+    test_normalize_team_name()
+    test_team_index_lookup_aliases_and_fuzzy()
+    test_analyze_team_uses_frame_index()
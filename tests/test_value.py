@@ -0,0 +1,130 @@
+# KinielaGPT - Spanish Football Quiniela Prediction MCP Server
+# Copyright (C) 2025 Ricardo Moya
+#
+# GitHub: https://github.com/RicardoMoya
+# LinkedIn: https://www.linkedin.com/in/phdricardomoya/
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tests para el módulo value.
+
+Ejecutar: python -m pytest tests/test_value.py -v -s
+"""
+
+import itertools
+
+import numpy as np
+
+from kinielagpt import value
+
+
+def build_matrices(n_matches: int, seed: int = 7) -> tuple[np.ndarray, np.ndarray]:
+    """Probabilidades LAE aleatorias y porcentajes del público desviados de ellas, ambos normalizados."""
+    rng = np.random.default_rng(seed)
+    probabilities = rng.dirichlet([3.0, 2.0, 2.0], size=n_matches)
+    shares = np.clip(probabilities + rng.normal(0.0, 0.1, size=probabilities.shape), 0.02, None)
+    return probabilities, shares / shares.sum(axis=1, keepdims=True)
+
+
+def test_sign_matrix() -> None:
+    """
+    Prueba la construcción de la matriz de probabilidades a partir de filas de data_source.
+
+    Raises
+    ------
+    AssertionError
+        Si las filas no se normalizan o las vacías no se reparten uniformemente.
+    """
+    print("=" * 80)
+    print("TEST: test_sign_matrix()")
+    print("=" * 80)
+
+    matrix = value.sign_matrix([{"1_Prob": 50.0, "X_Prob": 30.0, "2_Prob": 20.0}, {"1_Prob": 80.0}, {}])
+
+    expected = np.array([[0.5, 0.3, 0.2], [1.0, 0.0, 0.0], [1 / 3, 1 / 3, 1 / 3]])
+    assert np.allclose(matrix, expected), f"❌ Matriz inesperada: {matrix}"
+    assert value.sign_matrix([]).shape == (0, 3), "❌ Una lista vacía debe dar una matriz (0, 3)"
+    print("✅ Filas normalizadas, claves ausentes a 0 y filas vacías uniformes")
+
+
+def test_column_expected_values() -> None:
+    """
+    Prueba que el valor esperado vectorizado coincide con el cálculo columna a columna.
+
+    Raises
+    ------
+    AssertionError
+        Si algún valor difiere o una columna más apostada no vale menos a igual probabilidad.
+    """
+    print("=" * 80)
+    print("TEST: test_column_expected_values()")
+    print("=" * 80)
+
+    probabilities, shares = build_matrices(n_matches=5)
+    columns = np.array(list(itertools.product(range(3), repeat=5)))
+    values = value.column_expected_values(columns=columns, probabilities=probabilities, shares=shares,
+                                          apuestas=1000)
+
+    for column, result in zip(columns, values):
+        p = np.prod([probabilities[m, s] for m, s in enumerate(column)])
+        q = np.prod([shares[m, s] for m, s in enumerate(column)])
+        assert np.isclose(result, p / (1 + 1000 * q)), f"❌ Valor incorrecto para la columna {column}"
+
+    same_probability = np.full((1, 3), 1 / 3)
+    popular = value.column_expected_values(columns=np.array([[0]]), probabilities=same_probability,
+                                           shares=np.array([[0.8, 0.1, 0.1]]))
+    unpopular = value.column_expected_values(columns=np.array([[1]]), probabilities=same_probability,
+                                             shares=np.array([[0.8, 0.1, 0.1]]))
+    assert unpopular[0] > popular[0], "❌ A igual probabilidad, la columna menos apostada debe valer más"
+    print(f"✅ {len(columns)} columnas evaluadas de forma vectorizada")
+
+
+def test_best_value_column() -> None:
+    """
+    Prueba que la búsqueda por bloques encuentra la mejor columna de la búsqueda exhaustiva.
+
+    Raises
+    ------
+    AssertionError
+        Si la columna elegida no es la óptima o depende del tamaño de bloque.
+    """
+    print("=" * 80)
+    print("TEST: test_best_value_column()")
+    print("=" * 80)
+
+    probabilities, shares = build_matrices(n_matches=8)
+    columns = np.array(list(itertools.product(range(3), repeat=8)))
+    values = value.column_expected_values(columns=columns, probabilities=probabilities, shares=shares)
+    expected = columns[int(np.argmax(values))]
+
+    best = value.best_value_column(probabilities=probabilities, shares=shares, top=3, block_size=1000)
+    assert best["evaluated"] == 3 ** 8, f"❌ Se esperaban {3 ** 8} columnas evaluadas"
+    assert list(best["column"]) == list(expected), f"❌ Columna {best['column']}, esperada {expected}"
+    assert np.isclose(best["value"], values.max()), "❌ El valor de la mejor columna no coincide"
+
+    top2 = value.best_value_column(probabilities=probabilities, shares=shares, top=2)
+    top2_small = value.best_value_column(probabilities=probabilities, shares=shares, top=2, block_size=7)
+    assert list(top2["column"]) == list(top2_small["column"]), "❌ El resultado no debe depender del bloque"
+    assert top2["value"] <= best["value"], "❌ Restringir candidatos no puede mejorar el óptimo"
+
+    favourites = value.best_value_column(probabilities=probabilities, shares=shares, top=1)
+    assert list(favourites["column"]) == list(probabilities.argmax(axis=1)), "❌ top=1 debe dar los favoritos"
+    print(f"✅ Mejor columna encontrada entre {best['evaluated']} candidatas: valor {best['value']:.3e}")
+
+
+if __name__ == "__main__":
+    test_sign_matrix()
+    test_column_expected_values()
+    test_best_value_column()